@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Review-queue read benchmark: full log replay vs snapshot + tail replay.
+
+Builds a synthetic review-queue log (default 100k lines), then times:
+- full replay: re-parse every line, as every read did before snapshots
+- cold read: load the compacted snapshot and replay the tail past its offset
+- warm read: in-process state, replaying only rows appended since the last read
+
+Usage:
+    python scripts/perf/bench_review_queue.py --lines 100000 --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is importable when executed as a script.
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.api import review_queue_service  # noqa: E402
+from services.api.analysis_metadata_repository import FileBackedAnalysisMetadataRepository  # noqa: E402
+from services.api.review_queue_service import (  # noqa: E402
+    ReviewQueueDeps,
+    compact_review_queue,
+    enqueue_review_item,
+    list_review_items,
+)
+
+_STATUSES = ("queued", "claimed", "escalated", "resolved")
+
+
+def _write_log(path: Path, lines: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for n in range(lines):
+            item_no = n // len(_STATUSES)
+            status = _STATUSES[n % len(_STATUSES)]
+            row = {
+                "item_id": f"survey_{item_no + 1}",
+                "domain": "survey",
+                "report_id": f"report_{item_no}",
+                "teacher_id": f"teacher_{item_no % 200}",
+                "target_type": "report",
+                "target_id": f"report_{item_no}",
+                "status": status,
+                "reason": "low_confidence",
+                "operation": "enqueue" if status == "queued" else "transition",
+                "created_at": "2026-03-07T10:00:00",
+                "updated_at": "2026-03-07T10:00:00",
+            }
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def _full_replay(deps: ReviewQueueDeps) -> None:
+    latest = {}
+    for index, raw in enumerate(deps.metadata_repo.read_jsonl(deps.queue_log)):
+        item = review_queue_service._normalize_item(raw, index=index)
+        latest[item.item_id] = item
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        deps = ReviewQueueDeps(
+            metadata_repo=FileBackedAnalysisMetadataRepository(base_dir=base),
+            queue_log="survey_review_queue.jsonl",
+            now_iso=lambda: "2026-03-07T10:00:00",
+        )
+        _write_log(base / deps.queue_log, args.lines)
+
+        full_ms = _time_ms(lambda: _full_replay(deps), args.repeat)
+        compact_started = time.perf_counter()
+        compact_review_queue(deps=deps)
+        compact_ms = (time.perf_counter() - compact_started) * 1000.0
+
+        def _cold_read() -> None:
+            review_queue_service._STATES.clear()
+            list_review_items(teacher_id="teacher_7", domain=None, status=None, deps=deps)
+
+        cold_ms = _time_ms(_cold_read, args.repeat)
+
+        def _warm_read() -> None:
+            enqueue_review_item(
+                domain="survey",
+                report_id="report_new",
+                teacher_id="teacher_7",
+                reason="low_confidence",
+                confidence=0.4,
+                target_type="report",
+                target_id="report_new",
+                deps=deps,
+            )
+            list_review_items(teacher_id="teacher_7", domain=None, status=None, deps=deps)
+
+        warm_ms = _time_ms(_warm_read, args.repeat)
+
+    print(f"lines={args.lines}")
+    print(f"full_replay_ms={full_ms:.1f}")
+    print(f"compact_ms={compact_ms:.1f}")
+    print(f"cold_snapshot_read_ms={cold_ms:.1f}")
+    print(f"warm_enqueue_and_read_ms={warm_ms:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Student directory benchmark: search / name lookup / class roster over many profiles.
+
+Builds a synthetic ``student_profiles`` directory (default 20,000 files), then
+times each lookup:
+- legacy: load every profile and score every name, alias and class per call
+- indexed: the resident student directory index (stat-validated, candidate
+  prefilter before ``SequenceMatcher``)
+
+The first indexed call (cold build) is reported separately.
+
+Usage:
+    python scripts/perf/bench_student_directory.py --profiles 20000 --repeat 10
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Ensure project root is importable when executed as a script.
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.api.student_directory_index import StudentDirectoryIndex  # noqa: E402
+from services.api.student_directory_service import (  # noqa: E402
+    StudentDirectoryDeps,
+    list_student_ids_by_class,
+    student_candidates_by_name,
+    student_search,
+)
+
+_SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈姚卢姜崔钟谭陆汪范金石廖贾夏韦付方白邹孟熊秦邱江尹薛闫段雷侯龙史陶黎贺顾毛郝龚邵万钱严覃武戴莫孔向汤"
+_GIVEN = "伟芳娜秀英敏静丽强磊军洋勇艳杰娟涛明超秀兰霞平刚桂英华玉萍红娥玲芬燕彩春菊兰凤洁梅琳素云莲真环雪荣爱妹霞香月莺媛艳瑞凡佳嘉琼勤珍贞莉桂娣叶璧璐娅琦晶妍茜秋珊莎锦黛青倩婷姣婉娴瑾颖露瑶怡婵雁蓓纨仪荷丹蓉眉君琴蕊薇菁梦岚苑婕馨瑗琰韵融园艺咏卿聪澜纯毓悦昭冰爽琬茗羽希宁欣飘育滢馥筠柔竹霭凝晓欢霄枫芸菲寒伊亚宜可姬舒影荔枝思丽"
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", "", text or "").lower()
+
+
+def _load(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_profiles(profiles_dir: Path, count: int, rng: random.Random) -> None:
+    profiles_dir.mkdir(parents=True, exist_ok=True)
+    past = time.time() - 3600
+    for n in range(count):
+        name = rng.choice(_SURNAMES) + "".join(rng.choice(_GIVEN) for _ in range(rng.randint(1, 2)))
+        profile = {
+            "student_id": f"S{n:06d}",
+            "student_name": name,
+            "class_name": f"高{rng.randint(1, 3)}{2400 + rng.randint(1, 40)}班",
+            "aliases": [name[1:]] if n % 4 == 0 else [],
+        }
+        path = profiles_dir / f"{profile['student_id']}.json"
+        path.write_text(json.dumps(profile, ensure_ascii=False), encoding="utf-8")
+        os.utime(path, (past, past))
+    os.utime(profiles_dir, (past, past))
+
+
+def _legacy_search(profiles_dir: Path, query: str, limit: int):
+    q_norm = _normalize(query)
+    matches = []
+    for path in profiles_dir.glob("*.json"):
+        profile = _load(path)
+        student_id = profile.get("student_id") or path.stem
+        best = 0.0
+        for candidate in [student_id, profile.get("student_name", ""), profile.get("class_name", "")] + (
+            profile.get("aliases") or []
+        ):
+            cand_norm = _normalize(str(candidate)) if candidate else ""
+            if not cand_norm:
+                continue
+            score = 1.0 if q_norm in cand_norm else SequenceMatcher(None, q_norm, cand_norm).ratio()
+            best = max(best, score)
+        if best > 0.1:
+            matches.append((round(best, 3), student_id))
+    matches.sort(key=lambda item: item[0], reverse=True)
+    return [score for score, _sid in matches[:limit]]
+
+
+def _legacy_class_ids(profiles_dir: Path, class_name: str):
+    class_norm = _normalize(class_name)
+    return sorted(
+        str(profile.get("student_id") or path.stem)
+        for path in profiles_dir.glob("*.json")
+        if _normalize((profile := _load(path)).get("class_name") or "") == class_norm
+    )
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--legacy-repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        profiles_dir = data_dir / "student_profiles"
+        _write_profiles(profiles_dir, args.profiles, rng)
+        sample = _load(profiles_dir / "S000123.json")
+        query = sample["student_name"]
+        class_name = sample["class_name"]
+        deps = StudentDirectoryDeps(
+            data_dir=data_dir,
+            load_profile_file=_load,
+            normalize=_normalize,
+            directory_index=StudentDirectoryIndex(revalidate_sec=3600),
+        )
+
+        started = time.perf_counter()
+        indexed = [item["score"] for item in student_search(query, 5, deps)["matches"]]
+        cold_ms = (time.perf_counter() - started) * 1000.0
+        assert indexed == _legacy_search(profiles_dir, query, 5)
+        assert list_student_ids_by_class(class_name, deps) == _legacy_class_ids(profiles_dir, class_name)
+
+        legacy_search_ms = _time_ms(lambda: _legacy_search(profiles_dir, query, 5), args.legacy_repeat)
+        legacy_class_ms = _time_ms(lambda: _legacy_class_ids(profiles_dir, class_name), args.legacy_repeat)
+        search_ms = _time_ms(lambda: student_search(query, 5, deps), args.repeat)
+        fuzzy_ms = _time_ms(lambda: student_search(query[0] + "x", 5, deps), args.repeat)
+        name_ms = _time_ms(lambda: student_candidates_by_name(query, deps), args.repeat)
+        class_ms = _time_ms(lambda: list_student_ids_by_class(class_name, deps), args.repeat)
+
+    print(f"profiles={args.profiles}")
+    print(f"legacy_search_ms={legacy_search_ms:.1f}")
+    print(f"legacy_class_ids_ms={legacy_class_ms:.1f}")
+    print(f"indexed_cold_build_ms={cold_ms:.1f}")
+    print(f"indexed_search_ms={search_ms:.2f}")
+    print(f"indexed_fuzzy_search_ms={fuzzy_ms:.2f}")
+    print(f"indexed_candidates_by_name_ms={name_ms:.3f}")
+    print(f"indexed_class_ids_ms={class_ms:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
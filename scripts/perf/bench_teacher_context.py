@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Teacher turn-prep benchmark: long-term memory context for a teacher with many proposals.
+
+Builds a synthetic workspace (default 2,000 proposal files), then times the
+"Long-Term Memory" block a chat turn injects:
+- legacy: glob + stat-sort + JSON-parse the newest proposals on every turn
+- indexed: the in-process proposal record index, re-ranked on every turn
+- materialized: the cached, pre-rendered block (fingerprint check only)
+
+Usage:
+    python scripts/perf/bench_teacher_context.py --proposals 2000 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is importable when executed as a script.
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.api.teacher_context_service import build_teacher_memory_context_reader  # noqa: E402
+from services.api.teacher_memory_context_cache import TeacherMemoryContextCache  # noqa: E402
+from services.api.teacher_memory_record_index import (  # noqa: E402
+    TeacherMemoryRecordIndex,
+    proposals_dir_stamp,
+)
+from services.api.teacher_memory_store_service import (  # noqa: E402
+    TeacherMemoryStoreDeps,
+    teacher_memory_active_applied_records,
+)
+
+_STATUSES = ("applied", "applied", "proposed", "rejected", "deleted")
+_CONTEXT_MAX_ENTRIES = 20
+
+
+def _write_proposals(proposals_dir: Path, count: int) -> None:
+    proposals_dir.mkdir(parents=True, exist_ok=True)
+    past = time.time() - 3600
+    for n in range(count):
+        record = {
+            "proposal_id": f"tmem_{n:05d}",
+            "teacher_id": "teacher_bench",
+            "target": "MEMORY" if n % 3 else "USER",
+            "title": f"偏好 {n}",
+            "content": f"输出格式偏好第{n}条：先给结论，再列三条行动项。" * 3,
+            "source": "manual" if n % 2 else "auto_intent",
+            "status": _STATUSES[n % len(_STATUSES)],
+            "priority_score": n % 100,
+            "created_at": "2026-03-01T10:00:00",
+        }
+        path = proposals_dir / f"{record['proposal_id']}.json"
+        path.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+        os.utime(path, (past + n, past + n))
+    os.utime(proposals_dir, (past, past))
+
+
+def _legacy_recent(proposals_dir: Path, limit: int):
+    files = sorted(
+        proposals_dir.glob("*.json"),
+        key=lambda path: path.stat().st_mtime if path.exists() else 0,
+        reverse=True,
+    )
+    out = []
+    for path in files:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data.setdefault("proposal_id", path.stem)
+        out.append(data)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def _reader(proposals_dir: Path, recent, cache=None):
+    deps = TeacherMemoryStoreDeps(
+        teacher_workspace_dir=lambda teacher_id: proposals_dir.parent,
+        proposal_path=lambda teacher_id, proposal_id: proposals_dir / f"{proposal_id}.json",
+        recent_proposals=lambda teacher_id, limit: recent(proposals_dir, limit),
+        is_expired_record=lambda rec, now: False,
+        rank_score=lambda rec: float(rec.get("priority_score") or 0),
+        now_iso=lambda: "2026-03-07T10:00:00",
+    )
+    return build_teacher_memory_context_reader(
+        teacher_memory_active_applied_records=lambda teacher_id, target=None, limit=200: teacher_memory_active_applied_records(
+            teacher_id, deps=deps, target=target, limit=limit
+        ),
+        teacher_read_text=lambda path, max_chars=4000: "",
+        teacher_workspace_file=lambda teacher_id, name: proposals_dir.parent / name,
+        teacher_memory_rank_score=lambda rec: float(rec.get("priority_score") or 0),
+        teacher_memory_context_max_entries=_CONTEXT_MAX_ENTRIES,
+        context_cache=cache,
+        context_fingerprint=(lambda teacher_id: proposals_dir_stamp(proposals_dir)) if cache is not None else None,
+    )
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--proposals", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        proposals_dir = Path(tmp) / "teacher_bench" / "proposals"
+        _write_proposals(proposals_dir, args.proposals)
+
+        legacy = _reader(proposals_dir, _legacy_recent)
+        index = TeacherMemoryRecordIndex()
+        indexed = _reader(proposals_dir, index.recent)
+        materialized = _reader(proposals_dir, TeacherMemoryRecordIndex().recent, cache=TeacherMemoryContextCache())
+
+        expected = legacy("teacher_bench", 4000)
+        assert indexed("teacher_bench", 4000) == expected
+        assert materialized("teacher_bench", 4000) == expected
+
+        legacy_ms = _time_ms(lambda: legacy("teacher_bench", 4000), args.repeat)
+        indexed_ms = _time_ms(lambda: indexed("teacher_bench", 4000), args.repeat)
+        materialized_ms = _time_ms(lambda: materialized("teacher_bench", 4000), args.repeat)
+
+    print(f"proposals={args.proposals}")
+    print(f"legacy_turn_prep_ms={legacy_ms:.2f}")
+    print(f"indexed_turn_prep_ms={indexed_ms:.2f}")
+    print(f"materialized_turn_prep_ms={materialized_ms:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Teacher memory event log benchmark: last-N load and insights counters vs log size.
+
+Writes a synthetic ``memory_events.jsonl`` (default 200,000 events over 60 days),
+then times:
+- legacy load: ``read_text().splitlines()`` of the whole log, keep the last 5,000
+- tail load: backwards block-wise read of the last 5,000 lines
+- insights counters: per-day SQLite counters summed over a 14-day window
+- append: one logged event (log line + counter update)
+
+Usage:
+    python scripts/perf/bench_teacher_memory_events.py --events 200000 --repeat 10
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Ensure project root is importable when executed as a script.
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services.api.teacher_memory_event_log import get_memory_event_stats_store, tail_jsonl  # noqa: E402
+
+
+def _write_log(path: Path, count: int, days: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    start = date.today() - timedelta(days=days - 1)
+    with path.open("w", encoding="utf-8") as handle:
+        for n in range(count):
+            day = start + timedelta(days=n * days // count)
+            if n % 3 == 0:
+                rec = {"ts": f"{day.isoformat()}T10:00:00", "event": "context_injected", "count": 4}
+            else:
+                rec = {"ts": f"{day.isoformat()}T10:00:00", "event": "search", "mode": "mem0", "query": f"q{n % 500}", "hits": n % 2}
+            handle.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
+def _legacy_load(path: Path, limit: int):
+    out = []
+    for raw in reversed(path.read_text(encoding="utf-8", errors="ignore").splitlines()):
+        if raw.strip():
+            out.append(json.loads(raw))
+            if len(out) >= limit:
+                break
+    out.reverse()
+    return out
+
+
+def _time_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "telemetry" / "memory_events.jsonl"
+        _write_log(log_path, args.events, args.days)
+        store = get_memory_event_stats_store(log_path, max_bytes=1 << 40)
+        since_day = (date.today() - timedelta(days=14)).isoformat()
+
+        started = time.perf_counter()
+        store.summary(since_day=since_day)
+        seed_ms = (time.perf_counter() - started) * 1000.0
+        assert tail_jsonl(log_path, 5000) == _legacy_load(log_path, 5000)
+
+        legacy_ms = _time_ms(lambda: _legacy_load(log_path, 5000), args.repeat)
+        tail_ms = _time_ms(lambda: tail_jsonl(log_path, 5000), args.repeat)
+        summary_ms = _time_ms(lambda: store.summary(since_day=since_day), args.repeat)
+        append_ms = _time_ms(
+            lambda: store.append({"ts": f"{date.today().isoformat()}T11:00:00", "event": "context_injected"}),
+            args.repeat,
+        )
+        log_mb = log_path.stat().st_size / 1e6
+
+    print(f"events={args.events}")
+    print(f"log_mb={log_mb:.1f}")
+    print(f"legacy_load_last_5000_ms={legacy_ms:.1f}")
+    print(f"tail_load_last_5000_ms={tail_ms:.1f}")
+    print(f"counters_seed_once_ms={seed_ms:.1f}")
+    print(f"counters_summary_14d_ms={summary_ms:.2f}")
+    print(f"append_ms={append_ms:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
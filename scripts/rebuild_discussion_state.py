@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from services.api.config import DISCUSSION_COMPLETE_MARKER, STUDENT_SESSIONS_DIR  # noqa: E402
+from services.api.paths import safe_fs_id  # noqa: E402
+from services.api.session_discussion_service import rebuild_discussion_state  # noqa: E402
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Rebuild per-student discussion state (message count, last ts, pass flag) from session files.'
+    )
+    parser.add_argument('--sessions-dir', default=str(STUDENT_SESSIONS_DIR), help='student sessions root directory')
+    parser.add_argument('--student-id', action='append', default=[], help='only rebuild these students (repeatable)')
+    parser.add_argument('--marker', default=DISCUSSION_COMPLETE_MARKER, help='discussion pass marker')
+    args = parser.parse_args(argv)
+
+    root = Path(args.sessions_dir)
+    if args.student_id:
+        student_dirs = [root / safe_fs_id(student_id, prefix='student') for student_id in args.student_id]
+    else:
+        student_dirs = sorted(path for path in root.iterdir() if path.is_dir()) if root.is_dir() else []
+
+    students = 0
+    sessions = 0
+    for student_dir in student_dirs:
+        if not student_dir.is_dir():
+            continue
+        sessions += rebuild_discussion_state(student_dir, args.marker)
+        students += 1
+    sys.stdout.write(json.dumps({'ok': True, 'students': students, 'sessions': sessions}) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
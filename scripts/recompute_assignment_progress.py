@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from services.api import app_core  # noqa: E402
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            'Recompute every student row of materialized assignment progress (progress.json). '
+            'Reads serve the materialized rows for up to ASSIGNMENT_PROGRESS_MAX_AGE_SEC; use this '
+            'after edits made outside the grading and discussion events, or to repair a bad file.'
+        )
+    )
+    parser.add_argument('--assignment-id', action='append', default=[], help='only these assignments (repeatable)')
+    args = parser.parse_args(argv)
+
+    assignment_ids = list(args.assignment_id)
+    if not assignment_ids:
+        root = Path(app_core.DATA_DIR) / 'assignments'
+        assignment_ids = sorted(path.name for path in root.iterdir() if path.is_dir()) if root.is_dir() else []
+
+    recomputed = 0
+    failed = []
+    for assignment_id in assignment_ids:
+        result = app_core.recompute_assignment_progress(assignment_id, include_students=False)
+        if result.get('ok'):
+            recomputed += 1
+        else:
+            failed.append({'assignment_id': assignment_id, 'error': result.get('error')})
+    sys.stdout.write(json.dumps({'ok': not failed, 'recomputed': recomputed, 'failed': failed}) + '\n')
+    return 0 if not failed else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from services.api import mem0_adapter  # noqa: E402
+from services.api.paths import resolve_teacher_id, teacher_workspace_file  # noqa: E402
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Index a teacher's MEMORY.md entries into mem0 in one batch. Embeddings of "
+            "unchanged entries come from the local embedding cache."
+        )
+    )
+    parser.add_argument("--teacher-id", default="", help="teacher id (defaults to DEFAULT_TEACHER_ID)")
+    parser.add_argument("--file", default="", help="memory file to import (defaults to the workspace MEMORY.md)")
+    args = parser.parse_args(argv)
+
+    teacher_id = resolve_teacher_id(args.teacher_id or None)
+    path = Path(args.file) if args.file else teacher_workspace_file(teacher_id, "MEMORY.md")
+    result = mem0_adapter.teacher_mem0_import_memory_file(teacher_id, path)
+    sys.stdout.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+    return 0 if result.get("ok") else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Protocol
+from typing import Any, Dict, List, Protocol, Tuple
 
 from .job_repository import _atomic_write_json
 
@@ -44,6 +44,35 @@ class FileBackedAnalysisMetadataRepository:
                 rows.append(item)
         return rows
 
+    def read_jsonl_from(self, relative_path: str, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Rows appended after byte ``offset``, and the offset just past the last complete line.
+
+        A trailing line without its newline (an append still in flight) is left
+        for the next call. Raises ``ValueError`` when the file is shorter than
+        ``offset``, i.e. it was truncated or replaced.
+        """
+        target = self._resolve(relative_path)
+        if not target.exists():
+            if offset > 0:
+                raise ValueError(f'{relative_path} shrank below offset {offset}')
+            return [], 0
+        with target.open('rb') as handle:
+            handle.seek(0, 2)
+            if handle.tell() < offset:
+                raise ValueError(f'{relative_path} shrank below offset {offset}')
+            handle.seek(offset)
+            chunk = handle.read()
+        complete = chunk[: chunk.rfind(b'\n') + 1]
+        rows: List[Dict[str, Any]] = []
+        for line in complete.decode('utf-8').splitlines():
+            raw = line.strip()
+            if not raw:
+                continue
+            item = json.loads(raw)
+            if isinstance(item, dict):
+                rows.append(item)
+        return rows, offset + len(complete)
+
     def append_jsonl(self, relative_path: str, item: Dict[str, Any]) -> Path:
         target = self._resolve(relative_path)
         target.parent.mkdir(parents=True, exist_ok=True)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import time
-from collections import defaultdict
-from typing import Any, Callable, DefaultDict, Dict, Optional
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, DefaultDict, Deque, Dict, Iterator, Optional, Tuple
 
 from .analysis_metrics_store import AnalysisMetricsStore
 from .specialist_agents.events import SpecialistRuntimeEvent
@@ -24,6 +25,13 @@ _RUNTIME_REASON_COUNTERS = {
     'budget_exceeded': 'budget_rejection_count',
     'specialist_execution_failed': 'fallback_count',
 }
+_RUNTIME_PHASE_COUNTERS = {
+    'started': 'run_count',
+    'failed': 'fail_count',
+    'review_downgraded': 'review_downgrade_count',
+    'reviewer_rejected': 'reviewer_reject_count',
+    'rerun_requested': 'rerun_count',
+}
 _WORKFLOW_COUNTER_DEFAULTS = {
     'resolution_count': 0,
     'auto_selected_count': 0,
@@ -32,6 +40,13 @@ _WORKFLOW_COUNTER_DEFAULTS = {
 }
 _RUNTIME_RECORD_RETENTION_SEC = 7 * 24 * 60 * 60
 _MAX_RUNTIME_RECORDS = 10000
+_RUNTIME_BUCKET_SEC = 60
+_COMPACT_EVERY_EVENTS = 500
+_COMPACT_INTERVAL_SEC = 300.0
+
+# (phase, domain, strategy_id, agent_id, reason_code)
+_RuntimeKey = Tuple[str, str, str, str, Optional[str]]
+_GROUP_KEY_INDEX = {'strategy': 2, 'agent': 3}
 
 
 def _as_dict(raw: Any) -> Dict[str, Any]:
@@ -39,6 +54,17 @@ def _as_dict(raw: Any) -> Dict[str, Any]:
 
 
 class AnalysisMetricsService:
+    """In-memory analysis metrics backed by an append-only journal.
+
+    Every recorded event is appended to the store's journal and applied in
+    memory; the full snapshot is only rewritten on compaction (every
+    ``compact_every_events`` events or ``compact_interval_sec`` seconds).
+    Other processes sharing the store are caught up with under the store lock
+    before every append, snapshot and compaction.
+    Windowed runtime stats are kept as per-``runtime_bucket_sec`` counters, so
+    window boundaries have bucket granularity.
+    """
+
     def __init__(
         self,
         *,
@@ -46,59 +72,37 @@ class AnalysisMetricsService:
         now_ts: Callable[[], float] = time.time,
         runtime_record_retention_sec: int = _RUNTIME_RECORD_RETENTION_SEC,
         max_runtime_records: int = _MAX_RUNTIME_RECORDS,
+        runtime_bucket_sec: int = _RUNTIME_BUCKET_SEC,
+        compact_every_events: int = _COMPACT_EVERY_EVENTS,
+        compact_interval_sec: float = _COMPACT_INTERVAL_SEC,
     ) -> None:
         self._store = store
         self._now_ts = now_ts
         self._runtime_record_retention_sec = int(runtime_record_retention_sec or _RUNTIME_RECORD_RETENTION_SEC)
         self._max_runtime_records = int(max_runtime_records or _MAX_RUNTIME_RECORDS)
-        self._counters: DefaultDict[str, int] = defaultdict(int)
-        self._by_phase: DefaultDict[str, int] = defaultdict(int)
-        self._by_reason: DefaultDict[str, int] = defaultdict(int)
-        self._by_domain: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self._by_strategy: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self._by_agent: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self._workflow_counters: DefaultDict[str, int] = defaultdict(int)
-        self._workflow_by_effective_skill: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self._workflow_by_role: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self._workflow_by_reason: DefaultDict[str, int] = defaultdict(int)
-        self._workflow_by_resolution_mode: DefaultDict[str, int] = defaultdict(int)
-        self._workflow_by_outcome: DefaultDict[str, int] = defaultdict(int)
-        self._workflow_by_outcome_reason: DefaultDict[str, int] = defaultdict(int)
-        self._recent_runtime_records: list[Dict[str, Any]] = []
-        self._restore_snapshot(self._load_persisted_snapshot())
-        self._prune_recent_runtime_records()
+        self._runtime_bucket_sec = max(1, int(runtime_bucket_sec or _RUNTIME_BUCKET_SEC))
+        self._compact_every_events = max(1, int(compact_every_events or _COMPACT_EVERY_EVENTS))
+        self._compact_interval_sec = float(compact_interval_sec or _COMPACT_INTERVAL_SEC)
+        self._events_since_compact = 0
+        self._last_compact_ts = float(self._now_ts())
+        self._snapshot_identity: Optional[Tuple[int, int]] = None
+        self._reset_state()
+        if self._store is not None:
+            with self._store.locked():
+                self._reload_locked()
 
     def record(self, event: SpecialistRuntimeEvent) -> None:
         normalized = SpecialistRuntimeEvent.model_validate(event)
-        phase = self._bucket(normalized.phase)
-        domain = self._bucket(normalized.domain)
-        strategy_id = self._bucket(normalized.strategy_id)
-        agent_id = self._bucket(normalized.agent_id)
-        reason_code = self._reason_bucket(normalized.reason_code)
-
-        self._increment_dimensions(
-            phase=phase,
-            domain=domain,
-            strategy_id=strategy_id,
-            agent_id=agent_id,
-        )
-        if phase == 'started':
-            self._counters['run_count'] += 1
-        if phase == 'failed':
-            self._counters['fail_count'] += 1
-        if reason_code:
-            self._by_reason[reason_code] += 1
-            counter_key = _RUNTIME_REASON_COUNTERS.get(reason_code)
-            if counter_key:
-                self._counters[counter_key] += 1
-        self._append_runtime_record(
-            phase=phase,
-            domain=domain,
-            strategy_id=strategy_id,
-            agent_id=agent_id,
-            reason_code=reason_code,
+        self._emit(
+            {
+                'kind': 'runtime',
+                'phase': self._bucket(normalized.phase),
+                'domain': self._bucket(normalized.domain),
+                'strategy_id': self._bucket(normalized.strategy_id),
+                'agent_id': self._bucket(normalized.agent_id),
+                'reason_code': self._reason_bucket(normalized.reason_code),
+            }
         )
-        self._persist()
 
     def record_review_downgrade(
         self,
@@ -108,7 +112,7 @@ class AnalysisMetricsService:
         agent_id: str | None = None,
         reason_code: str | None = None,
     ) -> None:
-        self._record_auxiliary_phase(
+        self._emit_auxiliary(
             phase='review_downgraded',
             domain=domain,
             strategy_id=strategy_id,
@@ -116,14 +120,6 @@ class AnalysisMetricsService:
             reason_code=reason_code,
             counter_key='review_downgrade_count',
         )
-        self._append_runtime_record(
-            phase='review_downgraded',
-            domain=self._bucket(domain),
-            strategy_id=self._bucket(strategy_id),
-            agent_id=self._bucket(agent_id),
-            reason_code=self._reason_bucket(reason_code),
-        )
-        self._persist()
 
     def record_reviewer_rejection(
         self,
@@ -133,7 +129,7 @@ class AnalysisMetricsService:
         agent_id: str | None = None,
         reason_code: str | None = None,
     ) -> None:
-        self._record_auxiliary_phase(
+        self._emit_auxiliary(
             phase='reviewer_rejected',
             domain=domain,
             strategy_id=strategy_id,
@@ -141,14 +137,6 @@ class AnalysisMetricsService:
             reason_code=reason_code,
             counter_key='reviewer_reject_count',
         )
-        self._append_runtime_record(
-            phase='reviewer_rejected',
-            domain=self._bucket(domain),
-            strategy_id=self._bucket(strategy_id),
-            agent_id=self._bucket(agent_id),
-            reason_code=self._reason_bucket(reason_code),
-        )
-        self._persist()
 
     def record_rerun(
         self,
@@ -157,7 +145,7 @@ class AnalysisMetricsService:
         strategy_id: str | None,
         agent_id: str | None = None,
     ) -> None:
-        self._record_auxiliary_phase(
+        self._emit_auxiliary(
             phase='rerun_requested',
             domain=domain,
             strategy_id=strategy_id,
@@ -165,14 +153,6 @@ class AnalysisMetricsService:
             reason_code=None,
             counter_key='rerun_count',
         )
-        self._append_runtime_record(
-            phase='rerun_requested',
-            domain=self._bucket(domain),
-            strategy_id=self._bucket(strategy_id),
-            agent_id=self._bucket(agent_id),
-            reason_code=None,
-        )
-        self._persist()
 
     def record_workflow_resolution(
         self,
@@ -187,20 +167,17 @@ class AnalysisMetricsService:
         requested_rewritten: bool = False,
     ) -> None:
         del requested_skill_id, confidence
-        effective = self._bucket(effective_skill_id)
-        role_bucket = self._bucket(role)
-        reason_bucket = self._bucket(reason)
-        resolution_bucket = self._bucket(resolution_mode)
-        self._workflow_counters['resolution_count'] += 1
-        if auto_selected:
-            self._workflow_counters['auto_selected_count'] += 1
-        if requested_rewritten:
-            self._workflow_counters['requested_rewritten_count'] += 1
-        self._workflow_by_effective_skill[effective]['resolved'] += 1
-        self._workflow_by_role[role_bucket]['resolved'] += 1
-        self._workflow_by_reason[reason_bucket] += 1
-        self._workflow_by_resolution_mode[resolution_bucket] += 1
-        self._persist()
+        self._emit(
+            {
+                'kind': 'workflow_resolution',
+                'role': self._bucket(role),
+                'effective_skill_id': self._bucket(effective_skill_id),
+                'reason': self._bucket(reason),
+                'resolution_mode': self._bucket(resolution_mode),
+                'auto_selected': bool(auto_selected),
+                'requested_rewritten': bool(requested_rewritten),
+            }
+        )
 
     def record_workflow_outcome(
         self,
@@ -214,22 +191,25 @@ class AnalysisMetricsService:
         outcome_reason: str | None = None,
     ) -> None:
         del requested_skill_id, reason, resolution_mode
-        effective = self._bucket(effective_skill_id)
-        role_bucket = self._bucket(role)
-        outcome_bucket = self._bucket(outcome)
-        outcome_reason_bucket = self._bucket(outcome_reason)
-        self._workflow_counters['outcome_count'] += 1
-        self._workflow_by_effective_skill[effective][outcome_bucket] += 1
-        self._workflow_by_role[role_bucket][outcome_bucket] += 1
-        self._workflow_by_outcome[outcome_bucket] += 1
-        self._workflow_by_outcome_reason[outcome_reason_bucket] += 1
-        self._persist()
+        self._emit(
+            {
+                'kind': 'workflow_outcome',
+                'role': self._bucket(role),
+                'effective_skill_id': self._bucket(effective_skill_id),
+                'outcome': self._bucket(outcome),
+                'outcome_reason': self._bucket(outcome_reason),
+            }
+        )
 
     def snapshot(self, *, window_sec: int | None = None, include_event_log: bool = False) -> Dict[str, Any]:
+        with self._synced():
+            return self._build_snapshot(window_sec=window_sec, include_event_log=include_event_log)
+
+    def _build_snapshot(self, *, window_sec: int | None, include_event_log: bool) -> Dict[str, Any]:
         if window_sec is None:
             payload = self._build_all_time_snapshot()
         else:
-            payload = self._build_runtime_snapshot_from_records(self._runtime_records_within_window(window_sec))
+            payload = self._build_runtime_snapshot_from_counts(self._runtime_counts_within_window(window_sec))
             payload['window_sec'] = int(window_sec)
         payload['workflow_routing'] = self._build_workflow_payload()
         if include_event_log:
@@ -237,18 +217,40 @@ class AnalysisMetricsService:
         return payload
 
     def grouped_runtime_snapshot(self, *, group_by: str, window_sec: int | None = None) -> Dict[str, Dict[str, Any]]:
-        bucket_field = {'strategy': 'strategy_id', 'agent': 'agent_id'}.get(str(group_by or '').strip())
-        if not bucket_field:
+        key_index = _GROUP_KEY_INDEX.get(str(group_by or '').strip())
+        if key_index is None:
             return {}
-        grouped_records: DefaultDict[str, list[Dict[str, Any]]] = defaultdict(list)
-        for record in self._runtime_records_within_window(window_sec):
-            grouped_records[self._bucket(record.get(bucket_field))].append(record)
+        grouped_counts: DefaultDict[str, Counter[_RuntimeKey]] = defaultdict(Counter)
+        with self._synced():
+            counts_in_window = self._runtime_counts_within_window(window_sec)
+        for key, count in counts_in_window.items():
+            grouped_counts[self._bucket(key[key_index])][key] += count
         return {
-            bucket: self._build_runtime_snapshot_from_records(records)
-            for bucket, records in grouped_records.items()
-            if records
+            bucket: self._build_runtime_snapshot_from_counts(counts)
+            for bucket, counts in grouped_counts.items()
+            if counts
         }
 
+    def compact(self) -> None:
+        """Write a full snapshot covering every journaled event and truncate the journal."""
+        self._events_since_compact = 0
+        self._last_compact_ts = float(self._now_ts())
+        if self._store is None:
+            return
+        with self._store.locked():
+            # Fold in other processes' events first: truncating the journal drops them.
+            self._sync_locked()
+            self._prune_runtime_state()
+            payload = self._build_snapshot(window_sec=None, include_event_log=True)
+            payload['journal_seq'] = self._journal_seq
+            payload['runtime_bucket_sec'] = self._runtime_bucket_sec
+            payload['runtime_buckets'] = [
+                [start, [[*key, count] for key, count in counts.items()]] for start, counts in self._runtime_buckets
+            ]
+            self._store.compact(payload)
+            self._snapshot_identity = self._store.snapshot_identity()
+            self._journal_offset = 0
+
     def _build_all_time_snapshot(self) -> Dict[str, Any]:
         counters = dict(_COUNTER_DEFAULTS)
         counters.update({key: int(value) for key, value in self._counters.items()})
@@ -275,7 +277,7 @@ class AnalysisMetricsService:
             'by_outcome_reason': dict(self._workflow_by_outcome_reason),
         }
 
-    def _build_runtime_snapshot_from_records(self, records: list[Dict[str, Any]]) -> Dict[str, Any]:
+    def _build_runtime_snapshot_from_counts(self, counts: Counter[_RuntimeKey]) -> Dict[str, Any]:
         counters = dict(_COUNTER_DEFAULTS)
         by_phase: DefaultDict[str, int] = defaultdict(int)
         by_reason: DefaultDict[str, int] = defaultdict(int)
@@ -283,33 +285,20 @@ class AnalysisMetricsService:
         by_strategy: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
         by_agent: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
 
-        for record in records:
-            phase = self._bucket(record.get('phase'))
-            domain = self._bucket(record.get('domain'))
-            strategy_id = self._bucket(record.get('strategy_id'))
-            agent_id = self._bucket(record.get('agent_id'))
-            reason_code = self._reason_bucket(record.get('reason_code'))
-
-            by_phase[phase] += 1
-            by_domain[domain][phase] += 1
-            by_strategy[strategy_id][phase] += 1
-            by_agent[agent_id][phase] += 1
-
-            if phase == 'started':
-                counters['run_count'] += 1
-            if phase == 'failed':
-                counters['fail_count'] += 1
-            if phase == 'review_downgraded':
-                counters['review_downgrade_count'] += 1
-            if phase == 'reviewer_rejected':
-                counters['reviewer_reject_count'] += 1
-            if phase == 'rerun_requested':
-                counters['rerun_count'] += 1
+        for (phase, domain, strategy_id, agent_id, reason_code), count in counts.items():
+            by_phase[phase] += count
+            by_domain[domain][phase] += count
+            by_strategy[strategy_id][phase] += count
+            by_agent[agent_id][phase] += count
+
+            phase_counter = _RUNTIME_PHASE_COUNTERS.get(phase)
+            if phase_counter:
+                counters[phase_counter] += count
             if reason_code:
-                by_reason[reason_code] += 1
+                by_reason[reason_code] += count
                 counter_key = _RUNTIME_REASON_COUNTERS.get(reason_code)
                 if counter_key:
-                    counters[counter_key] += 1
+                    counters[counter_key] += count
 
         return {
             'schema_version': 'v1',
@@ -321,26 +310,203 @@ class AnalysisMetricsService:
             'by_agent': {key: dict(value) for key, value in by_agent.items()},
         }
 
-    def _runtime_records_within_window(self, window_sec: int | None) -> list[Dict[str, Any]]:
-        self._prune_recent_runtime_records()
+    def _runtime_counts_within_window(self, window_sec: int | None) -> Counter[_RuntimeKey]:
+        self._prune_runtime_state()
+        merged: Counter[_RuntimeKey] = Counter()
         if window_sec is None:
-            return [dict(item) for item in self._recent_runtime_records]
-        window_sec_final = max(int(window_sec or 0), 0)
-        if window_sec_final <= 0:
-            return []
-        threshold = float(self._now_ts()) - float(window_sec_final)
-        return [dict(item) for item in self._recent_runtime_records if float(item.get('timestamp_sec') or 0.0) >= threshold]
-
-    def _load_persisted_snapshot(self) -> Dict[str, Any]:
+            threshold = None
+        else:
+            window_sec_final = max(int(window_sec or 0), 0)
+            if window_sec_final <= 0:
+                return merged
+            threshold = self._bucket_start(float(self._now_ts()) - float(window_sec_final))
+        # Buckets are ordered oldest first; walk newest first and stop at the window edge.
+        for start, counts in reversed(self._runtime_buckets):
+            if threshold is not None and start < threshold:
+                break
+            merged.update(counts)
+        return merged
+
+    def _reset_state(self) -> None:
+        self._counters: DefaultDict[str, int] = defaultdict(int)
+        self._by_phase: DefaultDict[str, int] = defaultdict(int)
+        self._by_reason: DefaultDict[str, int] = defaultdict(int)
+        self._by_domain: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._by_strategy: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._by_agent: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._workflow_counters: DefaultDict[str, int] = defaultdict(int)
+        self._workflow_by_effective_skill: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._workflow_by_role: DefaultDict[str, DefaultDict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._workflow_by_reason: DefaultDict[str, int] = defaultdict(int)
+        self._workflow_by_resolution_mode: DefaultDict[str, int] = defaultdict(int)
+        self._workflow_by_outcome: DefaultDict[str, int] = defaultdict(int)
+        self._workflow_by_outcome_reason: DefaultDict[str, int] = defaultdict(int)
+        self._recent_runtime_records: Deque[Dict[str, Any]] = deque(maxlen=self._max_runtime_records)
+        self._runtime_buckets: Deque[Tuple[int, Counter[_RuntimeKey]]] = deque()
+        self._journal_seq = 0
+        self._journal_offset = 0
+        self._snapshot_identity = None
+
+    @contextmanager
+    def _synced(self) -> Iterator[None]:
         if self._store is None:
-            return {}
-        loaded = self._store.load_snapshot()
-        return loaded if isinstance(loaded, dict) else {}
+            yield
+            return
+        with self._store.locked():
+            self._sync_locked()
+            yield
+
+    def _reload_locked(self) -> None:
+        """Rebuild in-memory state from the snapshot and the whole journal."""
+        store = self._store
+        if store is None:
+            return
+        self._reset_state()
+        self._snapshot_identity = store.snapshot_identity()
+        loaded = store.load_snapshot()
+        self._restore_snapshot(loaded if isinstance(loaded, dict) else {})
+        events, self._journal_offset = store.read_events_from(0)
+        for event in events:
+            seq = int(event.get('seq') or 0)
+            if seq > self._journal_seq:
+                self._apply_event(event)
+                self._journal_seq = seq
+        self._prune_runtime_state()
+
+    def _sync_locked(self) -> None:
+        """Apply events other processes journaled since this one last looked.
+
+        Sequence numbers are assigned under the store lock, so they are
+        contiguous; a gap, a shrunken journal or a rewritten snapshot means
+        another process compacted in between and the state is reloaded.
+        """
+        store = self._store
+        if store is None:
+            return
+        if store.snapshot_identity() != self._snapshot_identity:
+            self._reload_locked()
+            return
+        try:
+            events, offset = store.read_events_from(self._journal_offset)
+        except ValueError:
+            self._reload_locked()
+            return
+        for event in events:
+            seq = int(event.get('seq') or 0)
+            if seq <= self._journal_seq:
+                continue
+            if seq != self._journal_seq + 1:
+                self._reload_locked()
+                return
+            self._apply_event(event)
+            self._journal_seq = seq
+        self._journal_offset = offset
+
+    def _emit_auxiliary(
+        self,
+        *,
+        phase: str,
+        domain: str | None,
+        strategy_id: str | None,
+        agent_id: str | None,
+        reason_code: str | None,
+        counter_key: str,
+    ) -> None:
+        self._emit(
+            {
+                'kind': 'runtime',
+                'phase': phase,
+                'domain': self._bucket(domain),
+                'strategy_id': self._bucket(strategy_id),
+                'agent_id': self._bucket(agent_id),
+                'reason_code': self._reason_bucket(reason_code),
+                'counter_key': counter_key,
+            }
+        )
 
-    def _persist(self) -> None:
+    def _emit(self, event: Dict[str, Any]) -> None:
+        event['timestamp_sec'] = round(float(self._now_ts()), 4)
         if self._store is None:
+            self._journal_seq += 1
+            event['seq'] = self._journal_seq
+            self._apply_event(event)
             return
-        self._store.save_snapshot(self.snapshot(include_event_log=True))
+        with self._store.locked():
+            self._sync_locked()
+            self._journal_seq += 1
+            event['seq'] = self._journal_seq
+            self._journal_offset = self._store.append_event(event)
+            self._apply_event(event)
+            self._events_since_compact += 1
+            if (
+                self._events_since_compact >= self._compact_every_events
+                or float(self._now_ts()) - self._last_compact_ts >= self._compact_interval_sec
+            ):
+                self.compact()
+
+    def _apply_event(self, event: Dict[str, Any]) -> None:
+        kind = str(event.get('kind') or '')
+        if kind == 'runtime':
+            self._apply_runtime_event(event)
+        elif kind == 'workflow_resolution':
+            self._apply_workflow_resolution(event)
+        elif kind == 'workflow_outcome':
+            self._apply_workflow_outcome(event)
+
+    def _apply_runtime_event(self, event: Dict[str, Any]) -> None:
+        phase = self._bucket(event.get('phase'))
+        domain = self._bucket(event.get('domain'))
+        strategy_id = self._bucket(event.get('strategy_id'))
+        agent_id = self._bucket(event.get('agent_id'))
+        reason_code = self._reason_bucket(event.get('reason_code'))
+        counter_key = str(event.get('counter_key') or '')
+
+        self._increment_dimensions(phase=phase, domain=domain, strategy_id=strategy_id, agent_id=agent_id)
+        if counter_key:
+            # Auxiliary phases (review/rerun) count once under their own key only.
+            self._counters[counter_key] += 1
+            if reason_code:
+                self._by_reason[reason_code] += 1
+        else:
+            phase_counter = {'started': 'run_count', 'failed': 'fail_count'}.get(phase)
+            if phase_counter:
+                self._counters[phase_counter] += 1
+            if reason_code:
+                self._by_reason[reason_code] += 1
+                reason_counter = _RUNTIME_REASON_COUNTERS.get(reason_code)
+                if reason_counter:
+                    self._counters[reason_counter] += 1
+        self._append_runtime_record(
+            {
+                'timestamp_sec': float(event.get('timestamp_sec') or 0.0),
+                'phase': phase,
+                'domain': domain,
+                'strategy_id': strategy_id,
+                'agent_id': agent_id,
+                'reason_code': reason_code,
+            }
+        )
+
+    def _apply_workflow_resolution(self, event: Dict[str, Any]) -> None:
+        effective = self._bucket(event.get('effective_skill_id'))
+        self._workflow_counters['resolution_count'] += 1
+        if event.get('auto_selected'):
+            self._workflow_counters['auto_selected_count'] += 1
+        if event.get('requested_rewritten'):
+            self._workflow_counters['requested_rewritten_count'] += 1
+        self._workflow_by_effective_skill[effective]['resolved'] += 1
+        self._workflow_by_role[self._bucket(event.get('role'))]['resolved'] += 1
+        self._workflow_by_reason[self._bucket(event.get('reason'))] += 1
+        self._workflow_by_resolution_mode[self._bucket(event.get('resolution_mode'))] += 1
+
+    def _apply_workflow_outcome(self, event: Dict[str, Any]) -> None:
+        effective = self._bucket(event.get('effective_skill_id'))
+        outcome_bucket = self._bucket(event.get('outcome'))
+        self._workflow_counters['outcome_count'] += 1
+        self._workflow_by_effective_skill[effective][outcome_bucket] += 1
+        self._workflow_by_role[self._bucket(event.get('role'))][outcome_bucket] += 1
+        self._workflow_by_outcome[outcome_bucket] += 1
+        self._workflow_by_outcome_reason[self._bucket(event.get('outcome_reason'))] += 1
 
     def _restore_snapshot(self, snapshot: Dict[str, Any]) -> None:
         if not isinstance(snapshot, dict):
@@ -359,56 +525,76 @@ class AnalysisMetricsService:
         self._update_counter_map(self._workflow_by_resolution_mode, workflow.get('by_resolution_mode'))
         self._update_counter_map(self._workflow_by_outcome, workflow.get('by_outcome'))
         self._update_counter_map(self._workflow_by_outcome_reason, workflow.get('by_outcome_reason'))
-        self._recent_runtime_records = self._normalize_runtime_records(snapshot.get('recent_runtime_records'))
-
-    def _record_auxiliary_phase(
-        self,
-        *,
-        phase: str,
-        domain: str | None,
-        strategy_id: str | None,
-        agent_id: str | None,
-        reason_code: str | None,
-        counter_key: str,
-    ) -> None:
-        self._increment_dimensions(
-            phase=phase,
-            domain=self._bucket(domain),
-            strategy_id=self._bucket(strategy_id),
-            agent_id=self._bucket(agent_id),
-        )
-        self._counters[counter_key] += 1
-        normalized_reason = self._reason_bucket(reason_code)
-        if normalized_reason:
-            self._by_reason[normalized_reason] += 1
-
-    def _append_runtime_record(
-        self,
-        *,
-        phase: str,
-        domain: str,
-        strategy_id: str,
-        agent_id: str,
-        reason_code: str | None,
-    ) -> None:
-        self._recent_runtime_records.append(
-            {
-                'timestamp_sec': round(float(self._now_ts()), 4),
-                'phase': self._bucket(phase),
-                'domain': self._bucket(domain),
-                'strategy_id': self._bucket(strategy_id),
-                'agent_id': self._bucket(agent_id),
-                'reason_code': self._reason_bucket(reason_code),
-            }
+        records = self._normalize_runtime_records(snapshot.get('recent_runtime_records'))
+        self._recent_runtime_records.extend(records)
+        buckets = self._normalize_runtime_buckets(snapshot)
+        if buckets is None:
+            # Snapshots written before runtime buckets existed: rebuild from the raw records.
+            for record in records:
+                self._add_to_runtime_bucket(record)
+        else:
+            self._runtime_buckets.extend(buckets)
+        try:
+            self._journal_seq = max(int(snapshot.get('journal_seq') or 0), 0)
+        except (TypeError, ValueError):
+            self._journal_seq = 0
+
+    def _normalize_runtime_buckets(self, snapshot: Dict[str, Any]) -> list[Tuple[int, Counter[_RuntimeKey]]] | None:
+        raw = snapshot.get('runtime_buckets')
+        if not isinstance(raw, list) or snapshot.get('runtime_bucket_sec') != self._runtime_bucket_sec:
+            return None
+        buckets: list[Tuple[int, Counter[_RuntimeKey]]] = []
+        for item in raw:
+            try:
+                start, rows = int(item[0]), item[1]
+                counts: Counter[_RuntimeKey] = Counter()
+                for phase, domain, strategy_id, agent_id, reason_code, count in rows:
+                    key = (str(phase), str(domain), str(strategy_id), str(agent_id), self._reason_bucket(reason_code))
+                    counts[key] += int(count)
+            except (TypeError, ValueError, IndexError):
+                continue
+            buckets.append((start, counts))
+        buckets.sort(key=lambda bucket: bucket[0])
+        return buckets
+
+    def _bucket_start(self, timestamp_sec: float) -> int:
+        return int(timestamp_sec // self._runtime_bucket_sec) * self._runtime_bucket_sec
+
+    def _add_to_runtime_bucket(self, record: Dict[str, Any]) -> None:
+        start = self._bucket_start(float(record.get('timestamp_sec') or 0.0))
+        key: _RuntimeKey = (
+            record['phase'],
+            record['domain'],
+            record['strategy_id'],
+            record['agent_id'],
+            record['reason_code'],
         )
-        self._prune_recent_runtime_records()
-
-    def _prune_recent_runtime_records(self) -> None:
+        if self._runtime_buckets and self._runtime_buckets[-1][0] == start:
+            self._runtime_buckets[-1][1][key] += 1
+            return
+        if not self._runtime_buckets or self._runtime_buckets[-1][0] < start:
+            self._runtime_buckets.append((start, Counter({key: 1})))
+            return
+        # Out-of-order timestamp (clock step back): fold into the matching bucket.
+        for existing_start, counts in self._runtime_buckets:
+            if existing_start == start:
+                counts[key] += 1
+                return
+        self._runtime_buckets.append((start, Counter({key: 1})))
+        self._runtime_buckets = deque(sorted(self._runtime_buckets, key=lambda bucket: bucket[0]))
+
+    def _append_runtime_record(self, record: Dict[str, Any]) -> None:
+        self._recent_runtime_records.append(record)
+        self._add_to_runtime_bucket(record)
+        self._prune_runtime_state()
+
+    def _prune_runtime_state(self) -> None:
         threshold = float(self._now_ts()) - float(self._runtime_record_retention_sec)
-        pruned = [item for item in self._recent_runtime_records if float(item.get('timestamp_sec') or 0.0) >= threshold]
-        if len(pruned) > self._max_runtime_records:
-            pruned = pruned[-self._max_runtime_records :]
-        self._recent_runtime_records = pruned
+        while self._recent_runtime_records and float(self._recent_runtime_records[0].get('timestamp_sec') or 0.0) < threshold:
+            self._recent_runtime_records.popleft()
+        bucket_threshold = self._bucket_start(threshold)
+        while self._runtime_buckets and self._runtime_buckets[0][0] < bucket_threshold:
+            self._runtime_buckets.popleft()
 
     def _increment_dimensions(self, *, phase: str, domain: str, strategy_id: str, agent_id: str) -> None:
         self._by_phase[phase] += 1
@@ -437,6 +623,7 @@ class AnalysisMetricsService:
                 )
             except Exception:
                 continue
+        normalized.sort(key=lambda item: item['timestamp_sec'])
         return normalized
 
     @staticmethod
@@ -474,3 +661,4 @@ class AnalysisMetricsService:
     def _reason_bucket(value: str | None) -> str | None:
         normalized = str(value or '').strip()
         return normalized or None
+
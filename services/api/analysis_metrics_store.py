@@ -1,13 +1,64 @@
 from __future__ import annotations
 
+import fcntl
 import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .fs_atomic import atomic_write_json
+
+_log = logging.getLogger(__name__)
 
 
 class AnalysisMetricsStore:
-    def __init__(self, path: Path) -> None:
+    """Compacted metrics snapshot plus an append-only event journal.
+
+    Every metrics event is appended to ``<snapshot>.journal.jsonl``; the full
+    snapshot is only rewritten (atomically) on compaction, after which the
+    journal is truncated. Events carry a ``seq`` and the snapshot records the
+    last ``journal_seq`` it covers, so a crash between the two steps never
+    double-counts replayed events.
+
+    Several processes (API workers, RQ workers) share one store, so appends,
+    journal reads and compaction run under :meth:`locked`, an ``flock`` on
+    ``<journal>.lock`` that is re-entrant within a process.  Callers assign
+    ``seq`` under that lock after catching up with the journal, which keeps
+    sequence numbers contiguous across processes.
+    """
+
+    def __init__(self, path: Path, *, journal_path: Path | None = None) -> None:
         self.path = Path(path)
+        self.journal_path = Path(journal_path) if journal_path else self.path.with_suffix('.journal.jsonl')
+        self.lock_path = self.journal_path.with_name(self.journal_path.name + '.lock')
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_fd: Optional[int] = None
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with self._lock:
+            if self._lock_depth == 0:
+                self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+                lock_fd = os.open(str(self.lock_path), os.O_WRONLY | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(lock_fd, fcntl.LOCK_EX)
+                except OSError:
+                    os.close(lock_fd)
+                    raise
+                self._lock_fd = lock_fd
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and self._lock_fd is not None:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+                    os.close(self._lock_fd)
+                    self._lock_fd = None
 
     def load_snapshot(self) -> Dict[str, Any]:
         if not self.path.exists():
@@ -15,7 +66,71 @@ class AnalysisMetricsStore:
         payload = json.loads(self.path.read_text(encoding='utf-8'))
         return payload if isinstance(payload, dict) else {}
 
+    def snapshot_identity(self) -> Optional[Tuple[int, int]]:
+        """Changes whenever any process rewrites the snapshot (it is replaced atomically)."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
     def save_snapshot(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.write_text(json.dumps(snapshot, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+        atomic_write_json(self.path, snapshot)
+        return snapshot
+
+    def append_event(self, event: Dict[str, Any]) -> int:
+        """Append ``event`` and return the journal's end offset after it."""
+        line = json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self.locked():
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal_path.open('a', encoding='utf-8') as handle:
+                handle.write(line)
+                handle.flush()
+                return handle.tell()
+
+    def read_events_from(self, offset: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Events journaled from byte ``offset`` on, and the offset just past them.
+
+        Raises ``ValueError`` when the journal is shorter than ``offset``, i.e.
+        another process compacted it since.
+        """
+        with self.locked():
+            if not self.journal_path.exists():
+                if offset > 0:
+                    raise ValueError(f'metrics journal shrank below offset {offset}')
+                return [], 0
+            events: List[Dict[str, Any]] = []
+            with self.journal_path.open('rb+') as handle:
+                handle.seek(0, 2)
+                if handle.tell() < offset:
+                    raise ValueError(f'metrics journal shrank below offset {offset}')
+                handle.seek(offset)
+                complete_bytes = offset
+                for raw_line in handle:
+                    if not raw_line.endswith(b'\n'):
+                        # Torn final line from a crash mid-append: cut it off so the
+                        # next append starts on a fresh line.
+                        handle.truncate(complete_bytes)
+                        break
+                    complete_bytes += len(raw_line)
+                    try:
+                        event = json.loads(raw_line.decode('utf-8'))
+                    except (UnicodeDecodeError, json.JSONDecodeError):
+                        _log.debug('skipping unreadable metrics journal line')
+                        continue
+                    if isinstance(event, dict):
+                        events.append(event)
+            return events, complete_bytes
+
+    def load_events(self, *, after_seq: int = 0) -> List[Dict[str, Any]]:
+        events, _ = self.read_events_from(0)
+        return [event for event in events if int(event.get('seq') or 0) > int(after_seq)]
+
+    def compact(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        with self.locked():
+            self.save_snapshot(snapshot)
+            if self.journal_path.exists():
+                with self.journal_path.open('r+', encoding='utf-8') as handle:
+                    handle.truncate(0)
+                    os.fsync(handle.fileno())
         return snapshot
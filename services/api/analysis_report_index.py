@@ -0,0 +1,238 @@
+"""Per-teacher listing index over a metadata repository's ``reports/*.json``.
+
+Class reports and video-homework reports were listed by globbing and parsing
+every report file, then filtering by teacher and sorting in Python.  This
+SQLite index keeps one row per report with the teacher, status and sort columns
+and serves keyset-paginated pages in listing order
+(``updated_at, created_at, report_id`` descending), the order the aggregated
+``/teacher/analysis/reports`` listing merges domains in.
+
+Rows are maintained by the domain's ``write_*_report`` helper.  The index is
+rebuilt from disk when it is first opened or when the reports directory was
+changed by something other than that writer (detected from the directory mtime
+recorded after every indexed write), the same scheme as
+:mod:`services.api.survey_report_index`; see also
+:mod:`services.api.dir_index_support`.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .dir_index_support import InstanceRegistry, SqliteIndex, dir_mtime_ns
+
+_INDEX_FILENAME = "report_index.sqlite3"
+
+
+@dataclass(frozen=True)
+class ReportListingEntry:
+    report_id: str
+    teacher_id: str
+    status: str
+    updated_at: str
+    created_at: str
+
+
+def entry_from_report(report: Dict[str, Any], *, fallback_id: str = "") -> Optional[ReportListingEntry]:
+    report_id = str(report.get("report_id") or fallback_id or "").strip()
+    if not report_id:
+        return None
+    return ReportListingEntry(
+        report_id=report_id,
+        teacher_id=str(report.get("teacher_id") or "").strip(),
+        status=str(report.get("status") or "unknown").strip() or "unknown",
+        updated_at=str(report.get("updated_at") or "").strip(),
+        created_at=str(report.get("created_at") or "").strip(),
+    )
+
+
+def encode_listing_cursor(updated_at: str, created_at: str, report_id: str) -> str:
+    """Cursor for the report that ends a page in ``updated_at`` listing order.
+
+    Shared by every analysis domain so the aggregated listing can hand one
+    cursor to all providers.
+    """
+    raw = json.dumps([updated_at, created_at, report_id], ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_listing_cursor(cursor: str) -> Optional[Tuple[str, str, str]]:
+    try:
+        updated_at, created_at, report_id = json.loads(base64.urlsafe_b64decode(str(cursor).encode("ascii")))
+        return str(updated_at), str(created_at), str(report_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+class ReportListingIndex(SqliteIndex):
+    def __init__(self, db_path: Path, *, reports_dir: Path) -> None:
+        super().__init__(db_path)
+        self.reports_dir = Path(reports_dir)
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS report_index (
+                report_id TEXT PRIMARY KEY,
+                teacher_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_report_teacher_order
+            ON report_index (teacher_id, updated_at, created_at, report_id)
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_report_teacher_status
+            ON report_index (teacher_id, status, updated_at, created_at, report_id)
+            """
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS report_index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    # -- freshness ---------------------------------------------------------
+
+    def _fingerprint(self) -> str:
+        return str(dir_mtime_ns(self.reports_dir))
+
+    def _stored_fingerprint(self, conn: sqlite3.Connection) -> Optional[str]:
+        row = conn.execute("SELECT value FROM report_index_meta WHERE key = 'fingerprint'").fetchone()
+        return str(row["value"]) if row is not None else None
+
+    def _store_fingerprint(self, conn: sqlite3.Connection, value: Optional[str] = None) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO report_index_meta (key, value) VALUES ('fingerprint', ?)",
+            (self._fingerprint() if value is None else value,),
+        )
+
+    def ensure_fresh(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._open() as conn:
+            if self._stored_fingerprint(conn) == self._fingerprint():
+                return
+        self.rebuild()
+
+    # -- writes ------------------------------------------------------------
+
+    def _upsert(self, conn: sqlite3.Connection, entry: ReportListingEntry) -> None:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO report_index (report_id, teacher_id, status, updated_at, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (entry.report_id, entry.teacher_id, entry.status, entry.updated_at, entry.created_at),
+        )
+
+    def record_report(self, report: Dict[str, Any], *, fallback_id: str = "") -> None:
+        entry = entry_from_report(report, fallback_id=fallback_id)
+        if entry is None or not self.exists():
+            # Not built yet: the first listing builds it from disk.
+            return
+        with self._lock, self._open() as conn:
+            stale = self._stored_fingerprint(conn) is None
+            conn.execute("BEGIN IMMEDIATE")
+            self._upsert(conn, entry)
+            if not stale:
+                self._store_fingerprint(conn)
+            conn.execute("COMMIT")
+
+    def remove(self, report_id: str) -> None:
+        if not self.exists():
+            return
+        with self._lock, self._open() as conn:
+            conn.execute("DELETE FROM report_index WHERE report_id = ?", (report_id,))
+            conn.execute("DELETE FROM report_index_meta WHERE key = 'fingerprint'")
+
+    def rebuild(self) -> int:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._open() as conn:
+            fingerprint = self._fingerprint()
+            entries: List[ReportListingEntry] = []
+            if self.reports_dir.exists():
+                for path in sorted(self.reports_dir.glob("*.json")):
+                    entry = entry_from_report(_load_json(path), fallback_id=path.stem)
+                    if entry is not None:
+                        entries.append(entry)
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM report_index")
+            for entry in entries:
+                self._upsert(conn, entry)
+            # Fingerprint taken before the scan: writes racing the scan make the
+            # next check rebuild again instead of being lost.
+            self._store_fingerprint(conn, fingerprint)
+            conn.execute("COMMIT")
+        return len(entries)
+
+    # -- reads -------------------------------------------------------------
+
+    def page(
+        self,
+        *,
+        teacher_id: str,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ReportListingEntry], Optional[str]]:
+        """Entries for ``teacher_id`` in listing order, plus the next-page cursor."""
+        self.ensure_fresh()
+        clauses = ["teacher_id = ?"]
+        params: List[Any] = [teacher_id]
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        after = decode_listing_cursor(cursor) if cursor else None
+        if after is not None:
+            clauses.append("(updated_at, created_at, report_id) < (?, ?, ?)")
+            params.extend(after)
+        query = (
+            "SELECT report_id, teacher_id, status, updated_at, created_at "
+            f"FROM report_index WHERE {' AND '.join(clauses)} "
+            "ORDER BY updated_at DESC, created_at DESC, report_id DESC"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(max(1, int(limit)) + 1)
+        with self._open() as conn:
+            rows = conn.execute(query, params).fetchall()
+        entries = [
+            ReportListingEntry(
+                report_id=str(row["report_id"]),
+                teacher_id=str(row["teacher_id"]),
+                status=str(row["status"]),
+                updated_at=str(row["updated_at"]),
+                created_at=str(row["created_at"]),
+            )
+            for row in rows
+        ]
+        next_cursor = None
+        if limit is not None and len(entries) > max(1, int(limit)):
+            entries = entries[: max(1, int(limit))]
+            last = entries[-1]
+            next_cursor = encode_listing_cursor(last.updated_at, last.created_at, last.report_id)
+        return entries, next_cursor
+
+
+_INDEXES: InstanceRegistry[ReportListingIndex] = InstanceRegistry()
+
+
+def get_report_listing_index(base_dir: Path) -> ReportListingIndex:
+    """The index over ``base_dir/reports``, stored next to it in ``base_dir``."""
+    db_path = Path(base_dir) / _INDEX_FILENAME
+    return _INDEXES.get(db_path, lambda: ReportListingIndex(db_path, reports_dir=Path(base_dir) / "reports"))
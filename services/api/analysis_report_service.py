@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import heapq
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+from .analysis_report_index import encode_listing_cursor
 from .analysis_report_models import (
     AnalysisReportDetail,
     AnalysisReportSummary,
@@ -66,7 +68,8 @@ class AnalysisReportProvider:
     domain: str
     default_strategy_id: str
     now_iso: Callable[[], str]
-    list_reports: Callable[[str, Optional[str]], Dict[str, Any]]
+    # (teacher_id, status[, limit, cursor]): newest-first, paged when limit is given.
+    list_reports: Callable[..., Dict[str, Any]]
     get_report: Callable[[str, str], Dict[str, Any]]
     rerun_report: Callable[[str, str, Optional[str]], Dict[str, Any]]
     list_review_queue: Callable[[str], Dict[str, Any]]
@@ -78,8 +81,20 @@ class AnalysisReportProvider:
 def build_survey_analysis_report_provider(core: Any | None = None) -> AnalysisReportProvider:
     survey_deps = build_survey_report_deps(core)
 
-    def list_reports(teacher_id: str, status: str | None = None) -> Dict[str, Any]:
-        return list_survey_reports(teacher_id=teacher_id, status=status, deps=survey_deps)
+    def list_reports(
+        teacher_id: str,
+        status: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Dict[str, Any]:
+        return list_survey_reports(
+            teacher_id=teacher_id,
+            status=status,
+            deps=survey_deps,
+            limit=limit,
+            cursor=cursor,
+            order='updated',
+        )
 
     def get_report(report_id: str, teacher_id: str) -> Dict[str, Any]:
         return get_survey_report(report_id=report_id, teacher_id=teacher_id, deps=survey_deps)
@@ -124,8 +139,19 @@ def build_survey_analysis_report_provider(core: Any | None = None) -> AnalysisRe
 def build_class_report_analysis_report_provider(core: Any | None = None) -> AnalysisReportProvider:
     class_report_deps = build_class_report_deps(core)
 
-    def list_reports(teacher_id: str, status: str | None = None) -> Dict[str, Any]:
-        return list_class_reports(teacher_id=teacher_id, status=status, deps=class_report_deps)
+    def list_reports(
+        teacher_id: str,
+        status: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Dict[str, Any]:
+        return list_class_reports(
+            teacher_id=teacher_id,
+            status=status,
+            deps=class_report_deps,
+            limit=limit,
+            cursor=cursor,
+        )
 
     def get_report(report_id: str, teacher_id: str) -> Dict[str, Any]:
         return get_class_report(report_id=report_id, teacher_id=teacher_id, deps=class_report_deps)
@@ -170,11 +196,18 @@ def build_class_report_analysis_report_provider(core: Any | None = None) -> Anal
 def build_video_homework_analysis_report_provider(core: Any | None = None) -> AnalysisReportProvider:
     multimodal_deps = build_multimodal_report_deps(core)
 
-    def list_reports(teacher_id: str, status: str | None = None) -> Dict[str, Any]:
+    def list_reports(
+        teacher_id: str,
+        status: str | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> Dict[str, Any]:
         return list_multimodal_reports(
             teacher_id=teacher_id,
             status=status,
             deps=multimodal_deps,
+            limit=limit,
+            cursor=cursor,
         )
 
     def get_report(report_id: str, teacher_id: str) -> Dict[str, Any]:
@@ -293,26 +326,81 @@ def list_analysis_reports(
     strategy_id: str | None,
     target_type: str | None,
     deps: AnalysisReportDeps,
+    limit: int | None = None,
+    cursor: str | None = None,
 ) -> Dict[str, Any]:
+    """Reports across domains, newest first.
+
+    Without ``limit`` every matching report is returned and ``summary`` covers
+    all of them.  With it, the providers' indexed pages are merged lazily into
+    one page plus a ``next_cursor`` (``None`` on the last page); ``summary``
+    then covers the returned page only.
+    """
     review_queue = deps.list_review_queue(teacher_id, domain, 'queued')
     review_items = list(review_queue.get('items') or [])
     open_review_ids = {str(item.get('report_id') or '').strip() for item in review_items if str(item.get('report_id') or '').strip()}
+    streams = [
+        _iter_provider_summaries(provider, teacher_id=teacher_id, status=status, limit=limit, cursor=cursor)
+        for provider in _iter_providers(deps.providers, domain)
+    ]
     items: List[Dict[str, Any]] = []
-    for provider in _iter_providers(deps.providers, domain):
-        payload = provider.list_reports(teacher_id, status)
-        for raw in payload.get('items') or []:
-            summary = _to_analysis_summary(provider, raw, report_id_hint=str(raw.get('report_id') or ''))
-            if strategy_id and summary.strategy_id != strategy_id:
-                continue
-            if target_type and summary.target_type != target_type:
-                continue
-            summary.review_required = summary.report_id in open_review_ids
-            items.append(summary.model_dump())
-    items.sort(key=lambda item: (str(item.get('updated_at') or ''), str(item.get('created_at') or ''), str(item.get('report_id') or '')), reverse=True)
-    return {
+    next_cursor: str | None = None
+    for summary in heapq.merge(*streams, key=_listing_sort_key, reverse=True):
+        if strategy_id and summary.strategy_id != strategy_id:
+            continue
+        if target_type and summary.target_type != target_type:
+            continue
+        if limit is not None and len(items) >= max(1, int(limit)):
+            last = items[-1]
+            next_cursor = encode_listing_cursor(*_listing_sort_key_of(last))
+            break
+        summary.review_required = summary.report_id in open_review_ids
+        items.append(summary.model_dump())
+    payload: Dict[str, Any] = {
         'items': items,
         'summary': _build_analysis_reports_summary(items=items, review_items=review_items),
     }
+    if limit is not None:
+        payload['next_cursor'] = next_cursor
+    return payload
+
+
+
+def _iter_provider_summaries(
+    provider: AnalysisReportProvider,
+    *,
+    teacher_id: str,
+    status: str | None,
+    limit: int | None,
+    cursor: str | None,
+) -> Iterator[AnalysisReportSummary]:
+    if limit is None:
+        summaries = [
+            _to_analysis_summary(provider, raw, report_id_hint=str(raw.get('report_id') or ''))
+            for raw in provider.list_reports(teacher_id, status).get('items') or []
+        ]
+        yield from sorted(summaries, key=_listing_sort_key, reverse=True)
+        return
+    # One extra row per page so the merge can tell whether another page exists.
+    batch = max(1, int(limit)) + 1
+    page_cursor = cursor
+    while True:
+        payload = provider.list_reports(teacher_id, status, batch, page_cursor)
+        for raw in payload.get('items') or []:
+            yield _to_analysis_summary(provider, raw, report_id_hint=str(raw.get('report_id') or ''))
+        page_cursor = payload.get('next_cursor')
+        if not page_cursor:
+            return
+
+
+
+def _listing_sort_key(summary: AnalysisReportSummary) -> Tuple[str, str, str]:
+    return (str(summary.updated_at or ''), str(summary.created_at or ''), str(summary.report_id or ''))
+
+
+
+def _listing_sort_key_of(item: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (str(item.get('updated_at') or ''), str(item.get('created_at') or ''), str(item.get('report_id') or ''))
 
 
 
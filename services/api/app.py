@@ -8,6 +8,7 @@ from typing import Any
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from . import settings as _settings
 from .analysis_metrics_service import AnalysisMetricsService
 from .analysis_metrics_store import AnalysisMetricsStore
 from .analysis_ops_service import AnalysisOpsService
@@ -16,6 +17,7 @@ from .auth_service import require_principal
 from .container import build_app_container
 from .core_context_middleware import build_set_core_context_middleware
 from .core_runtime import build_core_runtime
+from .diag_log_service import diag_log_stats
 from .observability import OBSERVABILITY
 from .rate_limit import rate_limit_middleware
 from .request_context import RequestIdFilter
@@ -52,6 +54,7 @@ def _ops_metrics_payload(core: Any) -> dict[str, Any]:
         metrics['analysis_runtime'] = analysis_snapshot()
     else:
         metrics['analysis_runtime'] = AnalysisMetricsService().snapshot()
+    metrics['diag_log'] = diag_log_stats()
     return metrics
 
 
@@ -149,6 +152,7 @@ def _build_runtime_entrypoint() -> Any:
 
         tenant_store = TenantConfigStore(tenant_db_path)
         tenant_registry = TenantRegistry(tenant_store)
+        tenant_registry.start_warmup(_settings.tenant_warmup_ids_raw().split(","))
         admin_app = create_admin_app(
             deps=TenantAdminDeps(
                 admin_key=tenant_admin_key,
@@ -5,7 +5,6 @@ from __future__ import annotations
 import csv
 import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
 import re
 import shutil
@@ -40,6 +39,7 @@ except Exception:
     pass
 
 from . import core_services as _core_services_module
+from . import diag_log_service as _diag_log_service_module
 from . import core_service_imports as _core_service_imports_module
 
 from . import config as _config_module
@@ -190,21 +190,10 @@ def _student_inflight(student_id: Optional[str]) -> Any:
         limit=_config_module.CHAT_STUDENT_INFLIGHT_LIMIT,
     )
 
-def _setup_diag_logger() -> Optional[logging.Logger]:
+def _setup_diag_logger() -> Optional[Any]:
     if not _config_module.DIAG_LOG_ENABLED:
         return None
-    _config_module.DIAG_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    logger = logging.getLogger("diag")
-    if logger.handlers:
-        return logger
-    logger.setLevel(logging.INFO)
-    handler = RotatingFileHandler(
-        str(_config_module.DIAG_LOG_PATH), maxBytes=2_000_000, backupCount=3, encoding="utf-8"
-    )
-    formatter = logging.Formatter("%(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-    return logger
+    return _diag_log_service_module.get_diag_logger(_config_module.DIAG_LOG_PATH)
 
 
 _DIAG_LOGGER = _setup_diag_logger()
@@ -213,17 +202,8 @@ LLM_GATEWAY = LLMGateway()
 def diag_log(event: str, payload: Optional[Dict[str, Any]] = None) -> None:
     if not _config_module.DIAG_LOG_ENABLED or _DIAG_LOGGER is None:
         return
-    record = {
-        "ts": datetime.now().isoformat(timespec="seconds"),
-        "event": event,
-    }
-    if payload:
-        record.update(payload)
-    try:
-        _DIAG_LOGGER.info(json.dumps(record, ensure_ascii=False, default=str))
-    except Exception:  # policy: allowed-broad-except
-        _log.debug("diag_log serialization failed for event=%s", event)
-        pass  # policy: allowed-broad-except
+    # Enqueue only: serialization and file writes happen on the diag writer thread.
+    _DIAG_LOGGER.log(event, payload)
 
 def chat_job_path(job_id: str) -> Path:
     return _core_service_imports_module._chat_job_path_impl(
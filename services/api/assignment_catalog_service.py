@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import quote
 
+from .assignment_index_store import get_assignment_index_store
+
 _log = logging.getLogger(__name__)
 _DEFAULT_LIST_LIMIT = 50
 _MAX_LIST_LIMIT = 100
@@ -155,6 +157,37 @@ def _normalize_paging(limit: Any, cursor: Any) -> tuple[int, int]:
     return limit_int, cursor_int
 
 
+def _questions_updated_at(questions_path: Path) -> Optional[str]:
+    try:
+        mtime = questions_path.stat().st_mtime
+    except OSError:
+        return None
+    return datetime.fromtimestamp(mtime).isoformat(timespec="seconds")
+
+
+def _describe_assignment_folder(folder: Path, deps: AssignmentCatalogDeps) -> Dict[str, Any]:
+    """Index row for one assignment folder (see ``assignment_index_store``)."""
+    meta = deps.load_assignment_meta(folder)
+    questions_path = folder / "questions.csv"
+    has_questions = questions_path.exists()
+    return {
+        "date": resolve_assignment_date(meta, folder),
+        "class_name": meta.get("class_name"),
+        "scope": meta.get("scope"),
+        "student_ids": meta.get("student_ids") or [],
+        "source": meta.get("source"),
+        "mode": meta.get("mode"),
+        "target_kp": meta.get("target_kp") or [],
+        "question_count": deps.count_csv_rows(questions_path) if has_questions else 0,
+        "updated_at": meta.get("generated_at") or (_questions_updated_at(questions_path) if has_questions else None),
+    }
+
+
+def mark_assignment_index_dirty(folder: Path) -> None:
+    """Tell the assignment index that ``folder``'s meta or questions were just written."""
+    get_assignment_index_store(folder.parent).mark_dirty(folder.name)
+
+
 def list_assignments(*, limit: Any = _DEFAULT_LIST_LIMIT, cursor: Any = 0, deps: AssignmentCatalogDeps) -> Dict[str, Any]:
     limit_int, cursor_int = _normalize_paging(limit, cursor)
     assignments_dir = deps.data_dir / "assignments"
@@ -167,35 +200,23 @@ def list_assignments(*, limit: Any = _DEFAULT_LIST_LIMIT, cursor: Any = 0, deps:
             "has_more": False,
         }
 
-    items = []
-    for folder in assignments_dir.iterdir():
-        if not folder.is_dir():
-            continue
-        assignment_id = folder.name
-        meta = deps.load_assignment_meta(folder)
-        assignment_date = resolve_assignment_date(meta, folder)
-        questions_path = folder / "questions.csv"
-        count = deps.count_csv_rows(questions_path) if questions_path.exists() else 0
-        updated_at = None
-        if meta.get("generated_at"):
-            updated_at = meta.get("generated_at")
-        elif questions_path.exists():
-            updated_at = datetime.fromtimestamp(questions_path.stat().st_mtime).isoformat(timespec="seconds")
-        items.append(
-            {
-                "assignment_id": assignment_id,
-                "date": assignment_date,
-                "question_count": count,
-                "updated_at": updated_at,
-                "mode": meta.get("mode"),
-                "target_kp": meta.get("target_kp") or [],
-                "class_name": meta.get("class_name"),
-            }
-        )
-
-    items.sort(key=lambda x: x.get("updated_at") or "", reverse=True)
-    total = len(items)
-    page = items[cursor_int : cursor_int + limit_int]
+    rows, total = get_assignment_index_store(assignments_dir).page(
+        limit=limit_int,
+        offset=cursor_int,
+        describe=lambda folder: _describe_assignment_folder(folder, deps),
+    )
+    page = [
+        {
+            "assignment_id": row["assignment_id"],
+            "date": row["date"],
+            "question_count": row["question_count"],
+            "updated_at": row["updated_at"],
+            "mode": row["mode"],
+            "target_kp": row["target_kp"],
+            "class_name": row["class_name"],
+        }
+        for row in rows
+    ]
     next_cursor = cursor_int + len(page)
     return {
         "assignments": page,
@@ -218,31 +239,23 @@ def find_assignment_for_date(
     if not assignments_dir.exists():
         return None
 
+    rows = get_assignment_index_store(assignments_dir).rows_for_date(
+        date_str,
+        describe=lambda folder: _describe_assignment_folder(folder, deps),
+    )
     candidates = []
-    for folder in assignments_dir.iterdir():
-        if not folder.is_dir():
-            continue
-        meta = deps.load_assignment_meta(folder)
-        assignment_date = resolve_assignment_date(meta, folder)
-        if assignment_date != date_str:
-            continue
-        spec = assignment_specificity(meta, student_id, class_name)
+    for row in rows:
+        spec = assignment_specificity(row, student_id, class_name)
         if spec <= 0:
             continue
-        source = str(meta.get("source") or "").lower()
-        teacher_flag = 0 if source == "auto" else 1
-        updated_at = meta.get("generated_at")
-        if not updated_at:
-            questions_path = folder / "questions.csv"
-            if questions_path.exists():
-                updated_at = datetime.fromtimestamp(questions_path.stat().st_mtime).isoformat(timespec="seconds")
-        candidates.append((teacher_flag, spec, parse_iso_timestamp(updated_at), folder, meta))
+        teacher_flag = 0 if row["source"] == "auto" else 1
+        candidates.append((teacher_flag, spec, parse_iso_timestamp(row["updated_at"]), row["assignment_id"]))
 
     if not candidates:
         return None
     candidates.sort(key=lambda x: (x[0], x[1], x[2]), reverse=True)
-    best = candidates[0]
-    return {"folder": best[3], "meta": best[4]}
+    folder = assignments_dir / candidates[0][3]
+    return {"folder": folder, "meta": deps.load_assignment_meta(folder)}
 
 
 def read_text_safe(path: Path, limit: int = 4000) -> str:
@@ -353,3 +366,4 @@ def postprocess_assignment_meta(
     meta.setdefault("completion_policy", completion_policy)
 
     deps.atomic_write_json(meta_path, meta)
+    mark_assignment_index_dirty(meta_path.parent)
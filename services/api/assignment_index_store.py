@@ -0,0 +1,325 @@
+"""SQLite index over the ``assignments/`` directory.
+
+The student "today" lookup and the teacher assignment listing used to walk every
+assignment folder, load its ``meta.json`` and count ``questions.csv`` rows on
+each request. This index keeps one row per folder with the lookup columns
+(date, class, scope, student ids, source) plus question count and
+``updated_at``, so the today lookup reads only the rows for one date and the
+listing pages with ``LIMIT``/``OFFSET``.
+
+Folders stay the source of truth. Rows are derived by a ``describe`` callable
+supplied by the catalog service, and kept fresh three ways:
+
+- writers call :meth:`AssignmentIndexStore.mark_dirty` after writing a folder's
+  meta (generate, upload confirm, meta postprocess), and dirty rows are
+  described again before the next query;
+- when the ``assignments/`` directory stamp changes (folder added or removed)
+  the folders are stat'ed and only the ones whose meta/questions stamps changed
+  are described again;
+- every ``verify_interval_sec`` the same stat pass runs regardless, to pick up
+  in-place edits made outside the writers.
+
+Stamps are judged as described in :mod:`services.api.dir_index_support`.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .dir_index_support import (
+    InstanceRegistry,
+    SqliteIndex,
+    dir_fingerprint_text,
+    file_stamp,
+    fingerprint_text_settled,
+    settled,
+)
+
+_log = logging.getLogger(__name__)
+
+_INDEX_SUFFIX = ".index.sqlite3"
+_DIRTY = ""
+
+Describe = Callable[[Path], Dict[str, Any]]
+
+_COLUMNS = (
+    "assignment_id",
+    "date",
+    "class_name",
+    "scope",
+    "student_ids",
+    "source",
+    "mode",
+    "target_kp",
+    "question_count",
+    "updated_at",
+    "stamp",
+)
+
+
+def _file_stamp(path: Path) -> Tuple[str, int]:
+    stamp = file_stamp(path)
+    if stamp is None:
+        return "-", 0
+    return f"{stamp[0]}:{stamp[1]}", stamp[0]
+
+
+def folder_stamp(folder: Path) -> str:
+    """``meta.json`` + ``questions.csv`` stamp, or ``""`` (dirty) while either is too fresh to trust."""
+    meta_stamp, meta_mtime = _file_stamp(folder / "meta.json")
+    questions_stamp, questions_mtime = _file_stamp(folder / "questions.csv")
+    if not settled(max(meta_mtime, questions_mtime)):
+        return _DIRTY
+    return f"{meta_stamp}|{questions_stamp}"
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def _row_values(assignment_id: str, stamp: str, info: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        assignment_id,
+        _text(info.get("date")),
+        _text(info.get("class_name")),
+        _text(info.get("scope")),
+        json.dumps(info.get("student_ids") or [], ensure_ascii=False),
+        str(info.get("source") or "").strip().lower(),
+        _text(info.get("mode")),
+        json.dumps(info.get("target_kp") or [], ensure_ascii=False),
+        int(info.get("question_count") or 0),
+        str(info.get("updated_at") or ""),
+        stamp,
+    )
+
+
+def _row_dict(row: sqlite3.Row | Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "assignment_id": str(row["assignment_id"]),
+        "date": row["date"],
+        "class_name": row["class_name"],
+        "scope": row["scope"],
+        "student_ids": json.loads(row["student_ids"] or "[]"),
+        "source": str(row["source"] or ""),
+        "mode": row["mode"],
+        "target_kp": json.loads(row["target_kp"] or "[]"),
+        "question_count": int(row["question_count"] or 0),
+        "updated_at": row["updated_at"] or None,
+    }
+
+
+class AssignmentIndexStore(SqliteIndex):
+    def __init__(self, db_path: Path, *, assignments_dir: Path, verify_interval_sec: float = 300.0) -> None:
+        super().__init__(db_path)
+        self.assignments_dir = Path(assignments_dir)
+        self.verify_interval_sec = float(verify_interval_sec)
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS assignment_index (
+                assignment_id TEXT PRIMARY KEY,
+                date TEXT,
+                class_name TEXT,
+                scope TEXT,
+                student_ids TEXT NOT NULL DEFAULT '[]',
+                source TEXT NOT NULL DEFAULT '',
+                mode TEXT,
+                target_kp TEXT NOT NULL DEFAULT '[]',
+                question_count INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL DEFAULT '',
+                stamp TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_assignment_date ON assignment_index (date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_assignment_updated ON assignment_index (updated_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_assignment_stamp ON assignment_index (stamp)")
+        conn.execute("CREATE TABLE IF NOT EXISTS assignment_index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    # -- freshness ---------------------------------------------------------
+
+    def _meta_value(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM assignment_index_meta WHERE key = ?", (key,)).fetchone()
+        return str(row["value"]) if row is not None else None
+
+    def _needs_scan(self, conn: sqlite3.Connection, fingerprint: str) -> bool:
+        if fingerprint != self._meta_value(conn, "fingerprint"):
+            return True
+        if not fingerprint_text_settled(fingerprint):
+            return True
+        try:
+            verified_at = float(self._meta_value(conn, "verified_at") or 0)
+        except ValueError:
+            verified_at = 0.0
+        return time.time() - verified_at > self.verify_interval_sec
+
+    def _scan_changes(self, conn: sqlite3.Connection) -> Tuple[List[Tuple[str, str]], List[str]]:
+        known = {
+            str(row["assignment_id"]): str(row["stamp"])
+            for row in conn.execute("SELECT assignment_id, stamp FROM assignment_index")
+        }
+        changed: List[Tuple[str, str]] = []
+        seen = set()
+        if self.assignments_dir.is_dir():
+            with os.scandir(self.assignments_dir) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    seen.add(entry.name)
+                    stamp = folder_stamp(Path(entry.path))
+                    if stamp != _DIRTY and known.get(entry.name) == stamp:
+                        continue
+                    changed.append((entry.name, stamp))
+        return changed, [name for name in known if name not in seen]
+
+    def _dirty_rows(self, conn: sqlite3.Connection) -> Tuple[List[Tuple[str, str]], List[str]]:
+        changed: List[Tuple[str, str]] = []
+        removed: List[str] = []
+        for row in conn.execute("SELECT assignment_id FROM assignment_index WHERE stamp = ?", (_DIRTY,)):
+            folder = self.assignments_dir / str(row["assignment_id"])
+            if folder.is_dir():
+                changed.append((folder.name, folder_stamp(folder)))
+            else:
+                removed.append(folder.name)
+        return changed, removed
+
+    def ensure_fresh(self, describe: Describe) -> None:
+        """Describe new, changed and dirty folders and drop removed ones.
+
+        Folders are described outside any transaction (``describe`` reads
+        meta and counts question rows), so writers calling :meth:`mark_dirty`
+        are never blocked behind it.  The write transaction then re-checks
+        each folder's stamp and leaves folders that changed meanwhile dirty
+        for the next query instead of storing a stale description.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with self._open() as conn:
+                # Stamp taken before the scan: writes racing the scan make the
+                # next check reconcile again instead of being lost.
+                fingerprint = dir_fingerprint_text(self.assignments_dir)
+                scan = self._needs_scan(conn, fingerprint)
+                changed, removed = self._scan_changes(conn) if scan else self._dirty_rows(conn)
+            if not (scan or changed or removed):
+                return
+            described = list(self._describe_many(changed, describe))
+            with self._open() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "DELETE FROM assignment_index WHERE assignment_id = ?",
+                    [(name,) for name in removed if not (self.assignments_dir / name).is_dir()],
+                )
+                self._upsert_many(conn, self._recheck_stamps(described))
+                if scan:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO assignment_index_meta (key, value) VALUES (?, ?)",
+                        [("fingerprint", fingerprint), ("verified_at", str(time.time()))],
+                    )
+                conn.execute("COMMIT")
+
+    def _recheck_stamps(
+        self, described: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> Iterable[Tuple[str, str, Dict[str, Any]]]:
+        for assignment_id, stamp, info in described:
+            if folder_stamp(self.assignments_dir / assignment_id) != stamp:
+                # Written while it was being described: keep it dirty.
+                stamp = _DIRTY
+            yield assignment_id, stamp, info
+
+    def _describe_many(
+        self, changed: List[Tuple[str, str]], describe: Describe
+    ) -> Iterable[Tuple[str, str, Dict[str, Any]]]:
+        for assignment_id, stamp in changed:
+            yield assignment_id, stamp, describe(self.assignments_dir / assignment_id)
+
+    def _upsert_many(self, conn: sqlite3.Connection, rows: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+        conn.executemany(
+            f"""
+            INSERT OR REPLACE INTO assignment_index ({", ".join(_COLUMNS)})
+            VALUES ({", ".join("?" for _ in _COLUMNS)})
+            """,
+            [_row_values(assignment_id, stamp, info) for assignment_id, stamp, info in rows],
+        )
+
+    def _scan_rows(self, describe: Describe) -> List[Dict[str, Any]]:
+        """Rows described straight from the folders, for when the index is locked."""
+        rows: List[Dict[str, Any]] = []
+        if self.assignments_dir.is_dir():
+            for folder in sorted(self.assignments_dir.iterdir()):
+                if folder.is_dir():
+                    rows.append(_row_dict(dict(zip(_COLUMNS, _row_values(folder.name, _DIRTY, describe(folder))))))
+        return rows
+
+    # -- writes ------------------------------------------------------------
+
+    def mark_dirty(self, assignment_id: str) -> None:
+        """Flag a folder whose meta or questions were just written; the next query re-describes it."""
+        if not self.exists():
+            # Not built yet: the first query builds it from disk.
+            return
+        try:
+            # No self._lock: it is held while ensure_fresh describes folders.
+            with self._open() as conn:
+                conn.execute(
+                    "INSERT INTO assignment_index (assignment_id, stamp) VALUES (?, ?) "
+                    "ON CONFLICT(assignment_id) DO UPDATE SET stamp = excluded.stamp",
+                    (str(assignment_id), _DIRTY),
+                )
+        except sqlite3.Error:
+            _log.warning("failed to mark assignment %s dirty in index", assignment_id, exc_info=True)
+
+    # -- reads -------------------------------------------------------------
+
+    def rows_for_date(self, date_str: str, *, describe: Describe) -> List[Dict[str, Any]]:
+        try:
+            self.ensure_fresh(describe)
+            with self._open() as conn:
+                rows = conn.execute(
+                    "SELECT * FROM assignment_index WHERE date = ? ORDER BY assignment_id",
+                    (str(date_str),),
+                ).fetchall()
+        except sqlite3.OperationalError:
+            _log.warning("assignment index unavailable, scanning %s", self.assignments_dir, exc_info=True)
+            return [row for row in self._scan_rows(describe) if row["date"] == str(date_str)]
+        return [_row_dict(row) for row in rows]
+
+    def page(self, *, limit: int, offset: int, describe: Describe) -> Tuple[List[Dict[str, Any]], int]:
+        """Rows by ``updated_at`` (newest first, missing last) and the total row count."""
+        limit, offset = max(0, int(limit)), max(0, int(offset))
+        try:
+            self.ensure_fresh(describe)
+            with self._open() as conn:
+                total = int(conn.execute("SELECT COUNT(*) AS n FROM assignment_index").fetchone()["n"])
+                rows = conn.execute(
+                    "SELECT * FROM assignment_index ORDER BY updated_at DESC, assignment_id LIMIT ? OFFSET ?",
+                    (limit, offset),
+                ).fetchall()
+        except sqlite3.OperationalError:
+            _log.warning("assignment index unavailable, scanning %s", self.assignments_dir, exc_info=True)
+            scanned = self._scan_rows(describe)
+            scanned.sort(key=lambda row: row["assignment_id"])
+            scanned.sort(key=lambda row: row["updated_at"] or "", reverse=True)
+            return scanned[offset : offset + limit], len(scanned)
+        return [_row_dict(row) for row in rows], total
+
+
+def assignment_index_path(assignments_dir: Path) -> Path:
+    """The index lives next to (not inside) the directory so its writes do not bump the directory stamp."""
+    assignments_dir = Path(assignments_dir)
+    return assignments_dir.with_name(assignments_dir.name + _INDEX_SUFFIX)
+
+
+_STORES: InstanceRegistry[AssignmentIndexStore] = InstanceRegistry()
+
+
+def get_assignment_index_store(assignments_dir: Path) -> AssignmentIndexStore:
+    db_path = assignment_index_path(assignments_dir)
+    return _STORES.get(db_path, lambda: AssignmentIndexStore(db_path, assignments_dir=Path(assignments_dir)))
@@ -1,6 +1,19 @@
+"""Assignment progress: per-student completion rows materialized in ``progress.json``.
+
+``compute_assignment_progress`` is the recompute-all path (also used for
+repair). It writes every student row plus a ``materialized`` marker holding the
+``meta.json`` stamp it was built from. Reads go through
+``read_assignment_progress``, which serves that file while the meta stamp still
+matches and the last full build is younger than ``progress_max_age_sec``;
+``overdue`` flags and counts are re-derived at read time so a passing due time
+needs no write. Grading and discussion events call
+``refresh_assignment_progress_student`` to recompute a single row in place.
+"""
 from __future__ import annotations
 
+import json
 import logging
+import threading
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -23,10 +36,16 @@ class AssignmentProgressDeps:
     atomic_write_json: Callable[[Any, Any], None]
     time_time: Callable[[], float]
     now_iso: Callable[[], str]
+    progress_max_age_sec: float = 0.0
 
 
 _log = logging.getLogger(__name__)
 
+_PROGRESS_FILENAME = "progress.json"
+_MATERIALIZED_VERSION = 1
+_MATERIALIZE_LOCKS: Dict[str, threading.RLock] = {}
+_MATERIALIZE_LOCKS_GUARD = threading.Lock()
+
 
 _DEFAULT_COMPLETION_POLICY: Dict[str, Any] = {
     "requires_discussion": True,
@@ -272,23 +291,100 @@ def _student_sort_key(item: Dict[str, Any]) -> tuple[str, str, str]:
     )
 
 
-def compute_assignment_progress(
+def _assignment_lock(folder: Path) -> threading.RLock:
+    key = str(folder)
+    with _MATERIALIZE_LOCKS_GUARD:
+        lock = _MATERIALIZE_LOCKS.get(key)
+        if lock is None:
+            lock = threading.RLock()
+            _MATERIALIZE_LOCKS[key] = lock
+        return lock
+
+
+def _meta_stamp(folder: Path) -> Optional[List[int]]:
+    try:
+        st = (folder / "meta.json").stat()
+    except OSError:
+        return None
+    return [int(st.st_mtime_ns), int(st.st_size)]
+
+
+def _load_materialized(folder: Path) -> Optional[Dict[str, Any]]:
+    """Return the materialized progress document if it still matches meta.json."""
+    try:
+        data = json.loads((folder / _PROGRESS_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("students"), list):
+        return None
+    marker = data.get("materialized")
+    if not isinstance(marker, dict) or marker.get("version") != _MATERIALIZED_VERSION:
+        return None
+    if marker.get("meta_stamp") != _meta_stamp(folder):
+        return None
+    return data
+
+
+def _within_max_age(data: Dict[str, Any], now_ts: float, max_age_sec: float) -> bool:
+    try:
+        built_at = float((data.get("materialized") or {}).get("built_at") or 0)
+    except (TypeError, ValueError):
+        return False
+    return max_age_sec > 0 and 0 <= now_ts - built_at <= max_age_sec
+
+
+def _write_materialized(
+    folder: Path,
+    data: Dict[str, Any],
     assignment_id: str,
+    deps: AssignmentProgressDeps,
+) -> None:
+    try:
+        deps.atomic_write_json(folder / _PROGRESS_FILENAME, data)
+    except Exception:  # policy: allowed-broad-except
+        _log.warning("failed to write progress.json for assignment %s", assignment_id, exc_info=True)
+
+
+def _row_checks(row: Dict[str, Any]) -> Dict[str, Any]:
+    checks = (row.get("completion") or {}).get("checks")
+    return checks if isinstance(checks, dict) else {}
+
+
+def _serve_materialized(data: Dict[str, Any], now_ts: float, include_students: bool) -> Dict[str, Any]:
+    """Re-derive overdue flags and counts for ``now_ts`` and strip internal keys."""
+    due_ts = _parse_due_timestamp(str(data.get("due_at") or ""))
+    students: List[Dict[str, Any]] = []
+    counts = {"discussion_pass": 0, "submitted": 0, "completed": 0, "overdue": 0}
+    for row in data.get("students") or []:
+        if not isinstance(row, dict):
+            continue
+        checks = _row_checks(row)
+        completed = bool(row.get("complete"))
+        row = {**row, "overdue": bool(due_ts and now_ts > due_ts and not completed)}
+        counts["discussion_pass"] += int(bool(checks.get("discussion_pass")))
+        counts["submitted"] += int(bool(checks.get("submitted")))
+        counts["completed"] += int(completed)
+        counts["overdue"] += int(row["overdue"])
+        students.append(row)
+    result = {key: value for key, value in data.items() if key != "materialized"}
+    result["counts"] = {"expected": int(data.get("expected_count") or 0), **counts}
+    result["students"] = students if include_students else []
+    return result
+
+
+def _build_progress_document(
+    assignment_id: str,
+    folder: Path,
     *,
     deps: AssignmentProgressDeps,
-    include_students: bool = True,
 ) -> Dict[str, Any]:
-    folder = _resolve_assignment_dir(deps.data_dir, assignment_id)
-    if folder is None:
-        return _assignment_not_found(assignment_id)
-    if not folder.exists():
-        return _assignment_not_found(assignment_id)
     meta = deps.load_assignment_meta(folder)
     if not meta:
         meta = {"assignment_id": assignment_id}
 
     deps.postprocess_assignment_meta(assignment_id)
     meta = deps.load_assignment_meta(folder) or meta
+    meta_stamp = _meta_stamp(folder)
 
     expected_students = _load_expected_students(meta)
     completion_policy = _normalize_completion_policy(meta)
@@ -298,11 +394,6 @@ def compute_assignment_progress(
     profiles = _profile_map(deps.list_all_student_profiles())
 
     students_out: List[Dict[str, Any]] = []
-    discussion_pass_count = 0
-    submission_count = 0
-    completed_count = 0
-    overdue_count = 0
-
     for sid in expected_students:
         student = _student_progress(
             assignment_id,
@@ -312,20 +403,14 @@ def compute_assignment_progress(
             completion_policy=completion_policy,
             due_ts=due_ts,
             now_ts=now_ts,
-            include_student_payload=include_students,
+            include_student_payload=True,
         )
-        discussion_pass_count += int(bool(student["discussion_pass"]))
-        submission_count += int(bool(student["submitted"]))
-        completed_count += int(bool(student["completed"]))
-        overdue_count += int(bool(student["overdue"]))
         payload = student.get("payload")
-        if include_students and isinstance(payload, dict):
+        if isinstance(payload, dict):
             students_out.append(payload)
+    students_out.sort(key=_student_sort_key)
 
-    if include_students:
-        students_out.sort(key=_student_sort_key)
-
-    result = {
+    return {
         "ok": True,
         "assignment_id": assignment_id,
         "date": deps.resolve_assignment_date(meta, folder),
@@ -333,20 +418,106 @@ def compute_assignment_progress(
         "class_name": meta.get("class_name") or "",
         "due_at": due_at or "",
         "expected_count": len(expected_students),
-        "counts": {
-            "expected": len(expected_students),
-            "discussion_pass": discussion_pass_count,
-            "submitted": submission_count,
-            "completed": completed_count,
-            "overdue": overdue_count,
-        },
-        "students": students_out if include_students else [],
+        "counts": {},
+        "students": students_out,
         "updated_at": deps.now_iso(),
+        "materialized": {
+            "version": _MATERIALIZED_VERSION,
+            "meta_stamp": meta_stamp,
+            "built_at": now_ts,
+        },
     }
 
-    try:
-        deps.atomic_write_json(folder / "progress.json", result)
-    except Exception:  # policy: allowed-broad-except
-        _log.warning("failed to write progress.json for assignment %s", assignment_id, exc_info=True)
 
-    return result
+def _resolve_existing_assignment_dir(data_dir: Path, assignment_id: str) -> Optional[Path]:
+    folder = _resolve_assignment_dir(data_dir, assignment_id)
+    if folder is None or not folder.exists():
+        return None
+    return folder
+
+
+def compute_assignment_progress(
+    assignment_id: str,
+    *,
+    deps: AssignmentProgressDeps,
+    include_students: bool = True,
+) -> Dict[str, Any]:
+    """Recompute every student row and rewrite the materialized ``progress.json``."""
+    folder = _resolve_existing_assignment_dir(deps.data_dir, assignment_id)
+    if folder is None:
+        return _assignment_not_found(assignment_id)
+    with _assignment_lock(folder):
+        data = _build_progress_document(assignment_id, folder, deps=deps)
+        built_at = data["materialized"]["built_at"]
+        data["counts"] = _serve_materialized(data, built_at, True)["counts"]
+        _write_materialized(folder, data, assignment_id, deps)
+    return _serve_materialized(data, built_at, include_students)
+
+
+def read_assignment_progress(
+    assignment_id: str,
+    *,
+    deps: AssignmentProgressDeps,
+    include_students: bool = True,
+) -> Dict[str, Any]:
+    """Serve the materialized progress, recomputing when missing, changed or too old."""
+    folder = _resolve_existing_assignment_dir(deps.data_dir, assignment_id)
+    if folder is None:
+        return _assignment_not_found(assignment_id)
+    if deps.progress_max_age_sec > 0:
+        now_ts = deps.time_time()
+        data = _load_materialized(folder)
+        if data is not None and _within_max_age(data, now_ts, deps.progress_max_age_sec):
+            return _serve_materialized(data, now_ts, include_students)
+    return compute_assignment_progress(assignment_id, deps=deps, include_students=include_students)
+
+
+def _find_student_row(data: Dict[str, Any], student_id: str) -> Optional[int]:
+    for index, row in enumerate(data.get("students") or []):
+        if isinstance(row, dict) and str(row.get("student_id") or "") == student_id:
+            return index
+    return None
+
+
+def refresh_assignment_progress_student(
+    assignment_id: str,
+    student_id: str,
+    *,
+    deps: AssignmentProgressDeps,
+    include_students: bool = True,
+) -> Dict[str, Any]:
+    """Recompute one student's row after a grading or discussion event.
+
+    Falls back to a full recompute when there is no fresh materialized document.
+    The full-build age is left untouched, so the staleness bound still forces a
+    periodic repair of changes made outside these events.
+    """
+    folder = _resolve_existing_assignment_dir(deps.data_dir, assignment_id)
+    if folder is None:
+        return _assignment_not_found(assignment_id)
+    sid = str(student_id or "").strip()
+    with _assignment_lock(folder):
+        now_ts = deps.time_time()
+        data = _load_materialized(folder)
+        if data is None or not _within_max_age(data, now_ts, deps.progress_max_age_sec):
+            return compute_assignment_progress(assignment_id, deps=deps, include_students=include_students)
+        index = _find_student_row(data, sid)
+        if index is None:
+            return _serve_materialized(data, now_ts, include_students)
+        row = data["students"][index]
+        policy = (row.get("completion") or {}).get("policy")
+        student = _student_progress(
+            assignment_id,
+            sid,
+            row,
+            deps=deps,
+            completion_policy=_normalize_completion_policy({"completion_policy": policy}),
+            due_ts=_parse_due_timestamp(str(data.get("due_at") or "")),
+            now_ts=now_ts,
+            include_student_payload=True,
+        )
+        data["students"][index] = student["payload"]
+        data["updated_at"] = deps.now_iso()
+        data["counts"] = _serve_materialized(data, now_ts, True)["counts"]
+        _write_materialized(folder, data, assignment_id, deps)
+    return _serve_materialized(data, now_ts, include_students)
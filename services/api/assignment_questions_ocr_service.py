@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 
 def _default_sanitize_filename(name: str) -> str:
@@ -23,6 +23,7 @@ class AssignmentQuestionsOcrDeps:
     run_script: Callable[[list[str]], str]
     sanitize_filename: Callable[[str], str] = _default_sanitize_filename
     sanitize_assignment_id: Callable[[str], str] = _default_sanitize_assignment_id
+    save_upload_file: Optional[Callable[[Any, Path], Awaitable[int]]] = None
 
 
 async def assignment_questions_ocr(
@@ -52,7 +53,12 @@ async def assignment_questions_ocr(
         if not filename:
             continue
         dest = batch_dir / filename
-        dest.write_bytes(await upload_file.read())
+        if deps.save_upload_file is not None:
+            await deps.save_upload_file(upload_file, dest)
+        else:
+            # Replace rather than rewrite: an earlier upload may be a blob-store hardlink.
+            dest.unlink(missing_ok=True)
+            dest.write_bytes(await upload_file.read())
         file_paths.append(str(dest))
 
     script = deps.app_root / "skills" / "physics-student-coach" / "scripts" / "ingest_assignment_questions.py"
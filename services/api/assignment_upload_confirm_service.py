@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from .assignment_catalog_service import mark_assignment_index_dirty
+
 _log = logging.getLogger(__name__)
 
 
@@ -355,6 +357,7 @@ def confirm_assignment_upload(
         deps=deps,
     )
     deps.atomic_write_json(meta_path, meta)
+    mark_assignment_index_dirty(out_dir)
     _mark_confirmed(job_id, deps)
 
     return {
@@ -0,0 +1,110 @@
+"""Bounded cache of normalized chat attachment text, keyed by content hash.
+
+A chat attachment's ``extracted.txt`` is written once at upload time and never
+rewritten, so its normalized (stripped) text can be shared by every later chat
+turn that references it. The upload records :func:`extracted_text_fields`
+(``extracted_sha256``, ``extracted_chars``, ``extracted_tokens``) in
+``meta.json``; context resolution then looks the hash up here and only reads
+``extracted.txt`` on a miss.
+
+Entries keep at most ``clip_chars`` characters of text (the context block is
+truncated far below that) together with the full length and token estimate, so
+a large PDF does not pin megabytes of text in memory. Deleting an attachment
+discards its entry.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+_WIDE_CHARS = re.compile(r"[\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt-token count: one per CJK/full-width character, one per four other characters."""
+    narrow = len(_WIDE_CHARS.sub("", text))
+    return (len(text) - narrow) + (narrow + 3) // 4
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def extracted_text_fields(text: str) -> Dict[str, Any]:
+    """Meta fields recorded next to ``extracted.txt`` at upload time."""
+    normalized = text.strip()
+    return {
+        "extracted_sha256": content_hash(text),
+        "extracted_chars": len(normalized),
+        "extracted_tokens": estimate_tokens(normalized),
+    }
+
+
+@dataclass(frozen=True)
+class AttachmentText:
+    content_hash: str
+    text: str
+    chars: int
+    tokens: int
+
+    @property
+    def clipped(self) -> bool:
+        return len(self.text) < self.chars
+
+
+def build_attachment_text(
+    raw: str,
+    *,
+    clip_chars: int,
+    digest: Optional[str] = None,
+    tokens: Optional[int] = None,
+) -> AttachmentText:
+    normalized = raw.strip()
+    return AttachmentText(
+        content_hash=digest or content_hash(raw),
+        text=normalized[: max(0, int(clip_chars))],
+        chars=len(normalized),
+        tokens=estimate_tokens(normalized) if tokens is None else int(tokens),
+    )
+
+
+class AttachmentContextCache:
+    def __init__(self, *, max_entries: int = 64, clip_chars: int = 32_000) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.clip_chars = int(clip_chars)
+        self._entries: "OrderedDict[str, AttachmentText]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str, *, min_chars: int = 0) -> Optional[AttachmentText]:
+        """Cached text for ``digest`` holding at least ``min_chars`` characters (or all of it)."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or (entry.clipped and len(entry.text) < min_chars):
+                return None
+            self._entries.move_to_end(digest)
+            return entry
+
+    def load(self, digest: str, raw: str, *, min_chars: int = 0, tokens: Optional[int] = None) -> AttachmentText:
+        """Normalize freshly read ``raw`` text and cache it under ``digest`` (``tokens`` as recorded at upload)."""
+        entry = build_attachment_text(raw, clip_chars=max(self.clip_chars, min_chars), digest=digest, tokens=tokens)
+        with self._lock:
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def discard(self, digest: str) -> None:
+        with self._lock:
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+ATTACHMENT_CONTEXT_CACHE = AttachmentContextCache()
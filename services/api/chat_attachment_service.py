@@ -7,6 +7,14 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
 
+from .chat_attachment_context_cache import (
+    ATTACHMENT_CONTEXT_CACHE,
+    AttachmentContextCache,
+    AttachmentText,
+    build_attachment_text,
+    estimate_tokens,
+    extracted_text_fields,
+)
 from .fs_atomic import atomic_write_json, atomic_write_text
 
 MAX_FILE_SIZE_BYTES = 10 * 1024 * 1024
@@ -46,6 +54,7 @@ class ChatAttachmentDeps:
     xls_to_table_preview: Callable[[Path], str]
     now_iso: Callable[[], str]
     uuid_hex: Callable[[], str]
+    context_cache: AttachmentContextCache = ATTACHMENT_CONTEXT_CACHE
 
 
 def _attachments_root(uploads_dir: Path) -> Path:
@@ -321,6 +330,8 @@ async def _create_attachment_item(
         error_detail=error_detail,
         deps=deps,
     )
+    if not error_code:
+        meta.update(extracted_text_fields(extracted_text))
     _write_meta(attachment_dir / "meta.json", meta)
     return _to_public_item(meta), total_written
 
@@ -352,32 +363,59 @@ def _resolve_accessible_attachment(
     return attachment_dir, meta, None
 
 
-def _attachment_context_block(
+def _attachment_context_text(
     attachment_dir: Path,
     meta: Dict[str, Any],
     *,
-    idx: int,
-) -> tuple[Optional[str], Optional[str]]:
+    min_chars: int,
+    deps: ChatAttachmentDeps,
+) -> tuple[Optional[AttachmentText], Optional[str]]:
     if str(meta.get("status") or "") != "ready":
         return None, str(meta.get("error_code") or "not_ready")
+    # Attachments uploaded before content hashes were recorded are read every time.
+    digest = str(meta.get("extracted_sha256") or "")
+    cached = deps.context_cache.get(digest, min_chars=min_chars) if digest else None
+    if cached is not None:
+        return cached, None
     extracted_path = attachment_dir / "extracted.txt"
     if not extracted_path.exists():
         return None, "missing_extracted"
     try:
-        text = extracted_path.read_text(encoding="utf-8", errors="ignore").strip()
+        raw = extracted_path.read_text(encoding="utf-8", errors="ignore")
     except Exception:
-        text = ""
-    if not text:
+        raw = ""
+    if digest:
+        recorded = meta.get("extracted_tokens")
+        tokens = int(recorded) if isinstance(recorded, int) else None
+        entry = deps.context_cache.load(digest, raw, min_chars=min_chars, tokens=tokens)
+    else:
+        entry = build_attachment_text(raw, clip_chars=min_chars)
+    if not entry.chars:
         return None, "extract_empty"
-    file_name = str(meta.get("file_name") or "unknown")
-    return f"[附件 #{idx}: {file_name}]\n{text}", None
-
-
-def _combine_attachment_context_blocks(blocks: List[str], max_chars: int) -> tuple[str, bool]:
-    combined = "\n\n".join(blocks).strip()
-    if len(combined) <= max_chars:
-        return combined, False
-    return combined[:max_chars].rstrip() + "…", True
+    return entry, None
+
+
+def _combine_attachment_context(parts: List[tuple[str, AttachmentText]], max_chars: int) -> tuple[str, bool, int]:
+    """Join ``header + text`` blocks, truncated to ``max_chars``; also returns the token estimate.
+
+    Entry texts hold at least ``max_chars`` characters (or all of them), so the
+    kept prefix is the same as joining the full texts; only the lengths and token
+    estimates recorded at upload time are needed for the rest.
+    """
+    pieces: List[str] = []
+    total_chars = 0
+    total_tokens = 0
+    for header, entry in parts:
+        total_chars += (2 if pieces else 0) + len(header) + entry.chars
+        total_tokens += estimate_tokens(header) + entry.tokens
+        pieces.append(header + entry.text)
+        if total_chars > max_chars:
+            break
+    combined = "\n\n".join(pieces)
+    if total_chars <= max_chars:
+        return combined, False, total_tokens
+    clipped = combined[:max_chars].rstrip() + "…"
+    return clipped, True, estimate_tokens(clipped)
 
 
 async def upload_chat_attachments(
@@ -535,6 +573,8 @@ def delete_chat_attachment(
     ):
         raise ChatAttachmentError(403, "forbidden_attachment")
     shutil.rmtree(attachment_dir, ignore_errors=True)
+    if meta.get("extracted_sha256"):
+        deps.context_cache.discard(str(meta["extracted_sha256"]))
     return {"ok": True, "deleted": True}
 
 
@@ -555,12 +595,17 @@ def resolve_chat_attachment_context(
         session_id=session_id,
     )
     if role_norm not in {"teacher", "student"}:
-        return {"attachment_context": "", "warnings": ["invalid_role"], "ready_attachment_ids": []}
+        return {
+            "attachment_context": "",
+            "attachment_context_tokens": 0,
+            "warnings": ["invalid_role"],
+            "ready_attachment_ids": [],
+        }
 
     ids = _extract_attachment_ids(attachment_ids)
     warnings: List[str] = []
     ready_ids: List[str] = []
-    blocks: List[str] = []
+    parts: List[tuple[str, AttachmentText]] = []
     for idx, raw_id in enumerate(ids, start=1):
         attachment_dir, meta, warning = _resolve_accessible_attachment(
             raw_id,
@@ -575,19 +620,21 @@ def resolve_chat_attachment_context(
             continue
         assert attachment_dir is not None
         assert meta is not None
-        block, warning = _attachment_context_block(attachment_dir, meta, idx=idx)
+        entry, warning = _attachment_context_text(attachment_dir, meta, min_chars=max_chars, deps=deps)
         if warning:
             warnings.append(f"{raw_id}:{warning}")
             continue
-        assert block is not None
-        blocks.append(block)
+        assert entry is not None
+        file_name = str(meta.get("file_name") or "unknown")
+        parts.append((f"[附件 #{idx}: {file_name}]\n", entry))
         ready_ids.append(raw_id)
 
-    combined, truncated = _combine_attachment_context_blocks(blocks, max_chars)
+    combined, truncated, tokens = _combine_attachment_context(parts, max_chars)
     if truncated:
         warnings.append("attachment_context_truncated")
     return {
         "attachment_context": combined,
+        "attachment_context_tokens": tokens,
         "warnings": warnings,
         "ready_attachment_ids": ready_ids,
     }
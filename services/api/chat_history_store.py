@@ -7,6 +7,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from .session_checkpoint_store import append_session_line
+
 _log = logging.getLogger(__name__)
 
 
@@ -198,5 +200,5 @@ def append_teacher_session_message(
     record: Dict[str, Any] = {"ts": deps.now_iso(), "role": role, "content": content}
     if meta:
         record.update(meta)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+    # Teacher sessions are checkpoint-compacted; append under the same lock as the reclaim.
+    append_session_line(path, (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
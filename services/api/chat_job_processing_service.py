@@ -773,6 +773,7 @@ class ChatJobProcessDeps:
     record_workflow_outcome: Callable[[Dict[str, Any]], None] = (
         lambda _payload: None
     )
+    refresh_assignment_progress_student: Optional[Callable[[str, str], Dict[str, Any]]] = None
 
 
 class _ChatJobStatusWriter:
@@ -1300,7 +1301,10 @@ def _run_student_assignment_evidence_auto_propose(
     request_id: str,
 ) -> None:
     try:
-        progress = deps.compute_assignment_progress(assignment_id, True)
+        if deps.refresh_assignment_progress_student is not None:
+            progress = deps.refresh_assignment_progress_student(assignment_id, student_id)
+        else:
+            progress = deps.compute_assignment_progress(assignment_id, True)
         evidence = _extract_student_assignment_evidence(progress, student_id=student_id)
         if evidence is None:
             return
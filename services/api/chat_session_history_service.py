@@ -4,6 +4,8 @@ import json
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
+from .session_checkpoint_store import iter_session_view_lines, session_view_lines
+
 _log = logging.getLogger(__name__)
 
 
@@ -27,22 +29,21 @@ def _parse_message_line(line: str) -> Optional[Dict[str, Any]]:
 def _load_forward_messages(path: Any, *, start: int, take: int) -> Tuple[List[Dict[str, Any]], int]:
     messages: List[Dict[str, Any]] = []
     next_cursor = start
-    with path.open("r", encoding="utf-8") as handle:
-        for idx, line in enumerate(handle):
-            if idx < start:
-                continue
-            if len(messages) >= take:
-                break
-            parsed = _parse_message_line(line)
-            if parsed is None:
-                continue
-            messages.append(parsed)
-            next_cursor = idx + 1
+    for idx, line in enumerate(iter_session_view_lines(path)):
+        if idx < start:
+            continue
+        if len(messages) >= take:
+            break
+        parsed = _parse_message_line(line)
+        if parsed is None:
+            continue
+        messages.append(parsed)
+        next_cursor = idx + 1
     return messages, next_cursor
 
 
 def _load_backward_messages(path: Any, *, end: int, take: int) -> Tuple[List[Dict[str, Any]], int]:
-    lines = path.read_text(encoding="utf-8").splitlines()
+    lines = session_view_lines(path)
     total = len(lines)
     end_idx = total if end < 0 else max(0, min(int(end), total))
     messages_rev: List[Dict[str, Any]] = []
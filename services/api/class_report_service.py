@@ -7,6 +7,7 @@ from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .analysis_lineage_service import extract_analysis_lineage
 from .analysis_metadata_repository import FileBackedAnalysisMetadataRepository
+from .analysis_report_index import ReportListingIndex, get_report_listing_index
 from .review_queue_service import ReviewQueueDeps, enqueue_review_item, list_review_items
 
 
@@ -23,6 +24,7 @@ class ClassReportDeps:
     review_queue_deps: ReviewQueueDeps
     now_iso: Callable[[], str]
     metrics_service: Any | None = None
+    report_index: ReportListingIndex | None = None
 
 
 
@@ -76,6 +78,7 @@ def load_class_signal_bundle(job_id: str, *, deps: ClassReportDeps) -> Dict[str,
 
 def write_class_report(report_id: str, payload: Dict[str, Any], *, deps: ClassReportDeps) -> Dict[str, Any]:
     deps.metadata_repo.write_json(_report_relative_path(report_id), dict(payload or {}))
+    _report_index(deps).record_report(dict(payload or {}), fallback_id=str(report_id or '').strip())
     return dict(payload or {})
 
 
@@ -160,21 +163,45 @@ def list_class_report_review_queue(*, teacher_id: str, deps: ClassReportDeps) ->
 
 
 
-def list_class_reports(*, teacher_id: str, status: str | None, deps: ClassReportDeps) -> Dict[str, Any]:
+def _report_index(deps: ClassReportDeps) -> ReportListingIndex:
+    return deps.report_index or get_report_listing_index(deps.metadata_repo.base_dir)
+
+
+
+def list_class_reports(
+    *,
+    teacher_id: str,
+    status: str | None,
+    deps: ClassReportDeps,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> Dict[str, Any]:
+    """List a teacher's reports from the report index, newest first.
+
+    Without ``limit`` every matching report is returned; with it, one page plus
+    a ``next_cursor`` for the following page (``None`` on the last page).
+    """
     teacher_id_final = _require_teacher_id(teacher_id)
     normalized_status = str(status or '').strip() or None
+    index = _report_index(deps)
+    entries, next_cursor = index.page(teacher_id=teacher_id_final, status=normalized_status, limit=limit, cursor=cursor)
     items: List[Dict[str, Any]] = []
-    reports_dir = deps.metadata_repo.base_dir / 'reports'
-    for path in sorted(reports_dir.glob('*.json')) if reports_dir.exists() else []:
-        raw = deps.metadata_repo.read_json(f'reports/{path.name}')
+    for entry in entries:
+        raw = _read_optional_json(_report_relative_path(entry.report_id), deps)
+        if raw is None:
+            # Deleted behind the index's back: drop the row and rescan next time.
+            index.remove(entry.report_id)
+            continue
         summary = _summary_from_report(raw)
         if summary['teacher_id'] != teacher_id_final:
             continue
         if normalized_status and summary['status'] != normalized_status:
             continue
         items.append(summary)
-    items.sort(key=lambda item: (str(item.get('updated_at') or ''), str(item.get('created_at') or ''), str(item.get('report_id') or '')), reverse=True)
-    return {'items': items}
+    payload: Dict[str, Any] = {'items': items}
+    if limit is not None:
+        payload['next_cursor'] = next_cursor
+    return payload
 
 
 
@@ -83,6 +83,7 @@ class ConfigValues:
     STUDENT_MEMORY_ASSIGNMENT_EVIDENCE_LOW_MASTERY_RATIO: float
     DISCUSSION_COMPLETE_MARKER: str
     GRADE_COUNT_CONF_THRESHOLD: float
+    ASSIGNMENT_PROGRESS_MAX_AGE_SEC: float
     OCR_MAX_CONCURRENCY: int
     LLM_MAX_CONCURRENCY: int
     LLM_MAX_CONCURRENCY_STUDENT: int
@@ -206,6 +207,7 @@ def build_config(
         STUDENT_MEMORY_ASSIGNMENT_EVIDENCE_LOW_MASTERY_RATIO=settings.student_memory_assignment_evidence_low_mastery_ratio,
         DISCUSSION_COMPLETE_MARKER=settings.discussion_complete_marker,
         GRADE_COUNT_CONF_THRESHOLD=settings.grade_count_conf_threshold,
+        ASSIGNMENT_PROGRESS_MAX_AGE_SEC=settings.assignment_progress_max_age_sec,
         OCR_MAX_CONCURRENCY=settings.ocr_max_concurrency,
         LLM_MAX_CONCURRENCY=settings.llm_max_concurrency,
         LLM_MAX_CONCURRENCY_STUDENT=settings.llm_max_concurrency_student,
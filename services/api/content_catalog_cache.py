@@ -0,0 +1,190 @@
+"""Process-wide, stat-validated cache of the lesson list and knowledge CSV tables.
+
+``list_lessons`` used to open every ``lessons/*/lesson.json`` per call, and
+``load_kp_catalog`` / ``load_question_kp_map`` re-parsed their CSV files for
+every exam analysis. This cache keeps:
+
+- parsed CSV tables keyed by path and validated by the file's
+  ``(mtime_ns, size)``. A settled parse is also persisted to a compact JSON
+  sidecar next to the ``knowledge`` directory (``knowledge.catalog.json``), so
+  a fresh worker process or a cold tenant loads it with one ``json.load``
+  instead of parsing the CSV again;
+- the lesson listing, one entry per lesson folder validated by its
+  ``lesson.json`` stamp. The folder list is re-scanned when the directory
+  stamp changes and at least every ``revalidate_sec``, to catch in-place
+  rewrites.
+
+Stamps are judged as described in :mod:`services.api.dir_index_support`. Writers inside the process call
+:func:`invalidate_content_catalog` after changing lessons or knowledge files.
+Returned containers are fresh copies, but the row dicts inside them are shared
+and must be treated as read-only.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .dir_index_support import Stamp, dir_fingerprint, file_stamp, settled
+from .fs_atomic import atomic_write_json
+
+_log = logging.getLogger(__name__)
+
+_SIDECAR_SUFFIX = ".catalog.json"
+_SIDECAR_VERSION = 1
+
+
+def _settled(stamp: Optional[Stamp]) -> bool:
+    return stamp is None or settled(stamp[0])
+
+
+def catalog_sidecar_path(path: Path) -> Path:
+    """``data/knowledge/x.csv`` -> ``data/knowledge.catalog.json`` (outside the watched directory)."""
+    folder = Path(path).parent
+    return folder.with_name(folder.name + _SIDECAR_SUFFIX)
+
+
+@dataclass
+class _LessonsListing:
+    fingerprint: Optional[Stamp] = None
+    checked_at: float = 0.0
+    unsettled: bool = True
+    folders: Dict[str, Tuple[Optional[Stamp], Dict[str, Any]]] = field(default_factory=dict)
+    items: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class ContentCatalogCache:
+    def __init__(self, *, revalidate_sec: float = 5.0) -> None:
+        self.revalidate_sec = float(revalidate_sec)
+        self._tables: Dict[str, Tuple[Stamp, Any]] = {}
+        self._lessons: Dict[str, _LessonsListing] = {}
+        self._lock = threading.Lock()
+
+    # -- CSV tables --------------------------------------------------------
+
+    def _read_sidecar(self, path: Path, stamp: Stamp) -> Optional[Any]:
+        try:
+            with open(catalog_sidecar_path(path), "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        entry = (payload.get("tables") or {}).get(path.name) if isinstance(payload, dict) else None
+        if not isinstance(entry, dict) or payload.get("version") != _SIDECAR_VERSION:
+            return None
+        return entry.get("data") if entry.get("stamp") == list(stamp) else None
+
+    def _write_sidecar(self, path: Path, stamp: Stamp, data: Any) -> None:
+        sidecar = catalog_sidecar_path(path)
+        try:
+            with open(sidecar, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError):
+            payload = {}
+        if not isinstance(payload, dict) or payload.get("version") != _SIDECAR_VERSION:
+            payload = {"version": _SIDECAR_VERSION, "tables": {}}
+        payload.setdefault("tables", {})[path.name] = {"stamp": list(stamp), "data": data}
+        try:
+            atomic_write_json(sidecar, payload)
+        except OSError:
+            _log.warning("failed to persist catalog sidecar %s", sidecar, exc_info=True)
+
+    def table(self, path: Path, parse: Callable[[Path], Any]) -> Any:
+        """``parse(path)`` cached until the file changes; ``None`` when the file is missing."""
+        path = Path(path)
+        stamp = file_stamp(path)
+        if stamp is None:
+            return None
+        key = str(path)
+        settled = _settled(stamp)
+        with self._lock:
+            cached = self._tables.get(key)
+        if cached is not None and cached[0] == stamp and settled:
+            return cached[1]
+        data = self._read_sidecar(path, stamp) if settled else None
+        if data is None:
+            data = parse(path)
+            if settled:
+                self._write_sidecar(path, stamp, data)
+        with self._lock:
+            self._tables[key] = (stamp, data)
+        return data
+
+    # -- lessons -----------------------------------------------------------
+
+    def _rescan_lessons(
+        self, lessons_dir: Path, listing: _LessonsListing, describe: Callable[[Path], Dict[str, Any]]
+    ) -> None:
+        folders: Dict[str, Tuple[Optional[Stamp], Dict[str, Any]]] = {}
+        unsettled = False
+        with os.scandir(lessons_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                folder = Path(entry.path)
+                stamp = file_stamp(folder / "lesson.json")
+                known = listing.folders.get(entry.name)
+                if known is not None and known[0] == stamp and _settled(stamp):
+                    folders[entry.name] = known
+                    continue
+                unsettled = unsettled or not _settled(stamp)
+                folders[entry.name] = (stamp, describe(folder))
+        listing.folders = folders
+        listing.items = sorted((item for _stamp, item in folders.values()), key=lambda x: x.get("lesson_id") or "")
+        listing.unsettled = unsettled
+
+    def lessons(self, lessons_dir: Path, describe: Callable[[Path], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Lesson items sorted by ``lesson_id``; ``describe(folder)`` builds one item."""
+        lessons_dir = Path(lessons_dir)
+        key = str(lessons_dir)
+        with self._lock:
+            listing = self._lessons.setdefault(key, _LessonsListing())
+            fingerprint = dir_fingerprint(lessons_dir)
+            if fingerprint is None:
+                self._lessons.pop(key, None)
+                return []
+            now = time.monotonic()
+            fresh = (
+                fingerprint == listing.fingerprint
+                and _settled(fingerprint)
+                and not listing.unsettled
+                and now - listing.checked_at < self.revalidate_sec
+            )
+            if not fresh:
+                self._rescan_lessons(lessons_dir, listing, describe)
+                listing.fingerprint = fingerprint
+                listing.checked_at = now
+            return [dict(item) for item in listing.items]
+
+    # -- invalidation ------------------------------------------------------
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Re-check entries related to ``path`` (everything when ``None``) on their next use.
+
+        Lesson listings keep their per-folder entries, so only folders whose
+        ``lesson.json`` stamp changed are described again.
+        """
+        prefix = str(Path(path)) if path is not None else None
+
+        def related(key: str) -> bool:
+            if prefix is None:
+                return True
+            return key == prefix or key.startswith(prefix + os.sep) or prefix.startswith(key + os.sep)
+
+        with self._lock:
+            for key in [k for k in self._tables if related(k)]:
+                self._tables.pop(key, None)
+            for key, listing in self._lessons.items():
+                if related(key):
+                    listing.fingerprint = None
+
+
+CONTENT_CATALOG_CACHE = ContentCatalogCache()
+
+
+def invalidate_content_catalog(path: Optional[Path] = None) -> None:
+    CONTENT_CATALOG_CACHE.invalidate(path)
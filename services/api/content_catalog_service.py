@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict
 
+from .content_catalog_cache import CONTENT_CATALOG_CACHE, ContentCatalogCache
+
 
 @dataclass(frozen=True)
 class ContentCatalogDeps:
@@ -13,30 +15,28 @@ class ContentCatalogDeps:
     app_root: Path
     load_profile_file: Callable[[Path], Dict[str, Any]]
     load_skills: Callable[..., Any]
+    catalog_cache: ContentCatalogCache = CONTENT_CATALOG_CACHE
 
 
 _log = logging.getLogger(__name__)
 
 
+def _describe_lesson(folder: Path, deps: ContentCatalogDeps) -> Dict[str, Any]:
+    lesson_id = folder.name
+    summary = ""
+    meta_path = folder / "lesson.json"
+    if meta_path.exists():
+        meta = deps.load_profile_file(meta_path)
+        lesson_id = meta.get("lesson_id") or lesson_id
+        summary = meta.get("summary", "")
+    return {"lesson_id": lesson_id, "summary": summary}
+
+
 def list_lessons(*, deps: ContentCatalogDeps) -> Dict[str, Any]:
     lessons_dir = deps.data_dir / "lessons"
     if not lessons_dir.exists():
         return {"lessons": []}
-
-    items = []
-    for folder in lessons_dir.iterdir():
-        if not folder.is_dir():
-            continue
-        lesson_id = folder.name
-        summary = ""
-        meta_path = folder / "lesson.json"
-        if meta_path.exists():
-            meta = deps.load_profile_file(meta_path)
-            lesson_id = meta.get("lesson_id") or lesson_id
-            summary = meta.get("summary", "")
-        items.append({"lesson_id": lesson_id, "summary": summary})
-
-    items.sort(key=lambda x: x.get("lesson_id") or "")
+    items = deps.catalog_cache.lessons(lessons_dir, lambda folder: _describe_lesson(folder, deps))
     return {"lessons": items}
 
 
@@ -51,10 +51,21 @@ def list_skills(*, deps: ContentCatalogDeps) -> Dict[str, Any]:
     return payload
 
 
-def load_kp_catalog(data_dir: Path) -> Dict[str, Dict[str, str]]:
-    path = data_dir / "knowledge" / "knowledge_points.csv"
-    if not path.exists():
-        return {}
+def load_kp_catalog(
+    data_dir: Path, *, cache: ContentCatalogCache = CONTENT_CATALOG_CACHE
+) -> Dict[str, Dict[str, str]]:
+    """``kp_id -> {name, status, notes}``; parsed once per file change (rows are shared, read-only)."""
+    table = cache.table(data_dir / "knowledge" / "knowledge_points.csv", _parse_kp_catalog)
+    return dict(table or {})
+
+
+def load_question_kp_map(data_dir: Path, *, cache: ContentCatalogCache = CONTENT_CATALOG_CACHE) -> Dict[str, str]:
+    """``question_id -> kp_id``; parsed once per file change."""
+    table = cache.table(data_dir / "knowledge" / "knowledge_point_map.csv", _parse_question_kp_map)
+    return dict(table or {})
+
+
+def _parse_kp_catalog(path: Path) -> Dict[str, Dict[str, str]]:
     out: Dict[str, Dict[str, str]] = {}
     try:
         with path.open("r", encoding="utf-8") as f:
@@ -74,10 +85,7 @@ def load_kp_catalog(data_dir: Path) -> Dict[str, Dict[str, str]]:
     return out
 
 
-def load_question_kp_map(data_dir: Path) -> Dict[str, str]:
-    path = data_dir / "knowledge" / "knowledge_point_map.csv"
-    if not path.exists():
-        return {}
+def _parse_question_kp_map(path: Path) -> Dict[str, str]:
     out: Dict[str, str] = {}
     try:
         with path.open("r", encoding="utf-8") as f:
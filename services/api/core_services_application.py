@@ -72,6 +72,12 @@ from .assignment_llm_gate_service import (
 from .assignment_progress_service import (
     compute_assignment_progress as _compute_assignment_progress_impl,
 )
+from .assignment_progress_service import (
+    read_assignment_progress as _read_assignment_progress_impl,
+)
+from .assignment_progress_service import (
+    refresh_assignment_progress_student as _refresh_assignment_progress_student_impl,
+)
 from .assignment_requirements_service import (
     ensure_requirements_for_assignment as _ensure_requirements_for_assignment_impl,
 )
@@ -135,6 +141,7 @@ from .exam_range_service import (
 from .exam_range_service import (
     exam_range_top_students as _exam_range_top_students_impl,
 )
+from .paths import student_sessions_base_dir
 from .session_discussion_service import (
     SessionDiscussionDeps,
 )
@@ -619,9 +626,11 @@ def session_discussion_pass(student_id: str, assignment_id: str) -> Dict[str, An
     marker = DISCUSSION_COMPLETE_MARKER
     load_index_fn: Callable[[str], List[Dict[str, Any]]] = load_student_sessions_index
     session_file_fn = student_session_file
+    sessions_dir_fn: Callable[[str], Path] = student_sessions_base_dir
     if core is not None:
         marker = str(getattr(core, "DISCUSSION_COMPLETE_MARKER", marker) or marker)
         session_file_fn = getattr(core, "student_session_file", session_file_fn)
+        sessions_dir_fn = getattr(core, "student_sessions_base_dir", sessions_dir_fn)
         index_path_fn = getattr(core, "student_sessions_index_path", None)
         if callable(index_path_fn):
             def _load_index_with_core(student_id_value: str) -> List[Dict[str, Any]]:
@@ -644,6 +653,8 @@ def session_discussion_pass(student_id: str, assignment_id: str) -> Dict[str, An
             marker=marker,
             load_student_sessions_index=load_index_fn,
             student_session_file=session_file_fn,
+            use_discussion_state=True,
+            student_sessions_dir=sessions_dir_fn,
         ),
     )
 
@@ -657,6 +668,14 @@ def best_submission_attempt(attempts: List[Dict[str, Any]]) -> Optional[Dict[str
 
 
 def compute_assignment_progress(assignment_id: str, include_students: bool = True) -> Dict[str, Any]:
+    return _read_assignment_progress_impl(
+        assignment_id,
+        deps=_assignment_progress_deps(),
+        include_students=include_students,
+    )
+
+
+def recompute_assignment_progress(assignment_id: str, include_students: bool = True) -> Dict[str, Any]:
     return _compute_assignment_progress_impl(
         assignment_id,
         deps=_assignment_progress_deps(),
@@ -664,6 +683,14 @@ def compute_assignment_progress(assignment_id: str, include_students: bool = Tru
     )
 
 
+def refresh_assignment_progress_student(assignment_id: str, student_id: str) -> Dict[str, Any]:
+    return _refresh_assignment_progress_student_impl(
+        assignment_id,
+        student_id,
+        deps=_assignment_progress_deps(),
+    )
+
+
 def build_assignment_context(detail: Optional[Dict[str, Any]], study_mode: bool = False) -> Optional[str]:
     return _build_assignment_context_impl(
         detail,
@@ -0,0 +1,272 @@
+"""Queue-based diagnostics log writer.
+
+``diag_log`` is called from request handlers and worker threads alike, so the
+calling thread only appends a small record to an in-memory queue.  A background
+writer serializes records and writes them in batches, flushing when a batch is
+full or the flush interval elapses.  When the queue is full new records are
+dropped and counted instead of blocking the caller.
+
+A forked child starts with empty queues and its own writer thread. RQ
+work-horses exit through ``os._exit`` and skip ``atexit``, so the worker
+flushes every logger when a job ends (see :mod:`services.api.workers.work_horse`).
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from . import settings as _settings
+from .workers.work_horse import register_job_end_hook
+
+_log = logging.getLogger(__name__)
+
+_LOGGERS: Dict[str, "AsyncDiagLogger"] = {}
+_LOGGERS_LOCK = threading.Lock()
+
+
+def parse_sample_rates(raw: str) -> Dict[str, float]:
+    """Parse ``event=rate`` pairs; a trailing ``*`` in the event name matches a prefix."""
+    rates: Dict[str, float] = {}
+    for part in str(raw or "").split(","):
+        name, sep, value = part.partition("=")
+        name = name.strip()
+        if not sep or not name:
+            continue
+        try:
+            rates[name] = max(0.0, min(1.0, float(value)))
+        except ValueError:
+            _log.debug("invalid diag sample rate: %s", part)
+    return rates
+
+
+class AsyncDiagLogger:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = 2_000_000,
+        backup_count: int = 3,
+        max_queue: int = 10_000,
+        batch_size: int = 256,
+        flush_interval_sec: float = 0.5,
+        sample_rates: Optional[Dict[str, float]] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.max_queue = max(1, int(max_queue))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_sec = max(0.01, float(flush_interval_sec))
+        self._sample_exact: Dict[str, float] = {}
+        self._sample_prefix: List[Tuple[str, float]] = []
+        for name, rate in (sample_rates or {}).items():
+            if name.endswith("*"):
+                self._sample_prefix.append((name[:-1], rate))
+            else:
+                self._sample_exact[name] = rate
+        self._sample_prefix.sort(key=lambda item: len(item[0]), reverse=True)
+        self._max_bytes = int(max_bytes)
+        self._backup_count = int(backup_count)
+        self._handler: Optional[RotatingFileHandler] = None
+        # deque.append/popleft are atomic, so producers never take a lock.
+        self._queue: Deque[Tuple[float, str, Optional[Dict[str, Any]]]] = deque()
+        self._reset_writer_state()
+        # Counters are best-effort: they are only read for reporting.
+        self._enqueued = 0
+        self._dropped = 0
+        self._sampled_out = 0
+        self._written = 0
+        self._batches = 0
+        self._write_errors = 0
+
+    def _reset_writer_state(self) -> None:
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+
+    def reset_after_fork(self) -> None:
+        """Drop state inherited from the parent in a forked child.
+
+        The parent's writer thread does not exist in the child and records
+        queued before the fork are written by the parent.
+        """
+        self._queue.clear()
+        self._handler = None
+        self._reset_writer_state()
+
+    def _sample_rate(self, event: str) -> float:
+        rate = self._sample_exact.get(event)
+        if rate is not None:
+            return rate
+        for prefix, prefix_rate in self._sample_prefix:
+            if event.startswith(prefix):
+                return prefix_rate
+        return 1.0
+
+    def log(self, event: str, payload: Optional[Dict[str, Any]] = None) -> bool:
+        """Enqueue one record; returns False when it was sampled out or dropped."""
+        rate = self._sample_rate(event)
+        if rate < 1.0 and random.random() >= rate:
+            self._sampled_out += 1
+            return False
+        if len(self._queue) >= self.max_queue:
+            self._dropped += 1
+            return False
+        self._queue.append((time.time(), event, dict(payload) if payload else None))
+        self._enqueued += 1
+        self._idle.clear()
+        if self._writer is None:
+            self._start_writer()
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _start_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is not None:
+                return
+            self._writer = threading.Thread(target=self._run, daemon=True, name="diag-log-writer")
+            self._writer.start()
+
+    def _open_handler(self) -> RotatingFileHandler:
+        if self._handler is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                str(self.path), maxBytes=self._max_bytes, backupCount=self._backup_count, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._handler = handler
+        return self._handler
+
+    @staticmethod
+    def _serialize(item: Tuple[float, str, Optional[Dict[str, Any]]]) -> str:
+        ts, event, payload = item
+        record: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(ts).isoformat(timespec="seconds"),
+            "event": event,
+        }
+        if payload:
+            record.update(payload)
+        try:
+            return json.dumps(record, ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            _log.debug("diag_log serialization failed for event=%s", event)
+            return json.dumps({"ts": record["ts"], "event": event, "serialize_error": True})
+
+    def _drain_batch(self) -> List[str]:
+        lines: List[str] = []
+        while len(lines) < self.batch_size:
+            try:
+                item = self._queue.popleft()
+            except IndexError:
+                break
+            lines.append(self._serialize(item))
+        return lines
+
+    def _write_batch(self, lines: List[str]) -> None:
+        # One LogRecord per batch: the rotation check runs once per batch
+        # instead of once per event.
+        record = logging.makeLogRecord({"msg": "\n".join(lines), "levelno": logging.INFO})
+        try:
+            self._open_handler().emit(record)
+            self._written += len(lines)
+            self._batches += 1
+        except Exception:  # policy: allowed-broad-except
+            self._write_errors += 1
+            _log.debug("diag log batch write failed", exc_info=True)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval_sec)
+            self._wakeup.clear()
+            while True:
+                lines = self._drain_batch()
+                if not lines:
+                    break
+                self._write_batch(lines)
+            if not self._queue:
+                self._idle.set()
+            if self._stop.is_set() and not self._queue:
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wake the writer and wait until the queue is drained."""
+        if self._writer is None:
+            return not self._queue
+        self._wakeup.set()
+        return self._idle.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self.flush(timeout)
+        if self._writer is not None:
+            self._writer.join(timeout)
+        if self._handler is not None:
+            self._handler.close()
+            self._handler = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "queued": len(self._queue),
+            "enqueued_total": self._enqueued,
+            "written_total": self._written,
+            "dropped_total": self._dropped,
+            "sampled_out_total": self._sampled_out,
+            "batches_total": self._batches,
+            "write_errors_total": self._write_errors,
+            "max_queue": self.max_queue,
+        }
+
+
+def get_diag_logger(path: Path) -> AsyncDiagLogger:
+    """Return the process-wide logger for ``path`` (tenants sharing a path share a writer)."""
+    key = str(Path(path).expanduser().resolve())
+    with _LOGGERS_LOCK:
+        logger = _LOGGERS.get(key)
+        if logger is None:
+            logger = AsyncDiagLogger(
+                Path(path),
+                max_queue=_settings.diag_log_queue_max(),
+                batch_size=_settings.diag_log_batch_size(),
+                flush_interval_sec=_settings.diag_log_flush_interval_ms() / 1000.0,
+                sample_rates=parse_sample_rates(_settings.diag_log_sample_rates_raw()),
+            )
+            _LOGGERS[key] = logger
+        return logger
+
+
+def diag_log_stats() -> List[Dict[str, Any]]:
+    with _LOGGERS_LOCK:
+        loggers = list(_LOGGERS.values())
+    return [logger.stats() for logger in loggers]
+
+
+def flush_all(timeout: float = 5.0) -> None:
+    with _LOGGERS_LOCK:
+        loggers = list(_LOGGERS.values())
+    for logger in loggers:
+        logger.flush(timeout)
+
+
+def _reset_loggers_after_fork() -> None:
+    global _LOGGERS_LOCK
+    _LOGGERS_LOCK = threading.Lock()
+    for logger in _LOGGERS.values():
+        logger.reset_after_fork()
+
+
+atexit.register(flush_all, 2.0)
+register_job_end_hook(flush_all)
+os.register_at_fork(after_in_child=_reset_loggers_after_fork)
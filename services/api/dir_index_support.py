@@ -0,0 +1,127 @@
+"""Shared freshness checks and SQLite plumbing for the directory-backed indexes.
+
+Several stores keep a derived index (in process or in a SQLite file next to the
+directory) over a folder of JSON/CSV files that stays the source of truth:
+proposal, assignment, survey and analysis report listings, the student
+directory, the memory record lookup and the lesson/knowledge catalog.
+
+Freshness is judged from ``stat`` stamps: ``(mtime_ns, st_ino)`` for a
+directory (the inode catches a directory swapped by rename) and
+``(mtime_ns, size)`` for a file. A stamp younger than
+:data:`RACY_WINDOW_NS` is never trusted, because a second write landing within
+the filesystem's timestamp granularity can leave it unchanged; like git's
+racy-clean check, such entries are re-validated on the next lookup instead.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+_log = logging.getLogger(__name__)
+
+Stamp = Tuple[int, int]
+RACY_WINDOW_NS = 2_000_000_000
+
+_T = TypeVar("_T")
+
+
+def settled(mtime_ns: int) -> bool:
+    """Whether a stamp with this mtime is old enough to be trusted."""
+    return time.time_ns() - mtime_ns > RACY_WINDOW_NS
+
+
+def dir_fingerprint(path: Path) -> Optional[Stamp]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_ino)
+
+
+def dir_fingerprint_text(path: Path) -> str:
+    """:func:`dir_fingerprint` as stored in an index's meta table (``""`` when missing)."""
+    fingerprint = dir_fingerprint(path)
+    return f"{fingerprint[0]}:{fingerprint[1]}" if fingerprint is not None else ""
+
+
+def fingerprint_text_settled(value: str) -> bool:
+    return settled(int(value.split(":")[0] or 0))
+
+
+def file_stamp(path: Path) -> Optional[Stamp]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def dir_mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+class SqliteIndex:
+    """Base for an index kept in its own SQLite file.
+
+    Connections run in autocommit mode (callers issue ``BEGIN IMMEDIATE`` for
+    multi-statement writes) and the schema is created on the first open in
+    this process. Subclasses implement :meth:`_create_schema`.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=3.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        raise NotImplementedError
+
+    def _init_db(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.execute("PRAGMA journal_mode=WAL;")
+        except sqlite3.DatabaseError:
+            _log.warning("WAL journal mode not available for %s", self.db_path, exc_info=True)
+        self._create_schema(conn)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = self._connect()
+        if not self._initialized:
+            self._init_db(conn)
+            self._initialized = True
+        return conn
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+
+class InstanceRegistry(Generic[_T]):
+    """Process-wide instances keyed by resolved path, so all callers share one lock per store."""
+
+    def __init__(self) -> None:
+        self._items: Dict[str, _T] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, factory: Callable[[], _T]) -> _T:
+        key = str(Path(path).resolve())
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                item = factory()
+                self._items[key] = item
+            return item
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
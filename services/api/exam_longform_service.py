@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import csv
 import logging
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from .content_catalog_service import load_kp_catalog as _load_kp_catalog
+from .content_catalog_service import load_question_kp_map as _load_question_kp_map
+
 _log = logging.getLogger(__name__)
 
 
@@ -89,45 +91,11 @@ def summarize_exam_students(exam_id: str, max_total: Optional[float], deps: Exam
 
 
 def load_kp_catalog(deps: ExamLongformDeps) -> Dict[str, Dict[str, str]]:
-    path = deps.data_dir / "knowledge" / "knowledge_points.csv"
-    if not path.exists():
-        return {}
-    out: Dict[str, Dict[str, str]] = {}
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            for row in reader:
-                kp_id = str(row.get("kp_id") or "").strip()
-                if not kp_id:
-                    continue
-                out[kp_id] = {
-                    "name": str(row.get("name") or "").strip(),
-                    "status": str(row.get("status") or "").strip(),
-                    "notes": str(row.get("notes") or "").strip(),
-                }
-    except Exception:
-        _log.debug("operation failed", exc_info=True)
-        return {}
-    return out
+    return _load_kp_catalog(deps.data_dir)
 
 
 def load_question_kp_map(deps: ExamLongformDeps) -> Dict[str, str]:
-    path = deps.data_dir / "knowledge" / "knowledge_point_map.csv"
-    if not path.exists():
-        return {}
-    out: Dict[str, str] = {}
-    try:
-        with path.open("r", encoding="utf-8") as handle:
-            reader = csv.DictReader(handle)
-            for row in reader:
-                qid = str(row.get("question_id") or "").strip()
-                kp_id = str(row.get("kp_id") or "").strip()
-                if qid and kp_id:
-                    out[qid] = kp_id
-    except Exception:
-        _log.debug("operation failed", exc_info=True)
-        return {}
-    return out
+    return _load_question_kp_map(deps.data_dir)
 
 
 def _analysis_payload(analysis_res: Dict[str, Any]) -> Optional[Dict[str, Any]]:
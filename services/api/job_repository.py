@@ -4,6 +4,7 @@ import fcntl
 import json
 import logging
 import os
+import sqlite3
 import time
 import uuid
 from datetime import datetime
@@ -13,6 +14,7 @@ from typing import Any, Dict
 from fastapi import UploadFile
 from starlette.concurrency import run_in_threadpool
 
+from . import settings as _settings
 from .chat_lock_service import (
     ChatLockDeps,
 )
@@ -22,7 +24,9 @@ from .chat_lock_service import (
 from .chat_lock_service import (
     try_acquire_lockfile as _try_acquire_lockfile_impl,
 )
-from .paths import exam_job_path, survey_job_path, upload_job_path
+from .paths import exam_job_path, survey_job_path, upload_blob_dir, upload_job_path
+from .survey_report_index import survey_report_index_for_core
+from .upload_blob_store import UploadBlobStore, get_upload_blob_store
 from .upload_io_service import sanitize_filename_io
 from .upload_text_service import save_upload_file as _save_upload_file_impl
 
@@ -175,12 +179,26 @@ def _release_lockfile(path: Path) -> None:
 # File upload helpers
 # ---------------------------------------------------------------------------
 
+def _upload_blob_store_for(dest: Path) -> UploadBlobStore | None:
+    if not _settings.upload_blob_store_enabled():
+        return None
+    from .wiring import get_app_core
+
+    blob_root = upload_blob_dir(get_app_core())
+    uploads_root = blob_root.parent.resolve()
+    # Only dedupe files that live under the uploads tree (same filesystem as the store).
+    if uploads_root not in dest.resolve().parents:
+        return None
+    return get_upload_blob_store(blob_root, gc_interval_sec=_settings.upload_blob_gc_interval_sec())
+
+
 async def save_upload_file(upload: UploadFile, dest: Path, chunk_size: int = 1024 * 1024) -> int:
     return await _save_upload_file_impl(
         upload,
         dest,
         chunk_size=chunk_size,
         run_in_threadpool=run_in_threadpool,
+        blob_store=_upload_blob_store_for(dest),
     )
 
 def sanitize_filename(name: str) -> str:
@@ -229,6 +247,10 @@ def write_survey_job(
         data.update(updates)
         data["updated_at"] = datetime.now().isoformat(timespec="seconds")
         _atomic_write_json(job_path, data)
+        try:
+            survey_report_index_for_core(core).record_job(data, fallback_id=job_dir.name)
+        except sqlite3.Error:
+            _log.warning("survey report index update failed for job %s", job_id, exc_info=True)
         return data
     finally:
         fcntl.flock(lock_fd, fcntl.LOCK_UN)
@@ -0,0 +1,95 @@
+"""Mergeable latency quantile sketch.
+
+Values are counted in logarithmically sized buckets (``gamma = (1+a)/(1-a)``),
+so every quantile estimate is within relative error ``a`` of the true value.
+Memory is bounded by the value range rather than the sample count, and two
+sketches with the same accuracy merge by adding bucket counts, which is what
+lets per-worker sketches be combined across processes.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional
+
+_DEFAULT_RELATIVE_ACCURACY = 0.01
+_MIN_TRACKED_VALUE = 1e-6
+
+
+class LatencySketch:
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "_bins", "_zero_count", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy: float = _DEFAULT_RELATIVE_ACCURACY) -> None:
+        accuracy = min(max(float(relative_accuracy), 1e-4), 0.5)
+        self.relative_accuracy = accuracy
+        self._gamma = (1.0 + accuracy) / (1.0 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float, count: int = 1) -> None:
+        v = max(0.0, float(value))
+        if v <= _MIN_TRACKED_VALUE:
+            self._zero_count += count
+        else:
+            idx = int(math.ceil(math.log(v) / self._log_gamma))
+            self._bins[idx] = self._bins.get(idx, 0) + count
+        self.count += count
+        self.sum += v * count
+        self.min = min(self.min, v)
+        self.max = max(self.max, v)
+
+    def merge(self, other: "LatencySketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different relative accuracy")
+        for idx, n in other._bins.items():
+            self._bins[idx] = self._bins.get(idx, 0) + n
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        if self.count <= 0:
+            return 0.0
+        rank = max(0.0, min(1.0, float(q))) * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        for idx in sorted(self._bins):
+            seen += self._bins[idx]
+            if rank < seen:
+                estimate = 2.0 * self._gamma**idx / (self._gamma + 1.0)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "a": self.relative_accuracy,
+            "bins": [[idx, n] for idx, n in self._bins.items()],
+            "zero": self._zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> Optional["LatencySketch"]:
+        if not isinstance(raw, dict):
+            return None
+        try:
+            sketch = cls(float(raw.get("a") or _DEFAULT_RELATIVE_ACCURACY))
+            sketch._bins = {int(idx): int(n) for idx, n in raw.get("bins") or []}
+            sketch._zero_count = int(raw.get("zero") or 0)
+            sketch.count = int(raw.get("count") or 0)
+            sketch.sum = float(raw.get("sum") or 0.0)
+            sketch.min = float(raw.get("min") or 0.0) if sketch.count else math.inf
+            sketch.max = float(raw.get("max") or 0.0)
+        except (TypeError, ValueError):
+            return None
+        return sketch
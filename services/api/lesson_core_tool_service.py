@@ -10,6 +10,8 @@ class LessonCaptureDeps:
     resolve_app_path: Callable[..., Any]
     app_root: Any
     run_script: Callable[[List[str]], Any]
+    # Called after the capture script wrote lesson files, so cached listings see them.
+    on_lessons_changed: Optional[Callable[[], None]] = None
 
 
 def _resolve_sources(args: Dict[str, Any], *, deps: LessonCaptureDeps) -> tuple[List[str], Optional[Dict[str, Any]]]:
@@ -90,4 +92,6 @@ def lesson_capture(args: Dict[str, Any], *, deps: LessonCaptureDeps) -> Dict[str
     _append_optional_value_arg(cmd, args, key="language", flag="--language")
 
     output = deps.run_script(cmd)
+    if deps.on_lessons_changed is not None:
+        deps.on_lessons_changed()
     return {"ok": True, "output": output, "lesson_id": lesson_id}
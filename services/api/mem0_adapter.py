@@ -3,7 +3,10 @@ from __future__ import annotations
 import logging
 import os
 import threading
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .mem0_embedding_cache import CachingEmbedder, EmbeddingCache
 
 _log = logging.getLogger(__name__)
 
@@ -69,6 +72,26 @@ def teacher_mem0_chunk_overlap_chars() -> int:
     return max(0, _env_int("TEACHER_MEM0_CHUNK_OVERLAP_CHARS", 100))
 
 
+def teacher_mem0_embed_cache_enabled() -> bool:
+    return _env_bool("TEACHER_MEM0_EMBED_CACHE", True)
+
+
+def teacher_mem0_embed_cache_path() -> Path:
+    raw = str(os.getenv("TEACHER_MEM0_EMBED_CACHE_PATH", "") or "").strip()
+    if raw:
+        return Path(raw)
+    base = str(os.getenv("MEM0_DIR", "") or "").strip() or str(Path.home() / ".mem0")
+    return Path(base) / "embedding_cache.sqlite3"
+
+
+def teacher_mem0_embed_batch_size() -> int:
+    return max(1, _env_int("TEACHER_MEM0_EMBED_BATCH_SIZE", 32))
+
+
+def teacher_mem0_embed_cache_max_entries() -> int:
+    return max(1, _env_int("TEACHER_MEM0_EMBED_CACHE_MAX_ENTRIES", 50000))
+
+
 def _teacher_user_id(teacher_id: str) -> str:
     return f"teacher:{teacher_id}"
 
@@ -99,6 +122,7 @@ def get_mem0() -> Optional[Any]:
             from mem0_config import get_config  # type: ignore
 
             _MEM0_INSTANCE = Memory.from_config(get_config())
+            _install_embedding_cache(_MEM0_INSTANCE)
             return _MEM0_INSTANCE
         except Exception as exc:
             _log.warning("mem0 initialization failed", exc_info=True)
@@ -106,6 +130,32 @@ def get_mem0() -> Optional[Any]:
             return None
 
 
+def _install_embedding_cache(memory: Any) -> None:
+    """Route mem0's embedder through the local content-hash cache (best effort)."""
+    if not teacher_mem0_embed_cache_enabled():
+        return
+    inner = getattr(memory, "embedding_model", None)
+    if inner is None or isinstance(inner, CachingEmbedder):
+        return
+    try:
+        cache = EmbeddingCache(teacher_mem0_embed_cache_path(), max_entries=teacher_mem0_embed_cache_max_entries())
+    except Exception:  # policy: allowed-broad-except
+        _log.warning("mem0 embedding cache unavailable; embedding without cache", exc_info=True)
+        return
+    memory.embedding_model = CachingEmbedder(inner, cache, batch_size=teacher_mem0_embed_batch_size())
+
+
+def _prefetch_embeddings(memory: Any, chunks: Sequence[str]) -> None:
+    embedder = getattr(memory, "embedding_model", None)
+    if not isinstance(embedder, CachingEmbedder):
+        return
+    try:
+        embedder.embed_many(chunks, "add")
+    except Exception:  # policy: allowed-broad-except
+        # Memory.add embeds (and caches) each chunk itself if the batch call fails.
+        _log.warning("mem0 batched embedding failed; falling back to per-chunk embedding", exc_info=True)
+
+
 def _chunk_text(text: str, max_chars: int, overlap_chars: int) -> List[str]:
     """
     Simple char-based chunker (tokenizer-free), good enough for sem-search.
@@ -195,6 +245,14 @@ def teacher_mem0_index_entry(
     *,
     metadata: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
+    return teacher_mem0_index_entries(teacher_id, [{"text": text, "metadata": metadata}])
+
+
+def teacher_mem0_index_entries(
+    teacher_id: str,
+    entries: Sequence[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Chunk and index several ``{"text", "metadata"}`` entries; embeddings are fetched in one batch."""
     if not teacher_mem0_write_enabled():
         return {"ok": False, "disabled": True}
 
@@ -202,26 +260,82 @@ def teacher_mem0_index_entry(
     if memory is None:
         return {"ok": False, "error": _MEM0_INIT_ERROR or "mem0_unavailable"}
 
-    base_md: Dict[str, Any] = {}
-    if isinstance(metadata, dict):
-        base_md.update(metadata)
-
     max_chars = teacher_mem0_chunk_chars()
     overlap = teacher_mem0_chunk_overlap_chars()
-    chunks = _chunk_text(text, max_chars=max_chars, overlap_chars=overlap)
-    if not chunks:
+    pending: List[tuple[str, Dict[str, Any]]] = []
+    for entry in entries:
+        chunks = _chunk_text(str(entry.get("text") or ""), max_chars=max_chars, overlap_chars=overlap)
+        base_md = entry.get("metadata")
+        for i, chunk in enumerate(chunks):
+            md: Dict[str, Any] = dict(base_md) if isinstance(base_md, dict) else {}
+            md["chunk_index"] = i
+            md["chunk_total"] = len(chunks)
+            pending.append((chunk, md))
+    if not pending:
         return {"ok": False, "error": "empty_text"}
 
+    _prefetch_embeddings(memory, [chunk for chunk, _md in pending])
     user_id = _teacher_user_id(teacher_id)
     results: List[Any] = []
-    for i, chunk in enumerate(chunks):
-        md = dict(base_md)
-        md["chunk_index"] = i
-        md["chunk_total"] = len(chunks)
+    for n, (chunk, md) in enumerate(pending):
         try:
             results.append(memory.add(chunk, user_id=user_id, infer=False, metadata=md))
         except Exception as exc:
-            _log.warning("mem0 index chunk %d/%d failed for teacher_id=%s", i, len(chunks), teacher_id, exc_info=True)
-            return {"ok": False, "error": str(exc), "indexed": i, "total": len(chunks)}
+            _log.warning("mem0 index chunk %d/%d failed for teacher_id=%s", n, len(pending), teacher_id, exc_info=True)
+            return {"ok": False, "error": str(exc), "indexed": n, "total": len(pending)}
+
+    return {"ok": True, "chunks": len(pending), "results_count": len(results)}
+
+
+def _memory_file_entries(path: Path, *, target: str) -> List[Dict[str, Any]]:
+    """Split a workspace memory file into its ``## title`` entries, as written by memory apply."""
+    entries: List[Dict[str, Any]] = []
+    title = ""
+    fields: Dict[str, str] = {}
+    body: List[str] = []
+
+    def _flush() -> None:
+        content = "\n".join(body).strip()
+        if not title or not content:
+            return
+        entries.append(
+            {
+                "text": f"{title}\n{content}",
+                "metadata": {
+                    "file": str(path),
+                    "proposal_id": fields.get("entry_id", ""),
+                    "target": target,
+                    "title": title,
+                    "source": fields.get("source", "import"),
+                    "ts": fields.get("ts", ""),
+                },
+            }
+        )
+
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line.startswith("## "):
+            _flush()
+            title, fields, body = line[3:].strip(), {}, []
+        elif title and not body and line.startswith("- ") and ":" in line:
+            key, _, value = line[2:].partition(":")
+            fields[key.strip()] = value.strip()
+        elif title and (body or line.strip()):
+            body.append(line)
+    _flush()
+    return entries
 
-    return {"ok": True, "chunks": len(chunks), "results_count": len(results)}
+
+def teacher_mem0_import_memory_file(teacher_id: str, path: Path, *, target: str = "MEMORY") -> Dict[str, Any]:
+    """Re-index every entry of a MEMORY.md-style file in one :func:`teacher_mem0_index_entries` call.
+
+    Unchanged entries hit the embedding cache, so re-importing a file only
+    embeds what changed.
+    """
+    path = Path(path)
+    if not path.exists():
+        return {"ok": False, "error": "file_not_found"}
+    entries = _memory_file_entries(path, target=target)
+    if not entries:
+        return {"ok": False, "error": "empty_text"}
+    result = teacher_mem0_index_entries(teacher_id, entries)
+    return {**result, "entries": len(entries)}
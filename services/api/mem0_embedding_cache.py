@@ -0,0 +1,224 @@
+"""Content-addressed embedding cache for the mem0 adapter.
+
+Embeddings are keyed by ``sha256(model_key + memory_action + text)`` in a
+local SQLite file, so re-importing unchanged MEMORY.md content never calls the
+embedding endpoint again. Some embedders embed differently per action, hence
+the action in the key. Only ``add``/``update`` embeddings are cached; search
+queries are one-off and go straight to the embedder. The table keeps at most
+``max_entries`` rows, dropping the oldest first.
+
+:class:`CachingEmbedder` wraps the embedder mem0 already uses
+(``Memory.embedding_model``) and adds :meth:`CachingEmbedder.embed_many`, which
+submits cache misses in one request per batch. mem0's embedders only embed one
+text per call, so for the OpenAI, Azure OpenAI and Ollama embedders the batch
+goes to the provider's list-input endpoint with the same text preparation and
+options the embedder's own ``embed`` uses; other embedders are called per text.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+_log = logging.getLogger(__name__)
+
+
+CACHED_MEMORY_ACTIONS = frozenset({"add", "update"})
+_DEFAULT_MAX_ENTRIES = 50_000
+
+
+def _cache_key(model_key: str, memory_action: str, text: str) -> str:
+    return hashlib.sha256(f"{model_key}\0{memory_action}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, db_path: Path, *, max_entries: int = _DEFAULT_MAX_ENTRIES):
+        self.db_path = Path(db_path).expanduser().resolve()
+        self.max_entries = max(1, int(max_entries))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=3.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            try:
+                conn.execute("PRAGMA journal_mode=WAL;")
+            except sqlite3.Error:
+                _log.warning("WAL journal mode not available for %s", self.db_path, exc_info=True)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    cache_key TEXT PRIMARY KEY,
+                    model_key TEXT NOT NULL,
+                    dims INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_created ON embeddings (created_at)")
+
+    def get_many(self, model_key: str, memory_action: str, texts: Sequence[str]) -> Dict[str, List[float]]:
+        keys = {_cache_key(model_key, memory_action, text): text for text in texts}
+        if not keys:
+            return {}
+        found: Dict[str, List[float]] = {}
+        key_list = list(keys)
+        with self._connect() as conn:
+            for start in range(0, len(key_list), 500):
+                batch = key_list[start : start + 500]
+                placeholders = ",".join("?" for _ in batch)
+                rows = conn.execute(
+                    f"SELECT cache_key, vector FROM embeddings WHERE cache_key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for row in rows:
+                    vec = array("f")
+                    vec.frombytes(row["vector"])
+                    found[keys[row["cache_key"]]] = vec.tolist()
+        return found
+
+    def put_many(self, model_key: str, memory_action: str, vectors: Mapping[str, Sequence[float]]) -> None:
+        if not vectors:
+            return
+        now = time.time()
+        rows = [
+            (_cache_key(model_key, memory_action, text), model_key, len(vec), array("f", vec).tobytes(), now)
+            for text, vec in vectors.items()
+        ]
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (cache_key, model_key, dims, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict_oldest(conn)
+            conn.execute("COMMIT")
+
+    def _evict_oldest(self, conn: sqlite3.Connection) -> None:
+        row = conn.execute("SELECT COUNT(*) AS n FROM embeddings").fetchone()
+        excess = int(row["n"] if row else 0) - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM embeddings WHERE cache_key IN "
+                "(SELECT cache_key FROM embeddings ORDER BY created_at ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*) AS n FROM embeddings").fetchone()
+        return int(row["n"] if row else 0)
+
+
+def embedder_model_key(embedder: Any) -> str:
+    config = getattr(embedder, "config", None)
+    model = getattr(config, "model", "") or ""
+    dims = getattr(config, "embedding_dims", "") or ""
+    return f"{type(embedder).__name__}:{model}:{dims}"
+
+
+def _openai_batch(embedder: Any, texts: List[str]) -> List[List[float]]:
+    # Mirrors mem0's OpenAIEmbedding.embed: newlines flattened, dimensions sent.
+    response = embedder.client.embeddings.create(
+        input=[text.replace("\n", " ") for text in texts],
+        model=embedder.config.model,
+        dimensions=embedder.config.embedding_dims,
+    )
+    return [list(item.embedding) for item in sorted(response.data, key=lambda item: item.index)]
+
+
+def _azure_openai_batch(embedder: Any, texts: List[str]) -> List[List[float]]:
+    # Mirrors mem0's AzureOpenAIEmbedding.embed: newlines flattened, no dimensions.
+    response = embedder.client.embeddings.create(
+        input=[text.replace("\n", " ") for text in texts],
+        model=embedder.config.model,
+    )
+    return [list(item.embedding) for item in sorted(response.data, key=lambda item: item.index)]
+
+
+def _ollama_batch(embedder: Any, texts: List[str]) -> List[List[float]]:
+    # ``/api/embed`` returns unit-length vectors where mem0's single-prompt call
+    # does not; the qdrant collections mem0 creates rank by cosine, so both agree.
+    response = embedder.client.embed(model=embedder.config.model, input=texts)
+    return [list(vec) for vec in response["embeddings"]]
+
+
+_PROVIDER_BATCHERS: Dict[str, Callable[[Any, List[str]], List[List[float]]]] = {
+    "OpenAIEmbedding": _openai_batch,
+    "AzureOpenAIEmbedding": _azure_openai_batch,
+    "OllamaEmbedding": _ollama_batch,
+}
+
+
+def _batcher_for(embedder: Any) -> Optional[Callable[[List[str], Optional[str]], List[List[float]]]]:
+    inner_batch = getattr(embedder, "embed_batch", None)
+    if callable(inner_batch):
+        return inner_batch
+    provider_batch = _PROVIDER_BATCHERS.get(type(embedder).__name__)
+    if provider_batch is None or getattr(embedder, "client", None) is None:
+        return None
+    if provider_batch is _ollama_batch and not callable(getattr(embedder.client, "embed", None)):
+        # ollama clients older than 0.3 only expose the single-prompt endpoint.
+        return None
+    return lambda texts, _memory_action: provider_batch(embedder, texts)
+
+
+class CachingEmbedder:
+    """Drop-in wrapper for a mem0 embedder that reads through :class:`EmbeddingCache`."""
+
+    def __init__(self, inner: Any, cache: EmbeddingCache, *, batch_size: int = 32):
+        self.inner = inner
+        self.cache = cache
+        self.batch_size = max(1, int(batch_size))
+        self.model_key = embedder_model_key(inner)
+        self._batch = _batcher_for(inner)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "requests": 0}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    def _count(self, **amounts: int) -> None:
+        with self._lock:
+            for key, amount in amounts.items():
+                self.stats[key] = self.stats.get(key, 0) + amount
+
+    def _embed_batch(self, texts: List[str], memory_action: Optional[str]) -> List[List[float]]:
+        if self._batch is not None:
+            self._count(requests=1)
+            vectors = [list(vec) for vec in self._batch(texts, memory_action)]
+            if len(vectors) != len(texts):
+                raise ValueError(f"embedding batch returned {len(vectors)} vectors for {len(texts)} texts")
+            return vectors
+        self._count(requests=len(texts))
+        return [list(self.inner.embed(text, memory_action)) for text in texts]
+
+    def embed_many(self, texts: Iterable[str], memory_action: Optional[str] = "add") -> Dict[str, List[float]]:
+        unique = list(dict.fromkeys(texts))
+        if memory_action not in CACHED_MEMORY_ACTIONS:
+            return dict(zip(unique, self._embed_batch(unique, memory_action))) if unique else {}
+        found = self.cache.get_many(self.model_key, memory_action, unique)
+        misses = [text for text in unique if text not in found]
+        self._count(hits=len(unique) - len(misses), misses=len(misses))
+        for start in range(0, len(misses), self.batch_size):
+            batch = misses[start : start + self.batch_size]
+            fresh = dict(zip(batch, self._embed_batch(batch, memory_action)))
+            self.cache.put_many(self.model_key, memory_action, fresh)
+            found.update(fresh)
+        return found
+
+    def embed(self, text: str, memory_action: Optional[str] = None) -> List[float]:
+        if memory_action not in CACHED_MEMORY_ACTIONS:
+            self._count(requests=1)
+            return list(self.inner.embed(text, memory_action))
+        return self.embed_many([text], memory_action)[text]
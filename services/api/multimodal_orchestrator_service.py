@@ -168,6 +168,7 @@ def process_multimodal_submission(submission_id: str, *, deps: MultimodalOrchest
         graph = SpecialistJobGraph(
             graph_id=str(strategy.strategy_id),
             domain='video_homework',
+            handoff_mode='reference',
             nodes=[
                 JobGraphNode(
                     node_id='analyze',
@@ -182,6 +183,7 @@ def process_multimodal_submission(submission_id: str, *, deps: MultimodalOrchest
                 JobGraphNode(
                     node_id='verify',
                     node_type='verify',
+                    depends_on=['analyze'],
                     max_budget={
                         'max_tokens': 400.0,
                         'timeout_sec': 10.0,
@@ -1,27 +1,27 @@
 from __future__ import annotations
 
-import math
+import json
+import logging
+import os
+import socket
 import threading
 import time
 from collections import defaultdict, deque
-from dataclasses import dataclass
-from typing import Any, Deque, Dict, List
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
-_LATENCY_BUCKETS = [0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0]
-_MAX_RECENT_SAMPLES = 5000
+from . import settings as _settings
+from .fs_atomic import atomic_write_json
+from .latency_sketch import LatencySketch
+
+_log = logging.getLogger(__name__)
 
+_LATENCY_BUCKETS = [0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0]
+_WINDOW_SLOTS = 5
+_SUMMARY_QUANTILES = (0.5, 0.95, 0.99)
 
-def _percentile(values: List[float], p: float) -> float:
-    if not values:
-        return 0.0
-    ordered = sorted(values)
-    idx = (len(ordered) - 1) * max(0.0, min(1.0, p))
-    lo = int(math.floor(idx))
-    hi = int(math.ceil(idx))
-    if lo == hi:
-        return float(ordered[lo])
-    frac = idx - lo
-    return float(ordered[lo]) * (1.0 - frac) + float(ordered[hi]) * frac
+# (method, route template, status class)
+SeriesKey = Tuple[str, str, str]
 
 
 def _bucket_key(value: float) -> str:
@@ -31,26 +31,106 @@ def _bucket_key(value: float) -> str:
     return "gt_5.00s"
 
 
-@dataclass(frozen=True)
-class RequestSample:
-    ts: float
-    latency_sec: float
-    status_code: int
-    method: str
-    route: str
+def _status_class(status_code: int) -> str:
+    return f"{max(0, min(int(status_code), 999)) // 100}xx"
+
+
+def _quantile_summary(sketch: LatencySketch) -> Dict[str, Any]:
+    return {
+        "count": sketch.count,
+        "p50": round(sketch.quantile(0.50), 4),
+        "p95": round(sketch.quantile(0.95), 4),
+        "p99": round(sketch.quantile(0.99), 4),
+    }
+
+
+class _RollingSketch:
+    """Latency sketches for fixed-width time slots covering a rolling window."""
+
+    __slots__ = ("slot_sec", "slots", "_slots")
+
+    def __init__(self, window_sec: int, slots: int = _WINDOW_SLOTS) -> None:
+        self.slots = max(1, int(slots))
+        self.slot_sec = max(1, int(window_sec) // self.slots)
+        self._slots: Deque[Tuple[int, LatencySketch]] = deque()
+
+    def _expire(self, now: float) -> None:
+        oldest = int(now // self.slot_sec) * self.slot_sec - (self.slots - 1) * self.slot_sec
+        while self._slots and self._slots[0][0] < oldest:
+            self._slots.popleft()
+
+    def add(self, now: float, value: float) -> None:
+        start = int(now // self.slot_sec) * self.slot_sec
+        if not self._slots or self._slots[-1][0] < start:
+            self._slots.append((start, LatencySketch()))
+            self._expire(now)
+        self._slots[-1][1].add(value)
+
+    def merge_slot(self, start: int, sketch: LatencySketch) -> None:
+        for existing_start, existing in self._slots:
+            if existing_start == start:
+                existing.merge(sketch)
+                return
+        self._slots.append((start, sketch))
+        self._slots = deque(sorted(self._slots, key=lambda item: item[0]))
+
+    def merged(self, now: float) -> LatencySketch:
+        self._expire(now)
+        total = LatencySketch()
+        for _, sketch in self._slots:
+            total.merge(sketch)
+        return total
+
+    def to_list(self, now: float) -> List[List[Any]]:
+        self._expire(now)
+        return [[start, sketch.to_dict()] for start, sketch in self._slots]
+
+
+class _Series:
+    __slots__ = ("count", "sum", "window")
+
+    def __init__(self, window_sec: int) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.window = _RollingSketch(window_sec)
 
 
 class ObservabilityStore:
-    def __init__(self) -> None:
+    """Request counters plus per-route latency sketches over a rolling window.
+
+    Snapshot cost depends on the number of routes, not on request volume.  With
+    ``shared_dir`` set, a background thread in each worker publishes its state
+    there every ``publish_interval_sec`` (recording never writes files, since it
+    runs on the event loop) and :meth:`aggregated` merges every worker's state
+    for export.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_sec: int = 300,
+        shared_dir: Optional[Path] = None,
+        publish_interval_sec: float = 10.0,
+        shared_max_age_sec: float = 120.0,
+    ) -> None:
         self._lock = threading.Lock()
         self._started_at = time.time()
+        self._window_sec = max(1, int(window_sec))
         self._inflight = 0
         self._requests_total = 0
         self._errors_total = 0
-        self._requests_by_route: Dict[str, int] = defaultdict(int)
-        self._errors_by_route: Dict[str, int] = defaultdict(int)
         self._latency_buckets: Dict[str, int] = defaultdict(int)
-        self._recent: Deque[RequestSample] = deque(maxlen=_MAX_RECENT_SAMPLES)
+        self._series: Dict[SeriesKey, _Series] = {}
+        self._timings: Dict[Tuple[str, str], _Series] = {}
+        self._counters: Dict[Tuple[str, str], float] = defaultdict(float)
+        self._gauges: Dict[str, float] = {}
+        self._global = _RollingSketch(self._window_sec)
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._shared_dir = Path(shared_dir) if shared_dir else None
+        self._publish_interval_sec = float(publish_interval_sec)
+        self._shared_max_age_sec = float(shared_max_age_sec)
+        self._publisher_pid = 0
+        self._publisher_stop: Optional[threading.Event] = None
 
     def inc_inflight(self) -> None:
         with self._lock:
@@ -63,41 +143,99 @@ class ObservabilityStore:
     def record(self, *, method: str, route: str, status_code: int, latency_sec: float) -> None:
         status = int(status_code)
         latency = max(0.0, float(latency_sec))
-        route_key = f"{method.upper()} {route}"
+        key = (method.upper(), route, _status_class(status))
+        now = time.time()
         with self._lock:
             self._requests_total += 1
-            self._requests_by_route[route_key] += 1
             if status >= 500:
                 self._errors_total += 1
-                self._errors_by_route[route_key] += 1
             self._latency_buckets[_bucket_key(latency)] += 1
-            self._recent.append(
-                RequestSample(
-                    ts=time.time(),
-                    latency_sec=latency,
-                    status_code=status,
-                    method=method.upper(),
-                    route=route,
-                )
-            )
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self._window_sec)
+            series.count += 1
+            series.sum += latency
+            series.window.add(now, latency)
+            self._global.add(now, latency)
+        self._ensure_publisher()
+
+    def record_timing(self, metric: str, label: str, seconds: float) -> None:
+        """Record a non-HTTP duration (e.g. queue wait) under ``metric`` / ``label``."""
+        value = max(0.0, float(seconds))
+        now = time.time()
+        with self._lock:
+            key = (str(metric), str(label or "unknown"))
+            series = self._timings.get(key)
+            if series is None:
+                series = self._timings[key] = _Series(self._window_sec)
+            series.count += 1
+            series.sum += value
+            series.window.add(now, value)
+        self._ensure_publisher()
+
+    def inc_counter(self, metric: str, label: str = "", amount: float = 1.0) -> None:
+        with self._lock:
+            self._counters[(str(metric), str(label or ""))] += float(amount)
+
+    def set_gauge(self, metric: str, value: float) -> None:
+        """Set a per-worker gauge; aggregated exports report the sum over workers."""
+        with self._lock:
+            self._gauges[str(metric)] = float(value)
+
+    def _ensure_publisher(self) -> None:
+        """Start this process's publishing thread (again after a fork, which does not copy threads)."""
+        if self._shared_dir is None or self._publisher_pid == os.getpid():
+            return
+        with self._lock:
+            pid = os.getpid()
+            if self._publisher_pid == pid:
+                return
+            self._publisher_pid = pid
+            stop = self._publisher_stop = threading.Event()
+        threading.Thread(
+            target=self._publish_loop, args=(stop,), name="observability-publish", daemon=True
+        ).start()
+
+    def _publish_loop(self, stop: threading.Event) -> None:
+        while not stop.wait(self._publish_interval_sec):
+            self.publish()
 
     def snapshot(self) -> Dict[str, Any]:
+        now = time.time()
         with self._lock:
-            recent = list(self._recent)
             inflight = self._inflight
             requests_total = self._requests_total
             errors_total = self._errors_total
-            requests_by_route = dict(self._requests_by_route)
-            errors_by_route = dict(self._errors_by_route)
             latency_buckets = dict(self._latency_buckets)
             started_at = self._started_at
+            overall = self._global.merged(now)
+            series = {key: (s.count, s.window.merged(now)) for key, s in self._series.items()}
+            timing_sketches = {key: s.window.merged(now) for key, s in self._timings.items()}
+            counter_values = dict(self._counters)
+            gauges = dict(self._gauges)
 
-        latencies = [x.latency_sec for x in recent]
-        uptime_sec = max(0.0, time.time() - started_at)
+        requests_by_route: Dict[str, int] = defaultdict(int)
+        errors_by_route: Dict[str, int] = defaultdict(int)
+        latency_by_route: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        for (method, route, status_class), (count, sketch) in series.items():
+            route_key = f"{method} {route}"
+            requests_by_route[route_key] += count
+            if status_class == "5xx":
+                errors_by_route[route_key] += count
+            latency_by_route[route_key][status_class] = _quantile_summary(sketch)
+
+        timings: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        for (metric, label), sketch in timing_sketches.items():
+            timings[metric][label] = _quantile_summary(sketch)
+        counters: Dict[str, Dict[str, float]] = defaultdict(dict)
+        for (metric, label), value in counter_values.items():
+            counters[metric][label] = value
+
+        uptime_sec = max(0.0, now - started_at)
         error_rate = (errors_total / requests_total) if requests_total else 0.0
         slo_latency_target_sec = 1.0
         slo_error_rate_target = 0.01
-        p95 = _percentile(latencies, 0.95) if latencies else 0.0
+        p95 = overall.quantile(0.95)
 
         return {
             "uptime_sec": round(uptime_sec, 3),
@@ -106,14 +244,19 @@ class ObservabilityStore:
             "http_5xx_total": errors_total,
             "http_error_rate": round(error_rate, 6),
             "http_latency_sec": {
-                "p50": round(_percentile(latencies, 0.50), 4) if latencies else 0.0,
+                "p50": round(overall.quantile(0.50), 4),
                 "p95": round(p95, 4),
-                "p99": round(_percentile(latencies, 0.99), 4) if latencies else 0.0,
-                "sample_count": len(latencies),
+                "p99": round(overall.quantile(0.99), 4),
+                "sample_count": overall.count,
+                "window_sec": self._window_sec,
                 "histogram": latency_buckets,
             },
-            "requests_by_route": requests_by_route,
-            "errors_by_route": errors_by_route,
+            "requests_by_route": dict(requests_by_route),
+            "errors_by_route": dict(errors_by_route),
+            "latency_by_route": dict(latency_by_route),
+            "timings": dict(timings),
+            "counters": dict(counters),
+            "gauges": gauges,
             "slo": {
                 "latency_p95_target_sec": slo_latency_target_sec,
                 "error_rate_target": slo_error_rate_target,
@@ -122,5 +265,198 @@ class ObservabilityStore:
             },
         }
 
+    def export_state(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {
+                "worker": self.worker_id,
+                "ts": now,
+                "started_at": self._started_at,
+                "window_sec": self._window_sec,
+                "inflight": self._inflight,
+                "requests_total": self._requests_total,
+                "errors_total": self._errors_total,
+                "latency_buckets": dict(self._latency_buckets),
+                "global": self._global.to_list(now),
+                "series": [
+                    [method, route, status_class, s.count, s.sum, s.window.to_list(now)]
+                    for (method, route, status_class), s in self._series.items()
+                ],
+                "timings": [
+                    [metric, label, s.count, s.sum, s.window.to_list(now)]
+                    for (metric, label), s in self._timings.items()
+                ],
+                "counters": [[metric, label, value] for (metric, label), value in self._counters.items()],
+                "gauges": [[metric, value] for metric, value in self._gauges.items()],
+            }
+
+    def merge_state(self, state: Dict[str, Any]) -> None:
+        """Add another worker's exported state into this store."""
+        with self._lock:
+            self._started_at = min(self._started_at, float(state.get("started_at") or self._started_at))
+            self._inflight += int(state.get("inflight") or 0)
+            self._requests_total += int(state.get("requests_total") or 0)
+            self._errors_total += int(state.get("errors_total") or 0)
+            for bucket, count in (state.get("latency_buckets") or {}).items():
+                self._latency_buckets[str(bucket)] += int(count)
+            self._merge_slots(self._global, state.get("global"))
+            for method, route, status_class, count, total, slots in state.get("series") or []:
+                key = (str(method), str(route), str(status_class))
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = _Series(self._window_sec)
+                series.count += int(count)
+                series.sum += float(total)
+                self._merge_slots(series.window, slots)
+            for metric, label, count, total, slots in state.get("timings") or []:
+                timing_key = (str(metric), str(label))
+                timing = self._timings.get(timing_key)
+                if timing is None:
+                    timing = self._timings[timing_key] = _Series(self._window_sec)
+                timing.count += int(count)
+                timing.sum += float(total)
+                self._merge_slots(timing.window, slots)
+            for metric, label, value in state.get("counters") or []:
+                self._counters[(str(metric), str(label))] += float(value)
+            for metric, value in state.get("gauges") or []:
+                self._gauges[str(metric)] = self._gauges.get(str(metric), 0.0) + float(value)
+
+    @staticmethod
+    def _merge_slots(target: _RollingSketch, raw_slots: Any) -> None:
+        for start, raw_sketch in raw_slots or []:
+            sketch = LatencySketch.from_dict(raw_sketch)
+            if sketch is not None:
+                target.merge_slot(int(start), sketch)
+
+    def publish(self) -> None:
+        shared_dir = self._shared_dir
+        if shared_dir is None:
+            return
+        try:
+            atomic_write_json(shared_dir / f"{self.worker_id}.json", self.export_state())
+        except OSError:
+            _log.warning("observability: publishing worker state failed", exc_info=True)
+
+    def detach_shared(self) -> None:
+        """Stop publishing to ``shared_dir`` from this process.
+
+        Used in RQ work-horses: they are forked per job and leave through
+        ``os._exit``, so a file they published would only shadow the parent
+        worker's state until it went stale.
+        """
+        self._shared_dir = None
+        if self._publisher_stop is not None:
+            self._publisher_stop.set()
+
+    def aggregated(self) -> "ObservabilityStore":
+        """Return a store merging every live worker's state (or ``self`` when unshared)."""
+        if self._shared_dir is None:
+            return self
+        self.publish()
+        merged = ObservabilityStore(window_sec=self._window_sec)
+        for state in _load_shared_states(self._shared_dir, max_age_sec=self._shared_max_age_sec):
+            merged.merge_state(state)
+        return merged
+
+    def series_summaries(self) -> List[Tuple[SeriesKey, int, float, LatencySketch]]:
+        now = time.time()
+        with self._lock:
+            return [(key, s.count, s.sum, s.window.merged(now)) for key, s in sorted(self._series.items())]
+
+    def counter_values(self) -> List[Tuple[Tuple[str, str], float]]:
+        with self._lock:
+            return sorted(self._counters.items())
+
+    def gauge_values(self) -> List[Tuple[str, float]]:
+        with self._lock:
+            return sorted(self._gauges.items())
+
+    def timing_summaries(self) -> List[Tuple[Tuple[str, str], int, float, LatencySketch]]:
+        now = time.time()
+        with self._lock:
+            return [(key, s.count, s.sum, s.window.merged(now)) for key, s in sorted(self._timings.items())]
+
+
+def _load_shared_states(shared_dir: Path, *, max_age_sec: float) -> Iterable[Dict[str, Any]]:
+    now = time.time()
+    for path in sorted(shared_dir.glob("*.json")):
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _log.debug("observability: unreadable worker state %s", path, exc_info=True)
+            continue
+        if not isinstance(state, dict):
+            continue
+        if now - float(state.get("ts") or 0.0) <= max_age_sec:
+            yield state
+        else:
+            # Live workers republish every few seconds; this one has exited.
+            path.unlink(missing_ok=True)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(store: ObservabilityStore) -> str:
+    """Render ``store`` in the Prometheus text exposition format (version 0.0.4)."""
+    snap = store.snapshot()
+    lines = [
+        "# HELP http_requests_total HTTP requests by route and status class.",
+        "# TYPE http_requests_total counter",
+    ]
+    summaries = store.series_summaries()
+    for (method, route, status_class), count, _, _ in summaries:
+        labels = f'method="{_escape_label(method)}",route="{_escape_label(route)}",status_class="{status_class}"'
+        lines.append(f"http_requests_total{{{labels}}} {count}")
+    lines += [
+        "# HELP http_request_duration_seconds Request latency; quantiles cover the rolling window.",
+        "# TYPE http_request_duration_seconds summary",
+    ]
+    for (method, route, status_class), count, total, sketch in summaries:
+        labels = f'method="{_escape_label(method)}",route="{_escape_label(route)}",status_class="{status_class}"'
+        for q in _SUMMARY_QUANTILES:
+            lines.append(f'http_request_duration_seconds{{{labels},quantile="{q}"}} {sketch.quantile(q):.6f}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {count}")
+    timing_metric = ""
+    for (metric, label), count, total, sketch in store.timing_summaries():
+        name = f"{metric}_seconds"
+        if metric != timing_metric:
+            timing_metric = metric
+            lines.append(f"# TYPE {name} summary")
+        labels = f'class="{_escape_label(label)}"'
+        for q in _SUMMARY_QUANTILES:
+            lines.append(f'{name}{{{labels},quantile="{q}"}} {sketch.quantile(q):.6f}')
+        lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {count}")
+    counter_metric = ""
+    for (metric, label), value in store.counter_values():
+        if metric != counter_metric:
+            counter_metric = metric
+            lines.append(f"# TYPE {metric} counter")
+        labels = f'{{kind="{_escape_label(label)}"}}' if label else ""
+        lines.append(f"{metric}{labels} {value:g}")
+    for metric, value in store.gauge_values():
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric} {value:g}")
+    lines += [
+        "# HELP http_inflight_requests Requests currently being handled.",
+        "# TYPE http_inflight_requests gauge",
+        f"http_inflight_requests {snap['inflight_requests']}",
+        "# HELP process_uptime_seconds Seconds since the oldest reporting worker started.",
+        "# TYPE process_uptime_seconds gauge",
+        f"process_uptime_seconds {snap['uptime_sec']}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _build_default_store() -> ObservabilityStore:
+    shared_dir = _settings.observability_shared_dir()
+    return ObservabilityStore(
+        window_sec=_settings.observability_window_sec(),
+        shared_dir=Path(shared_dir) if shared_dir else None,
+    )
+
 
-OBSERVABILITY = ObservabilityStore()
+OBSERVABILITY = _build_default_store()
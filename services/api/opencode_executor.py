@@ -8,8 +8,12 @@ import shutil
 import subprocess
 import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .opencode_session_pool import OPENCODE_SERVER_POOL
+from .workers.work_horse import in_work_horse
 
 _log = logging.getLogger(__name__)
 
@@ -24,7 +28,12 @@ _PACKAGE_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,79}$")
 _MAX_STD_CHARS = 60000
 _MAX_TIMEOUT_SEC = 3600
 _HELP_CACHE_LOCK = threading.Lock()
-_HELP_CACHE: Dict[str, Dict[str, bool]] = {}
+# Keyed by (path, mtime_ns, size) so an upgraded binary is probed again.
+_HELP_CACHE: Dict[Tuple[str, int, int], Dict[str, bool]] = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+# How long a request waits for a busy pooled server before running one-shot.
+_POOL_WAIT_SEC = 10.0
 
 
 def _clip_text(value: str) -> str:
@@ -179,9 +188,31 @@ def _extract_candidate(stdout: str, stderr: str) -> Dict[str, Any]:
     }
 
 
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def _load_config_file(path: Path) -> Dict[str, Any]:
-    if not path.exists() or yaml is None:
+    """Parsed bridge config, re-read only when the file's (mtime, size) changes."""
+    stamp = _file_stamp(path)
+    if stamp is None or yaml is None:
         return {}
+    key = str(path)
+    with _CONFIG_CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return dict(cached[1])
+    loaded = _parse_config_file(path)
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[key] = (stamp, dict(loaded))
+    return loaded
+
+
+def _parse_config_file(path: Path) -> Dict[str, Any]:
     try:
         parsed = yaml.safe_load(path.read_text(encoding="utf-8"))
     except Exception:  # policy: allowed-broad-except
@@ -206,6 +237,8 @@ def _opencode_config_defaults() -> Dict[str, Any]:
         "config_path": "",
         "timeout_sec": 180,
         "max_retries": 3,
+        "pool_size": 2,
+        "pool_idle_sec": 600,
         "extra_env": {},
     }
 
@@ -221,6 +254,8 @@ def _apply_opencode_env_map(merged: Dict[str, Any]) -> None:
         "OPENCODE_BRIDGE_CONFIG_PATH": "config_path",
         "OPENCODE_BRIDGE_TIMEOUT_SEC": "timeout_sec",
         "OPENCODE_BRIDGE_MAX_RETRIES": "max_retries",
+        "OPENCODE_BRIDGE_POOL_SIZE": "pool_size",
+        "OPENCODE_BRIDGE_POOL_IDLE_SEC": "pool_idle_sec",
     }
     for env_name, key in env_map.items():
         value = os.getenv(env_name)
@@ -243,7 +278,7 @@ def _apply_opencode_extra_env(merged: Dict[str, Any]) -> None:
 
 def _normalize_opencode_mode(value: Any) -> str:
     mode = str(value or "run").strip().lower()
-    return mode if mode in {"run", "attach"} else "run"
+    return mode if mode in {"run", "attach", "serve"} else "run"
 
 
 def _normalize_opencode_extra_env(value: Any) -> Dict[str, str]:
@@ -287,6 +322,8 @@ def load_opencode_bridge_config(app_root: Path, overrides: Optional[Dict[str, An
         "config_path": str(merged.get("config_path") or "").strip(),
         "timeout_sec": _as_int(merged.get("timeout_sec"), 180, 30, _MAX_TIMEOUT_SEC),
         "max_retries": _as_int(merged.get("max_retries"), 3, 1, 6),
+        "pool_size": _as_int(merged.get("pool_size"), 2, 1, 8),
+        "pool_idle_sec": _as_int(merged.get("pool_idle_sec"), 600, 30, 86400),
         "extra_env": extra_env,
         "config_file": str(config_file),
     }
@@ -328,7 +365,7 @@ def resolve_opencode_status(app_root: Path, overrides: Optional[Dict[str, Any]]
 
 
 def _detect_run_flags(binary: str, timeout_sec: int = 15) -> Dict[str, bool]:
-    key = str(binary)
+    key = (str(binary), *(_file_stamp(Path(binary)) or (0, 0)))
     with _HELP_CACHE_LOCK:
         cached = _HELP_CACHE.get(key)
     if cached is not None:
@@ -405,6 +442,7 @@ def _build_opencode_run_command(
     flags: Dict[str, bool],
     config: Dict[str, Any],
     prompt: str,
+    session_url: str = "",
 ) -> List[str]:
     cmd: List[str] = [binary, "run"]
     if flags.get("format"):
@@ -422,10 +460,11 @@ def _build_opencode_run_command(
     if config_path and flags.get("config"):
         cmd.extend(["--config", config_path])
 
+    attach_url = session_url
     if str(config.get("mode") or "run") == "attach":
         attach_url = str(config.get("attach_url") or "").strip()
-        if attach_url and flags.get("attach"):
-            cmd.extend(["--attach", attach_url])
+    if attach_url and flags.get("attach"):
+        cmd.extend(["--attach", attach_url])
 
     if flags.get("prompt"):
         cmd.extend(["--prompt", prompt])
@@ -497,6 +536,40 @@ def _run_opencode_command(
     return {"ok": True, "proc": proc}
 
 
+def _session_key(binary: str, app_root: Path, config: Dict[str, Any]) -> str:
+    parts = [binary, str(app_root), config.get("config_path") or "", config.get("extra_env") or {}]
+    return json.dumps(parts, ensure_ascii=False, sort_keys=True)
+
+
+@contextmanager
+def _codegen_session(
+    *,
+    binary: str,
+    flags: Dict[str, bool],
+    config: Dict[str, Any],
+    app_root: Path,
+    env: Dict[str, str],
+) -> Iterator[Any]:
+    """A pooled ``opencode serve`` lease in ``serve`` mode; ``None`` means a one-shot ``opencode run``.
+
+    RQ work-horses exit after one job, so a server started there would never be
+    reused or stopped; they always run one-shot.
+    """
+    if str(config.get("mode") or "run") != "serve" or not flags.get("attach") or in_work_horse():
+        yield None
+        return
+    OPENCODE_SERVER_POOL.max_size = _as_int(config.get("pool_size"), 2, 1, 8)
+    OPENCODE_SERVER_POOL.idle_sec = float(_as_int(config.get("pool_idle_sec"), 600, 30, 86400))
+    with OPENCODE_SERVER_POOL.lease(
+        _session_key(binary, app_root, config),
+        binary=binary,
+        cwd=app_root,
+        env=env,
+        wait_sec=_POOL_WAIT_SEC,
+    ) as server:
+        yield server
+
+
 def run_opencode_codegen(
     *,
     app_root: Path,
@@ -526,22 +599,28 @@ def run_opencode_codegen(
         attempt=attempt,
         max_retries=max_retries,
     )
-    cmd = _build_opencode_run_command(
-        binary=binary,
-        flags=flags,
-        config=config if isinstance(config, dict) else {},
-        prompt=prompt,
-    )
-    env = _build_opencode_run_env(config if isinstance(config, dict) else {})
-    t0 = time.monotonic()
-    run_result = _run_opencode_command(
-        cmd=cmd,
-        app_root=app_root,
-        env=env,
-        timeout_sec=timeout_sec,
-        status=status,
-        started_at=t0,
-    )
+    config = config if isinstance(config, dict) else {}
+    env = _build_opencode_run_env(config)
+    with _codegen_session(binary=binary, flags=flags, config=config, app_root=app_root, env=env) as server:
+        session_url = str(getattr(server, "url", "") or "")
+        cmd = _build_opencode_run_command(
+            binary=binary,
+            flags=flags,
+            config=config,
+            prompt=prompt,
+            session_url=session_url,
+        )
+        t0 = time.monotonic()
+        run_result = _run_opencode_command(
+            cmd=cmd,
+            app_root=app_root,
+            env=env,
+            timeout_sec=timeout_sec,
+            status=status,
+            started_at=t0,
+        )
+        if server is not None and not run_result.get("ok"):
+            server.healthy = False
     if not run_result.get("ok"):
         return dict(run_result.get("result") or {})
     proc = run_result["proc"]
@@ -562,5 +641,6 @@ def run_opencode_codegen(
         "stderr": stderr,
         "command": cmd,
         "flags": flags,
+        "session_url": session_url,
         "status": status,
     }
@@ -0,0 +1,277 @@
+"""Bounded pool of long-lived ``opencode serve`` processes.
+
+In ``serve`` mode chart codegen runs ``opencode run --attach <url>`` against a
+server from this pool instead of a standalone ``opencode run``. Provider, agent
+and plugin start-up then happens once per server rather than once per request.
+
+Servers are keyed by everything that shapes their runtime (binary, working
+directory, extra environment, config path). Each server serves one request at a
+time and at most ``max_size`` servers run at once. A reaper thread, alive while
+the pool holds servers, stops servers idle for longer than ``idle_sec`` or that
+exited. Servers run in their own session and are stopped as a process group, on
+eviction and at interpreter exit. When no server can be leased the caller falls
+back to a one-shot ``opencode run``.
+
+The pool belongs to the process that started its servers: a forked child starts
+with an empty pool, and RQ work-horses (see :mod:`services.api.workers.work_horse`)
+do not use it at all.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import signal
+import socket
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_log = logging.getLogger(__name__)
+
+_HOST = "127.0.0.1"
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((_HOST, 0))
+        return int(sock.getsockname()[1])
+
+
+def _port_open(port: int) -> bool:
+    try:
+        with socket.create_connection((_HOST, port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def _signal_group(proc: Any, sig: int) -> bool:
+    """Signal the server's process group (its pid, as it leads its own session)."""
+    pid = getattr(proc, "pid", None)
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    try:
+        os.killpg(pid, sig)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _stop(proc: Any) -> None:
+    try:
+        if not _signal_group(proc, signal.SIGTERM):
+            proc.terminate()
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        if not _signal_group(proc, signal.SIGKILL):
+            proc.kill()
+    except OSError:
+        _log.debug("opencode server already gone", exc_info=True)
+
+
+@dataclass
+class _Server:
+    key: str
+    url: str
+    proc: Any
+    busy: bool = True
+    # Cleared by the caller when the server should not be reused (e.g. a request timed out).
+    healthy: bool = True
+    last_used: float = field(default_factory=time.monotonic)
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+
+class OpencodeServerPool:
+    def __init__(
+        self,
+        *,
+        max_size: int = 2,
+        idle_sec: float = 600.0,
+        start_timeout_sec: float = 20.0,
+        popen: Callable[..., Any] = subprocess.Popen,
+        port_open: Callable[[int], bool] = _port_open,
+    ) -> None:
+        self.max_size = max(1, int(max_size))
+        self.idle_sec = float(idle_sec)
+        self.start_timeout_sec = float(start_timeout_sec)
+        self._popen = popen
+        self._port_open = port_open
+        self._servers: List[_Server] = []
+        self._starting = 0
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def _start(self, key: str, *, binary: str, cwd: Path, env: Dict[str, str]) -> Optional[_Server]:
+        port = _free_port()
+        cmd = [binary, "serve", "--hostname", _HOST, "--port", str(port)]
+        try:
+            proc = self._popen(
+                cmd,
+                cwd=str(cwd),
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError:
+            _log.warning("failed to start opencode server: %s", cmd, exc_info=True)
+            return None
+        deadline = time.monotonic() + self.start_timeout_sec
+        while time.monotonic() < deadline and proc.poll() is None:
+            if self._port_open(port):
+                return _Server(key=key, url=f"http://{_HOST}:{port}", proc=proc)
+            time.sleep(0.1)
+        _log.warning("opencode server did not become ready on port %s", port)
+        _stop(proc)
+        return None
+
+    def reset_after_fork(self) -> None:
+        """Forget the parent's servers in a forked child; they stay owned by the parent."""
+        self._servers = []
+        self._starting = 0
+        self._cond = threading.Condition()
+        self._reaper = None
+
+    def _ensure_reaper_locked(self) -> None:
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, name="opencode-pool-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self) -> None:
+        interval = max(1.0, min(60.0, self.idle_sec / 4))
+        cond = self._cond
+        while True:
+            with cond:
+                if self._cond is not cond:
+                    # reset_after_fork replaced the pool state; it is not ours to reap.
+                    return
+                if not self._servers and not self._starting:
+                    self._reaper = None
+                    return
+                cond.wait(timeout=interval)
+            self.reap()
+
+    def reap(self) -> int:
+        """Stop idle and exited servers now; returns how many were stopped."""
+        with self._cond:
+            stale = self._evict_locked(time.monotonic())
+        for server in stale:
+            _stop(server.proc)
+        return len(stale)
+
+    def _evict_locked(self, now: float) -> List[_Server]:
+        """Drop exited servers and idle ones past ``idle_sec``; returns those to stop."""
+        stale = [
+            s
+            for s in self._servers
+            if not s.busy and (not s.alive() or now - s.last_used > self.idle_sec)
+        ]
+        self._servers = [s for s in self._servers if s not in stale]
+        return stale
+
+    def _claim_locked(self, key: str) -> Optional[_Server]:
+        for server in self._servers:
+            if server.key == key and not server.busy:
+                server.busy = True
+                return server
+        return None
+
+    def _make_room_locked(self) -> List[_Server]:
+        """Free a slot for a new server, evicting an idle server of another key if needed."""
+        if len(self._servers) + self._starting < self.max_size:
+            return []
+        idle = sorted((s for s in self._servers if not s.busy), key=lambda s: s.last_used)
+        if not idle:
+            return []
+        self._servers.remove(idle[0])
+        return [idle[0]]
+
+    def acquire(
+        self, key: str, *, binary: str, cwd: Path, env: Dict[str, str], wait_sec: float
+    ) -> Optional[_Server]:
+        deadline = time.monotonic() + max(0.0, wait_sec)
+        while True:
+            with self._cond:
+                to_stop = self._evict_locked(time.monotonic())
+                server = self._claim_locked(key)
+                can_start = False
+                if server is None:
+                    to_stop += self._make_room_locked()
+                    can_start = len(self._servers) + self._starting < self.max_size
+                    self._starting += int(can_start)
+                if server is None and not can_start and not to_stop:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._cond.wait(timeout=remaining):
+                        return None
+                    continue
+            for stale in to_stop:
+                _stop(stale.proc)
+            if server is not None or can_start:
+                break
+        if server is not None:
+            return server
+        return self._start_reserved(key, binary=binary, cwd=cwd, env=env)
+
+    def _start_reserved(
+        self, key: str, *, binary: str, cwd: Path, env: Dict[str, str]
+    ) -> Optional[_Server]:
+        server: Optional[_Server] = None
+        try:
+            server = self._start(key, binary=binary, cwd=cwd, env=env)
+        finally:
+            with self._cond:
+                self._starting -= 1
+                if server is not None:
+                    self._servers.append(server)
+                    self._ensure_reaper_locked()
+                self._cond.notify_all()
+        return server
+
+    def release(self, server: _Server, *, healthy: bool = True) -> None:
+        with self._cond:
+            server.busy = False
+            server.last_used = time.monotonic()
+            if not healthy and server in self._servers:
+                self._servers.remove(server)
+            self._cond.notify_all()
+        if not healthy:
+            _stop(server.proc)
+
+    @contextmanager
+    def lease(
+        self, key: str, *, binary: str, cwd: Path, env: Dict[str, str], wait_sec: float
+    ) -> Iterator[Optional[_Server]]:
+        server = self.acquire(key, binary=binary, cwd=cwd, env=env, wait_sec=wait_sec)
+        if server is None:
+            yield None
+            return
+        completed = False
+        try:
+            yield server
+            completed = True
+        finally:
+            self.release(server, healthy=completed and server.healthy and server.alive())
+
+    def shutdown(self) -> None:
+        with self._cond:
+            servers, self._servers = self._servers, []
+            self._cond.notify_all()
+        for server in servers:
+            _stop(server.proc)
+
+
+OPENCODE_SERVER_POOL = OpencodeServerPool()
+atexit.register(OPENCODE_SERVER_POOL.shutdown)
+os.register_at_fork(after_in_child=OPENCODE_SERVER_POOL.reset_after_fork)
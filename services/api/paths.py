@@ -93,6 +93,11 @@ def exam_job_path(job_id: str, core: Any | None = None) -> Path:
     return exam_upload_job_dir / safe
 
 
+def upload_blob_dir(core: Any | None = None) -> Path:
+    uploads_dir = _path_from_core(core, "UPLOADS_DIR", UPLOADS_DIR)
+    return uploads_dir / "blobs"
+
+
 # ---------------------------------------------------------------------------
 # Survey job / report paths
 # ---------------------------------------------------------------------------
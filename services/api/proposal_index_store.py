@@ -0,0 +1,294 @@
+"""SQLite index over a memory proposals directory.
+
+Teacher and student memory proposals are stored one JSON file per proposal
+(``<workspace>/proposals`` and ``<workspace>/student_memory/proposals``).
+Listing, daily auto-proposal quotas and duplicate checks used to sort the whole
+directory by mtime and parse files until enough matched. This index keeps one
+row per file with the filter columns (student, status, source, memory type,
+created_at, a whitespace-insensitive content key) plus the record itself, so
+those become indexed queries.
+
+The JSON files stay the export every other reader uses. Rows are upserted by
+:meth:`ProposalIndexStore.record_write` after each write, and before each query
+the index is reconciled with the directory: when the directory stamp differs
+from the stored one, files are stat'ed and only the ones whose
+``(mtime_ns, size)`` changed are parsed again (see
+:mod:`services.api.dir_index_support`).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .dir_index_support import (
+    InstanceRegistry,
+    SqliteIndex,
+    Stamp,
+    dir_fingerprint_text,
+    fingerprint_text_settled,
+    settled,
+)
+
+_log = logging.getLogger(__name__)
+
+_INDEX_SUFFIX = ".index.sqlite3"
+
+
+def dedupe_text_key(value: Any) -> str:
+    return re.sub(r"\s+", "", str(value or "").strip().lower())
+
+
+def _norm(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _read_record(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            rec = json.load(handle)
+    except (OSError, ValueError):
+        _log.warning("failed to read proposal file %s", path, exc_info=True)
+        return None
+    return rec if isinstance(rec, dict) and rec else None
+
+
+def _row_values(name: str, stamp: Stamp, rec: Optional[Dict[str, Any]]) -> Tuple[Any, ...]:
+    rec = rec or {}
+    return (
+        name,
+        str(rec.get("proposal_id") or name[: -len(".json")]),
+        str(rec.get("student_id") or "").strip(),
+        _norm(rec.get("status")),
+        _norm(rec.get("source")),
+        _norm(rec.get("memory_type")),
+        str(rec.get("created_at") or "").strip(),
+        dedupe_text_key(rec.get("content")),
+        stamp[0],
+        stamp[1],
+        json.dumps(rec, ensure_ascii=False) if rec else None,
+    )
+
+
+def _row_record(row: sqlite3.Row) -> Dict[str, Any]:
+    rec = json.loads(row["record"])
+    rec.setdefault("proposal_id", str(row["file_name"])[: -len(".json")])
+    return rec
+
+
+class ProposalIndexStore(SqliteIndex):
+    def __init__(self, db_path: Path, *, proposals_dir: Path) -> None:
+        super().__init__(db_path)
+        self.proposals_dir = Path(proposals_dir)
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS proposal_index (
+                file_name TEXT PRIMARY KEY,
+                proposal_id TEXT NOT NULL,
+                student_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                source TEXT NOT NULL,
+                memory_type TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                content_key TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                record TEXT
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_proposal_status ON proposal_index (status, mtime_ns)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_proposal_student ON proposal_index (student_id, status, mtime_ns)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_proposal_dedupe ON proposal_index (student_id, memory_type, content_key)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_proposal_created ON proposal_index (student_id, created_at, source)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS proposal_index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    # -- freshness ---------------------------------------------------------
+
+    def _stored_fingerprint(self, conn: sqlite3.Connection) -> Optional[str]:
+        row = conn.execute("SELECT value FROM proposal_index_meta WHERE key = 'fingerprint'").fetchone()
+        return str(row["value"]) if row is not None else None
+
+    def _scan_changes(
+        self, conn: sqlite3.Connection
+    ) -> Tuple[List[Tuple[str, Stamp, Optional[Dict[str, Any]]]], List[str]]:
+        known: Dict[str, Stamp] = {
+            str(row["file_name"]): (int(row["mtime_ns"]), int(row["size"]))
+            for row in conn.execute("SELECT file_name, mtime_ns, size FROM proposal_index")
+        }
+        changed: List[Tuple[str, Stamp, Optional[Dict[str, Any]]]] = []
+        seen = set()
+        if self.proposals_dir.is_dir():
+            with os.scandir(self.proposals_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    seen.add(entry.name)
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    if known.get(entry.name) == stamp and settled(stamp[0]):
+                        continue
+                    changed.append((entry.name, stamp, _read_record(entry.path)))
+        return changed, [name for name in known if name not in seen]
+
+    def ensure_fresh(self) -> None:
+        """Reconcile the index with the directory unless its settled stamp is unchanged."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._open() as conn:
+            # Stamp taken before the scan: writes racing the scan make the next
+            # check reconcile again instead of being lost.
+            fingerprint = dir_fingerprint_text(self.proposals_dir)
+            if fingerprint == self._stored_fingerprint(conn) and fingerprint_text_settled(fingerprint):
+                return
+            changed, removed = self._scan_changes(conn)
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("DELETE FROM proposal_index WHERE file_name = ?", [(name,) for name in removed])
+            self._upsert_many(conn, changed)
+            conn.execute(
+                "INSERT OR REPLACE INTO proposal_index_meta (key, value) VALUES ('fingerprint', ?)",
+                (fingerprint,),
+            )
+            conn.execute("COMMIT")
+
+    def invalidate(self) -> None:
+        if not self.exists():
+            return
+        with self._lock, self._open() as conn:
+            conn.execute("DELETE FROM proposal_index_meta WHERE key = 'fingerprint'")
+
+    # -- writes ------------------------------------------------------------
+
+    def _upsert_many(
+        self, conn: sqlite3.Connection, rows: Iterable[Tuple[str, Stamp, Optional[Dict[str, Any]]]]
+    ) -> None:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO proposal_index
+                (file_name, proposal_id, student_id, status, source, memory_type,
+                 created_at, content_key, mtime_ns, size, record)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [_row_values(name, stamp, rec) for name, stamp, rec in rows],
+        )
+
+    def record_write(self, path: Path, payload: Dict[str, Any]) -> None:
+        """Upsert the row for a proposal file that was just written with ``payload``."""
+        if not self.exists():
+            # Not built yet: the first query builds it from disk.
+            return
+        try:
+            st = Path(path).stat()
+            with self._lock, self._open() as conn:
+                self._upsert_many(conn, [(Path(path).name, (st.st_mtime_ns, st.st_size), dict(payload))])
+        except (OSError, sqlite3.Error):
+            _log.warning("failed to index proposal write %s", path, exc_info=True)
+
+    # -- reads -------------------------------------------------------------
+
+    def _query(self, sql: str, params: Sequence[Any]) -> List[sqlite3.Row]:
+        self.ensure_fresh()
+        with self._open() as conn:
+            return conn.execute(sql, list(params)).fetchall()
+
+    def list_records(
+        self,
+        *,
+        status: Optional[str] = None,
+        student_id: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Most recently written records first; deleted ones only when asked for by ``status``."""
+        clauses = ["record IS NOT NULL", "status = ?" if status else "status != 'deleted'"]
+        params: List[Any] = [status] if status else []
+        if student_id:
+            clauses.append("student_id = ?")
+            params.append(student_id)
+        params.append(max(1, int(limit)))
+        rows = self._query(
+            f"SELECT file_name, record FROM proposal_index WHERE {' AND '.join(clauses)} "
+            "ORDER BY mtime_ns DESC, file_name DESC LIMIT ?",
+            params,
+        )
+        return [_row_record(row) for row in rows]
+
+    def count_created(
+        self,
+        *,
+        student_id: str,
+        statuses: Sequence[str],
+        created_prefix: str,
+        source_prefix: str,
+    ) -> int:
+        placeholders = ",".join("?" for _ in statuses)
+        rows = self._query(
+            "SELECT COUNT(*) AS n FROM proposal_index WHERE record IS NOT NULL AND student_id = ? "
+            f"AND status IN ({placeholders}) AND substr(created_at, 1, ?) = ? AND substr(source, 1, ?) = ?",
+            [
+                student_id,
+                *statuses,
+                len(created_prefix),
+                created_prefix,
+                len(source_prefix),
+                source_prefix,
+            ],
+        )
+        return int(rows[0]["n"]) if rows else 0
+
+    def find_duplicate(
+        self,
+        *,
+        student_id: str,
+        memory_type: str,
+        content: str,
+        statuses: Sequence[str],
+    ) -> Optional[Dict[str, Any]]:
+        placeholders = ",".join("?" for _ in statuses)
+        rows = self._query(
+            "SELECT file_name, record FROM proposal_index WHERE record IS NOT NULL AND student_id = ? "
+            f"AND memory_type = ? AND content_key = ? AND status IN ({placeholders}) "
+            "ORDER BY mtime_ns DESC, file_name DESC LIMIT 1",
+            [student_id, _norm(memory_type), dedupe_text_key(content), *statuses],
+        )
+        return _row_record(rows[0]) if rows else None
+
+    def facets(self, *, student_id: Optional[str] = None) -> List[Tuple[str, str, str]]:
+        """``(status, memory_type, created_at)`` of every readable record, without parsing them."""
+        clauses = ["record IS NOT NULL"]
+        params: List[Any] = []
+        if student_id:
+            clauses.append("student_id = ?")
+            params.append(student_id)
+        rows = self._query(
+            f"SELECT status, memory_type, created_at FROM proposal_index WHERE {' AND '.join(clauses)}",
+            params,
+        )
+        return [(str(row["status"]), str(row["memory_type"]), str(row["created_at"])) for row in rows]
+
+
+def proposal_index_path(proposals_dir: Path) -> Path:
+    """The index lives next to (not inside) the directory so its writes do not bump the directory stamp."""
+    proposals_dir = Path(proposals_dir)
+    return proposals_dir.with_name(proposals_dir.name + _INDEX_SUFFIX)
+
+
+_STORES: InstanceRegistry[ProposalIndexStore] = InstanceRegistry()
+
+
+def get_proposal_index_store(proposals_dir: Path) -> ProposalIndexStore:
+    db_path = proposal_index_path(proposals_dir)
+    return _STORES.get(db_path, lambda: ProposalIndexStore(db_path, proposals_dir=Path(proposals_dir)))
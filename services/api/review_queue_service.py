@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import logging
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -32,6 +34,10 @@ _TIMESTAMP_FIELD_BY_STATUS = {
     'retry_requested': 'retried_at',
 }
 _FEEDBACK_DISPOSITIONS = {'resolved', 'rejected', 'dismissed', 'escalated', 'retry_requested'}
+_SNAPSHOT_EVERY_ROWS = 2000
+_SNAPSHOT_VERSION = 1
+
+_log = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -261,7 +267,104 @@ def _resolve_review_feedback_log(deps: ReviewQueueDeps) -> Path | None:
     return path
 
 
+@dataclass
+class _QueueState:
+    """Latest item per ``item_id`` materialized from the log up to ``offset``."""
+
+    items: Dict[str, ReviewQueueItem] = field(default_factory=dict)
+    offset: int = 0
+    row_count: int = 0
+    snapshot_row_count: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_STATES: Dict[str, _QueueState] = {}
+_STATES_LOCK = threading.Lock()
+
+
+def _snapshot_log(deps: ReviewQueueDeps) -> str:
+    return f'{deps.queue_log}.snapshot.json'
+
+
+def _state_key(deps: ReviewQueueDeps) -> str:
+    return f"{getattr(deps.metadata_repo, 'base_dir', id(deps.metadata_repo))}::{deps.queue_log}"
+
+
+def _load_snapshot(deps: ReviewQueueDeps) -> _QueueState:
+    try:
+        raw = deps.metadata_repo.read_json(_snapshot_log(deps))
+    except (OSError, ValueError):
+        return _QueueState()
+    if int(raw.get('version') or 0) != _SNAPSHOT_VERSION:
+        return _QueueState()
+    state = _QueueState(offset=int(raw.get('offset') or 0), row_count=int(raw.get('row_count') or 0))
+    for item_raw in raw.get('items') or []:
+        item = ReviewQueueItem.model_validate(item_raw)
+        state.items[item.item_id] = item
+    state.snapshot_row_count = state.row_count
+    return state
+
+
+def _write_snapshot(state: _QueueState, deps: ReviewQueueDeps) -> None:
+    deps.metadata_repo.write_json(
+        _snapshot_log(deps),
+        {
+            'version': _SNAPSHOT_VERSION,
+            'offset': state.offset,
+            'row_count': state.row_count,
+            'items': [item.model_dump(exclude_none=True) for item in state.items.values()],
+        },
+    )
+    state.snapshot_row_count = state.row_count
+
+
+def _catch_up(state: _QueueState, deps: ReviewQueueDeps) -> None:
+    try:
+        rows, offset = deps.metadata_repo.read_jsonl_from(deps.queue_log, state.offset)  # type: ignore[attr-defined]
+    except ValueError:
+        _log.warning('review queue log %s shrank; replaying from the start', deps.queue_log)
+        state.items.clear()
+        state.row_count = state.snapshot_row_count = 0
+        rows, offset = deps.metadata_repo.read_jsonl_from(deps.queue_log, 0)  # type: ignore[attr-defined]
+    for raw in rows:
+        normalized = _normalize_item(raw, index=state.row_count)
+        state.items[normalized.item_id] = normalized
+        state.row_count += 1
+    state.offset = offset
+
+
+def _materialized_state(deps: ReviewQueueDeps) -> _QueueState:
+    key = _state_key(deps)
+    with _STATES_LOCK:
+        state = _STATES.get(key)
+        if state is None:
+            state = _STATES[key] = _load_snapshot(deps)
+    with state.lock:
+        _catch_up(state, deps)
+        if state.row_count - state.snapshot_row_count >= _SNAPSHOT_EVERY_ROWS:
+            _write_snapshot(state, deps)
+    return state
+
+
+def compact_review_queue(*, deps: ReviewQueueDeps) -> Dict[str, Any]:
+    """Write the materialized queue state and the log offset it covers.
+
+    Later reads (in any process) start from the snapshot and only replay log
+    rows appended after it. The log itself is left untouched as the audit trail.
+    """
+    if not callable(getattr(deps.metadata_repo, 'read_jsonl_from', None)):
+        return {'ok': False, 'reason': 'unsupported_repository'}
+    state = _materialized_state(deps)
+    with state.lock:
+        _write_snapshot(state, deps)
+        return {'ok': True, 'offset': state.offset, 'rows': state.row_count, 'items': len(state.items)}
+
+
 def _load_latest_items(deps: ReviewQueueDeps) -> List[ReviewQueueItem]:
+    if callable(getattr(deps.metadata_repo, 'read_jsonl_from', None)):
+        state = _materialized_state(deps)
+        with state.lock:
+            return list(state.items.values())
     latest: Dict[str, ReviewQueueItem] = {}
     for index, raw in enumerate(deps.metadata_repo.read_jsonl(deps.queue_log)):
         normalized = _normalize_item(raw, index=index)
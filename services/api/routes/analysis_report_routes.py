@@ -42,6 +42,8 @@ def _teacher_analysis_reports_response(
     strategy_id: str,
     target_type: str,
     deps: Any,
+    limit: int = 0,
+    cursor: str = '',
 ) -> Any:
     teacher_id_scoped = scoped_teacher_id(teacher_id) or ''
     try:
@@ -52,6 +54,8 @@ def _teacher_analysis_reports_response(
             strategy_id=strategy_id or None,
             target_type=target_type or None,
             deps=deps,
+            limit=limit or None,
+            cursor=cursor or None,
         )
     except (AnalysisReportServiceError, Exception) as exc:
         _raise_http_exception(exc)
@@ -173,6 +177,8 @@ def _register_analysis_reports_list_route(router: APIRouter, *, deps: Any) -> No
         status: str = Query(default=''),
         strategy_id: str = Query(default=''),
         target_type: str = Query(default=''),
+        limit: int = Query(default=0, ge=0, le=200),
+        cursor: str = Query(default=''),
     ) -> Any:
         return _teacher_analysis_reports_response(
             teacher_id=teacher_id,
@@ -181,6 +187,8 @@ def _register_analysis_reports_list_route(router: APIRouter, *, deps: Any) -> No
             strategy_id=strategy_id,
             target_type=target_type,
             deps=deps,
+            limit=limit,
+            cursor=cursor,
         )
 
 
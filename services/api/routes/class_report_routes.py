@@ -40,6 +40,8 @@ def build_router(core: Any) -> APIRouter:
     async def teacher_class_reports(
         teacher_id: str = Query(default=''),
         status: str = Query(default=''),
+        limit: int = Query(default=0, ge=0, le=200),
+        cursor: str = Query(default=''),
     ) -> Any:
         teacher_id_scoped = scoped_teacher_id(teacher_id) or ''
         try:
@@ -50,6 +52,8 @@ def build_router(core: Any) -> APIRouter:
                 strategy_id=None,
                 target_type=None,
                 deps=analysis_deps,
+                limit=limit or None,
+                cursor=cursor or None,
             )
         except (AnalysisReportServiceError, Exception) as exc:
             _raise_http_exception(exc)
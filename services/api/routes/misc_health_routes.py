@@ -5,7 +5,11 @@ import shutil
 from typing import Any
 
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from ..auth_service import require_principal
+from ..observability import OBSERVABILITY, render_prometheus
 
 _log = logging.getLogger(__name__)
 _DISK_MIN_BYTES = 100 * 1024 * 1024  # 100 MB
@@ -52,3 +56,10 @@ def register_misc_health_routes(router: APIRouter, core: Any) -> None:
         degraded = any(c.get("status") not in ("ok", "skipped") for c in checks.values())
         payload = {"status": "degraded" if degraded else "ok", "checks": checks}
         return JSONResponse(content=payload, status_code=503 if degraded else 200)
+
+    @router.get("/health/metrics")
+    async def health_metrics():
+        require_principal(roles=("service", "admin"))
+        # Aggregation reads every worker's state file; keep it off the event loop.
+        body = await run_in_threadpool(lambda: render_prometheus(OBSERVABILITY.aggregated()))
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
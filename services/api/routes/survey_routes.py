@@ -56,6 +56,8 @@ def _teacher_survey_reports_response(
     teacher_id: str,
     status: str,
     analysis_deps: Any,
+    limit: int = 0,
+    cursor: str = "",
 ) -> Any:
     teacher_id_scoped = scoped_teacher_id(teacher_id) or ""
     try:
@@ -66,6 +68,8 @@ def _teacher_survey_reports_response(
             strategy_id=None,
             target_type=None,
             deps=analysis_deps,
+            limit=limit or None,
+            cursor=cursor or None,
         )
     except (AnalysisReportServiceError, Exception) as exc:
         _raise_http_exception(exc)
@@ -132,11 +136,15 @@ def _register_teacher_survey_reports_route(router: APIRouter, *, analysis_deps:
     async def teacher_survey_reports(
         teacher_id: str = Query(default=""),
         status: str = Query(default=""),
+        limit: int = Query(default=0, ge=0, le=200),
+        cursor: str = Query(default=""),
     ) -> Any:
         return _teacher_survey_reports_response(
             teacher_id=teacher_id,
             status=status,
             analysis_deps=analysis_deps,
+            limit=limit,
+            cursor=cursor,
         )
 
 
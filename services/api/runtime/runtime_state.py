@@ -15,6 +15,7 @@ from services.api.queue import queue_backend_factory
 
 def reset_runtime_state(mod: Any, *, create_chat_idempotency_store: Callable[[Any], Any]) -> None:
     mod.UPLOAD_JOB_QUEUE = deque()
+    mod.UPLOAD_JOB_ACTIVE = set()
     mod.UPLOAD_JOB_LOCK = threading.Lock()
     mod.UPLOAD_JOB_EVENT = threading.Event()
     mod.UPLOAD_JOB_WORKER_STARTED = False
@@ -22,6 +23,7 @@ def reset_runtime_state(mod: Any, *, create_chat_idempotency_store: Callable[[An
     mod.UPLOAD_JOB_WORKER_THREAD = None
 
     mod.EXAM_JOB_QUEUE = deque()
+    mod.EXAM_JOB_ACTIVE = set()
     mod.EXAM_JOB_LOCK = threading.Lock()
     mod.EXAM_JOB_EVENT = threading.Event()
     mod.EXAM_JOB_WORKER_STARTED = False
@@ -29,6 +31,7 @@ def reset_runtime_state(mod: Any, *, create_chat_idempotency_store: Callable[[An
     mod.EXAM_JOB_WORKER_THREAD = None
 
     mod.SURVEY_JOB_QUEUE = deque()
+    mod.SURVEY_JOB_ACTIVE = set()
     mod.SURVEY_JOB_LOCK = threading.Lock()
     mod.SURVEY_JOB_EVENT = threading.Event()
     mod.SURVEY_JOB_WORKER_STARTED = False
@@ -83,3 +86,21 @@ def reset_runtime_state(mod: Any, *, create_chat_idempotency_store: Callable[[An
     mod._SESSION_INDEX_LOCKS_LOCK = threading.Lock()
     # Delegate session lock reset to extracted module (self-managed state)
     _session_store_module.reset_session_locks()
+
+
+_ACTIVE_JOB_STATE = (
+    "UPLOAD_JOB_QUEUE",
+    "UPLOAD_JOB_ACTIVE",
+    "EXAM_JOB_QUEUE",
+    "EXAM_JOB_ACTIVE",
+    "SURVEY_JOB_QUEUE",
+    "SURVEY_JOB_ACTIVE",
+    "CHAT_JOB_QUEUED",
+    "CHAT_JOB_TO_LANE",
+    "_PROFILE_UPDATE_QUEUE",
+)
+
+
+def runtime_has_active_jobs(mod: Any) -> bool:
+    """True while the inline workers of ``mod`` have queued or running jobs."""
+    return any(getattr(mod, name, None) for name in _ACTIVE_JOB_STATE)
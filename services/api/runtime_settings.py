@@ -79,6 +79,7 @@ class AppSettings:
     student_memory_assignment_evidence_low_mastery_ratio: float
     discussion_complete_marker: str
     grade_count_conf_threshold: float
+    assignment_progress_max_age_sec: float
     ocr_max_concurrency: int
     llm_max_concurrency: int
     llm_max_concurrency_student: int
@@ -225,6 +226,9 @@ def load_settings(env: Mapping[str, str] | None = None) -> AppSettings:
         ),
         discussion_complete_marker=_env_str(source, "DISCUSSION_COMPLETE_MARKER", "【个性化作业】"),
         grade_count_conf_threshold=_env_float(source, "GRADE_COUNT_CONF_THRESHOLD", 0.6),
+        assignment_progress_max_age_sec=max(
+            0.0, _env_float(source, "ASSIGNMENT_PROGRESS_MAX_AGE_SEC", 120.0)
+        ),
         ocr_max_concurrency=max(1, _env_int(source, "OCR_MAX_CONCURRENCY", 4)),
         llm_max_concurrency=llm_max_concurrency,
         llm_max_concurrency_student=max(
@@ -0,0 +1,261 @@
+"""Append-only compaction checkpoints for session JSONL files.
+
+Checkpoint compaction never rewrites the session file. It appends a
+``session_summary`` record and writes a small pointer sidecar
+(``<session>.checkpoint.json``) with the byte offsets of the kept tail and of
+that summary record. Readers go through :func:`iter_session_view_lines`, which
+yields ``[summary] + tail + later appends`` without reading the compacted
+prefix. :func:`reclaim_session_prefix` later rewrites the file to exactly that
+view off the request path, so line cursors handed out earlier stay valid.
+
+Appenders hold :func:`session_append_lock` while they write, and the reclaim
+holds it across its copy and rename, so no append can land in the file being
+replaced.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .fs_atomic import atomic_write_json
+
+_log = logging.getLogger(__name__)
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+APPEND_LOCK_SUFFIX = ".lock"
+_SUMMARY_KIND = "session_summary"
+
+_RECLAIM_LOCK = threading.Lock()
+_RECLAIM_INFLIGHT: Set[str] = set()
+
+
+@dataclass(frozen=True)
+class SessionCheckpoint:
+    checkpoint_id: str
+    tail_offset: int
+    checkpoint_offset: int
+
+
+@dataclass(frozen=True)
+class SessionSegment:
+    """Live part of a session: the active summary plus records after the compacted prefix."""
+
+    summary: Optional[Dict[str, Any]]
+    entries: List[Tuple[int, Dict[str, Any]]]
+
+
+def checkpoint_pointer_path(path: Path) -> Path:
+    return path.with_name(path.stem + CHECKPOINT_SUFFIX)
+
+
+@contextmanager
+def session_append_lock(path: Path) -> Iterator[None]:
+    """Exclusive ``flock`` on ``<session>.lock`` for appending to ``path`` or rewriting it."""
+    lock_path = path.with_name(path.name + APPEND_LOCK_SUFFIX)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    lock_fd = os.open(str(lock_path), os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(lock_fd, fcntl.LOCK_UN)
+        os.close(lock_fd)
+
+
+def _append_bytes(path: Path, data: bytes) -> int:
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+        # With O_APPEND the file position ends right after our own write.
+        return os.lseek(fd, 0, os.SEEK_CUR) - len(data)
+    finally:
+        os.close(fd)
+
+
+def append_session_line(path: Path, data: bytes) -> int:
+    """Append ``data`` under the session append lock; returns the offset it was written at."""
+    with session_append_lock(path):
+        return _append_bytes(path, data)
+
+
+def _read_line_at(path: Path, offset: int) -> bytes:
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        return handle.readline()
+
+
+def _parse_line(raw: Any) -> Optional[Dict[str, Any]]:
+    text = raw.decode("utf-8", errors="ignore") if isinstance(raw, bytes) else str(raw or "")
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        obj = json.loads(text)
+    except json.JSONDecodeError:
+        _log.debug("JSON parse failed", exc_info=True)
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def read_session_checkpoint(path: Path) -> Optional[SessionCheckpoint]:
+    """Return the active checkpoint, or None when there is none or the file was rewritten since."""
+    pointer_path = checkpoint_pointer_path(path)
+    if not pointer_path.exists():
+        return None
+    try:
+        data = json.loads(pointer_path.read_text(encoding="utf-8"))
+        checkpoint = SessionCheckpoint(
+            checkpoint_id=str(data["checkpoint_id"]),
+            tail_offset=int(data["tail_offset"]),
+            checkpoint_offset=int(data["checkpoint_offset"]),
+        )
+        size = path.stat().st_size
+    except (OSError, ValueError, KeyError, TypeError):
+        _log.debug("ignoring unreadable session checkpoint %s", pointer_path, exc_info=True)
+        return None
+    if not 0 <= checkpoint.tail_offset <= checkpoint.checkpoint_offset < size:
+        return None
+    try:
+        record = _parse_line(_read_line_at(path, checkpoint.checkpoint_offset))
+    except OSError:
+        return None
+    if not record or record.get("checkpoint_id") != checkpoint.checkpoint_id:
+        return None
+    return checkpoint
+
+
+def _iter_raw_view(path: Path, checkpoint: Optional[SessionCheckpoint]) -> Iterator[Tuple[int, bytes]]:
+    if checkpoint is None:
+        offset = 0
+        with path.open("rb") as handle:
+            for raw in handle:
+                yield offset, raw
+                offset += len(raw)
+        return
+    yield checkpoint.checkpoint_offset, _read_line_at(path, checkpoint.checkpoint_offset)
+    offset = checkpoint.tail_offset
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        for raw in handle:
+            line_offset = offset
+            offset += len(raw)
+            if line_offset == checkpoint.checkpoint_offset:
+                continue
+            # Summaries superseded by the active checkpoint are not part of the view.
+            if _SUMMARY_KIND.encode("utf-8") in raw:
+                record = _parse_line(raw)
+                if record is not None and record.get("kind") == _SUMMARY_KIND:
+                    continue
+            yield line_offset, raw
+
+
+def iter_session_view_lines(path: Path) -> Iterator[str]:
+    """Yield the session's lines as history loaders should see them."""
+    if not path.exists():
+        return
+    for _offset, raw in _iter_raw_view(path, read_session_checkpoint(path)):
+        yield raw.decode("utf-8", errors="ignore").rstrip("\r\n")
+
+
+def session_view_lines(path: Path) -> List[str]:
+    return list(iter_session_view_lines(path))
+
+
+def read_session_segment(path: Path) -> SessionSegment:
+    checkpoint = read_session_checkpoint(path)
+    summary: Optional[Dict[str, Any]] = None
+    entries: List[Tuple[int, Dict[str, Any]]] = []
+    for offset, raw in _iter_raw_view(path, checkpoint):
+        record = _parse_line(raw)
+        if record is None:
+            continue
+        if checkpoint is not None and offset == checkpoint.checkpoint_offset:
+            summary = record
+            continue
+        entries.append((offset, record))
+    return SessionSegment(summary=summary, entries=entries)
+
+
+def append_session_checkpoint(path: Path, record: Dict[str, Any], *, tail_offset: int) -> SessionCheckpoint:
+    """Append ``record`` as the new checkpoint and point readers at ``tail_offset``."""
+    checkpoint_id = uuid.uuid4().hex
+    payload = dict(record, checkpoint_id=checkpoint_id, tail_offset=int(tail_offset))
+    data = (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+    # The pointer is written under the same lock so a reclaim never sees the
+    # record without it, or rewrites the file between the two.
+    with session_append_lock(path):
+        checkpoint = SessionCheckpoint(
+            checkpoint_id=checkpoint_id,
+            tail_offset=int(tail_offset),
+            checkpoint_offset=_append_bytes(path, data),
+        )
+        atomic_write_json(
+            checkpoint_pointer_path(path),
+            {
+                "checkpoint_id": checkpoint.checkpoint_id,
+                "tail_offset": checkpoint.tail_offset,
+                "checkpoint_offset": checkpoint.checkpoint_offset,
+            },
+        )
+    return checkpoint
+
+
+def reclaim_session_prefix(path: Path) -> bool:
+    """Physically drop the compacted prefix by rewriting the file to its current view.
+
+    Runs under :func:`session_append_lock`, so appends wait for the rename
+    instead of landing in the replaced file. The pointer is only dropped if it
+    still names the checkpoint the copy was made from.
+    """
+    with session_append_lock(path):
+        checkpoint = read_session_checkpoint(path)
+        if checkpoint is None:
+            return False
+        tmp = path.with_suffix(path.suffix + f".{uuid.uuid4().hex}.tmp")
+        try:
+            with tmp.open("wb") as target:
+                for _offset, raw in _iter_raw_view(path, checkpoint):
+                    target.write(raw if raw.endswith(b"\n") else raw + b"\n")
+                target.flush()
+                os.fsync(target.fileno())
+            tmp.replace(path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        pointer_path = checkpoint_pointer_path(path)
+        try:
+            pointer_id = json.loads(pointer_path.read_text(encoding="utf-8")).get("checkpoint_id")
+        except (OSError, ValueError, AttributeError):
+            pointer_id = None
+        if pointer_id == checkpoint.checkpoint_id:
+            pointer_path.unlink(missing_ok=True)
+    return True
+
+
+def schedule_session_reclaim(path: Path) -> bool:
+    """Run :func:`reclaim_session_prefix` in a background thread, once per file at a time."""
+    key = str(path)
+    with _RECLAIM_LOCK:
+        if key in _RECLAIM_INFLIGHT:
+            return False
+        _RECLAIM_INFLIGHT.add(key)
+
+    def _run() -> None:
+        try:
+            reclaim_session_prefix(path)
+        except Exception:  # policy: allowed-broad-except
+            _log.warning("session prefix reclaim failed for %s", path, exc_info=True)
+        finally:
+            with _RECLAIM_LOCK:
+                _RECLAIM_INFLIGHT.discard(key)
+
+    threading.Thread(target=_run, name="session-reclaim", daemon=True).start()
+    return True
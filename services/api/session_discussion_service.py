@@ -2,18 +2,34 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+import weakref
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .fs_atomic import atomic_write_json
 
 _log = logging.getLogger(__name__)
 
+DISCUSSION_STATE_FILENAME = "discussion_state.json"
+_STATE_VERSION = 1
+
+_STATE_LOCKS: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_STATE_LOCKS_LOCK = threading.Lock()
+
 
 @dataclass(frozen=True)
 class SessionDiscussionDeps:
     marker: str
     load_student_sessions_index: Callable[[str], List[Dict[str, Any]]]
     student_session_file: Callable[[str, str], Path]
+    # Read the per-student state file in the student's sessions directory
+    # (message count, last ts and pass flag per session) and only parse bytes
+    # appended since, instead of rescanning every linked session. Needs
+    # ``student_sessions_dir`` to locate the state file.
+    use_discussion_state: bool = False
+    student_sessions_dir: Optional[Callable[[str], Path]] = None
 
 
 def _session_ids(student_id: str, assignment_id: str, *, deps: SessionDiscussionDeps) -> List[str]:
@@ -39,39 +55,142 @@ def _default_discussion_result(assignment_id: str) -> Dict[str, Any]:
     }
 
 
-def _scan_session_file(path: Path, *, session_id: str, marker: str) -> Dict[str, Any]:
-    passed = False
-    message_count = 0
-    last_ts = ""
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception:
-                _log.debug("JSON parse failed", exc_info=True)
-                continue
-            if not isinstance(obj, dict):
-                continue
-            message_count += 1
-            ts = str(obj.get("ts") or "")
-            if ts:
-                last_ts = ts
-            if str(obj.get("role") or "") == "assistant":
-                content = str(obj.get("content") or "")
-                if marker and marker in content:
-                    passed = True
+def _new_state_entry(ino: int) -> Dict[str, Any]:
+    return {"ino": ino, "offset": 0, "message_count": 0, "last_ts": "", "pass": False}
+
+
+def _passes(obj: Dict[str, Any], marker: str) -> bool:
+    return str(obj.get("role") or "") == "assistant" and bool(marker) and marker in str(obj.get("content") or "")
+
+
+def _apply_record(entry: Dict[str, Any], obj: Dict[str, Any], marker: str) -> None:
+    entry["message_count"] = int(entry.get("message_count") or 0) + 1
+    ts = str(obj.get("ts") or "")
+    if ts:
+        entry["last_ts"] = ts
+    if _passes(obj, marker):
+        entry["pass"] = True
+
+
+def _apply_line(entry: Dict[str, Any], raw: bytes, marker: str) -> None:
+    line = raw.decode("utf-8", errors="ignore").strip()
+    if not line:
+        return
+    try:
+        obj = json.loads(line)
+    except json.JSONDecodeError:
+        _log.debug("JSON parse failed", exc_info=True)
+        return
+    if isinstance(obj, dict):
+        _apply_record(entry, obj, marker)
+
+
+def _catch_up(entry: Optional[Dict[str, Any]], path: Path, marker: str) -> Tuple[Dict[str, Any], bool]:
+    """Bring a session's discussion state up to the end of its file.
+
+    Only the bytes after the recorded offset are parsed; a replaced or shrunken
+    file is rescanned from the start. A trailing line without its newline is
+    still being written and is left for the next call.
+    """
+    st = path.stat()
+    if entry is None or entry.get("ino") != st.st_ino or int(entry.get("offset") or 0) > st.st_size:
+        entry = _new_state_entry(st.st_ino)
+    offset = int(entry["offset"])
+    if offset == st.st_size:
+        return entry, False
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        for raw in handle:
+            if not raw.endswith(b"\n"):
+                break
+            _apply_line(entry, raw, marker)
+            offset += len(raw)
+    entry["offset"] = offset
+    return entry, True
+
+
+def _entry_result(entry: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+    passed = bool(entry.get("pass"))
     return {
         "status": "pass" if passed else "in_progress",
         "pass": passed,
         "session_id": session_id,
-        "message_count": message_count,
-        "last_ts": last_ts,
+        "message_count": int(entry.get("message_count") or 0),
+        "last_ts": str(entry.get("last_ts") or ""),
     }
 
 
+def _scan_session_file(path: Path, *, session_id: str, marker: str) -> Dict[str, Any]:
+    entry, _changed = _catch_up(None, path, marker)
+    return _entry_result(entry, session_id)
+
+
+# ---------------------------------------------------------------------------
+# Persistent per-student discussion state
+# ---------------------------------------------------------------------------
+
+
+def _state_lock(path: Path) -> threading.Lock:
+    key = str(path)
+    with _STATE_LOCKS_LOCK:
+        lock = _STATE_LOCKS.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _STATE_LOCKS[key] = lock
+        return lock
+
+
+def load_discussion_state(path: Path, marker: str) -> Dict[str, Dict[str, Any]]:
+    """Per-session-file entries; state recorded under another marker is discarded."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        _log.warning("ignoring unreadable discussion state %s", path, exc_info=True)
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _STATE_VERSION or data.get("marker") != marker:
+        return {}
+    sessions = data.get("sessions")
+    return {str(k): v for k, v in sessions.items() if isinstance(v, dict)} if isinstance(sessions, dict) else {}
+
+
+def save_discussion_state(path: Path, marker: str, sessions: Dict[str, Dict[str, Any]]) -> None:
+    atomic_write_json(path, {"version": _STATE_VERSION, "marker": marker, "sessions": sessions})
+
+
+def record_discussion_append(session_path: Path, record: Dict[str, Any], *, marker: str) -> None:
+    """Persist the state right away when an appended record flips the pass flag.
+
+    Other records cannot change the pass flag, so they are not written
+    through. The next progress query or passing record catches up on all of
+    them with one read of the appended bytes and one state write.
+    """
+    if not _passes(record, marker):
+        return
+    state_path = discussion_state_path(session_path)
+    with _state_lock(state_path):
+        sessions = load_discussion_state(state_path, marker)
+        entry, changed = _catch_up(sessions.get(session_path.name), session_path, marker)
+        if changed:
+            sessions[session_path.name] = entry
+            save_discussion_state(state_path, marker, sessions)
+
+
+def rebuild_discussion_state(sessions_dir: Path, marker: str) -> int:
+    """Recompute the state of every session file in one student's sessions directory."""
+    state_path = sessions_dir / DISCUSSION_STATE_FILENAME
+    with _state_lock(state_path):
+        sessions: Dict[str, Dict[str, Any]] = {}
+        for path in sorted(sessions_dir.glob("*.jsonl")):
+            try:
+                sessions[path.name], _changed = _catch_up(None, path, marker)
+            except OSError:
+                _log.warning("failed to read session file %s", path, exc_info=True)
+        save_discussion_state(state_path, marker, sessions)
+    return len(sessions)
+
+
 def _is_better_discussion_result(candidate: Dict[str, Any], current: Dict[str, Any]) -> bool:
     if bool(candidate.get("pass")) and not bool(current.get("pass")):
         return True
@@ -80,7 +199,9 @@ def _is_better_discussion_result(candidate: Dict[str, Any], current: Dict[str, A
     )
 
 
-def session_discussion_pass(student_id: str, assignment_id: str, *, deps: SessionDiscussionDeps) -> Dict[str, Any]:
+def _discussion_pass_from_files(
+    student_id: str, assignment_id: str, *, deps: SessionDiscussionDeps
+) -> Dict[str, Any]:
     best = _default_discussion_result(assignment_id)
     for sid in _session_ids(student_id, assignment_id, deps=deps):
         path = deps.student_session_file(student_id, sid)
@@ -96,3 +217,49 @@ def session_discussion_pass(student_id: str, assignment_id: str, *, deps: Sessio
             continue
 
     return best
+
+
+def discussion_state_path(session_path: Path) -> Path:
+    return session_path.with_name(DISCUSSION_STATE_FILENAME)
+
+
+def _discussion_pass_from_state(
+    student_id: str,
+    assignment_id: str,
+    *,
+    sessions_dir: Path,
+    deps: SessionDiscussionDeps,
+) -> Dict[str, Any]:
+    best = _default_discussion_result(assignment_id)
+    state_path = sessions_dir / DISCUSSION_STATE_FILENAME
+    with _state_lock(state_path):
+        sessions = load_discussion_state(state_path, deps.marker)
+        changed = False
+        for sid in _session_ids(student_id, assignment_id, deps=deps):
+            path = deps.student_session_file(student_id, sid)
+            try:
+                entry, updated = _catch_up(sessions.get(path.name), path, deps.marker)
+            except FileNotFoundError:
+                continue
+            except OSError:
+                _log.warning("failed to read session file %s for student=%s", path, student_id, exc_info=True)
+                continue
+            sessions[path.name] = entry
+            changed = changed or updated
+            candidate = _entry_result(entry, sid)
+            if _is_better_discussion_result(candidate, best):
+                best = candidate
+        if changed:
+            try:
+                save_discussion_state(state_path, deps.marker, sessions)
+            except OSError:
+                _log.warning("failed to save discussion state %s", state_path, exc_info=True)
+    return best
+
+
+def session_discussion_pass(student_id: str, assignment_id: str, *, deps: SessionDiscussionDeps) -> Dict[str, Any]:
+    if deps.use_discussion_state and deps.student_sessions_dir is not None:
+        return _discussion_pass_from_state(
+            student_id, assignment_id, sessions_dir=deps.student_sessions_dir(student_id), deps=deps
+        )
+    return _discussion_pass_from_files(student_id, assignment_id, deps=deps)
@@ -9,7 +9,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from .config import SESSION_INDEX_MAX_ITEMS
+from .config import DISCUSSION_COMPLETE_MARKER, SESSION_INDEX_MAX_ITEMS
 from .job_repository import _atomic_write_json
 from .paths import (
     student_session_file,
@@ -21,6 +21,8 @@ from .paths import (
     teacher_sessions_base_dir,
     teacher_sessions_index_path,
 )
+from .session_checkpoint_store import append_session_line
+from .session_discussion_service import record_discussion_append
 from .session_view_state import (
     load_session_view_state as _load_session_view_state_impl,
 )
@@ -173,6 +175,10 @@ def append_student_session_message(
         os.fsync(fd)
     finally:
         os.close(fd)
+    try:
+        record_discussion_append(path, record, marker=DISCUSSION_COMPLETE_MARKER)
+    except OSError:
+        _log.warning("failed to update discussion state for student=%s", student_id, exc_info=True)
 
 
 # ---------------------------------------------------------------------------
@@ -249,10 +255,4 @@ def append_teacher_session_message(
     if meta:
         record.update({k: v for k, v in meta.items() if k not in _RESERVED_META_KEYS})
     line = json.dumps(record, ensure_ascii=False) + "\n"
-    data = line.encode("utf-8")
-    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND)
-    try:
-        os.write(fd, data)
-        os.fsync(fd)
-    finally:
-        os.close(fd)
+    append_session_line(path, line.encode("utf-8"))
@@ -52,10 +52,42 @@ def rq_queue_name() -> str:
     return env_str("RQ_QUEUE_NAME", "default")
 
 
+def rq_priority_queues_enabled() -> bool:
+    return env_bool("RQ_PRIORITY_QUEUES", "1")
+
+
+def rq_queue_weights_raw() -> str:
+    return env_str("RQ_QUEUE_WEIGHTS", "")
+
+
+def rq_worker_job_classes_raw() -> str:
+    return env_str("RQ_WORKER_JOB_CLASSES", "").strip()
+
+
+def rq_worker_mode() -> str:
+    return env_str("RQ_WORKER_MODE", "fork").strip().lower()
+
+
+def rq_worker_warm_tenants_raw() -> str:
+    return env_str("RQ_WORKER_WARM_TENANTS", "")
+
+
 def tenant_id() -> str:
     return env_str("TENANT_ID", "").strip()
 
 
+def tenant_cache_max_resident() -> int:
+    return max(1, env_int("TENANT_CACHE_MAX_RESIDENT", 32))
+
+
+def tenant_cache_idle_ttl_sec() -> float:
+    return max(0.0, env_float("TENANT_CACHE_IDLE_TTL_SEC", 1800.0))
+
+
+def tenant_warmup_ids_raw() -> str:
+    return env_str("TENANT_WARMUP_IDS", "")
+
+
 def data_dir() -> str:
     return env_str("DATA_DIR", "")
 
@@ -72,6 +104,30 @@ def diag_log_path() -> str:
     return env_str("DIAG_LOG_PATH", "")
 
 
+def diag_log_queue_max() -> int:
+    return max(1, env_int("DIAG_LOG_QUEUE_MAX", 10000))
+
+
+def diag_log_batch_size() -> int:
+    return max(1, env_int("DIAG_LOG_BATCH_SIZE", 256))
+
+
+def diag_log_flush_interval_ms() -> int:
+    return max(10, env_int("DIAG_LOG_FLUSH_INTERVAL_MS", 500))
+
+
+def diag_log_sample_rates_raw() -> str:
+    return env_str("DIAG_LOG_SAMPLE_RATES", "")
+
+
+def observability_window_sec() -> int:
+    return max(5, env_int("OBSERVABILITY_WINDOW_SEC", 300))
+
+
+def observability_shared_dir() -> str:
+    return env_str("OBSERVABILITY_SHARED_DIR", "")
+
+
 def chat_worker_pool_size() -> int:
     return max(1, env_int("CHAT_WORKER_POOL_SIZE", 4))
 
@@ -119,6 +175,19 @@ def teacher_session_compact_max_source_chars() -> int:
     return max(2000, env_int("TEACHER_SESSION_COMPACT_MAX_SOURCE_CHARS", 12000))
 
 
+def teacher_session_compact_mode() -> str:
+    mode = env_str("TEACHER_SESSION_COMPACT_MODE", "rewrite").strip().lower()
+    return mode if mode in {"rewrite", "checkpoint"} else "rewrite"
+
+
+def teacher_session_compact_reclaim_bytes() -> int:
+    return max(0, env_int("TEACHER_SESSION_COMPACT_RECLAIM_BYTES", 1024 * 1024))
+
+
+def teacher_memory_context_cache_ttl_sec() -> float:
+    return max(0.0, env_float("TEACHER_MEMORY_CONTEXT_CACHE_TTL_SEC", 300.0))
+
+
 def teacher_session_context_include_summary() -> bool:
     return env_bool("TEACHER_SESSION_CONTEXT_INCLUDE_SUMMARY", "1")
 
@@ -225,6 +294,10 @@ def grade_count_conf_threshold() -> float:
     return env_float("GRADE_COUNT_CONF_THRESHOLD", 0.6)
 
 
+def assignment_progress_max_age_sec() -> float:
+    return max(0.0, env_float("ASSIGNMENT_PROGRESS_MAX_AGE_SEC", 120.0))
+
+
 def ocr_max_concurrency() -> int:
     return max(1, env_int("OCR_MAX_CONCURRENCY", 4))
 
@@ -438,3 +511,23 @@ def multimodal_max_duration_sec() -> int:
 
 def multimodal_extract_timeout_sec() -> int:
     return max(5, env_int("MULTIMODAL_EXTRACT_TIMEOUT_SEC", 90))
+
+
+
+def upload_blob_store_enabled() -> bool:
+    return env_bool("UPLOAD_BLOB_STORE_ENABLED", "1")
+
+
+
+def upload_blob_gc_interval_sec() -> int:
+    return max(0, env_int("UPLOAD_BLOB_GC_INTERVAL_SEC", 3600))
+
+
+
+def upload_extract_cache_max_bytes() -> int:
+    return max(1, env_int("UPLOAD_EXTRACT_CACHE_MAX_MB", 256)) * 1024 * 1024
+
+
+
+def upload_extract_cache_max_age_sec() -> int:
+    return max(1, env_int("UPLOAD_EXTRACT_CACHE_MAX_AGE_DAYS", 30)) * 86400
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from .contracts import ArtifactRef, HandoffContract, SpecialistAgentResult
+
+JOB_GRAPH_ARTIFACT_TYPE = 'job_graph_result'
+
+
+def payload_bytes(payload: Any) -> int:
+    return len(json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+class JobGraphArtifactStore:
+    """In-process store for node results of running job graphs.
+
+    In ``reference`` handoff mode downstream nodes get :class:`ArtifactRef`
+    entries instead of inlined results; a result is only dumped to a dict the
+    first time a consumer materializes it. Artifacts are released when their
+    graph run finishes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: Dict[str, SpecialistAgentResult] = {}
+        self._materialized: Dict[str, Dict[str, Any]] = {}
+        self._materialized_bytes: Dict[str, int] = {}
+
+    @staticmethod
+    def artifact_id(run_id: str, node_id: str) -> str:
+        return f'{run_id}/{node_id}'
+
+    def ref(self, run_id: str, node_id: str) -> ArtifactRef:
+        artifact_id = self.artifact_id(run_id, node_id)
+        return ArtifactRef(artifact_id=artifact_id, artifact_type=JOB_GRAPH_ARTIFACT_TYPE, uri=f'job-graph://{artifact_id}')
+
+    def put(self, run_id: str, node_id: str, result: SpecialistAgentResult) -> ArtifactRef:
+        with self._lock:
+            self._results[self.artifact_id(run_id, node_id)] = result
+        return self.ref(run_id, node_id)
+
+    def materialize(self, artifact_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cached = self._materialized.get(artifact_id)
+            if cached is not None:
+                return cached
+            result = self._results.get(artifact_id)
+        if result is None:
+            return None
+        payload = result.model_dump()
+        run_id = artifact_id.rsplit('/', 1)[0]
+        size = payload_bytes(payload)
+        with self._lock:
+            if artifact_id in self._results:
+                self._materialized[artifact_id] = payload
+                self._materialized_bytes[run_id] = self._materialized_bytes.get(run_id, 0) + size
+        return payload
+
+    def release(self, run_id: str) -> int:
+        """Drop a finished run's artifacts; returns the bytes materialized for it."""
+        prefix = f'{run_id}/'
+        with self._lock:
+            for artifact_id in [key for key in self._results if key.startswith(prefix)]:
+                self._results.pop(artifact_id, None)
+                self._materialized.pop(artifact_id, None)
+            return self._materialized_bytes.pop(run_id, 0)
+
+
+JOB_GRAPH_ARTIFACTS = JobGraphArtifactStore()
+
+
+def job_graph_inputs(handoff: HandoffContract) -> Dict[str, Dict[str, Any]]:
+    """Upstream node results visible to ``handoff``, keyed by node id, in either handoff mode."""
+    inline = (handoff.constraints or {}).get('job_graph_results')
+    if isinstance(inline, dict):
+        return dict(inline)
+    inputs: Dict[str, Dict[str, Any]] = {}
+    for ref in handoff.artifact_refs or []:
+        if ref.artifact_type != JOB_GRAPH_ARTIFACT_TYPE:
+            continue
+        payload = JOB_GRAPH_ARTIFACTS.materialize(ref.artifact_id)
+        if payload is not None:
+            inputs[ref.artifact_id.rsplit('/', 1)[-1]] = payload
+    return inputs
+
+
+def job_graph_previous_result(handoff: HandoffContract) -> Optional[Dict[str, Any]]:
+    inline = (handoff.constraints or {}).get('job_graph_previous_result')
+    if isinstance(inline, dict):
+        return inline
+    refs = [ref for ref in handoff.artifact_refs or [] if ref.artifact_type == JOB_GRAPH_ARTIFACT_TYPE]
+    if not refs:
+        return None
+    return JOB_GRAPH_ARTIFACTS.materialize(refs[-1].artifact_id)
@@ -13,6 +13,8 @@ class JobGraphNode(BaseModel):
     handoff: HandoffContract
     max_budget: Dict[str, float] = Field(default_factory=dict)
     allow_statuses: List[str] = Field(default_factory=lambda: ['completed'])
+    # None keeps the legacy chain (depends on the previous node); [] marks a root node.
+    depends_on: List[str] | None = None
 
 
 class SpecialistJobGraph(BaseModel):
@@ -20,6 +22,9 @@ class SpecialistJobGraph(BaseModel):
     domain: str | None = None
     nodes: List[JobGraphNode] = Field(default_factory=list)
     max_nodes: int = 6
+    # 'inline' copies upstream results into constraints; 'reference' passes
+    # ArtifactRefs to the node's declared inputs only (see job_graph_artifacts).
+    handoff_mode: Literal['inline', 'reference'] = 'inline'
 
 
 class SpecialistJobGraphResult(BaseModel):
@@ -27,3 +32,4 @@ class SpecialistJobGraphResult(BaseModel):
     results: List[SpecialistAgentResult] = Field(default_factory=list)
     final_result: SpecialistAgentResult
     review_metadata: Dict[str, Any] = Field(default_factory=dict)
+    stats: Dict[str, Any] = Field(default_factory=dict)
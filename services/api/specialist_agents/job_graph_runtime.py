@@ -1,15 +1,44 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict
+import contextvars
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List
 
+from ..observability import OBSERVABILITY
 from .contracts import HandoffContract, SpecialistAgentResult
 from .governor import SpecialistAgentRuntimeError
+from .job_graph_artifacts import JOB_GRAPH_ARTIFACTS, payload_bytes
 from .job_graph_models import JobGraphNode, SpecialistJobGraph, SpecialistJobGraphResult
 
+_DEFAULT_MAX_PARALLEL = 4
+
 
 class SpecialistJobGraphRuntime:
-    def __init__(self, *, executor: Callable[[HandoffContract], SpecialistAgentResult]) -> None:
+    """Run a specialist job graph, executing independent nodes concurrently.
+
+    Nodes without ``depends_on`` depend on the node before them, which keeps
+    plain node lists sequential. Dependencies must name earlier nodes, so list
+    order is always a valid topological order; ``trace``/``results`` follow it
+    regardless of completion order. Every node's budget is checked before any
+    node runs, and at most ``max_parallel`` executor calls run at once. When a
+    node fails, nodes not yet started are skipped and the failure is raised
+    once the nodes still running have returned.
+
+    With ``handoff_mode='reference'`` a node only receives ArtifactRefs to its
+    direct inputs; the results live in :data:`JOB_GRAPH_ARTIFACTS` until the
+    run ends. Each run records handoff payload bytes and wall time.
+    """
+
+    def __init__(
+        self,
+        *,
+        executor: Callable[[HandoffContract], SpecialistAgentResult],
+        max_parallel: int = _DEFAULT_MAX_PARALLEL,
+    ) -> None:
         self._executor = executor
+        self._max_parallel = max(1, int(max_parallel))
 
     def run(self, graph: SpecialistJobGraph) -> SpecialistJobGraphResult:
         request = SpecialistJobGraph.model_validate(graph)
@@ -20,22 +49,29 @@ class SpecialistJobGraphRuntime:
         node_ids = [str(node.node_id or '').strip() for node in request.nodes]
         if len(node_ids) != len(set(node_ids)):
             raise ValueError('job graph node_id must be unique')
+        dependencies = _resolve_dependencies(request.nodes)
+        for node in request.nodes:
+            self._validate_node_budget(node=node, handoff=node.handoff)
+
+        run_id = uuid.uuid4().hex
+        reference = request.handoff_mode == 'reference'
+        stats: Dict[str, Any] = {'handoff_mode': request.handoff_mode, 'handoff_payload_bytes': 0}
+        started = time.perf_counter()
+        try:
+            results_by_id = self._execute(request.nodes, dependencies, run_id=run_id, reference=reference, stats=stats)
+        finally:
+            stats['materialized_bytes'] = JOB_GRAPH_ARTIFACTS.release(run_id)
+        stats['elapsed_ms'] = round((time.perf_counter() - started) * 1000.0, 3)
+        _record_run_metrics(request, stats)
 
         trace: list[str] = []
         results: list[SpecialistAgentResult] = []
-        results_by_node: Dict[str, Dict[str, Any]] = {}
         final_result: SpecialistAgentResult | None = None
         review_metadata: Dict[str, Any] = {}
-
         for node in request.nodes:
-            prepared_handoff = self._prepare_handoff(node=node, trace=trace, results_by_node=results_by_node, results=results)
+            result = results_by_id[node.node_id]
             trace.append(node.node_id)
-            self._validate_node_budget(node=node, handoff=prepared_handoff)
-            result = self._executor(prepared_handoff)
-            if str(result.status or '').strip() not in set(node.allow_statuses or ['completed']):
-                raise SpecialistAgentRuntimeError('specialist_execution_failed', 'job graph node returned unexpected status.')
             results.append(result)
-            results_by_node[node.node_id] = result.model_dump()
             if node.node_type == 'verify' and _is_reviewer_result(result.output):
                 review_metadata = dict(result.output or {})
                 continue
@@ -47,23 +83,76 @@ class SpecialistJobGraphRuntime:
             results=results,
             final_result=resolved_final_result,
             review_metadata=review_metadata,
+            stats=stats,
         )
 
+    def _execute(
+        self,
+        nodes: List[JobGraphNode],
+        dependencies: Dict[str, List[str]],
+        *,
+        run_id: str,
+        reference: bool,
+        stats: Dict[str, Any],
+    ) -> Dict[str, SpecialistAgentResult]:
+        ancestors = _ancestors(nodes, dependencies)
+        done: Dict[str, SpecialistAgentResult] = {}
+        pending = list(nodes)
+        running: Dict[Future, JobGraphNode] = {}
+        pool = ThreadPoolExecutor(max_workers=min(self._max_parallel, len(nodes)), thread_name_prefix='job-graph')
+        try:
+            while pending or running:
+                for node in [n for n in pending if all(dep in done for dep in dependencies[n.node_id])]:
+                    if len(running) >= self._max_parallel:
+                        break
+                    pending.remove(node)
+                    if reference:
+                        handoff = self._reference_handoff(node=node, dependencies=dependencies[node.node_id], run_id=run_id)
+                    else:
+                        handoff = self._prepare_handoff(node=node, ancestors=ancestors[node.node_id], dependencies=dependencies[node.node_id], done=done)
+                    stats['handoff_payload_bytes'] += _handoff_payload_bytes(node.handoff, handoff)
+                    ctx = contextvars.copy_context()
+                    running[pool.submit(ctx.run, self._executor, handoff)] = node
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node = running.pop(future)
+                    result = future.result()
+                    if str(result.status or '').strip() not in set(node.allow_statuses or ['completed']):
+                        raise SpecialistAgentRuntimeError('specialist_execution_failed', 'job graph node returned unexpected status.')
+                    done[node.node_id] = result
+                    if reference:
+                        JOB_GRAPH_ARTIFACTS.put(run_id, node.node_id, result)
+        finally:
+            # On a node failure, queued nodes are cancelled and nodes already
+            # running are waited for: none of the run's work outlives it, and
+            # run() only releases the run's artifacts once nothing reads them.
+            pool.shutdown(wait=True, cancel_futures=True)
+        return done
+
     def _prepare_handoff(
         self,
         *,
         node: JobGraphNode,
-        trace: list[str],
-        results_by_node: Dict[str, Dict[str, Any]],
-        results: list[SpecialistAgentResult],
+        ancestors: List[str],
+        dependencies: List[str],
+        done: Dict[str, SpecialistAgentResult],
     ) -> HandoffContract:
         constraints = dict(node.handoff.constraints or {})
-        if results:
-            constraints['job_graph_previous_result'] = results[-1].model_dump()
-            constraints['job_graph_results'] = dict(results_by_node)
-            constraints['job_graph_trace'] = list(trace)
+        if dependencies:
+            constraints['job_graph_previous_result'] = done[dependencies[-1]].model_dump()
+            constraints['job_graph_results'] = {node_id: done[node_id].model_dump() for node_id in ancestors}
+            constraints['job_graph_trace'] = list(ancestors)
         return node.handoff.model_copy(update={'constraints': constraints})
 
+    def _reference_handoff(self, *, node: JobGraphNode, dependencies: List[str], run_id: str) -> HandoffContract:
+        if not dependencies:
+            return node.handoff
+        refs = list(node.handoff.artifact_refs or [])
+        refs += [JOB_GRAPH_ARTIFACTS.ref(run_id, node_id) for node_id in dependencies]
+        constraints = dict(node.handoff.constraints or {})
+        constraints['job_graph_inputs'] = list(dependencies)
+        return node.handoff.model_copy(update={'constraints': constraints, 'artifact_refs': refs})
+
     def _validate_node_budget(self, *, node: JobGraphNode, handoff: HandoffContract) -> None:
         for key in ('max_tokens', 'timeout_sec', 'max_steps'):
             allowed = (node.max_budget or {}).get(key)
@@ -75,6 +164,50 @@ class SpecialistJobGraphRuntime:
 
 
 
+def _handoff_payload_bytes(original: HandoffContract, prepared: HandoffContract) -> int:
+    if prepared is original:
+        return 0
+    added = {key: value for key, value in prepared.constraints.items() if key not in (original.constraints or {})}
+    extra_refs = [ref.model_dump() for ref in prepared.artifact_refs[len(original.artifact_refs or []):]]
+    return payload_bytes({'constraints': added, 'artifact_refs': extra_refs})
+
+
+def _record_run_metrics(request: SpecialistJobGraph, stats: Dict[str, Any]) -> None:
+    label = str(request.domain or 'default')
+    OBSERVABILITY.record_timing('job_graph_run', label, float(stats['elapsed_ms']) / 1000.0)
+    OBSERVABILITY.inc_counter('job_graph_handoff_bytes_total', request.handoff_mode, stats['handoff_payload_bytes'])
+    OBSERVABILITY.inc_counter('job_graph_materialized_bytes_total', request.handoff_mode, stats['materialized_bytes'])
+
+
+def _resolve_dependencies(nodes: List[JobGraphNode]) -> Dict[str, List[str]]:
+    seen: List[str] = []
+    dependencies: Dict[str, List[str]] = {}
+    for node in nodes:
+        if node.depends_on is None:
+            declared = seen[-1:]
+        else:
+            declared = list(dict.fromkeys(str(dep or '').strip() for dep in node.depends_on))
+            unknown = [dep for dep in declared if dep not in seen]
+            if unknown:
+                raise ValueError(f'job graph node {node.node_id} depends on unknown or later node(s): {", ".join(unknown)}')
+        # Keep list order so "previous result" is deterministic.
+        dependencies[node.node_id] = [node_id for node_id in seen if node_id in declared]
+        seen.append(node.node_id)
+    return dependencies
+
+
+def _ancestors(nodes: List[JobGraphNode], dependencies: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    order = {node.node_id: index for index, node in enumerate(nodes)}
+    ancestors: Dict[str, List[str]] = {}
+    for node in nodes:
+        collected = set(dependencies[node.node_id])
+        for dep in dependencies[node.node_id]:
+            collected.update(ancestors[dep])
+        ancestors[node.node_id] = sorted(collected, key=order.__getitem__)
+    return ancestors
+
+
+
 def _is_reviewer_result(output: Dict[str, Any]) -> bool:
     if not isinstance(output, dict):
         return False
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Any, Callable, Dict
 
 from .contracts import HandoffContract, SpecialistAgentResult
+from .job_graph_artifacts import job_graph_previous_result
 
 
 @dataclass(frozen=True)
@@ -50,8 +51,7 @@ def run_reviewer_analyst(
 ) -> SpecialistAgentResult:
     del multimodal_submission_bundle, teacher_context, task_goal
     request = HandoffContract.model_validate(handoff)
-    constraints = dict(request.constraints or {})
-    previous_raw = constraints.get('job_graph_previous_result')
+    previous_raw = job_graph_previous_result(request)
     checked_sections: list[str] = []
     issue_list: list[Dict[str, Any]] = []
 
@@ -0,0 +1,326 @@
+"""Resident, mtime-validated index over ``student_profiles/*.json``.
+
+Directory lookups (search, name → candidates, class → ids, full listing) used to
+load every profile file per call. This index keeps one small entry per profile
+file plus:
+
+- ``exact``: normalized name / id / class+name / alias → files, for
+  ``student_candidates_by_name``;
+- ``by_class``: normalized class name → files;
+- ``chars``: character → ``{(file, key_no): count}`` postings over the
+  normalized search keys, used to bound fuzzy scores before scoring.
+
+Fuzzy search computes, from the postings alone, each key's character-multiset
+overlap with the query. ``2 * overlap / (len(query) + len(key))`` is
+``SequenceMatcher.quick_ratio`` and an upper bound of ``ratio``, so profiles are
+scored in descending bound order and the scan stops once no remaining bound can
+beat the current top ``limit``; results are identical to scoring everything.
+
+Freshness: the directory is re-stat'ed (only files whose ``(mtime_ns, size)``
+changed are re-read) when its own stamp changes, and at least every
+``revalidate_sec`` to catch in-place rewrites (several scripts write profiles
+without a rename). Stamps are judged as described in
+:mod:`services.api.dir_index_support`.
+"""
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from .dir_index_support import Stamp, dir_fingerprint, settled
+
+_KeyId = Tuple[str, int]
+_MIN_SEARCH_SCORE = 0.1
+
+
+@dataclass(frozen=True)
+class StudentEntry:
+    student_id: str
+    student_name: str
+    class_name: str
+    class_norm: str
+    keys: Tuple[str, ...]
+    exact: Tuple[str, ...]
+
+
+@dataclass
+class _DirIndex:
+    fingerprint: Optional[Stamp] = None
+    checked_at: float = 0.0
+    unsettled: bool = True
+    files: Dict[str, Tuple[Stamp, StudentEntry]] = field(default_factory=dict)
+    exact: Dict[str, Set[str]] = field(default_factory=dict)
+    by_class: Dict[str, Set[str]] = field(default_factory=dict)
+    chars: Dict[str, Dict[_KeyId, int]] = field(default_factory=dict)
+    profiles: Optional[List[Dict[str, str]]] = None
+
+
+def build_student_entry(
+    profile: Dict[str, Any],
+    stem: str,
+    normalize: Callable[[str], str],
+) -> StudentEntry:
+    student_id = str(profile.get("student_id") or stem).strip()
+    student_name = str(profile.get("student_name") or "")
+    class_name = str(profile.get("class_name") or "")
+    aliases = [str(alias) for alias in (profile.get("aliases") or []) if alias]
+    keys = [normalize(value) for value in [student_id, student_name, class_name, *aliases] if value]
+    exact = [normalize(student_name), normalize(student_id), *(normalize(alias) for alias in aliases)]
+    if class_name and student_name:
+        exact.append(normalize(f"{class_name}{student_name}"))
+    return StudentEntry(
+        student_id=student_id,
+        student_name=student_name,
+        class_name=class_name,
+        class_norm=normalize(class_name),
+        keys=tuple(dict.fromkeys(key for key in keys if key)),
+        exact=tuple(dict.fromkeys(key for key in exact if key)),
+    )
+
+
+class StudentDirectoryIndex:
+    def __init__(self, *, revalidate_sec: float = 5.0, max_dirs: int = 32) -> None:
+        self.revalidate_sec = float(revalidate_sec)
+        self._lock = threading.Lock()
+        self._dirs: "OrderedDict[Tuple[str, Hashable, Hashable], _DirIndex]" = OrderedDict()
+        self._max_dirs = max(1, int(max_dirs))
+
+    # -- maintenance -------------------------------------------------------
+
+    def _remove(self, index: _DirIndex, name: str) -> None:
+        cached = index.files.pop(name, None)
+        if cached is None:
+            return
+        entry = cached[1]
+        for key in entry.exact:
+            index.exact.get(key, set()).discard(name)
+        index.by_class.get(entry.class_norm, set()).discard(name)
+        for key_no, key in enumerate(entry.keys):
+            for ch in set(key):
+                index.chars.get(ch, {}).pop((name, key_no), None)
+
+    def _add(self, index: _DirIndex, name: str, stamp: Stamp, entry: StudentEntry) -> None:
+        index.files[name] = (stamp, entry)
+        for key in entry.exact:
+            index.exact.setdefault(key, set()).add(name)
+        if entry.class_norm:
+            index.by_class.setdefault(entry.class_norm, set()).add(name)
+        for key_no, key in enumerate(entry.keys):
+            for ch, count in Counter(key).items():
+                index.chars.setdefault(ch, {})[(name, key_no)] = count
+
+    def _is_current(self, index: _DirIndex, fingerprint: Optional[Stamp], now: float) -> bool:
+        return (
+            fingerprint is not None
+            and fingerprint == index.fingerprint
+            and not index.unsettled
+            and settled(fingerprint[0])
+            and now - index.checked_at < self.revalidate_sec
+        )
+
+    def _rescan(
+        self,
+        profiles_dir: Path,
+        index: _DirIndex,
+        load: Callable[[Path], Dict[str, Any]],
+        normalize: Callable[[str], str],
+    ) -> Tuple[bool, bool]:
+        """Re-read new or changed files and drop removed ones; returns ``(changed, unsettled)``."""
+        seen: Set[str] = set()
+        changed = unsettled = False
+        with os.scandir(profiles_dir) as entries:
+            for item in entries:
+                if not item.name.endswith(".json") or not item.is_file():
+                    continue
+                try:
+                    st = item.stat()
+                except OSError:
+                    continue
+                seen.add(item.name)
+                stamp = (st.st_mtime_ns, st.st_size)
+                fresh = settled(stamp[0])
+                unsettled = unsettled or not fresh
+                cached = index.files.get(item.name)
+                if cached is not None and cached[0] == stamp and fresh:
+                    continue
+                entry = build_student_entry(load(Path(item.path)) or {}, item.name[: -len(".json")], normalize)
+                self._remove(index, item.name)
+                self._add(index, item.name, stamp, entry)
+                changed = True
+        for name in [name for name in index.files if name not in seen]:
+            self._remove(index, name)
+            changed = True
+        return changed, unsettled
+
+    def _refresh(
+        self,
+        profiles_dir: Path,
+        index: _DirIndex,
+        load: Callable[[Path], Dict[str, Any]],
+        normalize: Callable[[str], str],
+    ) -> None:
+        fingerprint = dir_fingerprint(profiles_dir)
+        now = time.monotonic()
+        if self._is_current(index, fingerprint, now):
+            return
+        if fingerprint is None:
+            changed, unsettled = bool(index.files), False
+            for name in list(index.files):
+                self._remove(index, name)
+        else:
+            changed, unsettled = self._rescan(profiles_dir, index, load, normalize)
+            unsettled = unsettled or not settled(fingerprint[0])
+        if changed:
+            index.profiles = None
+        index.fingerprint = fingerprint
+        index.checked_at = now
+        index.unsettled = unsettled
+
+    def _fresh_index(
+        self,
+        profiles_dir: Path,
+        load: Callable[[Path], Dict[str, Any]],
+        normalize: Callable[[str], str],
+    ) -> _DirIndex:
+        key = (str(profiles_dir), load, normalize)
+        index = self._dirs.get(key)
+        if index is None:
+            index = self._dirs[key] = _DirIndex()
+            while len(self._dirs) > self._max_dirs:
+                self._dirs.popitem(last=False)
+        else:
+            self._dirs.move_to_end(key)
+        self._refresh(profiles_dir, index, load, normalize)
+        return index
+
+    def invalidate(self, profiles_dir: Optional[Path] = None) -> None:
+        """Force the next lookup to re-stat ``profiles_dir`` (all directories when omitted)."""
+        with self._lock:
+            for key, index in self._dirs.items():
+                if profiles_dir is None or key[0] == str(profiles_dir):
+                    index.checked_at = 0.0
+
+    # -- lookups -----------------------------------------------------------
+
+    def _entries(self, index: _DirIndex, names: Any) -> List[StudentEntry]:
+        return [index.files[name][1] for name in sorted(names)]
+
+    def profiles(
+        self,
+        profiles_dir: Path,
+        *,
+        load: Callable[[Path], Dict[str, Any]],
+        normalize: Callable[[str], str],
+    ) -> List[Dict[str, str]]:
+        """``student_id``/``student_name``/``class_name`` of every profile, first file per id wins."""
+        with self._lock:
+            index = self._fresh_index(profiles_dir, load, normalize)
+            if index.profiles is None:
+                out: List[Dict[str, str]] = []
+                seen: Set[str] = set()
+                for entry in self._entries(index, index.files):
+                    if not entry.student_id or entry.student_id in seen:
+                        continue
+                    seen.add(entry.student_id)
+                    out.append(
+                        {
+                            "student_id": entry.student_id,
+                            "student_name": entry.student_name,
+                            "class_name": entry.class_name,
+                        }
+                    )
+                index.profiles = out
+            return [dict(item) for item in index.profiles]
+
+    def exact_matches(
+        self,
+        profiles_dir: Path,
+        key: str,
+        *,
+        load: Callable[[Path], Dict[str, Any]],
+        normalize: Callable[[str], str],
+    ) -> List[StudentEntry]:
+        with self._lock:
+            index = self._fresh_index(profiles_dir, load, normalize)
+            return self._entries(index, index.exact.get(key, ()))
+
+    def class_members(
+        self,
+        profiles_dir: Path,
+        class_norm: str,
+        *,
+        load: Callable[[Path], Dict[str, Any]],
+        normalize: Callable[[str], str],
+    ) -> List[StudentEntry]:
+        with self._lock:
+            index = self._fresh_index(profiles_dir, load, normalize)
+            return self._entries(index, index.by_class.get(class_norm, ()))
+
+    def search(
+        self,
+        profiles_dir: Path,
+        query: str,
+        limit: int,
+        *,
+        load: Callable[[Path], Dict[str, Any]],
+        normalize: Callable[[str], str],
+    ) -> List[Tuple[StudentEntry, float]]:
+        """Top ``limit`` profiles by best key score (substring hit = 1.0, else ``SequenceMatcher.ratio``)."""
+        if not query or limit <= 0:
+            return []
+        with self._lock:
+            index = self._fresh_index(profiles_dir, load, normalize)
+            bounds = _key_bounds(index, query)
+            ranked = _profile_bounds(bounds)
+            top: List[Tuple[float, str]] = []
+            for bound, name in ranked:
+                if bound <= _MIN_SEARCH_SCORE or (len(top) >= limit and bound <= top[0][0]):
+                    break
+                score = _best_score(index.files[name][1], query, bounds[name])
+                if score <= _MIN_SEARCH_SCORE:
+                    continue
+                if len(top) < limit:
+                    heapq.heappush(top, (score, name))
+                elif score > top[0][0]:
+                    heapq.heapreplace(top, (score, name))
+            ordered = sorted(top, key=lambda item: (-item[0], item[1]))
+            return [(index.files[name][1], score) for score, name in ordered]
+
+
+def _key_bounds(index: _DirIndex, query: str) -> Dict[str, Dict[int, float]]:
+    """``{file: {key_no: quick_ratio upper bound}}`` for keys sharing a character with ``query``."""
+    overlap: Dict[_KeyId, int] = {}
+    for ch, wanted in Counter(query).items():
+        for key_id, count in index.chars.get(ch, {}).items():
+            overlap[key_id] = overlap.get(key_id, 0) + min(wanted, count)
+    bounds: Dict[str, Dict[int, float]] = {}
+    for (name, key_no), common in overlap.items():
+        key = index.files[name][1].keys[key_no]
+        bound = 1.0 if common == len(query) and query in key else 2.0 * common / (len(query) + len(key))
+        bounds.setdefault(name, {})[key_no] = bound
+    return bounds
+
+
+def _profile_bounds(bounds: Dict[str, Dict[int, float]]) -> List[Tuple[float, str]]:
+    return sorted(((max(keys.values()), name) for name, keys in bounds.items()), key=lambda item: (-item[0], item[1]))
+
+
+def _best_score(entry: StudentEntry, query: str, key_bounds: Dict[int, float]) -> float:
+    best = 0.0
+    for key_no, bound in sorted(key_bounds.items(), key=lambda item: -item[1]):
+        if bound <= best:
+            break
+        key = entry.keys[key_no]
+        score = 1.0 if query in key else SequenceMatcher(None, query, key).ratio()
+        best = max(best, score)
+    return best
+
+
+STUDENT_DIRECTORY_INDEX = StudentDirectoryIndex()
@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional
 
+from .student_directory_index import STUDENT_DIRECTORY_INDEX
+
 
 @dataclass(frozen=True)
 class StudentImportDeps:
@@ -232,6 +234,9 @@ def import_students_from_responses(
         if len(sample) < 10:
             sample.append(student_id)
 
+    # Profiles are rewritten in place, which does not bump the directory stamp.
+    STUDENT_DIRECTORY_INDEX.invalidate(profiles_dir)
+
     total = len(students)
     if total == 0:
         skipped = 0
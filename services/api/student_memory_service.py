@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from .proposal_index_store import ProposalIndexStore, dedupe_text_key, get_proposal_index_store
+
 _log = logging.getLogger(__name__)
 
 _ALLOWED_MEMORY_TYPES = {
@@ -36,6 +38,7 @@ _BLOCK_PATTERNS: Tuple[Tuple[str, Any], ...] = (
 
 _AUTO_MIN_CONTENT_CHARS = 12
 _AUTO_MAX_PROPOSALS_PER_DAY = 6
+_AUTO_ACTIVE_STATUSES = ("proposed", "applied")
 _ASSIGNMENT_EVIDENCE_HIGH_MASTERY_RATIO = 0.85
 _ASSIGNMENT_EVIDENCE_LOW_MASTERY_RATIO = 0.45
 
@@ -68,10 +71,6 @@ class StudentMemoryDeps:
     assignment_evidence_low_mastery_ratio: float
 
 
-def _norm_text_for_dedupe(value: str) -> str:
-    return re.sub(r"\s+", "", str(value or "").strip().lower())
-
-
 def _safe_fs_id(value: str, prefix: str) -> str:
     raw = str(value or "").strip()
     slug = re.sub(r"[^\w-]+", "_", raw).strip("_")
@@ -101,6 +100,11 @@ def _atomic_write_json(path: Path, payload: Dict[str, Any]) -> None:
     tmp = path.with_suffix(path.suffix + f".tmp.{uuid.uuid4().hex[:8]}")
     tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
     tmp.replace(path)
+    get_proposal_index_store(path.parent).record_write(path, payload)
+
+
+def _proposal_index(teacher_id: str, *, deps: StudentMemoryDeps) -> ProposalIndexStore:
+    return get_proposal_index_store(_proposals_dir(teacher_id, deps=deps))
 
 
 def _append_event(
@@ -338,29 +342,24 @@ def _infer_assignment_evidence_candidate(
 
 
 def _auto_daily_quota_reached(
-    existing: List[Dict[str, Any]],
+    index: ProposalIndexStore,
     *,
+    student_id: str,
     today: str,
 ) -> bool:
-    count = 0
-    for rec in existing:
-        status = str(rec.get("status") or "").strip().lower()
-        if status not in {"proposed", "applied"}:
-            continue
-        created_at = str(rec.get("created_at") or "").strip()
-        if not today or not created_at.startswith(today):
-            continue
-        source = str(rec.get("source") or "").strip().lower()
-        if not source.startswith("auto_"):
-            continue
-        count += 1
-        if count >= _AUTO_MAX_PROPOSALS_PER_DAY:
-            return True
-    return False
+    if not today:
+        return False
+    count = index.count_created(
+        student_id=student_id,
+        statuses=_AUTO_ACTIVE_STATUSES,
+        created_prefix=today,
+        source_prefix="auto_",
+    )
+    return count >= _AUTO_MAX_PROPOSALS_PER_DAY
 
 
 def _auto_find_duplicate(
-    existing: List[Dict[str, Any]],
+    index: ProposalIndexStore,
     *,
     student_id: str,
     memory_type: str,
@@ -368,54 +367,22 @@ def _auto_find_duplicate(
 ) -> Optional[Dict[str, Any]]:
     sid = str(student_id or "").strip()
     mt = str(memory_type or "").strip().lower()
-    norm = _norm_text_for_dedupe(content)
-    if not sid or not mt or not norm:
+    if not sid or not mt or not dedupe_text_key(content):
         return None
-    for rec in existing:
-        status = str(rec.get("status") or "").strip().lower()
-        if status not in {"proposed", "applied"}:
-            continue
-        if str(rec.get("student_id") or "").strip() != sid:
-            continue
-        if str(rec.get("memory_type") or "").strip().lower() != mt:
-            continue
-        if _norm_text_for_dedupe(str(rec.get("content") or "")) == norm:
-            return rec
-    return None
-
-
-def _load_existing_proposals(
-    teacher_id: str,
-    student_id: str,
-    *,
-    deps: StudentMemoryDeps,
-) -> List[Dict[str, Any]]:
-    existing_resp = list_proposals_api(
-        teacher_id,
-        student_id=student_id,
-        status=None,
-        limit=300,
-        deps=deps,
-    )
-    if not bool(existing_resp.get("ok")):
-        return []
-    proposals = existing_resp.get("proposals")
-    if not isinstance(proposals, list):
-        return []
-    return [item for item in proposals if isinstance(item, dict)]
+    return index.find_duplicate(student_id=sid, memory_type=mt, content=content, statuses=_AUTO_ACTIVE_STATUSES)
 
 
 def _resolve_auto_proposal_conflict(
-    existing: List[Dict[str, Any]],
+    index: ProposalIndexStore,
     *,
     today: str,
     student_id: str,
     candidate: Dict[str, Any],
 ) -> Optional[Dict[str, Any]]:
-    if _auto_daily_quota_reached(existing, today=today):
+    if _auto_daily_quota_reached(index, student_id=student_id, today=today):
         return {"ok": False, "created": False, "reason": "daily_quota_reached"}
     duplicate = _auto_find_duplicate(
-        existing,
+        index,
         student_id=student_id,
         memory_type=str(candidate.get("memory_type") or ""),
         content=str(candidate.get("content") or ""),
@@ -458,36 +425,8 @@ def _auto_create_failed_response(created: Dict[str, Any]) -> Dict[str, Any]:
     return {"ok": False, "created": False, "reason": error, "error": error}
 
 
-def _list_proposal_files(proposals_dir: Path) -> List[Path]:
-    def _safe_mtime(path: Path) -> float:
-        try:
-            return path.stat().st_mtime
-        except OSError:
-            return 0.0
-
-    return sorted(proposals_dir.glob("*.json"), key=_safe_mtime, reverse=True)
-
-
-def _proposal_matches_filters(
-    rec: Dict[str, Any],
-    *,
-    student_filter: Optional[str],
-    status_norm: Optional[str],
-) -> bool:
-    rec_status = str(rec.get("status") or "").strip().lower()
-    if status_norm and rec_status != status_norm:
-        return False
-    if not status_norm and rec_status == "deleted":
-        return False
-    if student_filter and str(rec.get("student_id") or "").strip() != student_filter:
-        return False
-    return True
-
-
-def _normalize_listed_proposal(rec: Dict[str, Any], *, path: Path) -> Dict[str, Any]:
+def _normalize_listed_proposal(rec: Dict[str, Any]) -> Dict[str, Any]:
     proposal = dict(rec)
-    if "proposal_id" not in proposal:
-        proposal["proposal_id"] = path.stem
     if not isinstance(proposal.get("provenance"), dict):
         proposal["provenance"] = _build_student_memory_provenance(
             proposal.get("source"),
@@ -520,9 +459,9 @@ def student_memory_auto_propose_from_turn_api(
         return {"ok": False, "created": False, "reason": "no_candidate"}
 
     teacher_id_final = deps.resolve_teacher_id(teacher_input)
-    existing = _load_existing_proposals(teacher_id_final, sid, deps=deps)
+    index = _proposal_index(teacher_id_final, deps=deps)
     today = str(deps.now_iso() or "").strip().split("T", 1)[0]
-    conflict = _resolve_auto_proposal_conflict(existing, today=today, student_id=sid, candidate=candidate)
+    conflict = _resolve_auto_proposal_conflict(index, today=today, student_id=sid, candidate=candidate)
     if conflict:
         return conflict
 
@@ -591,9 +530,9 @@ def student_memory_auto_propose_from_assignment_evidence_api(
         return {"ok": False, "created": False, "reason": "no_candidate"}
 
     teacher_id_final = deps.resolve_teacher_id(teacher_input)
-    existing = _load_existing_proposals(teacher_id_final, sid, deps=deps)
+    index = _proposal_index(teacher_id_final, deps=deps)
     today = str(deps.now_iso() or "").strip().split("T", 1)[0]
-    conflict = _resolve_auto_proposal_conflict(existing, today=today, student_id=sid, candidate=candidate)
+    conflict = _resolve_auto_proposal_conflict(index, today=today, student_id=sid, candidate=candidate)
     if conflict:
         return conflict
 
@@ -646,18 +585,12 @@ def list_proposals_api(
         return {"ok": False, "error": "invalid_status"}
 
     take = max(1, min(int(limit or 20), 200))
-    proposals_dir = _proposals_dir(teacher_id_final, deps=deps)
-
-    items: List[Dict[str, Any]] = []
-    for path in _list_proposal_files(proposals_dir):
-        rec = _load_record(path)
-        if not rec:
-            continue
-        if not _proposal_matches_filters(rec, student_filter=student_filter, status_norm=status_norm):
-            continue
-        items.append(_normalize_listed_proposal(rec, path=path))
-        if len(items) >= take:
-            break
+    records = _proposal_index(teacher_id_final, deps=deps).list_records(
+        status=status_norm,
+        student_id=student_filter,
+        limit=take,
+    )
+    items = [_normalize_listed_proposal(rec) for rec in records]
 
     return {
         "ok": True,
@@ -761,22 +694,15 @@ def insights_api(
     type_counts: Dict[str, int] = {}
     total = 0
 
-    proposals_dir = _proposals_dir(teacher_id_final, deps=deps)
-    for path in proposals_dir.glob("*.json"):
-        rec = _load_record(path)
-        if not rec:
-            continue
-        if student_filter and str(rec.get("student_id") or "").strip() != student_filter:
-            continue
-        created_at = str(rec.get("created_at") or "").strip()
+    for status, mtype, created_at in _proposal_index(teacher_id_final, deps=deps).facets(student_id=student_filter):
         try:
             created_dt = datetime.fromisoformat(created_at)
         except Exception:
             created_dt = None
         if created_dt is not None and created_dt < cutoff:
             continue
-        status = str(rec.get("status") or "proposed").strip().lower() or "proposed"
-        mtype = str(rec.get("memory_type") or "unknown").strip().lower() or "unknown"
+        status = status or "proposed"
+        mtype = mtype or "unknown"
         status_counts[status] = status_counts.get(status, 0) + 1
         type_counts[mtype] = type_counts.get(mtype, 0) + 1
         total += 1
@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from fastapi import HTTPException
 
@@ -35,6 +35,14 @@ class StudentSubmitDeps:
     resolve_teacher_id: Callable[[Optional[str]], str]
     diag_log: Callable[[str, Dict[str, Any]], None]
     sanitize_filename: Callable[[str], str] = _default_sanitize_filename
+    save_upload_file: Optional[Callable[[Any, Path], Awaitable[int]]] = None
+    refresh_assignment_progress_student: Optional[Callable[[str, str], Dict[str, Any]]] = None
+
+
+def _refresh_student_progress(deps: StudentSubmitDeps, assignment_id: str, student_id: str) -> Dict[str, Any]:
+    if deps.refresh_assignment_progress_student is not None:
+        return deps.refresh_assignment_progress_student(assignment_id, student_id)
+    return deps.compute_assignment_progress(assignment_id, True)
 
 
 def _find_student_evidence(
@@ -77,7 +85,12 @@ async def submit(
         if not filename:
             continue
         dest = deps.uploads_dir / filename
-        dest.write_bytes(await upload_file.read())
+        if deps.save_upload_file is not None:
+            await deps.save_upload_file(upload_file, dest)
+        else:
+            # Replace rather than rewrite: an earlier upload may be a blob-store hardlink.
+            dest.unlink(missing_ok=True)
+            dest.write_bytes(await upload_file.read())
         file_paths.append(str(dest))
 
     script = deps.app_root / "scripts" / "grade_submission.py"
@@ -100,7 +113,7 @@ async def submit(
     out = deps.run_script(args)
     if safe_assignment_id:
         try:
-            progress = deps.compute_assignment_progress(safe_assignment_id, True)
+            progress = _refresh_student_progress(deps, safe_assignment_id, safe_student_id)
             evidence = _find_student_evidence(progress=progress, student_id=safe_student_id)
             if evidence:
                 teacher_id = str(deps.resolve_teacher_id(None) or "").strip() or None
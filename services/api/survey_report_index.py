@@ -0,0 +1,380 @@
+"""Per-teacher index over survey reports and in-flight survey jobs.
+
+Listing used to glob every ``survey_reports/*.json`` and
+``survey_jobs/*/job.json`` and filter by teacher afterwards, so its cost grew
+with the whole tenant's history.  This SQLite index keeps one row per listed
+report (a finished report, or a job that has no report yet) keyed by
+``report_id`` with the teacher, status and sort columns, and serves
+keyset-paginated pages straight from a covering index.
+
+Rows are maintained incrementally by ``write_survey_report`` /
+``write_survey_job``.  The index is rebuilt from disk when it is first opened,
+when :meth:`SurveyReportIndex.invalidate` is called, or when the report/job
+directories were changed by something other than those writers (detected from
+the directory mtimes recorded after every indexed write).
+"""
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .analysis_report_index import decode_listing_cursor, encode_listing_cursor
+from .config import DATA_DIR, UPLOADS_DIR
+from .dir_index_support import InstanceRegistry, SqliteIndex, dir_mtime_ns
+from .paths import _path_from_core
+
+_STATUS_RANK = {
+    "teacher_notified": 6,
+    "analysis_ready": 5,
+    "review": 4,
+    "analysis_running": 3,
+    "bundle_ready": 2,
+    "normalized": 1,
+    "queued": 0,
+}
+
+_INDEX_FILENAME = "survey_report_index.sqlite3"
+
+
+def status_rank(status: str) -> int:
+    return _STATUS_RANK.get(str(status or "").strip(), 0)
+
+
+@dataclass(frozen=True)
+class SurveyReportIndexEntry:
+    report_id: str
+    teacher_id: str
+    status: str
+    updated_at: str
+    created_at: str
+    source: str
+    job_id: str
+
+    @property
+    def status_rank(self) -> int:
+        return status_rank(self.status)
+
+
+def entry_from_report(report: Dict[str, Any], *, fallback_id: str = "") -> Optional[SurveyReportIndexEntry]:
+    report_id = str(report.get("report_id") or fallback_id or "").strip()
+    if not report_id:
+        return None
+    return SurveyReportIndexEntry(
+        report_id=report_id,
+        teacher_id=str(report.get("teacher_id") or "").strip(),
+        status=str(report.get("status") or "unknown").strip() or "unknown",
+        updated_at=str(report.get("updated_at") or "").strip(),
+        created_at=str(report.get("created_at") or "").strip(),
+        source="report",
+        job_id=str(report.get("job_id") or "").strip(),
+    )
+
+
+def entry_from_job(job: Dict[str, Any], *, fallback_id: str = "") -> Optional[SurveyReportIndexEntry]:
+    job_id = str(job.get("job_id") or fallback_id or "").strip()
+    report_id = str(job.get("report_id") or job_id or "").strip()
+    if not report_id:
+        return None
+    return SurveyReportIndexEntry(
+        report_id=report_id,
+        teacher_id=str(job.get("teacher_id") or "").strip(),
+        status=str(job.get("status") or job.get("queue_status") or "queued").strip() or "queued",
+        updated_at=str(job.get("updated_at") or "").strip(),
+        created_at=str(job.get("created_at") or "").strip(),
+        source="job",
+        job_id=job_id,
+    )
+
+
+def encode_cursor(entry: SurveyReportIndexEntry) -> str:
+    raw = json.dumps(
+        [entry.status_rank, entry.updated_at, entry.created_at, entry.report_id],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[int, str, str, str]]:
+    try:
+        rank, updated_at, created_at, report_id = json.loads(base64.urlsafe_b64decode(str(cursor).encode("ascii")))
+        return int(rank), str(updated_at), str(created_at), str(report_id)
+    except (TypeError, ValueError):
+        return None
+
+
+def _load_json(path: Path) -> Dict[str, Any]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+class SurveyReportIndex(SqliteIndex):
+    def __init__(self, db_path: Path, *, reports_dir: Path, jobs_dir: Path) -> None:
+        super().__init__(db_path)
+        self.reports_dir = Path(reports_dir)
+        self.jobs_dir = Path(jobs_dir)
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS survey_report_index (
+                report_id TEXT PRIMARY KEY,
+                teacher_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                status_rank INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                source TEXT NOT NULL,
+                job_id TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_survey_report_teacher_order
+            ON survey_report_index (teacher_id, status_rank, updated_at, created_at, report_id)
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_survey_report_teacher_status
+            ON survey_report_index (teacher_id, status, status_rank, updated_at, created_at, report_id)
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_survey_report_teacher_updated
+            ON survey_report_index (teacher_id, updated_at, created_at, report_id)
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_survey_report_job ON survey_report_index (job_id)")
+        conn.execute("CREATE TABLE IF NOT EXISTS survey_report_index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    # -- freshness ---------------------------------------------------------
+
+    def _fingerprint(self) -> str:
+        return f"{dir_mtime_ns(self.reports_dir)}:{dir_mtime_ns(self.jobs_dir)}"
+
+    def _stored_fingerprint(self, conn: sqlite3.Connection) -> Optional[str]:
+        row = conn.execute("SELECT value FROM survey_report_index_meta WHERE key = 'fingerprint'").fetchone()
+        return str(row["value"]) if row is not None else None
+
+    def _store_fingerprint(self, conn: sqlite3.Connection, value: Optional[str] = None) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO survey_report_index_meta (key, value) VALUES ('fingerprint', ?)",
+            (self._fingerprint() if value is None else value,),
+        )
+
+    def invalidate(self) -> None:
+        if not self.exists():
+            return
+        with self._lock, self._open() as conn:
+            conn.execute("DELETE FROM survey_report_index_meta WHERE key = 'fingerprint'")
+
+    def ensure_fresh(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._open() as conn:
+            if self._stored_fingerprint(conn) == self._fingerprint():
+                return
+        self.rebuild()
+
+    # -- writes ------------------------------------------------------------
+
+    def _upsert(self, conn: sqlite3.Connection, entry: SurveyReportIndexEntry) -> None:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO survey_report_index
+                (report_id, teacher_id, status, status_rank, updated_at, created_at, source, job_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                entry.report_id,
+                entry.teacher_id,
+                entry.status,
+                entry.status_rank,
+                entry.updated_at,
+                entry.created_at,
+                entry.source,
+                entry.job_id,
+            ),
+        )
+
+    def _apply_report(self, conn: sqlite3.Connection, entry: SurveyReportIndexEntry) -> None:
+        # A finished report hides the job row it came from.
+        if entry.job_id:
+            conn.execute(
+                "DELETE FROM survey_report_index WHERE source = 'job' AND job_id = ? AND report_id != ?",
+                (entry.job_id, entry.report_id),
+            )
+        self._upsert(conn, entry)
+
+    def _apply_job(self, conn: sqlite3.Connection, entry: SurveyReportIndexEntry) -> None:
+        shadowed = conn.execute(
+            "SELECT 1 FROM survey_report_index WHERE source = 'report' AND (report_id = ? OR job_id = ?) LIMIT 1",
+            (entry.report_id, entry.job_id),
+        ).fetchone()
+        if shadowed is None:
+            self._upsert(conn, entry)
+
+    def _record_write(self, entry: Optional[SurveyReportIndexEntry]) -> None:
+        if entry is None or not self.exists():
+            # Not built yet: the first listing builds it from disk.
+            return
+        with self._lock, self._open() as conn:
+            stale = self._stored_fingerprint(conn) is None
+            conn.execute("BEGIN IMMEDIATE")
+            if entry.source == "report":
+                self._apply_report(conn, entry)
+            else:
+                self._apply_job(conn, entry)
+            if not stale:
+                self._store_fingerprint(conn)
+            conn.execute("COMMIT")
+
+    def record_report(self, report: Dict[str, Any], *, fallback_id: str = "") -> None:
+        self._record_write(entry_from_report(report, fallback_id=fallback_id))
+
+    def record_job(self, job: Dict[str, Any], *, fallback_id: str = "") -> None:
+        self._record_write(entry_from_job(job, fallback_id=fallback_id))
+
+    def remove(self, report_id: str) -> None:
+        if not self.exists():
+            return
+        with self._lock, self._open() as conn:
+            conn.execute("DELETE FROM survey_report_index WHERE report_id = ?", (report_id,))
+            conn.execute("DELETE FROM survey_report_index_meta WHERE key = 'fingerprint'")
+
+    def _scan_disk(self) -> Tuple[List[SurveyReportIndexEntry], List[SurveyReportIndexEntry]]:
+        reports: List[SurveyReportIndexEntry] = []
+        jobs: List[SurveyReportIndexEntry] = []
+        if self.reports_dir.exists():
+            for path in sorted(self.reports_dir.glob("*.json")):
+                entry = entry_from_report(_load_json(path), fallback_id=path.stem)
+                if entry is not None:
+                    reports.append(entry)
+        if self.jobs_dir.exists():
+            for path in sorted(self.jobs_dir.glob("*/job.json")):
+                payload = _load_json(path)
+                entry = entry_from_job(payload, fallback_id=path.parent.name) if payload else None
+                if entry is not None:
+                    jobs.append(entry)
+        return reports, jobs
+
+    def rebuild(self) -> int:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._open() as conn:
+            fingerprint = self._fingerprint()
+            reports, jobs = self._scan_disk()
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM survey_report_index")
+            for entry in reports:
+                self._apply_report(conn, entry)
+            for entry in jobs:
+                self._apply_job(conn, entry)
+            # Fingerprint taken before the scan: writes racing the scan make the
+            # next check rebuild again instead of being lost.
+            self._store_fingerprint(conn, fingerprint)
+            conn.execute("COMMIT")
+            count = conn.execute("SELECT COUNT(*) AS n FROM survey_report_index").fetchone()["n"]
+        return int(count)
+
+    # -- reads -------------------------------------------------------------
+
+    def page(
+        self,
+        *,
+        teacher_id: str,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order: str = "status",
+    ) -> Tuple[List[SurveyReportIndexEntry], Optional[str]]:
+        """Entries for ``teacher_id`` in listing order, plus the next-page cursor.
+
+        ``order="status"`` is the survey listing's own order (most advanced
+        status first); ``order="updated"`` is the newest-first order shared with
+        the other analysis domains, with cursors from
+        :func:`~services.api.analysis_report_index.encode_listing_cursor`.
+        """
+        self.ensure_fresh()
+        by_updated = order == "updated"
+        clauses = ["teacher_id = ?"]
+        params: List[Any] = [teacher_id]
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if cursor and by_updated:
+            after_updated = decode_listing_cursor(cursor)
+            if after_updated is not None:
+                clauses.append("(updated_at, created_at, report_id) < (?, ?, ?)")
+                params.extend(after_updated)
+        elif cursor:
+            after = decode_cursor(cursor)
+            if after is not None:
+                clauses.append("(status_rank, updated_at, created_at, report_id) < (?, ?, ?, ?)")
+                params.extend(after)
+        order_by = "updated_at DESC, created_at DESC, report_id DESC"
+        if not by_updated:
+            order_by = "status_rank DESC, " + order_by
+        query = (
+            "SELECT report_id, teacher_id, status, updated_at, created_at, source, job_id "
+            f"FROM survey_report_index WHERE {' AND '.join(clauses)} ORDER BY {order_by}"
+        )
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(max(1, int(limit)) + 1)
+        with self._open() as conn:
+            rows = conn.execute(query, params).fetchall()
+        entries = [_entry_from_row(row) for row in rows]
+        next_cursor = None
+        if limit is not None and len(entries) > max(1, int(limit)):
+            entries = entries[: max(1, int(limit))]
+            last = entries[-1]
+            next_cursor = (
+                encode_listing_cursor(last.updated_at, last.created_at, last.report_id)
+                if by_updated
+                else encode_cursor(last)
+            )
+        return entries, next_cursor
+
+
+def _entry_from_row(row: sqlite3.Row) -> SurveyReportIndexEntry:
+    return SurveyReportIndexEntry(
+        report_id=str(row["report_id"]),
+        teacher_id=str(row["teacher_id"]),
+        status=str(row["status"]),
+        updated_at=str(row["updated_at"]),
+        created_at=str(row["created_at"]),
+        source=str(row["source"]),
+        job_id=str(row["job_id"]),
+    )
+
+
+_INDEXES: InstanceRegistry[SurveyReportIndex] = InstanceRegistry()
+
+
+def get_survey_report_index(data_dir: Path, uploads_dir: Path) -> SurveyReportIndex:
+    db_path = Path(data_dir) / "analysis" / _INDEX_FILENAME
+    return _INDEXES.get(
+        db_path,
+        lambda: SurveyReportIndex(
+            db_path,
+            reports_dir=Path(data_dir) / "survey_reports",
+            jobs_dir=Path(uploads_dir) / "survey_jobs",
+        ),
+    )
+
+
+def survey_report_index_for_core(core: Any | None = None) -> SurveyReportIndex:
+    return get_survey_report_index(
+        _path_from_core(core, "DATA_DIR", DATA_DIR),
+        _path_from_core(core, "UPLOADS_DIR", UPLOADS_DIR),
+    )
+
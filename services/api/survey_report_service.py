@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -12,6 +11,7 @@ from .api_models import SurveyReportDetail, SurveyReportSummary, SurveyReviewQue
 from .config import DATA_DIR, UPLOADS_DIR
 from .job_repository import load_survey_job, write_survey_job
 from .review_queue_service import ReviewQueueDeps, has_open_review_item, list_review_items
+from .survey_report_index import SurveyReportIndex, SurveyReportIndexEntry, get_survey_report_index
 from .survey_repository import (
     load_survey_bundle,
     load_survey_report,
@@ -40,6 +40,7 @@ class SurveyReportReadDeps:
     review_queue_deps: ReviewQueueDeps
     now_iso: Callable[[], str]
     metrics_service: Any | None = None
+    report_index: SurveyReportIndex | None = None
 
 
 
@@ -65,6 +66,7 @@ def build_survey_report_deps(core: Any | None = None) -> SurveyReportReadDeps:
         ),
         now_iso=lambda: datetime.now().isoformat(timespec="seconds"),
         metrics_service=metrics_service,
+        report_index=get_survey_report_index(data_dir, uploads_dir),
     )
 
 
@@ -77,45 +79,6 @@ def _require_teacher_id(teacher_id: str) -> str:
 
 
 
-def _load_json(path: Path) -> Dict[str, Any]:
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except FileNotFoundError:
-        raise
-    except Exception:
-        return {}
-    return payload if isinstance(payload, dict) else {}
-
-
-
-def _iter_report_payloads(deps: SurveyReportReadDeps) -> List[Dict[str, Any]]:
-    report_dir = deps.data_dir / "survey_reports"
-    rows: List[Dict[str, Any]] = []
-    if not report_dir.exists():
-        return rows
-    for path in sorted(report_dir.glob("*.json")):
-        payload = _load_json(path)
-        if payload:
-            payload.setdefault("report_id", path.stem)
-            rows.append(payload)
-    return rows
-
-
-
-def _iter_job_payloads(deps: SurveyReportReadDeps) -> List[Dict[str, Any]]:
-    jobs_dir = deps.uploads_dir / "survey_jobs"
-    rows: List[Dict[str, Any]] = []
-    if not jobs_dir.exists():
-        return rows
-    for path in sorted(jobs_dir.glob("*/job.json")):
-        payload = _load_json(path)
-        if payload:
-            payload.setdefault("job_id", path.parent.name)
-            rows.append(payload)
-    return rows
-
-
-
 def _safe_float(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -210,62 +173,73 @@ def _summary_from_job(job: Dict[str, Any], deps: SurveyReportReadDeps) -> Dict[s
 
 
 
-def _status_rank(status: str) -> int:
-    order = {
-        "teacher_notified": 6,
-        "analysis_ready": 5,
-        "review": 4,
-        "analysis_running": 3,
-        "bundle_ready": 2,
-        "normalized": 1,
-        "queued": 0,
-    }
-    return order.get(str(status or "").strip(), 0)
+def _summary_for_entry(entry: SurveyReportIndexEntry, deps: SurveyReportReadDeps) -> Optional[Dict[str, Any]]:
+    try:
+        if entry.source == "report":
+            report = deps.load_survey_report(entry.report_id)
+            if not isinstance(report, dict):
+                return None
+            report.setdefault("report_id", entry.report_id)
+            return _summary_from_report(report, deps)
+        job = deps.load_survey_job(entry.job_id or entry.report_id)
+        if not isinstance(job, dict):
+            return None
+        job.setdefault("job_id", entry.job_id)
+        return _summary_from_job(job, deps)
+    except FileNotFoundError:
+        return None
+
 
 
+def _report_index(deps: SurveyReportReadDeps) -> SurveyReportIndex:
+    return deps.report_index or get_survey_report_index(deps.data_dir, deps.uploads_dir)
 
-def _sort_key(summary: Dict[str, Any]) -> Tuple[int, str, str]:
-    updated_at = str(summary.get("updated_at") or "")
-    created_at = str(summary.get("created_at") or "")
-    return (_status_rank(str(summary.get("status") or "")), updated_at, created_at)
 
 
+def list_survey_reports(
+    *,
+    teacher_id: str,
+    status: str | None,
+    deps: SurveyReportReadDeps,
+    limit: int | None = None,
+    cursor: str | None = None,
+    order: str = "status",
+) -> Dict[str, Any]:
+    """List a teacher's reports (and report-less jobs) from the report index.
 
-def list_survey_reports(*, teacher_id: str, status: str | None, deps: SurveyReportReadDeps) -> Dict[str, Any]:
+    Without ``limit`` every matching item is returned; with it, one page plus a
+    ``next_cursor`` for the following page (``None`` on the last page).  Only
+    the rows on the page are loaded from disk.  ``order`` is passed to
+    :meth:`SurveyReportIndex.page`.
+    """
     teacher_id_final = _require_teacher_id(teacher_id)
     normalized_status = str(status or "").strip() or None
+    index = _report_index(deps)
+    entries, next_cursor = index.page(
+        teacher_id=teacher_id_final,
+        status=normalized_status,
+        limit=limit,
+        cursor=cursor,
+        order=order,
+    )
 
-    report_payloads = _iter_report_payloads(deps)
     summaries: List[Dict[str, Any]] = []
-    seen_report_ids: set[str] = set()
-    seen_job_ids: set[str] = set()
-
-    for report in report_payloads:
-        summary = _summary_from_report(report, deps)
-        if summary["teacher_id"] != teacher_id_final:
-            continue
-        if normalized_status and summary["status"] != normalized_status:
-            continue
-        summaries.append(summary)
-        seen_report_ids.add(summary["report_id"])
-        job_id = str(report.get("job_id") or "").strip()
-        if job_id:
-            seen_job_ids.add(job_id)
-
-    for job in _iter_job_payloads(deps):
-        job_id = str(job.get("job_id") or "").strip()
-        report_id = str(job.get("report_id") or job_id or "").strip()
-        if not report_id or report_id in seen_report_ids or job_id in seen_job_ids:
+    for entry in entries:
+        summary = _summary_for_entry(entry, deps)
+        if summary is None:
+            # Deleted behind the index's back: drop the row and rescan next time.
+            index.remove(entry.report_id)
             continue
-        summary = _summary_from_job(job, deps)
         if summary["teacher_id"] != teacher_id_final:
             continue
         if normalized_status and summary["status"] != normalized_status:
             continue
         summaries.append(summary)
 
-    summaries.sort(key=_sort_key, reverse=True)
-    return {"items": summaries}
+    payload: Dict[str, Any] = {"items": summaries}
+    if limit is not None:
+        payload["next_cursor"] = next_cursor
+    return payload
 
 
 
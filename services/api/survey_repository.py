@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import json
+import logging
 import re
+import sqlite3
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -12,6 +14,9 @@ from .paths import (
     survey_report_path,
     survey_review_queue_path,
 )
+from .survey_report_index import survey_report_index_for_core
+
+_log = logging.getLogger(__name__)
 
 
 def _safe_payload_name(name: str) -> str:
@@ -66,6 +71,10 @@ def write_survey_report(report_id: str, payload: Dict[str, Any], *, core: Any |
     target = survey_report_path(report_id, core=core)
     target.parent.mkdir(parents=True, exist_ok=True)
     _atomic_write_json(target, payload)
+    try:
+        survey_report_index_for_core(core).record_report(payload, fallback_id=target.stem)
+    except sqlite3.Error:
+        _log.warning("survey report index update failed for %s", report_id, exc_info=True)
     return target
 
 
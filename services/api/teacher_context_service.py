@@ -4,7 +4,11 @@ import json
 import logging
 import re
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Protocol
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Protocol, Tuple
+
+from .session_checkpoint_store import iter_session_view_lines
+from .teacher_memory_context_cache import TeacherMemoryContextCache
 
 _log = logging.getLogger(__name__)
 
@@ -46,20 +50,19 @@ def teacher_session_summary_text(
         log.debug("Failed to resolve session file path for teacher=%s session=%s", teacher_id, session_id)
         return ""
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            for _idx, line in zip(range(5), handle):
-                line = str(line or "").strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                except Exception:
-                    log.debug("Skipping non-JSON line in session file %s", path)
-                    continue
-                if isinstance(obj, dict) and obj.get("kind") == "session_summary":
-                    summary = str(obj.get("content") or "").strip()
-                    return (summary[:max_chars] + "…") if max_chars and len(summary) > max_chars else summary
-                break
+        for _idx, line in zip(range(5), iter_session_view_lines(path)):
+            line = str(line or "").strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except Exception:
+                log.debug("Skipping non-JSON line in session file %s", path)
+                continue
+            if isinstance(obj, dict) and obj.get("kind") == "session_summary":
+                summary = str(obj.get("content") or "").strip()
+                return (summary[:max_chars] + "…") if max_chars and len(summary) > max_chars else summary
+            break
     except Exception:
         log.warning("Failed to read session file %s for summary", path, exc_info=True)
         return ""
@@ -90,9 +93,12 @@ def build_teacher_memory_context_reader(
     teacher_workspace_file: Callable[[str, str], Any],
     teacher_memory_rank_score: Callable[[Dict[str, Any]], float],
     teacher_memory_context_max_entries: int,
+    context_cache: Optional[TeacherMemoryContextCache] = None,
+    context_cache_key: Optional[Callable[[str], str]] = None,
+    context_fingerprint: Optional[Callable[[str], Optional[Hashable]]] = None,
 ) -> Callable[[str, int], str]:
-    def _reader(teacher_id: str, max_chars: int = 4000) -> str:
-        return teacher_memory_context_text(
+    def _render(teacher_id: str, max_chars: int) -> Tuple[str, Optional[float]]:
+        return _render_teacher_memory_context(
             teacher_id,
             max_chars=max_chars,
             teacher_memory_active_applied_records=teacher_memory_active_applied_records,
@@ -102,9 +108,30 @@ def build_teacher_memory_context_reader(
             teacher_memory_context_max_entries=teacher_memory_context_max_entries,
         )
 
+    def _reader(teacher_id: str, max_chars: int = 4000) -> str:
+        if context_cache is None or context_fingerprint is None:
+            return _render(teacher_id, max_chars)[0]
+        key = context_cache_key(teacher_id) if context_cache_key is not None else teacher_id
+        return context_cache.get_or_build(
+            key,
+            max_chars,
+            context_fingerprint(teacher_id),
+            lambda: _render(teacher_id, max_chars),
+        )
+
     return _reader
 
 
+def _record_expires_ts(rec: Dict[str, Any]) -> Optional[float]:
+    raw = str(rec.get("expires_at") or "").strip()
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
 def teacher_memory_context_text(
     teacher_id: str,
     max_chars: int = 4000,
@@ -115,16 +142,39 @@ def teacher_memory_context_text(
     teacher_memory_rank_score: Callable[[Dict[str, Any]], float],
     teacher_memory_context_max_entries: int,
 ) -> str:
+    return _render_teacher_memory_context(
+        teacher_id,
+        max_chars=max_chars,
+        teacher_memory_active_applied_records=teacher_memory_active_applied_records,
+        teacher_read_text=teacher_read_text,
+        teacher_workspace_file=teacher_workspace_file,
+        teacher_memory_rank_score=teacher_memory_rank_score,
+        teacher_memory_context_max_entries=teacher_memory_context_max_entries,
+    )[0]
+
+
+def _render_teacher_memory_context(
+    teacher_id: str,
+    max_chars: int = 4000,
+    *,
+    teacher_memory_active_applied_records: TeacherMemoryActiveAppliedRecordsCallable,
+    teacher_read_text: Callable[..., str],
+    teacher_workspace_file: Callable[[str, str], Any],
+    teacher_memory_rank_score: Callable[[Dict[str, Any]], float],
+    teacher_memory_context_max_entries: int,
+) -> Tuple[str, Optional[float]]:
+    """Render the memory block; also returns when its first record expires (None: no expiry)."""
     if max_chars <= 0:
-        return ""
+        return "", None
     active = teacher_memory_active_applied_records(
         teacher_id,
         target="MEMORY",
         limit=teacher_memory_context_max_entries,
     )
     if not active:
-        return teacher_read_text(teacher_workspace_file(teacher_id, "MEMORY.md"), max_chars=max_chars).strip()
+        return teacher_read_text(teacher_workspace_file(teacher_id, "MEMORY.md"), max_chars=max_chars).strip(), None
 
+    expiries = [ts for ts in (_record_expires_ts(rec) for rec in active) if ts is not None]
     lines: List[str] = []
     used = 0
     for rec in active:
@@ -139,7 +189,7 @@ def teacher_memory_context_text(
             break
         lines.append(line)
         used += len(line) + 1
-    return "\n".join(lines).strip()
+    return "\n".join(lines).strip(), (min(expiries) if expiries else None)
 
 
 @dataclass(frozen=True)
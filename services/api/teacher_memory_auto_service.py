@@ -6,6 +6,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Sequence
 
+from .session_checkpoint_store import session_view_lines
+
 _log = logging.getLogger(__name__)
 
 
@@ -120,7 +122,7 @@ def _low_priority_inferred_result(
 
 def _load_session_dialog(path: Any) -> List[Dict[str, Any]]:
     records: List[Dict[str, Any]] = []
-    for line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
+    for line in session_view_lines(path):
         text = (line or "").strip()
         if not text:
             continue
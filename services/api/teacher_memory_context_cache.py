@@ -0,0 +1,100 @@
+"""Materialized per-teacher "Long-Term Memory" context blocks.
+
+Rendering the block ranks every active applied proposal, so chat turns read a
+cached copy instead. An entry is reused only while
+
+- its fingerprint (proposals directory stamp + MEMORY.md stamp, supplied by the
+  caller) is unchanged, which also catches writes from other workers;
+- no rendered record has reached its ``expires_at``;
+- it is younger than ``ttl_sec``, which bounds drift of age-decayed rank scores.
+
+Proposal writers in this process call :meth:`TeacherMemoryContextCache.invalidate`
+(write-through) so the next turn re-renders without waiting on the filesystem.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from . import settings as _settings
+
+
+@dataclass(frozen=True)
+class _ContextEntry:
+    fingerprint: Hashable
+    text: str
+    built_at: float
+    valid_until: Optional[float]
+
+
+class TeacherMemoryContextCache:
+    def __init__(
+        self,
+        *,
+        ttl_sec: float = 300.0,
+        max_entries: int = 512,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_sec = float(ttl_sec)
+        self._max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], _ContextEntry]" = OrderedDict()
+        self.stats = {"hits": 0, "builds": 0, "invalidations": 0}
+
+    def get_or_build(
+        self,
+        key: str,
+        max_chars: int,
+        fingerprint: Optional[Hashable],
+        build: Callable[[], Tuple[str, Optional[float]]],
+    ) -> str:
+        """Return the cached block for ``key`` or render it with ``build``.
+
+        ``build`` returns ``(text, valid_until)``; a ``None`` fingerprint means
+        the inputs are too fresh to trust, so the block is rendered uncached.
+        """
+        if fingerprint is None or self.ttl_sec <= 0:
+            return build()[0]
+        slot = (key, int(max_chars))
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(slot)
+            if (
+                entry is not None
+                and entry.fingerprint == fingerprint
+                and now - entry.built_at < self.ttl_sec
+                and (entry.valid_until is None or now < entry.valid_until)
+            ):
+                self._entries.move_to_end(slot)
+                self.stats["hits"] += 1
+                return entry.text
+        text, valid_until = build()
+        with self._lock:
+            self.stats["builds"] += 1
+            self._entries[slot] = _ContextEntry(
+                fingerprint=fingerprint,
+                text=text,
+                built_at=now,
+                valid_until=valid_until,
+            )
+            self._entries.move_to_end(slot)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return text
+
+    def invalidate(self, key: Optional[Any] = None) -> None:
+        key_str = None if key is None else str(key)
+        with self._lock:
+            self.stats["invalidations"] += 1
+            if key_str is None:
+                self._entries.clear()
+                return
+            for slot in [slot for slot in self._entries if slot[0] == key_str]:
+                self._entries.pop(slot, None)
+
+
+TEACHER_MEMORY_CONTEXT_CACHE = TeacherMemoryContextCache(ttl_sec=_settings.teacher_memory_context_cache_ttl_sec())
@@ -7,9 +7,11 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from . import mem0_adapter
+from . import settings as _settings
 from .config import (
     _TEACHER_MEMORY_AUTO_INFER_BLOCK_PATTERNS,
     _TEACHER_MEMORY_AUTO_INFER_STABLE_PATTERNS,
@@ -54,6 +56,7 @@ from .paths import (
     teacher_workspace_dir,
     teacher_workspace_file,
 )
+from .proposal_index_store import get_proposal_index_store
 from .session_store import (
     load_teacher_sessions_index,
     save_teacher_sessions_index,
@@ -66,10 +69,12 @@ from .teacher_context_service import (
 from .teacher_memory_apply_service import TeacherMemoryApplyDeps
 from .teacher_memory_apply_service import teacher_memory_apply as teacher_memory_apply_impl
 from .teacher_memory_auto_service import TeacherMemoryAutoDeps
+from .teacher_memory_context_cache import TEACHER_MEMORY_CONTEXT_CACHE
 from .teacher_memory_governance_service import TeacherMemoryGovernanceDeps
 from .teacher_memory_insights_service import TeacherMemoryInsightsDeps
 from .teacher_memory_propose_service import TeacherMemoryProposeDeps
 from .teacher_memory_propose_service import teacher_memory_propose as teacher_memory_propose_impl
+from .teacher_memory_record_index import proposals_dir_stamp
 from .teacher_memory_record_service import (
     TeacherMemoryRecordDeps,
     teacher_memory_auto_infer_candidate,
@@ -105,8 +110,10 @@ from .teacher_memory_storage_service import (
 from .teacher_memory_store_service import (
     TeacherMemoryStoreDeps,
     teacher_memory_active_applied_records,
+    teacher_memory_event_stats,
     teacher_memory_load_events,
     teacher_memory_load_record,
+    teacher_memory_load_records,
     teacher_memory_log_event,
 )
 from .teacher_session_compaction_helpers import (
@@ -247,14 +254,45 @@ def _teacher_proposal_path(teacher_id: str, proposal_id: str) -> Any:
     return teacher_proposal_path(teacher_id, proposal_id, deps=_teacher_memory_storage_deps())
 
 
+def _teacher_proposals_dir(teacher_id: str) -> Path:
+    return teacher_workspace_dir(teacher_id) / "proposals"
+
+
+def _proposal_write_json(path: Any, payload: Any) -> None:
+    """Proposal writes go through here so the memory context and proposal index see them right away."""
+    _atomic_write_json(path, payload)
+    TEACHER_MEMORY_CONTEXT_CACHE.invalidate(Path(path).parent)
+    get_proposal_index_store(Path(path).parent).record_write(Path(path), payload)
+
+
+def _teacher_memory_context_fingerprint(teacher_id: str) -> Optional[Tuple[Any, Any]]:
+    stamp = proposals_dir_stamp(_teacher_proposals_dir(teacher_id))
+    if stamp is None:
+        return None
+    try:
+        st = teacher_workspace_file(teacher_id, "MEMORY.md").stat()
+        memory_stamp: Any = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        memory_stamp = None
+    return (stamp, memory_stamp)
+
+
 def _teacher_memory_load_record(teacher_id: str, proposal_id: str) -> Optional[Dict[str, Any]]:
     return teacher_memory_load_record(teacher_id, proposal_id, deps=_teacher_memory_store_deps())
 
 
+def _teacher_memory_load_records(teacher_id: str, proposal_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    return teacher_memory_load_records(teacher_id, proposal_ids, deps=_teacher_memory_store_deps())
+
+
 def _teacher_memory_load_events(teacher_id: str, limit: int = 5000) -> List[Dict[str, Any]]:
     return teacher_memory_load_events(teacher_id, deps=_teacher_memory_store_deps(), limit=limit)
 
 
+def _teacher_memory_event_stats(teacher_id: str, since_day: str) -> Dict[str, Any]:
+    return teacher_memory_event_stats(teacher_id, deps=_teacher_memory_store_deps(), since_day=since_day)
+
+
 def _teacher_memory_active_applied_records(
     teacher_id: str,
     *,
@@ -352,6 +390,7 @@ def _teacher_memory_search_deps():
         log_event=_teacher_memory_log_event_bridge,
         teacher_workspace_file=teacher_workspace_file,
         teacher_daily_memory_dir=teacher_daily_memory_dir,
+        load_records=_teacher_memory_load_records,
     )
 
 
@@ -365,13 +404,14 @@ def _teacher_memory_insights_deps():
         age_days=lambda rec, now: _teacher_memory_age_days(rec, now=now),
         load_events=lambda teacher_id, limit: _teacher_memory_load_events(teacher_id, limit=limit),
         parse_dt=_teacher_memory_parse_dt,
+        load_event_stats=_teacher_memory_event_stats,
     )
 
 
 def _teacher_memory_apply_deps():
     return TeacherMemoryApplyDeps(
         proposal_path=_teacher_proposal_path,
-        atomic_write_json=_atomic_write_json,
+        atomic_write_json=_proposal_write_json,
         now_iso=lambda: datetime.now().isoformat(timespec="seconds"),
         log_event=_teacher_memory_log_event_bridge,
         is_sensitive=_teacher_memory_is_sensitive,
@@ -402,7 +442,7 @@ def _teacher_memory_propose_deps():
     return TeacherMemoryProposeDeps(
         ensure_teacher_workspace=_ensure_teacher_workspace,
         proposal_path=_teacher_proposal_path,
-        atomic_write_json=_atomic_write_json,
+        atomic_write_json=_proposal_write_json,
         uuid_hex=lambda: uuid.uuid4().hex,
         now_iso=lambda: datetime.now().isoformat(timespec="seconds"),
         priority_score=_teacher_memory_priority_score,
@@ -440,7 +480,7 @@ def _teacher_memory_record_deps():
         auto_infer_min_repeats=TEACHER_MEMORY_AUTO_INFER_MIN_REPEATS,
         auto_max_proposals_per_day=TEACHER_MEMORY_AUTO_MAX_PROPOSALS_PER_DAY,
         proposal_path=_teacher_proposal_path,
-        atomic_write_json=_atomic_write_json,
+        atomic_write_json=_proposal_write_json,
     )
 
 
@@ -462,7 +502,7 @@ def _teacher_memory_governance_deps():
         conflicts=_teacher_memory_conflicts,
         now_iso=lambda: datetime.now().isoformat(timespec="seconds"),
         proposal_path=_teacher_proposal_path,
-        atomic_write_json=_atomic_write_json,
+        atomic_write_json=_proposal_write_json,
         auto_max_proposals_per_day=TEACHER_MEMORY_AUTO_MAX_PROPOSALS_PER_DAY,
     )
 
@@ -472,7 +512,7 @@ def _teacher_memory_storage_deps():
         ensure_teacher_workspace=_ensure_teacher_workspace,
         teacher_workspace_dir=teacher_workspace_dir,
         safe_fs_id=safe_fs_id,
-        atomic_write_json=_atomic_write_json,
+        atomic_write_json=_proposal_write_json,
         now_iso=lambda: datetime.now().isoformat(timespec="seconds"),
         teacher_daily_memory_path=teacher_daily_memory_path,
         teacher_workspace_file=teacher_workspace_file,
@@ -528,6 +568,9 @@ def _teacher_context_deps():
             teacher_workspace_file=teacher_workspace_file,
             teacher_memory_rank_score=_teacher_memory_rank_score,
             teacher_memory_context_max_entries=TEACHER_MEMORY_CONTEXT_MAX_ENTRIES,
+            context_cache=TEACHER_MEMORY_CONTEXT_CACHE,
+            context_cache_key=lambda teacher_id: str(_teacher_proposals_dir(teacher_id)),
+            context_fingerprint=_teacher_memory_context_fingerprint,
         ),
         include_session_summary=TEACHER_SESSION_CONTEXT_INCLUDE_SUMMARY,
         session_summary_max_chars=TEACHER_SESSION_CONTEXT_SUMMARY_MAX_CHARS,
@@ -551,4 +594,6 @@ def _teacher_session_compaction_deps():
         write_teacher_session_records=write_teacher_session_records,
         mark_teacher_session_compacted=_mark_teacher_session_compacted,
         diag_log=_app_core().diag_log,
+        compact_mode=_settings.teacher_session_compact_mode(),
+        reclaim_min_bytes=_settings.teacher_session_compact_reclaim_bytes(),
     )
@@ -0,0 +1,278 @@
+"""Teacher memory event log: bounded appends, tail reads and per-day counters.
+
+Every memory search and every chat turn that injects memory context appends one
+line to ``<workspace>/telemetry/memory_events.jsonl``. Reading the last events
+used to load the whole file, and the insights endpoint re-aggregated up to
+5,000 events per call. Here:
+
+- :func:`tail_jsonl` reads the file backwards in fixed-size blocks, so the cost
+  depends on the number of lines wanted, not on the file size;
+- the log is rotated to ``memory_events.1.jsonl`` once it grows past
+  ``max_bytes`` (one generation is kept);
+- :class:`MemoryEventStatsStore` keeps per-day counters (search calls and hits,
+  search modes, per-query calls, injected contexts) in a sibling SQLite file.
+  Counters are updated in the same transaction that appends the line, so
+  concurrent writers in other processes neither lose nor double-count events,
+  and a log written before the counters existed is counted once, on first use.
+
+The JSONL file stays the raw export; the counters are derived data.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .dir_index_support import InstanceRegistry, SqliteIndex
+
+_log = logging.getLogger(__name__)
+
+_BLOCK_SIZE = 64 * 1024
+_STATS_SUFFIX = ".stats.sqlite3"
+_ROTATED_SUFFIX = ".1.jsonl"
+_QUERY_KEY_CHARS = 120
+# Longer than the widest insights window (90 days).
+_RETAIN_DAYS = 120
+
+
+def _iter_lines_backwards(path: Path) -> Iterator[bytes]:
+    try:
+        handle = open(path, "rb")
+    except OSError:
+        return
+    with handle:
+        handle.seek(0, os.SEEK_END)
+        pos = handle.tell()
+        carry = b""
+        while pos > 0:
+            step = min(_BLOCK_SIZE, pos)
+            pos -= step
+            handle.seek(pos)
+            lines = (handle.read(step) + carry).split(b"\n")
+            # The first piece may continue in the previous block.
+            carry = lines.pop(0)
+            yield from reversed(lines)
+        yield carry
+
+
+def _parse_line(raw: bytes) -> Optional[Dict[str, Any]]:
+    line = raw.decode("utf-8", errors="ignore").strip()
+    if not line:
+        return None
+    try:
+        rec = json.loads(line)
+    except ValueError:
+        _log.debug("skipping malformed JSONL line in %s", line[:80])
+        return None
+    return rec if isinstance(rec, dict) else None
+
+
+def rotated_log_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(path.name[: -len(".jsonl")] + _ROTATED_SUFFIX)
+
+
+def tail_jsonl(path: Path, limit: int) -> List[Dict[str, Any]]:
+    """Last ``limit`` JSON objects of the log (falling back to the rotated file), oldest first."""
+    out: List[Dict[str, Any]] = []
+    for source in (Path(path), rotated_log_path(path)):
+        for raw in _iter_lines_backwards(source):
+            rec = _parse_line(raw)
+            if rec is None:
+                continue
+            out.append(rec)
+            if len(out) >= limit:
+                out.reverse()
+                return out
+    out.reverse()
+    return out
+
+
+def _event_day(rec: Dict[str, Any]) -> Optional[str]:
+    day = str(rec.get("ts") or "")[:10]
+    try:
+        date.fromisoformat(day)
+    except ValueError:
+        return None
+    return day
+
+
+def _coerce_hits(value: Any) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+class MemoryEventStatsStore(SqliteIndex):
+    def __init__(self, db_path: Path, *, log_path: Path, max_bytes: int) -> None:
+        super().__init__(db_path)
+        self.log_path = Path(log_path)
+        self.max_bytes = int(max_bytes)
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS event_daily (
+                day TEXT NOT NULL,
+                event TEXT NOT NULL,
+                calls INTEGER NOT NULL,
+                hit_calls INTEGER NOT NULL,
+                PRIMARY KEY (day, event)
+            )
+            """
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_mode_daily ("
+            "day TEXT NOT NULL, mode TEXT NOT NULL, calls INTEGER NOT NULL, PRIMARY KEY (day, mode))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_query_daily ("
+            "day TEXT NOT NULL, query TEXT NOT NULL, calls INTEGER NOT NULL, hit_calls INTEGER NOT NULL, "
+            "PRIMARY KEY (day, query))"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS event_stats_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def _open(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+    # -- counters ----------------------------------------------------------
+
+    def _count(self, conn: sqlite3.Connection, rec: Dict[str, Any]) -> None:
+        day = _event_day(rec)
+        if day is None:
+            return
+        event = str(rec.get("event") or "").strip() or "unknown"
+        hit = 1 if event == "search" and _coerce_hits(rec.get("hits")) > 0 else 0
+        conn.execute(
+            "INSERT INTO event_daily (day, event, calls, hit_calls) VALUES (?, ?, 1, ?) "
+            "ON CONFLICT (day, event) DO UPDATE SET calls = calls + 1, hit_calls = hit_calls + excluded.hit_calls",
+            (day, event, hit),
+        )
+        if event != "search":
+            return
+        mode = str(rec.get("mode") or "unknown").strip().lower() or "unknown"
+        conn.execute(
+            "INSERT INTO search_mode_daily (day, mode, calls) VALUES (?, ?, 1) "
+            "ON CONFLICT (day, mode) DO UPDATE SET calls = calls + 1",
+            (day, mode),
+        )
+        query = str(rec.get("query") or "").strip()[:_QUERY_KEY_CHARS]
+        if query:
+            conn.execute(
+                "INSERT INTO search_query_daily (day, query, calls, hit_calls) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (day, query) DO UPDATE SET calls = calls + 1, hit_calls = hit_calls + excluded.hit_calls",
+                (day, query, hit),
+            )
+
+    def _ensure_seeded(self, conn: sqlite3.Connection) -> None:
+        """Count a log written before the counters existed; call inside a write transaction."""
+        if conn.execute("SELECT 1 FROM event_stats_meta WHERE key = 'seeded'").fetchone() is not None:
+            return
+        for source in (rotated_log_path(self.log_path), self.log_path):
+            for raw in _iter_lines_backwards(source):
+                rec = _parse_line(raw)
+                if rec is not None:
+                    self._count(conn, rec)
+        conn.execute("INSERT OR REPLACE INTO event_stats_meta (key, value) VALUES ('seeded', '1')")
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        cutoff = (date.today() - timedelta(days=_RETAIN_DAYS)).isoformat()
+        for table in ("event_daily", "search_mode_daily", "search_query_daily"):
+            conn.execute(f"DELETE FROM {table} WHERE day < ?", (cutoff,))
+
+    def _rotate_if_needed(self, conn: sqlite3.Connection) -> None:
+        try:
+            size = self.log_path.stat().st_size
+        except OSError:
+            return
+        if size < self.max_bytes:
+            return
+        os.replace(self.log_path, rotated_log_path(self.log_path))
+        self._prune(conn)
+
+    def append(self, rec: Dict[str, Any]) -> None:
+        """Append ``rec`` to the log and count it, atomically with respect to other writers."""
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        with self._lock, self._open() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._ensure_seeded(conn)
+                self._rotate_if_needed(conn)
+                with self.log_path.open("a", encoding="utf-8") as handle:
+                    handle.write(line)
+                self._count(conn, rec)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # -- reads -------------------------------------------------------------
+
+    def _seed_if_needed(self, conn: sqlite3.Connection) -> None:
+        if conn.execute("SELECT 1 FROM event_stats_meta WHERE key = 'seeded'").fetchone() is not None:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._ensure_seeded(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def summary(self, *, since_day: str, top_queries: int = 10) -> Dict[str, Any]:
+        """Search and context-injection counters for days ``>= since_day``."""
+        with self._lock, self._open() as conn:
+            self._seed_if_needed(conn)
+            events = {
+                str(row["event"]): row
+                for row in conn.execute(
+                    "SELECT event, SUM(calls) AS calls, SUM(hit_calls) AS hit_calls FROM event_daily "
+                    "WHERE day >= ? AND event IN ('search', 'context_injected') GROUP BY event",
+                    (since_day,),
+                )
+            }
+            modes = {
+                str(row["mode"]): int(row["calls"])
+                for row in conn.execute(
+                    "SELECT mode, SUM(calls) AS calls FROM search_mode_daily WHERE day >= ? GROUP BY mode",
+                    (since_day,),
+                )
+            }
+            queries = [
+                {"query": str(row["query"]), "calls": int(row["calls"]), "hit_calls": int(row["hit_calls"])}
+                for row in conn.execute(
+                    "SELECT query, SUM(calls) AS calls, SUM(hit_calls) AS hit_calls FROM search_query_daily "
+                    "WHERE day >= ? GROUP BY query ORDER BY hit_calls DESC, calls DESC, query LIMIT ?",
+                    (since_day, max(1, int(top_queries))),
+                )
+            ]
+        search = events.get("search")
+        injected = events.get("context_injected")
+        return {
+            "search_calls": int(search["calls"]) if search is not None else 0,
+            "search_hit_calls": int(search["hit_calls"]) if search is not None else 0,
+            "context_injected": int(injected["calls"]) if injected is not None else 0,
+            "search_mode_breakdown": modes,
+            "top_queries": queries,
+        }
+
+
+def event_stats_path(log_path: Path) -> Path:
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.name[: -len(".jsonl")] + _STATS_SUFFIX)
+
+
+_STORES: InstanceRegistry[MemoryEventStatsStore] = InstanceRegistry()
+
+
+def get_memory_event_stats_store(log_path: Path, *, max_bytes: int) -> MemoryEventStatsStore:
+    db_path = event_stats_path(log_path)
+    store = _STORES.get(db_path, lambda: MemoryEventStatsStore(db_path, log_path=Path(log_path), max_bytes=max_bytes))
+    store.max_bytes = int(max_bytes)
+    return store
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 
 def _coerce_float(value: Any) -> float | None:
@@ -46,6 +46,9 @@ class TeacherMemoryInsightsDeps:
     age_days: Callable[[Dict[str, Any], datetime], int]
     load_events: Callable[[str, int], List[Dict[str, Any]]]
     parse_dt: Callable[[Any], Any]
+    # Per-day counters ``(teacher_id, since_day) -> summary``; when set, the
+    # event log is not read and the window is counted in whole days.
+    load_event_stats: Optional[Callable[[str, str], Dict[str, Any]]] = None
 
 
 @dataclass
@@ -215,6 +218,37 @@ def _summarize_events(
     return metrics
 
 
+def _event_metrics_from_stats(stats: Dict[str, Any]) -> _EventMetrics:
+    query_stats = {
+        str(item.get("query") or ""): dict(item) for item in stats.get("top_queries") or [] if isinstance(item, dict)
+    }
+    return _EventMetrics(
+        search_calls=_coerce_int(stats.get("search_calls")),
+        search_hit_calls=_coerce_int(stats.get("search_hit_calls")),
+        context_injected=_coerce_int(stats.get("context_injected")),
+        search_mode_breakdown={str(k): _coerce_int(v) for k, v in (stats.get("search_mode_breakdown") or {}).items()},
+        query_stats=query_stats,
+    )
+
+
+def _load_event_metrics(
+    teacher_id: str,
+    *,
+    window_days: int,
+    now: datetime,
+    deps: TeacherMemoryInsightsDeps,
+) -> _EventMetrics:
+    window_start = now - timedelta(days=window_days)
+    if deps.load_event_stats is not None:
+        return _event_metrics_from_stats(deps.load_event_stats(teacher_id, window_start.date().isoformat()))
+    return _summarize_events(
+        deps.load_events(teacher_id, 5000),
+        window_days=window_days,
+        window_start=window_start,
+        deps=deps,
+    )
+
+
 def _build_top_queries(query_stats: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
     top_queries: List[Dict[str, Any]] = []
     for query_entry in query_stats.values():
@@ -244,15 +278,9 @@ def teacher_memory_insights(
     deps.ensure_teacher_workspace(teacher_id)
     window_days = max(1, min(int(days or 14), 90))
     now = datetime.now()
-    window_start = now - timedelta(days=window_days)
 
     proposal_metrics = _summarize_proposals(deps.recent_proposals(teacher_id, 1500), now=now, deps=deps)
-    event_metrics = _summarize_events(
-        deps.load_events(teacher_id, 5000),
-        window_days=window_days,
-        window_start=window_start,
-        deps=deps,
-    )
+    event_metrics = _load_event_metrics(teacher_id, window_days=window_days, now=now, deps=deps)
     top_queries = _build_top_queries(event_metrics.query_stats)
 
     return {
@@ -0,0 +1,134 @@
+"""In-process index of teacher memory proposal records keyed by proposal id.
+
+Proposal files are only ever written through ``atomic_write_json`` (tmp file +
+rename), so every create, update or delete bumps the ``proposals`` directory
+mtime. A lookup whose directory fingerprint is unchanged is answered from
+memory; otherwise the directory is rescanned and only files whose
+``(mtime_ns, size)`` changed are re-read. Stamps are judged as described in
+:mod:`services.api.dir_index_support`.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .dir_index_support import Stamp, dir_fingerprint, settled
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass
+class _DirIndex:
+    fingerprint: Optional[Stamp] = None
+    files: Dict[str, Tuple[Stamp, Optional[Dict[str, Any]]]] = field(default_factory=dict)
+    by_id: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+def proposals_dir_stamp(proposals_dir: Path) -> Optional[Stamp]:
+    """Directory stamp usable as a cache key, or None while it is too fresh to trust."""
+    fingerprint = dir_fingerprint(proposals_dir)
+    if fingerprint is None:
+        return (0, 0)
+    return fingerprint if settled(fingerprint[0]) else None
+
+
+def _read_record(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            rec = json.load(handle)
+    except (OSError, ValueError):
+        _log.warning("failed to read proposal file %s", path, exc_info=True)
+        return None
+    return rec if isinstance(rec, dict) else None
+
+
+class TeacherMemoryRecordIndex:
+    def __init__(self, *, max_dirs: int = 256) -> None:
+        self._lock = threading.Lock()
+        self._dirs: "OrderedDict[str, _DirIndex]" = OrderedDict()
+        self._max_dirs = max(1, int(max_dirs))
+
+    def _refresh(self, proposals_dir: Path, index: _DirIndex) -> None:
+        fingerprint = dir_fingerprint(proposals_dir)
+        if fingerprint is not None and fingerprint == index.fingerprint and settled(fingerprint[0]):
+            return
+        files: Dict[str, Tuple[Stamp, Optional[Dict[str, Any]]]] = {}
+        if fingerprint is not None:
+            with os.scandir(proposals_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    cached = index.files.get(entry.name)
+                    if cached is not None and cached[0] == stamp and settled(stamp[0]):
+                        files[entry.name] = cached
+                    else:
+                        files[entry.name] = (stamp, _read_record(entry.path))
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for name, (_stamp, rec) in files.items():
+            if rec is None:
+                continue
+            stem = name[: -len(".json")]
+            rec.setdefault("proposal_id", stem)
+            by_id[stem] = rec
+            by_id.setdefault(str(rec["proposal_id"]), rec)
+        index.fingerprint = fingerprint
+        index.files = files
+        index.by_id = by_id
+
+    def _fresh_index(self, proposals_dir: Path) -> _DirIndex:
+        key = str(proposals_dir)
+        index = self._dirs.get(key)
+        if index is None:
+            index = self._dirs[key] = _DirIndex()
+            while len(self._dirs) > self._max_dirs:
+                self._dirs.popitem(last=False)
+        else:
+            self._dirs.move_to_end(key)
+        self._refresh(proposals_dir, index)
+        return index
+
+    def lookup(self, proposals_dir: Path, proposal_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Return copies of the current records for ``proposal_ids``; missing ids are absent."""
+        with self._lock:
+            index = self._fresh_index(proposals_dir)
+            out: Dict[str, Dict[str, Any]] = {}
+            for pid in proposal_ids:
+                rec = index.by_id.get(pid)
+                if rec is not None:
+                    out[pid] = dict(rec)
+            return out
+
+    def recent(self, proposals_dir: Path, limit: int) -> List[Dict[str, Any]]:
+        """Copies of up to ``limit`` records, most recently modified file first."""
+        with self._lock:
+            index = self._fresh_index(proposals_dir)
+            ordered = sorted(index.files.values(), key=lambda item: item[0][0], reverse=True)
+            out: List[Dict[str, Any]] = []
+            for _stamp, rec in ordered:
+                if rec is None:
+                    continue
+                out.append(dict(rec))
+                if len(out) >= limit:
+                    break
+            return out
+
+    def invalidate(self, proposals_dir: Optional[Path] = None) -> None:
+        with self._lock:
+            if proposals_dir is None:
+                self._dirs.clear()
+            else:
+                self._dirs.pop(str(proposals_dir), None)
+
+
+TEACHER_MEMORY_RECORD_INDEX = TeacherMemoryRecordIndex()
@@ -5,6 +5,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional, Sequence
 
+from .session_checkpoint_store import session_view_lines
 from .teacher_memory_governance_service import (
     TeacherMemoryGovernanceDeps,
 )
@@ -20,6 +21,7 @@ from .teacher_memory_governance_service import (
 from .teacher_memory_governance_service import (
     teacher_memory_mark_superseded as _teacher_memory_mark_superseded_impl,
 )
+from .teacher_memory_record_index import TEACHER_MEMORY_RECORD_INDEX
 
 _log = logging.getLogger(__name__)
 
@@ -55,26 +57,7 @@ def teacher_memory_recent_proposals(teacher_id: str, *, deps: TeacherMemoryRecor
     if not proposals_dir.exists():
         return []
     take = max(1, min(int(limit or 200), 1000))
-    files = sorted(
-        proposals_dir.glob('*.json'),
-        key=lambda path: path.stat().st_mtime if path.exists() else 0,
-        reverse=True,
-    )
-    out: List[Dict[str, Any]] = []
-    for path in files:
-        try:
-            data = json.loads(path.read_text(encoding='utf-8'))
-        except Exception:
-            _log.warning('failed to read proposal file %s', path, exc_info=True)
-            continue
-        if not isinstance(data, dict):
-            continue
-        if 'proposal_id' not in data:
-            data['proposal_id'] = path.stem
-        out.append(data)
-        if len(out) >= take:
-            break
-    return out
+    return TEACHER_MEMORY_RECORD_INDEX.recent(proposals_dir, take)
 
 
 
@@ -90,7 +73,7 @@ def teacher_memory_recent_user_turns(
         return []
     take = max(1, min(int(limit or 24), 120))
     out: List[str] = []
-    lines = path.read_text(encoding='utf-8', errors='ignore').splitlines()
+    lines = session_view_lines(path)
     for line in reversed(lines):
         text = str(line or '').strip()
         if not text:
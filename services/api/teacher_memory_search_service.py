@@ -31,6 +31,7 @@ class TeacherMemorySearchDeps:
     log_event: Callable[[str, str, Dict[str, Any]], None]
     teacher_workspace_file: Callable[[str, str], Path]
     teacher_daily_memory_dir: Callable[[str], Path]
+    load_records: Optional[Callable[[str, List[str]], Dict[str, Dict[str, Any]]]] = None
 
 
 @dataclass(frozen=True)
@@ -68,6 +69,23 @@ def _call_mem0_search(
     return mem0_search_any(teacher_id, query, topk)
 
 
+def _resolve_match_records(
+    teacher_id: str,
+    raw_matches: List[Any],
+    *,
+    deps: TeacherMemorySearchDeps,
+) -> Optional[Dict[str, Dict[str, Any]]]:
+    """One batch lookup for every hit's record; None means fall back to per-hit ``load_record``."""
+    if not deps.search_filter_expired or deps.load_records is None:
+        return None
+    proposal_ids = [
+        str(item.get("proposal_id") or "").strip()
+        for item in raw_matches
+        if isinstance(item, dict) and str(item.get("proposal_id") or "").strip()
+    ]
+    return deps.load_records(teacher_id, proposal_ids) if proposal_ids else {}
+
+
 def _filter_mem0_matches(
     teacher_id: str,
     raw_matches: List[Any],
@@ -79,13 +97,14 @@ def _filter_mem0_matches(
     dropped_expired = 0
     dropped_inactive = 0
     dropped_missing = 0
+    records = _resolve_match_records(teacher_id, raw_matches, deps=deps)
     for item in raw_matches:
         if not isinstance(item, dict):
             continue
         if deps.search_filter_expired:
             proposal_id = str(item.get("proposal_id") or "").strip()
             if proposal_id:
-                record = deps.load_record(teacher_id, proposal_id)
+                record = records.get(proposal_id) if records is not None else deps.load_record(teacher_id, proposal_id)
                 if not isinstance(record, dict):
                     dropped_missing += 1
                     continue
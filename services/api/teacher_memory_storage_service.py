@@ -5,6 +5,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional
 
+from .proposal_index_store import get_proposal_index_store
 from .teacher_memory_propose_service import _teacher_memory_provenance
 
 _log = logging.getLogger(__name__)
@@ -43,13 +44,6 @@ def ensure_teacher_memory_provenance(rec: Dict[str, Any]) -> Dict[str, Any]:
     return provenance
 
 
-def _safe_mtime(path: Any) -> float:
-    try:
-        return path.stat().st_mtime
-    except OSError:
-        return 0.0
-
-
 def _normalized_proposal_status(status: Optional[str]) -> Optional[str]:
     return (status or '').strip().lower() or None
 
@@ -63,23 +57,6 @@ def _load_proposal_record(path: Any) -> Optional[Dict[str, Any]]:
     return rec if isinstance(rec, dict) else None
 
 
-def _proposal_visible(rec: Dict[str, Any], *, status_norm: Optional[str]) -> bool:
-    rec_status = str(rec.get('status') or '').strip().lower()
-    if rec_status == 'deleted':
-        return False
-    return not status_norm or rec_status == status_norm
-
-
-def _proposal_record_for_listing(path: Any, *, status_norm: Optional[str]) -> Optional[Dict[str, Any]]:
-    rec = _load_proposal_record(path)
-    if rec is None or not _proposal_visible(rec, status_norm=status_norm):
-        return None
-    if 'proposal_id' not in rec:
-        rec['proposal_id'] = path.stem
-    ensure_teacher_memory_provenance(rec)
-    return rec
-
-
 def _find_entry_marker_idx(lines: List[str], proposal_id: str) -> int:
     marker = f'- entry_id: {proposal_id}'
     for idx, line in enumerate(lines):
@@ -147,15 +124,9 @@ def teacher_memory_list_proposals(
         return {'ok': False, 'error': 'invalid_status', 'teacher_id': teacher_id}
 
     take = max(1, min(int(limit or 20), 200))
-    files = sorted(proposals_dir.glob('*.json'), key=_safe_mtime, reverse=True)
-    items: List[Dict[str, Any]] = []
-    for path in files:
-        rec = _proposal_record_for_listing(path, status_norm=status_norm)
-        if rec is None:
-            continue
-        items.append(rec)
-        if len(items) >= take:
-            break
+    items = get_proposal_index_store(proposals_dir).list_records(status=status_norm, limit=take)
+    for rec in items:
+        ensure_teacher_memory_provenance(rec)
     return {'ok': True, 'teacher_id': teacher_id, 'proposals': items}
 
 
@@ -4,7 +4,11 @@ import json
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .teacher_memory_event_log import get_memory_event_stats_store, tail_jsonl
+from .teacher_memory_record_index import TEACHER_MEMORY_RECORD_INDEX, TeacherMemoryRecordIndex
 
 _log = logging.getLogger(__name__)
 
@@ -17,6 +21,7 @@ class TeacherMemoryStoreDeps:
     is_expired_record: Callable[[Dict[str, Any], Optional[datetime]], bool]
     rank_score: Callable[[Dict[str, Any]], float]
     now_iso: Callable[[], str]
+    event_log_max_bytes: int = 8 * 1024 * 1024
 
 
 def teacher_memory_event_log_path(teacher_id: str, *, deps: TeacherMemoryStoreDeps) -> Any:
@@ -43,8 +48,7 @@ def teacher_memory_log_event(
             rec[str(k)] = v
     try:
         path = teacher_memory_event_log_path(teacher_id, deps=deps)
-        with path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        get_memory_event_stats_store(path, max_bytes=deps.event_log_max_bytes).append(rec)
     except Exception:
         _log.warning("failed to write memory event log for teacher=%s", teacher_id, exc_info=True)
         return
@@ -52,26 +56,13 @@ def teacher_memory_log_event(
 
 def teacher_memory_load_events(teacher_id: str, *, deps: TeacherMemoryStoreDeps, limit: int = 5000) -> List[Dict[str, Any]]:
     path = teacher_memory_event_log_path(teacher_id, deps=deps)
-    if not path.exists():
-        return []
-    out: List[Dict[str, Any]] = []
-    lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-    for raw in reversed(lines):
-        line = str(raw or "").strip()
-        if not line:
-            continue
-        try:
-            rec = json.loads(line)
-        except Exception:
-            _log.debug("skipping malformed JSONL line in event log for teacher=%s", teacher_id)
-            continue
-        if not isinstance(rec, dict):
-            continue
-        out.append(rec)
-        if len(out) >= max(100, int(limit or 5000)):
-            break
-    out.reverse()
-    return out
+    return tail_jsonl(path, max(100, int(limit or 5000)))
+
+
+def teacher_memory_event_stats(teacher_id: str, *, deps: TeacherMemoryStoreDeps, since_day: str) -> Dict[str, Any]:
+    """Per-day event counters summed from ``since_day`` on, without reading the log."""
+    path = teacher_memory_event_log_path(teacher_id, deps=deps)
+    return get_memory_event_stats_store(path, max_bytes=deps.event_log_max_bytes).summary(since_day=since_day)
 
 
 def teacher_memory_load_record(teacher_id: str, proposal_id: str, *, deps: TeacherMemoryStoreDeps) -> Optional[Dict[str, Any]]:
@@ -90,6 +81,21 @@ def teacher_memory_load_record(teacher_id: str, proposal_id: str, *, deps: Teach
     return rec
 
 
+def teacher_memory_load_records(
+    teacher_id: str,
+    proposal_ids: Iterable[str],
+    *,
+    deps: TeacherMemoryStoreDeps,
+    index: TeacherMemoryRecordIndex = TEACHER_MEMORY_RECORD_INDEX,
+) -> Dict[str, Dict[str, Any]]:
+    """Batch form of :func:`teacher_memory_load_record`; ids without a readable record are absent."""
+    wanted = [pid for pid in dict.fromkeys(str(p or "").strip() for p in proposal_ids) if pid]
+    if not wanted:
+        return {}
+    proposals_dir = Path(deps.teacher_workspace_dir(teacher_id)) / "proposals"
+    return index.lookup(proposals_dir, wanted)
+
+
 def teacher_memory_active_applied_records(
     teacher_id: str,
     *,
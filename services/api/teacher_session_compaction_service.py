@@ -4,10 +4,16 @@ import json
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
-_log = logging.getLogger(__name__)
+from .session_checkpoint_store import (
+    append_session_checkpoint,
+    read_session_segment,
+    schedule_session_reclaim,
+    session_view_lines,
+)
 
+_log = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -23,10 +29,16 @@ class TeacherSessionCompactionDeps:
     write_teacher_session_records: Callable[[Any, List[Dict[str, Any]]], None]
     mark_teacher_session_compacted: Callable[[str, str, int, int], None]
     diag_log: Callable[[str, Dict[str, Any]], None]
+    # "rewrite" replaces the file with [summary] + tail; "checkpoint" appends the
+    # summary and moves the read pointer, leaving space reclaim to a background pass.
+    compact_mode: str = "rewrite"
+    reclaim_min_bytes: int = 1024 * 1024
+    append_session_checkpoint: Callable[..., Any] = append_session_checkpoint
+    schedule_session_reclaim: Optional[Callable[[Any], Any]] = schedule_session_reclaim
 
 
 def _load_session_records(path: Any) -> tuple[List[str], List[Dict[str, Any]]]:
-    raw_lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
+    raw_lines = session_view_lines(path)
     records: List[Dict[str, Any]] = []
     for line in raw_lines:
         text = (line or "").strip()
@@ -79,6 +91,59 @@ def _build_summary_record(
     }
 
 
+def _compact_checkpoint(
+    teacher_id: str,
+    session_id: str,
+    path: Any,
+    *,
+    deps: TeacherSessionCompactionDeps,
+) -> Dict[str, Any]:
+    segment = read_session_segment(path)
+    dialog = [
+        (offset, record)
+        for offset, record in segment.entries
+        if str(record.get("role") or "") in {"user", "assistant"} and not bool(record.get("synthetic"))
+    ]
+    if len(dialog) <= deps.compact_max_messages:
+        return {"ok": False, "reason": "below_threshold", "messages": len(dialog)}
+
+    keep_tail = _resolve_keep_tail(len(dialog), deps)
+    head = [record for _offset, record in dialog[:-keep_tail]]
+    tail_offset = dialog[-keep_tail][0]
+    previous_summary = str((segment.summary or {}).get("content") or "").strip()
+    summary_text = deps.teacher_compact_summary(head, previous_summary)
+    summary_record = _build_summary_record(
+        summary_text,
+        compacted_messages=len(head),
+        keep_tail=keep_tail,
+    )
+    checkpoint = deps.append_session_checkpoint(path, summary_record, tail_offset=tail_offset)
+    deps.mark_teacher_session_compacted(teacher_id, session_id, len(head), keep_tail + 1)
+    reclaim_scheduled = False
+    if deps.schedule_session_reclaim is not None and checkpoint.tail_offset >= max(1, deps.reclaim_min_bytes):
+        reclaim_scheduled = bool(deps.schedule_session_reclaim(path))
+    deps.diag_log(
+        "teacher.session.compacted",
+        {
+            "teacher_id": teacher_id,
+            "session_id": session_id,
+            "mode": "checkpoint",
+            "compacted_messages": len(head),
+            "tail_messages": keep_tail,
+            "dead_prefix_bytes": checkpoint.tail_offset,
+            "reclaim_scheduled": reclaim_scheduled,
+        },
+    )
+    return {
+        "ok": True,
+        "teacher_id": teacher_id,
+        "session_id": session_id,
+        "mode": "checkpoint",
+        "compacted_messages": len(head),
+        "tail_messages": keep_tail,
+    }
+
+
 def maybe_compact_teacher_session(
     teacher_id: str,
     session_id: str,
@@ -95,6 +160,8 @@ def maybe_compact_teacher_session(
     path = deps.teacher_session_file(teacher_id, session_id)
     if not path.exists():
         return {"ok": False, "reason": "session_not_found"}
+    if deps.compact_mode == "checkpoint":
+        return _compact_checkpoint(teacher_id, session_id, path, deps=deps)
 
     raw_lines, records = _load_session_records(path)
     if not raw_lines:
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Any, Optional
 
 from services.api.runtime import bootstrap
+from services.api.runtime.runtime_state import runtime_has_active_jobs
 from services.api.runtime_settings import load_settings
 from services.api.wiring import CURRENT_CORE
 
@@ -76,6 +77,10 @@ class TenantAppInstance:
             if token is not None:
                 CURRENT_CORE.reset(token)
 
+    def has_active_jobs(self) -> bool:
+        core = getattr(self.module, "get_core", lambda: None)()
+        return runtime_has_active_jobs(core) if core is not None else False
+
     def shutdown(self) -> None:
         self.activate()
         core = getattr(self.module, "get_core", lambda: None)()
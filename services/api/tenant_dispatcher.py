@@ -4,6 +4,8 @@ import logging
 import re
 from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
+from starlette.concurrency import run_in_threadpool
+
 from .auth_service import AuthError, principal_can_access_tenant, resolve_principal_from_scope
 from .tenant_registry import TenantRegistry
 from .wiring import CURRENT_CORE
@@ -54,6 +56,7 @@ class MultiTenantDispatcher:
         handle = await self._resolve_tenant_handle(scope=scope, send=send, tenant_id=tenant_id)
         if handle is None:
             return
+        # The handle is leased; _dispatch_tenant_app releases it.
         new_scope = dict(scope)
         new_scope["path"] = rest_path
         return await self._dispatch_tenant_app(handle=handle, scope=new_scope, receive=receive, send=send)
@@ -78,7 +81,7 @@ class MultiTenantDispatcher:
             await self._send_simple(send, status=403, body=b"forbidden_tenant_scope")
             return None
         try:
-            handle = self.registry.get_or_create(tenant_id)
+            handle = await self._lease_tenant(tenant_id)
         except Exception:
             _log.warning("failed to resolve tenant %s", tenant_id, exc_info=True)
             await self._send_simple(send, status=404, body=b"tenant not found")
@@ -86,11 +89,18 @@ class MultiTenantDispatcher:
         try:
             handle.instance.activate()
         except Exception:
+            self.registry.release(handle)
             _log.warning("failed to activate tenant %s", tenant_id, exc_info=True)
             await self._send_simple(send, status=500, body=b"tenant activation failed")
             return None
         return handle
 
+    async def _lease_tenant(self, tenant_id: str) -> Any:
+        """Leased handle for ``tenant_id``; a cold build runs off the event loop."""
+        if self.registry.get_loaded(tenant_id) is not None:
+            return self.registry.get_or_create(tenant_id, lease=True)
+        return await run_in_threadpool(self.registry.get_or_create, tenant_id, lease=True)
+
     async def _dispatch_tenant_app(
         self,
         *,
@@ -108,6 +118,7 @@ class MultiTenantDispatcher:
         try:
             await handle.app(scope, receive, send)
         finally:
+            self.registry.release(handle)
             if token is not None:
                 CURRENT_CORE.reset(token)
 
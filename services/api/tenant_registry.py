@@ -3,10 +3,15 @@ from __future__ import annotations
 import logging
 import re
 import threading
-from dataclasses import dataclass
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from . import settings as _settings
+from .observability import OBSERVABILITY
 from .tenant_app_factory import TenantAppInstance, TenantLimits, TenantSettings, create_tenant_app
 from .tenant_config_store import TenantConfigStore
 
@@ -28,66 +33,211 @@ class TenantHandle:
     tenant_id: str
     settings: TenantSettings
     instance: TenantAppInstance
+    last_used: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
 
     @property
     def app(self):
         return self.instance.app
 
+    def busy(self) -> bool:
+        """Requests in flight or background jobs still queued/running in the tenant runtime."""
+        if self.in_flight > 0:
+            return True
+        has_active_jobs = getattr(self.instance, "has_active_jobs", None)
+        return bool(has_active_jobs()) if callable(has_active_jobs) else False
+
+
+def _tenant_limits(extra: Dict[str, Any]) -> TenantLimits:
+    limits = TenantLimits()
+    limits_raw = extra.get("limits") if isinstance(extra.get("limits"), dict) else {}
+    for key in ("llm_total", "llm_student", "llm_teacher", "ocr"):
+        raw = limits_raw.get(key) if isinstance(limits_raw, dict) else None
+        if raw is None:
+            raw = extra.get(key)
+        if raw is None:
+            continue
+        try:
+            value = int(raw)
+        except Exception:
+            _log.debug("numeric conversion failed", exc_info=True)
+            continue
+        if value <= 0:
+            continue
+        limits = TenantLimits(**{**limits.__dict__, key: value})
+    return limits
+
 
 class TenantRegistry:
-    def __init__(self, store: TenantConfigStore):
+    """Bounded cache of running tenant apps.
+
+    At most ``max_resident`` tenants stay loaded; the least recently used one is
+    shut down to make room, and tenants idle longer than ``idle_ttl_sec`` are
+    shut down by a sweep that runs at most once a minute on access (``0``
+    disables idle eviction). Handles with requests in flight (see
+    :meth:`get_or_create` with ``lease=True``) or with background jobs still
+    queued or running in their runtime are never evicted. Cold tenants are
+    built under a per-tenant lock, so one slow startup only blocks requests for
+    that same tenant.
+    """
+
+    def __init__(
+        self,
+        store: TenantConfigStore,
+        *,
+        max_resident: Optional[int] = None,
+        idle_ttl_sec: Optional[float] = None,
+        metrics: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.store = store
+        self.max_resident = max(1, int(max_resident if max_resident is not None else _settings.tenant_cache_max_resident()))
+        self.idle_ttl_sec = float(idle_ttl_sec if idle_ttl_sec is not None else _settings.tenant_cache_idle_ttl_sec())
+        self._metrics = metrics if metrics is not None else OBSERVABILITY
+        self._clock = clock
         self._lock = threading.RLock()
-        self._handles: Dict[str, TenantHandle] = {}
+        self._handles: "OrderedDict[str, TenantHandle]" = OrderedDict()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._warmup_thread: Optional[threading.Thread] = None
+        self._last_sweep = clock()
 
     def get_loaded(self, tenant_id: str) -> Optional[TenantHandle]:
         with self._lock:
             return self._handles.get(tenant_id)
 
-    def get_or_create(self, tenant_id: str) -> TenantHandle:
+    def resident_count(self) -> int:
+        with self._lock:
+            return len(self._handles)
+
+    def _touch(self, handle: TenantHandle, *, lease: bool = False) -> TenantHandle:
+        handle.last_used = self._clock()
+        if lease:
+            handle.in_flight += 1
+        self._handles.move_to_end(handle.tenant_id)
+        return handle
+
+    def get_or_create(self, tenant_id: str, *, reason: str = "request", lease: bool = False) -> TenantHandle:
+        """Loaded (or freshly built) handle for ``tenant_id``.
+
+        With ``lease=True`` the handle is marked in flight under the registry
+        lock before it is returned, so it cannot be evicted in between; the
+        caller must pass it to :meth:`release` when done.
+        """
         tid = validate_tenant_id(tenant_id)
         with self._lock:
             existing = self._handles.get(tid)
             if existing is not None:
-                return existing
-
-            cfg = self.store.get(tid)
-            if cfg is None or not cfg.enabled:
-                raise KeyError("tenant_not_found")
-
-            limits = TenantLimits()
-            extra = cfg.extra if isinstance(cfg.extra, dict) else {}
-            limits_raw = extra.get("limits") if isinstance(extra.get("limits"), dict) else {}
-            for key in ("llm_total", "llm_student", "llm_teacher", "ocr"):
-                raw = limits_raw.get(key) if isinstance(limits_raw, dict) else None
-                if raw is None:
-                    raw = extra.get(key)
-                if raw is None:
-                    continue
-                try:
-                    value = int(raw)
-                except Exception:
-                    _log.debug("numeric conversion failed", exc_info=True)
-                    continue
-                if value <= 0:
-                    continue
-                limits = TenantLimits(**{**limits.__dict__, key: value})
-
-            settings = TenantSettings(
-                tenant_id=tid,
-                data_dir=Path(cfg.data_dir).expanduser().resolve(),
-                uploads_dir=Path(cfg.uploads_dir).expanduser().resolve(),
-                limits=limits,
-            )
-            instance = create_tenant_app(settings)
+                self._maybe_sweep()
+                return self._touch(existing, lease=lease)
+            build_lock = self._build_locks.setdefault(tid, threading.Lock())
+        with build_lock:
+            with self._lock:
+                existing = self._handles.get(tid)
+                if existing is not None:
+                    return self._touch(existing, lease=lease)
+            handle = self._build(tid, reason=reason)
+            with self._lock:
+                self._handles[tid] = handle
+                self._touch(handle, lease=lease)
+                victims = self._select_victims(keep=tid)
+                self._metrics.set_gauge("tenant_resident", len(self._handles))
+        self._shutdown_victims(victims)
+        return handle
+
+    def _build(self, tid: str, *, reason: str) -> TenantHandle:
+        cfg = self.store.get(tid)
+        if cfg is None or not cfg.enabled:
+            raise KeyError("tenant_not_found")
+        extra = cfg.extra if isinstance(cfg.extra, dict) else {}
+        settings = TenantSettings(
+            tenant_id=tid,
+            data_dir=Path(cfg.data_dir).expanduser().resolve(),
+            uploads_dir=Path(cfg.uploads_dir).expanduser().resolve(),
+            limits=_tenant_limits(extra),
+        )
+        started = time.perf_counter()
+        instance = create_tenant_app(settings)
+        try:
+            instance.startup()
+        except Exception:
+            _log.error("tenant %s startup failed", tid, exc_info=True)
+            raise
+        self._metrics.record_timing("tenant_build", reason, time.perf_counter() - started)
+        return TenantHandle(tenant_id=tid, settings=settings, instance=instance, last_used=self._clock())
+
+    def _select_victims(self, *, keep: str = "") -> List[Tuple[TenantHandle, str]]:
+        victims: List[Tuple[TenantHandle, str]] = []
+        now = self._clock()
+        for tid, handle in list(self._handles.items()):
+            if tid == keep or handle.busy():
+                continue
+            if self.idle_ttl_sec > 0 and now - handle.last_used >= self.idle_ttl_sec:
+                victims.append((self._handles.pop(tid), "idle"))
+        # OrderedDict iterates least recently used first.
+        for tid, handle in list(self._handles.items()):
+            if len(self._handles) <= self.max_resident:
+                break
+            if tid == keep or handle.busy():
+                continue
+            victims.append((self._handles.pop(tid), "lru"))
+        return victims
+
+    def _shutdown_victims(self, victims: List[Tuple[TenantHandle, str]]) -> None:
+        for handle, why in victims:
+            self._metrics.inc_counter("tenant_evictions_total", why)
+            _log.info("evicting tenant %s (%s)", handle.tenant_id, why)
             try:
-                instance.startup()
+                handle.instance.shutdown()
             except Exception:
-                _log.error("tenant %s startup failed", tid, exc_info=True)
-                raise
-            handle = TenantHandle(tenant_id=tid, settings=settings, instance=instance)
-            self._handles[tid] = handle
-            return handle
+                _log.warning("shutdown failed for tenant %s during eviction", handle.tenant_id, exc_info=True)
+
+    def _maybe_sweep(self) -> None:
+        if self.idle_ttl_sec <= 0 or self._clock() - self._last_sweep < min(60.0, self.idle_ttl_sec):
+            return
+        self._last_sweep = self._clock()
+        # Shutting idle tenants down can be slow; keep it off the request path.
+        threading.Thread(target=self.evict_idle, name="tenant-idle-sweep", daemon=True).start()
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            victims = [(handle, why) for handle, why in self._select_victims() if why == "idle"]
+            self._metrics.set_gauge("tenant_resident", len(self._handles))
+        self._shutdown_victims(victims)
+        return len(victims)
+
+    def release(self, handle: TenantHandle) -> None:
+        """End a lease taken by :meth:`get_or_create` or :meth:`lease`."""
+        with self._lock:
+            handle.in_flight = max(0, handle.in_flight - 1)
+            handle.last_used = self._clock()
+
+    @contextmanager
+    def lease(self, handle: TenantHandle) -> Iterator[TenantHandle]:
+        """Mark an already resolved ``handle`` busy for the duration of a request."""
+        with self._lock:
+            handle.in_flight += 1
+        try:
+            yield handle
+        finally:
+            self.release(handle)
+
+    def start_warmup(self, tenant_ids: Iterable[str]) -> Optional[threading.Thread]:
+        """Build ``tenant_ids`` on a background thread; failures are logged and skipped."""
+        ids = [tid for tid in dict.fromkeys(str(t or "").strip() for t in tenant_ids) if tid]
+        if not ids:
+            return None
+
+        def _run() -> None:
+            for tid in ids[: self.max_resident]:
+                try:
+                    self.get_or_create(tid, reason="warmup")
+                except Exception:  # policy: allowed-broad-except
+                    _log.warning("tenant warmup failed for %s", tid, exc_info=True)
+
+        thread = threading.Thread(target=_run, name="tenant-warmup", daemon=True)
+        self._warmup_thread = thread
+        thread.start()
+        return thread
 
     def replace(self, tenant_id: str) -> TenantHandle:
         tid = validate_tenant_id(tenant_id)
@@ -104,6 +254,7 @@ class TenantRegistry:
         tid = validate_tenant_id(tenant_id)
         with self._lock:
             prior = self._handles.pop(tid, None)
+            self._metrics.set_gauge("tenant_resident", len(self._handles))
         if prior is not None:
             try:
                 prior.instance.shutdown()
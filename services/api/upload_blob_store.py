@@ -0,0 +1,294 @@
+"""Content-addressed store for uploaded file bodies.
+
+Uploads are streamed into ``<uploads_dir>/blobs`` while their SHA-256 is
+computed, stored once per digest and hardlinked into the per-job directories
+that reference them, so N jobs uploading the same file cost one body on disk.
+Blobs are read-only and a job file shares the blob's inode: writers must
+replace a job file (write a temporary file and rename it over), never rewrite
+it in place. Where a hardlink is not possible the job file is reflinked, else
+copied. Every link is recorded as a reference whose liveness is checked
+against the job file's inode (or size for clones), and unreferenced blobs are
+garbage-collected in the background at most once per ``gc_interval_sec``.
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from .dir_index_support import InstanceRegistry
+
+_log = logging.getLogger(__name__)
+
+# Linux FICLONE ioctl: copy-on-write clone on filesystems that support it.
+_FICLONE = 0x40049409
+_DEFAULT_CHUNK_SIZE = 1024 * 1024
+_KNOWN_DIGESTS_MAX_ITEMS = 4096
+
+_STORES: InstanceRegistry["UploadBlobStore"] = InstanceRegistry()
+_KNOWN_DIGESTS: Dict[Tuple[str, int, int, int], str] = {}
+_KNOWN_DIGESTS_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    digest: str
+    size: int
+    path: Path
+    created: bool
+
+
+def _stat_key(path: Path) -> Optional[Tuple[str, int, int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return str(path.resolve()), int(st.st_ino), int(st.st_size), int(st.st_mtime_ns)
+
+
+def remember_digest(path: Path, digest: str) -> None:
+    key = _stat_key(path)
+    if key is None:
+        return
+    with _KNOWN_DIGESTS_LOCK:
+        if len(_KNOWN_DIGESTS) >= _KNOWN_DIGESTS_MAX_ITEMS:
+            _KNOWN_DIGESTS.pop(next(iter(_KNOWN_DIGESTS)))
+        _KNOWN_DIGESTS[key] = digest
+
+
+def known_digest(path: Path) -> str:
+    """Return the SHA-256 recorded when ``path`` was saved, if it is unchanged since."""
+    key = _stat_key(path)
+    if key is None:
+        return ""
+    with _KNOWN_DIGESTS_LOCK:
+        return _KNOWN_DIGESTS.get(key, "")
+
+
+def _materialize(src: Path, dest: Path) -> str:
+    """Create ``dest`` with ``src``'s body: a hardlink, else a copy-on-write clone, else a copy."""
+    try:
+        os.link(src, dest)
+        return "hardlink"
+    except OSError:
+        _log.debug("hardlink unavailable for %s", dest, exc_info=True)
+    with src.open("rb") as s, dest.open("wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            return "reflink"
+        except OSError:
+            _log.debug("reflink unavailable for %s", dest, exc_info=True)
+        shutil.copyfileobj(s, d, _DEFAULT_CHUNK_SIZE)
+    return "copy"
+
+
+class UploadBlobStore:
+    def __init__(self, root: Path, *, gc_interval_sec: float = 0.0, gc_min_age_sec: float = 3600.0) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.refs_dir = self.root / "refs"
+        self.tmp_dir = self.root / "tmp"
+        # ``0`` disables background collection.
+        self.gc_interval_sec = float(gc_interval_sec)
+        self.gc_min_age_sec = float(gc_min_age_sec)
+        self._last_gc = time.monotonic()
+        self._gc_lock = threading.Lock()
+
+    def blob_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _ref_dir(self, digest: str) -> Path:
+        return self.refs_dir / digest[:2] / digest
+
+    def _spool(self, stream: BinaryIO, chunk_size: int) -> Tuple[Path, str, int]:
+        """Copy ``stream`` to a temporary file, hashing while writing."""
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.tmp_dir / f"{uuid.uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with tmp.open("wb") as out:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return tmp, digest.hexdigest(), size
+
+    def _promote(self, tmp: Path, digest: str, size: int) -> BlobRef:
+        """Store spooled ``tmp`` as blob ``digest`` unless it is already stored (``tmp`` is kept then)."""
+        target = self.blob_path(digest)
+        if target.exists():
+            self._touch_refs(digest)
+            return BlobRef(digest=digest, size=size, path=target, created=False)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.chmod(tmp, 0o444)
+        tmp.replace(target)
+        return BlobRef(digest=digest, size=size, path=target, created=True)
+
+    def ingest_stream(self, stream: BinaryIO, *, chunk_size: int = _DEFAULT_CHUNK_SIZE) -> BlobRef:
+        """Copy ``stream`` into the store, hashing while writing; identical bodies are stored once."""
+        tmp, digest, size = self._spool(stream, chunk_size)
+        try:
+            return self._promote(tmp, digest, size)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def link(self, digest: str, dest: Path) -> str:
+        """Link blob ``digest`` at ``dest`` and record the reference.
+
+        ``dest`` is replaced atomically and returns the method used
+        (``hardlink``, ``reflink`` or ``copy``). Raises ``FileNotFoundError``
+        when the blob is gone (e.g. collected meanwhile).
+        """
+        source = self.blob_path(digest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        staging = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.link")
+        try:
+            method = _materialize(source, staging)
+            staging.replace(dest)
+        finally:
+            staging.unlink(missing_ok=True)
+        self._add_ref(digest, dest, method)
+        remember_digest(dest, digest)
+        return method
+
+    def save_stream(self, stream: BinaryIO, dest: Path, *, chunk_size: int = _DEFAULT_CHUNK_SIZE) -> BlobRef:
+        tmp, digest, size = self._spool(stream, chunk_size)
+        try:
+            ref = self._promote(tmp, digest, size)
+            try:
+                self.link(digest, dest)
+            except FileNotFoundError:
+                if ref.created:
+                    raise
+                # A collection removed the existing blob before it was linked:
+                # store the spooled copy instead.
+                _log.info("blob %s collected while linking; re-ingesting", digest)
+                ref = self._promote(tmp, digest, size)
+                self.link(digest, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self.maybe_collect_garbage()
+        return ref
+
+    def _touch_refs(self, digest: str) -> None:
+        # Refresh the GC age guard without touching the read-only blob inode.
+        ref_dir = self._ref_dir(digest)
+        ref_dir.mkdir(parents=True, exist_ok=True)
+        os.utime(ref_dir)
+
+    def _last_used(self, digest: str, blob_mtime: float) -> float:
+        try:
+            return max(blob_mtime, self._ref_dir(digest).stat().st_mtime)
+        except OSError:
+            return blob_mtime
+
+    def _add_ref(self, digest: str, dest: Path, method: str) -> None:
+        ref_dir = self._ref_dir(digest)
+        ref_dir.mkdir(parents=True, exist_ok=True)
+        resolved = str(dest.resolve())
+        name = hashlib.sha1(resolved.encode("utf-8", errors="ignore")).hexdigest()
+        (ref_dir / name).write_text(f"{method}\n{resolved}", encoding="utf-8")
+
+    def _live_refs(self, digest: str) -> List[Path]:
+        ref_dir = self._ref_dir(digest)
+        if not ref_dir.exists():
+            return []
+        blob_st = self.blob_path(digest).stat()
+        live: List[Path] = []
+        for ref_file in ref_dir.iterdir():
+            try:
+                method, _, raw_target = ref_file.read_text(encoding="utf-8").partition("\n")
+                target = Path(raw_target.strip())
+                target_st = target.stat()
+                if method == "hardlink":
+                    alive = target_st.st_ino == blob_st.st_ino and target_st.st_dev == blob_st.st_dev
+                else:
+                    alive = target_st.st_size == blob_st.st_size
+            except OSError:
+                alive = False
+            if alive:
+                live.append(target)
+            else:
+                ref_file.unlink(missing_ok=True)
+        return live
+
+    def ref_count(self, digest: str) -> int:
+        if not self.blob_path(digest).exists():
+            return 0
+        return len(self._live_refs(digest))
+
+    def maybe_collect_garbage(self) -> bool:
+        """Start a background collection when ``gc_interval_sec`` has elapsed since the last one."""
+        if self.gc_interval_sec <= 0:
+            return False
+        with self._gc_lock:
+            if time.monotonic() - self._last_gc < self.gc_interval_sec:
+                return False
+            self._last_gc = time.monotonic()
+        threading.Thread(target=self._collect_in_background, name="upload-blob-gc", daemon=True).start()
+        return True
+
+    def _collect_in_background(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / "gc.lock", "a+b") as lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Another process is collecting this store right now.
+                return
+            try:
+                result = self.collect_garbage(min_age_sec=self.gc_min_age_sec)
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        if result["removed"]:
+            _log.info("upload blob gc: %s", result)
+
+    def collect_garbage(self, *, min_age_sec: float = 3600.0) -> Dict[str, Any]:
+        """Delete blobs without live references that are older than ``min_age_sec``.
+
+        References whose target was deleted or replaced are pruned first. The age
+        guard keeps blobs that were ingested but not yet linked.
+        """
+        removed = 0
+        freed = 0
+        kept = 0
+        now = time.time()
+        if not self.objects_dir.exists():
+            return {"removed": 0, "freed_bytes": 0, "kept": 0}
+        for blob in self.objects_dir.glob("*/*"):
+            digest = blob.name
+            try:
+                st = blob.stat()
+                if self._live_refs(digest) or (now - self._last_used(digest, st.st_mtime)) < min_age_sec:
+                    kept += 1
+                    continue
+                blob.unlink()
+            except OSError:
+                _log.debug("blob gc skipped %s", digest, exc_info=True)
+                kept += 1
+                continue
+            shutil.rmtree(self._ref_dir(digest), ignore_errors=True)
+            removed += 1
+            freed += int(st.st_size)
+        return {"removed": removed, "freed_bytes": freed, "kept": kept}
+
+
+def get_upload_blob_store(root: Path, *, gc_interval_sec: float = 0.0) -> UploadBlobStore:
+    store = _STORES.get(Path(root), lambda: UploadBlobStore(Path(root), gc_interval_sec=gc_interval_sec))
+    store.gc_interval_sec = float(gc_interval_sec)
+    return store
@@ -1,26 +1,49 @@
 from __future__ import annotations
 
+import hashlib
 import html as html_lib
 import logging
 import os
 import re
+import tempfile
+import threading
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from fastapi import UploadFile
 
+from .fs_atomic import atomic_write_text
+from .upload_blob_store import UploadBlobStore, known_digest
+
 _log = logging.getLogger(__name__)
 
 _OCR_UTILS: Optional[Tuple[Any, Any]] = None
 
+_PDF_MIN_TEXT_CHARS = 50
+_PDF_PARALLEL_MIN_PAGES = 8
+_PDF_OCR_RESOLUTION = 200
+_PDF_EXTRACT_CACHE_MAX_ITEMS = 64
+_PDF_EXTRACT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_PDF_EXTRACT_CACHE_LOCK = threading.Lock()
+# Last sweep (time.monotonic) per on-disk extract cache directory.
+_PDF_EXTRACT_CACHE_SWEPT: Dict[str, float] = {}
+
 
 @dataclass(frozen=True)
 class UploadTextDeps:
     diag_log: Callable[..., None]
     limit: Callable[[Any], Any]
     ocr_semaphore: Any
+    extract_cache_dir: Optional[Path] = None
+    extract_cache_max_bytes: int = 256 * 1024 * 1024
+    extract_cache_max_age_sec: float = 30 * 86400.0
+    # ``0`` disables sweeping the on-disk cache.
+    extract_cache_sweep_interval_sec: float = 3600.0
 
 
 
@@ -46,7 +69,14 @@ async def save_upload_file(
     *,
     run_in_threadpool: Callable[[Callable[..., Any]], Any],
     chunk_size: int = 1024 * 1024,
+    blob_store: Optional[UploadBlobStore] = None,
 ) -> int:
+    """Stream an upload to ``dest`` and return the number of bytes written.
+
+    With a ``blob_store`` the body is hashed while it is copied, stored once per
+    SHA-256 and linked into ``dest``. Either way ``dest`` is replaced rather than
+    rewritten in place.
+    """
     dest.parent.mkdir(parents=True, exist_ok=True)
 
     def _copy() -> int:
@@ -56,13 +86,20 @@ async def save_upload_file(
         except Exception:
             _log.debug("operation failed", exc_info=True)
             pass
-        with dest.open("wb") as out:
-            while True:
-                chunk = upload.file.read(chunk_size)
-                if not chunk:
-                    break
-                out.write(chunk)
-                total += len(chunk)
+        if blob_store is not None:
+            return blob_store.save_stream(upload.file, dest, chunk_size=chunk_size).size
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.part")
+        try:
+            with tmp.open("wb") as out:
+                while True:
+                    chunk = upload.file.read(chunk_size)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    total += len(chunk)
+            tmp.replace(dest)
+        finally:
+            tmp.unlink(missing_ok=True)
         return total
 
     return await run_in_threadpool(_copy)
@@ -108,64 +145,372 @@ def extract_text_from_html(content: str) -> str:
 
 
 
-def extract_text_from_pdf(
+def file_content_sha256(path: Path, *, chunk_size: int = 1024 * 1024) -> str:
+    recorded = known_digest(path)
+    if recorded:
+        return recorded
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as handle:
+            while True:
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+    except Exception:
+        _log.debug("file hash failed for %s", path, exc_info=True)
+        return ""
+    return digest.hexdigest()
+
+
+
+def reset_pdf_extract_cache() -> None:
+    with _PDF_EXTRACT_CACHE_LOCK:
+        _PDF_EXTRACT_CACHE.clear()
+        _PDF_EXTRACT_CACHE_SWEPT.clear()
+
+
+
+def _env_positive_int(name: str, default: int) -> int:
+    raw = str(os.getenv(name, "") or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(1, int(raw))
+    except Exception:
+        _log.debug("numeric conversion failed", exc_info=True)
+        return default
+
+
+
+def _pdf_extract_cache_key(path: Path, *, language: str, ocr_mode: str, prompt: str) -> str:
+    digest = file_content_sha256(path)
+    if not digest:
+        return ""
+    options = hashlib.sha256(f"{language}\0{ocr_mode}\0{prompt}".encode("utf-8")).hexdigest()[:16]
+    return f"{digest}_{options}"
+
+
+
+def _pdf_extract_cache_get(key: str, cache_dir: Optional[Path]) -> Optional[str]:
+    with _PDF_EXTRACT_CACHE_LOCK:
+        cached = _PDF_EXTRACT_CACHE.get(key)
+        if cached is not None:
+            _PDF_EXTRACT_CACHE.move_to_end(key)
+            return cached
+    if cache_dir is None:
+        return None
+    cache_path = cache_dir / f"{key}.txt"
+    if not cache_path.exists():
+        return None
+    try:
+        text = cache_path.read_text(encoding="utf-8")
+        os.utime(cache_path)
+    except Exception:
+        _log.debug("file read failed", exc_info=True)
+        return None
+    _pdf_extract_cache_remember(key, text)
+    return text
+
+
+
+def _pdf_extract_cache_remember(key: str, text: str) -> None:
+    with _PDF_EXTRACT_CACHE_LOCK:
+        _PDF_EXTRACT_CACHE[key] = text
+        _PDF_EXTRACT_CACHE.move_to_end(key)
+        while len(_PDF_EXTRACT_CACHE) > _PDF_EXTRACT_CACHE_MAX_ITEMS:
+            _PDF_EXTRACT_CACHE.popitem(last=False)
+
+
+
+def _pdf_extract_cache_put(key: str, text: str, deps: UploadTextDeps) -> None:
+    _pdf_extract_cache_remember(key, text)
+    cache_dir = deps.extract_cache_dir
+    if cache_dir is None:
+        return
+    try:
+        atomic_write_text(cache_dir / f"{key}.txt", text)
+    except Exception:
+        _log.debug("pdf extract cache write failed for %s", key, exc_info=True)
+    _pdf_extract_cache_maybe_sweep(deps)
+
+
+
+def _pdf_extract_cache_maybe_sweep(deps: UploadTextDeps) -> bool:
+    """Sweep the on-disk cache in the background, at most once per sweep interval per process."""
+    cache_dir = deps.extract_cache_dir
+    if cache_dir is None or deps.extract_cache_sweep_interval_sec <= 0:
+        return False
+    now = time.monotonic()
+    with _PDF_EXTRACT_CACHE_LOCK:
+        last = _PDF_EXTRACT_CACHE_SWEPT.get(str(cache_dir))
+        if last is not None and now - last < deps.extract_cache_sweep_interval_sec:
+            return False
+        _PDF_EXTRACT_CACHE_SWEPT[str(cache_dir)] = now
+    threading.Thread(
+        target=sweep_pdf_extract_cache,
+        args=(cache_dir,),
+        kwargs={"max_bytes": deps.extract_cache_max_bytes, "max_age_sec": deps.extract_cache_max_age_sec},
+        name="pdf-extract-cache-sweep",
+        daemon=True,
+    ).start()
+    return True
+
+
+
+def sweep_pdf_extract_cache(cache_dir: Path, *, max_bytes: int, max_age_sec: float) -> Dict[str, int]:
+    """Delete cached extracts unused for ``max_age_sec``, then the least recently used beyond ``max_bytes``.
+
+    Disk hits refresh an entry's mtime, so mtime orders entries by last use.
+    """
+    entries: List[Tuple[float, int, Path]] = []
+    for path in cache_dir.glob("*.txt"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, int(st.st_size), path))
+    entries.sort()
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    freed = 0
+    for mtime, size, path in entries:
+        if now - mtime <= max_age_sec and total <= max_bytes:
+            break
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            _log.debug("pdf extract cache sweep could not remove %s", path, exc_info=True)
+            continue
+        total -= size
+        removed += 1
+        freed += size
+    if removed:
+        _log.info("pdf extract cache sweep: removed=%d freed_bytes=%d", removed, freed)
+    return {"removed": removed, "freed_bytes": freed, "kept": len(entries) - removed}
+
+
+
+def _extract_pdf_page_range(path: Path, start: int, stop: int) -> List[str]:
+    import pdfplumber  # type: ignore
+
+    with pdfplumber.open(str(path)) as pdf:
+        return [pdf.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+
+def _extract_pdf_pages(path: Path) -> List[str]:
+    import pdfplumber  # type: ignore
+
+    workers = _env_positive_int("PDF_EXTRACT_WORKERS", 4)
+    with pdfplumber.open(str(path)) as pdf:
+        page_count = len(pdf.pages)
+        if workers <= 1 or page_count < _PDF_PARALLEL_MIN_PAGES:
+            return [page.extract_text() or "" for page in pdf.pages]
+    # pdfplumber page objects are not safe to share across threads, so each
+    # worker opens its own handle over a contiguous page range.
+    span = -(-page_count // workers)
+    ranges = [(start, min(start + span, page_count)) for start in range(0, page_count, span)]
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        chunks = list(pool.map(lambda bounds: _extract_pdf_page_range(path, *bounds), ranges))
+    return [text for chunk in chunks for text in chunk]
+
+
+
+def _render_pdf_pages(path: Path, indexes: List[int], out_dir: Path) -> Dict[int, Path]:
+    import pdfplumber  # type: ignore
+
+    rendered: Dict[int, Path] = {}
+    # Rendering goes through pdfium, which is not thread-safe; keep it serial.
+    with pdfplumber.open(str(path)) as pdf:
+        for index in indexes:
+            image_path = out_dir / f"page_{index + 1:04d}.png"
+            try:
+                pdf.pages[index].to_image(resolution=_PDF_OCR_RESOLUTION).save(str(image_path))
+            except Exception:
+                _log.debug("pdf page render failed page=%s", index + 1, exc_info=True)
+                continue
+            rendered[index] = image_path
+    return rendered
+
+
+
+def _is_fatal_ocr_error(exc: Exception) -> bool:
+    return "OCR unavailable" in str(exc) or "Missing OCR SDK" in str(exc)
+
+
+
+def _ocr_pdf_pages(
     path: Path,
+    indexes: List[int],
     *,
     deps: UploadTextDeps,
-    language: str = "zh",
-    ocr_mode: str = "FREE_OCR",
-    prompt: str = "",
-) -> str:
-    text = ""
+    ocr_with_sdk: Callable[..., str],
+    language: str,
+    ocr_mode: str,
+    prompt: str,
+) -> Optional[Tuple[Dict[int, str], bool]]:
+    """OCR only the given low-text pages; returns None when pages cannot be rendered."""
+    ocr_timeout = parse_timeout_env("OCR_TIMEOUT_SEC")
+    with tempfile.TemporaryDirectory(prefix="pdf_ocr_") as tmp:
+        try:
+            rendered = _render_pdf_pages(path, indexes, Path(tmp))
+        except Exception:
+            _log.debug("pdf page render unavailable", exc_info=True)
+            rendered = {}
+        if not rendered:
+            return None
+
+        def _ocr_page(index: int) -> Tuple[int, str, Optional[Exception]]:
+            try:
+                with deps.limit(deps.ocr_semaphore):
+                    text = ocr_with_sdk(
+                        rendered[index], language=language, mode=ocr_mode, prompt=prompt, timeout=ocr_timeout
+                    )
+                return index, str(text or ""), None
+            except Exception as exc:
+                return index, "", exc
+
+        t0 = time.monotonic()
+        workers = min(len(rendered), _env_positive_int("PDF_OCR_PAGE_WORKERS", 4))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_ocr_page, sorted(rendered)))
+
+    results: Dict[int, str] = {}
+    complete = len(rendered) == len(indexes)
+    for index, text, error in outcomes:
+        if error is None:
+            results[index] = text
+            continue
+        complete = False
+        deps.diag_log(
+            "pdf.page_ocr.error",
+            {"file": str(path), "page": index + 1, "error": str(error)[:200], "timeout": ocr_timeout},
+        )
+        if _is_fatal_ocr_error(error):
+            raise error
+    deps.diag_log(
+        "pdf.page_ocr.done",
+        {
+            "file": str(path),
+            "pages": [index + 1 for index in sorted(results)],
+            "duration_ms": int((time.monotonic() - t0) * 1000),
+            "timeout": ocr_timeout,
+        },
+    )
+    return results, complete
+
+
+
+def _ocr_whole_pdf(
+    path: Path,
+    *,
+    deps: UploadTextDeps,
+    ocr_with_sdk: Callable[..., str],
+    language: str,
+    ocr_mode: str,
+    prompt: str,
+) -> Tuple[str, bool]:
+    ocr_timeout = parse_timeout_env("OCR_TIMEOUT_SEC")
     try:
-        import pdfplumber  # type: ignore
+        t0 = time.monotonic()
+        with deps.limit(deps.ocr_semaphore):
+            ocr_text = ocr_with_sdk(path, language=language, mode=ocr_mode, prompt=prompt, timeout=ocr_timeout)
+        deps.diag_log(
+            "pdf.ocr.done",
+            {
+                "file": str(path),
+                "duration_ms": int((time.monotonic() - t0) * 1000),
+                "timeout": ocr_timeout,
+            },
+        )
+        return ocr_text, True
+    except Exception as exc:
+        _log.debug("whole-document pdf ocr failed for %s", path, exc_info=True)
+        deps.diag_log("pdf.ocr.error", {"file": str(path), "error": str(exc)[:200], "timeout": ocr_timeout})
+        if _is_fatal_ocr_error(exc):
+            raise
+        return "", False
 
+
+
+def _extract_text_from_pdf_uncached(
+    path: Path,
+    *,
+    deps: UploadTextDeps,
+    language: str,
+    ocr_mode: str,
+    prompt: str,
+) -> Tuple[str, bool]:
+    pages: List[str] = []
+    complete = True
+    try:
         t1 = time.monotonic()
-        pages_text = []
-        with pdfplumber.open(str(path)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                if page_text:
-                    pages_text.append(page_text)
-        text = "\n".join(pages_text)
+        pages = _extract_pdf_pages(path)
         deps.diag_log(
             "pdf.extract.done",
-            {"file": str(path), "duration_ms": int((time.monotonic() - t1) * 1000)},
+            {"file": str(path), "pages": len(pages), "duration_ms": int((time.monotonic() - t1) * 1000)},
         )
     except Exception as exc:
-        _log.debug("numeric conversion failed", exc_info=True)
+        _log.debug("pdf page text extraction failed for %s", path, exc_info=True)
         deps.diag_log("pdf.extract.error", {"file": str(path), "error": str(exc)[:200]})
+        complete = False
+    text = "\n".join(page for page in pages if page)
 
-    if len(text.strip()) >= 50:
-        return clean_ocr_text(text)
-
-    ocr_text = ""
-    ocr_timeout = parse_timeout_env("OCR_TIMEOUT_SEC")
+    min_page_chars = _env_positive_int("PDF_PAGE_OCR_MIN_CHARS", 20)
+    low_pages = [index for index, page in enumerate(pages) if len(page.strip()) < min_page_chars]
     _, ocr_with_sdk = load_ocr_utils()
-    if ocr_with_sdk:
-        try:
-            t0 = time.monotonic()
-            with deps.limit(deps.ocr_semaphore):
-                ocr_text = ocr_with_sdk(path, language=language, mode=ocr_mode, prompt=prompt, timeout=ocr_timeout)
-            deps.diag_log(
-                "pdf.ocr.done",
-                {
-                    "file": str(path),
-                    "duration_ms": int((time.monotonic() - t0) * 1000),
-                    "timeout": ocr_timeout,
-                },
-            )
-        except Exception as exc:
-            _log.debug("numeric conversion failed", exc_info=True)
-            deps.diag_log("pdf.ocr.error", {"file": str(path), "error": str(exc)[:200], "timeout": ocr_timeout})
-            if "OCR unavailable" in str(exc) or "Missing OCR SDK" in str(exc):
-                raise
-
-    if len(ocr_text.strip()) >= 50:
-        return clean_ocr_text(ocr_text)
+    if low_pages and ocr_with_sdk:
+        page_ocr = _ocr_pdf_pages(
+            path, low_pages, deps=deps, ocr_with_sdk=ocr_with_sdk, language=language, ocr_mode=ocr_mode, prompt=prompt
+        )
+        if page_ocr is not None:
+            ocr_pages, ocr_complete = page_ocr
+            stitched = [ocr_pages.get(index) or page for index, page in enumerate(pages)]
+            return clean_ocr_text("\n".join(page for page in stitched if page)), complete and ocr_complete
+
+    if len(text.strip()) >= _PDF_MIN_TEXT_CHARS:
+        return clean_ocr_text(text), complete
+    if not ocr_with_sdk:
+        return clean_ocr_text(text), False
+
+    # Pages could not be rendered individually: fall back to OCR of the whole file.
+    ocr_text, ocr_complete = _ocr_whole_pdf(
+        path, deps=deps, ocr_with_sdk=ocr_with_sdk, language=language, ocr_mode=ocr_mode, prompt=prompt
+    )
     if ocr_text:
-        return clean_ocr_text(ocr_text)
-    return clean_ocr_text(text)
+        return clean_ocr_text(ocr_text), ocr_complete
+    return clean_ocr_text(text), False
+
+
+
+def extract_text_from_pdf(
+    path: Path,
+    *,
+    deps: UploadTextDeps,
+    language: str = "zh",
+    ocr_mode: str = "FREE_OCR",
+    prompt: str = "",
+) -> str:
+    """Extract PDF text page by page, OCR-ing only pages without a text layer.
+
+    Results are cached by file content hash (plus OCR options), so re-parses and
+    retries of the same upload skip extraction entirely. Partial results caused by
+    OCR errors are never cached.
+    """
+    cache_key = _pdf_extract_cache_key(path, language=language, ocr_mode=ocr_mode, prompt=prompt)
+    if cache_key:
+        cached = _pdf_extract_cache_get(cache_key, deps.extract_cache_dir)
+        if cached is not None:
+            deps.diag_log("pdf.extract.cache_hit", {"file": str(path), "key": cache_key})
+            return cached
+    text, complete = _extract_text_from_pdf_uncached(
+        path, deps=deps, language=language, ocr_mode=ocr_mode, prompt=prompt
+    )
+    if cache_key and complete and text:
+        _pdf_extract_cache_put(cache_key, text, deps)
+    return text
 
 
 
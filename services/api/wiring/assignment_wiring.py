@@ -235,6 +235,7 @@ def _assignment_progress_deps(core: Any | None = None):
         atomic_write_json=_ac._atomic_write_json,
         time_time=time.time,
         now_iso=lambda: datetime.now().isoformat(timespec="seconds"),
+        progress_max_age_sec=_ac.ASSIGNMENT_PROGRESS_MAX_AGE_SEC,
     )
 
 
@@ -353,6 +354,7 @@ def _assignment_questions_ocr_deps(core: Any | None = None):
         run_script=_ac.run_script,
         sanitize_filename=_ac.sanitize_filename,
         sanitize_assignment_id=_ac.safe_slug,
+        save_upload_file=_ac.save_upload_file,
     )
 
 
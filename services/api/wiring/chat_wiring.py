@@ -395,6 +395,7 @@ def _chat_job_process_deps(core: Any | None = None):
             request_id=(str(kwargs.get("request_id") or "") or None),
         ),
         compute_assignment_progress=_ac.compute_assignment_progress,
+        refresh_assignment_progress_student=_ac.refresh_assignment_progress_student,
         student_memory_auto_propose_from_assignment_evidence=lambda **kwargs: _student_memory_auto_propose_from_assignment_evidence_api(
             deps=student_memory_deps,
             teacher_id=kwargs.get("teacher_id"),
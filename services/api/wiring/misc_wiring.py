@@ -25,6 +25,7 @@ from typing import Any
 
 from services.common.tool_registry import DEFAULT_TOOL_REGISTRY
 
+from .. import settings as _settings
 from ..agent_service import (
     AgentRuntimeDeps,
 )
@@ -79,6 +80,7 @@ from ..chart_agent_run_service import (
 from ..chart_agent_run_service import (
     chart_agent_packages as _chart_agent_packages_impl,
 )
+from ..content_catalog_cache import invalidate_content_catalog
 from ..content_catalog_service import ContentCatalogDeps
 from ..core_example_tool_service import CoreExampleToolDeps
 from ..core_utils import _is_safe_tool_id, _resolve_app_path
@@ -221,6 +223,11 @@ def _upload_text_deps(core: Any | None = None):
         diag_log=_ac.diag_log,
         limit=_ac._limit,
         ocr_semaphore=(_ac._OCR_SEMAPHORE, GLOBAL_OCR_SEMAPHORE),
+        extract_cache_dir=_ac.UPLOADS_DIR / "extract_cache",
+        extract_cache_max_bytes=_settings.upload_extract_cache_max_bytes(),
+        extract_cache_max_age_sec=_settings.upload_extract_cache_max_age_sec(),
+        # Swept on the upload blob store's GC schedule.
+        extract_cache_sweep_interval_sec=_settings.upload_blob_gc_interval_sec(),
     )
 
 
@@ -280,6 +287,7 @@ def _lesson_core_tool_deps(core: Any | None = None):
         resolve_app_path=_resolve_app_path,
         app_root=_ac.APP_ROOT,
         run_script=_ac.run_script,
+        on_lessons_changed=invalidate_content_catalog,
     )
 
 
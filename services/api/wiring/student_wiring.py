@@ -14,6 +14,10 @@ __all__ = [
 
 from datetime import datetime
 
+from ..assignment_progress_service import (
+    refresh_assignment_progress_student as _refresh_assignment_progress_student_impl,
+)
+from ..job_repository import save_upload_file as _save_upload_file
 from ..student_directory_service import StudentDirectoryDeps
 from ..student_import_service import StudentImportDeps
 from ..student_memory_service import (
@@ -25,6 +29,7 @@ from ..student_memory_service import (
 from ..student_ops_service import StudentOpsDeps
 from ..student_submit_service import StudentSubmitDeps
 from . import get_app_core as _app_core
+from .assignment_wiring import _assignment_progress_deps
 
 
 def _student_submit_deps(core=None):
@@ -43,7 +48,13 @@ def _student_submit_deps(core=None):
         student_submissions_dir=_ac.STUDENT_SUBMISSIONS_DIR,
         run_script=_ac.run_script,
         sanitize_filename=_ac.sanitize_filename,
+        save_upload_file=_save_upload_file,
         compute_assignment_progress=_ac.compute_assignment_progress,
+        refresh_assignment_progress_student=lambda assignment_id, student_id: _refresh_assignment_progress_student_impl(
+            assignment_id,
+            student_id,
+            deps=_assignment_progress_deps(core),
+        ),
         student_memory_auto_propose_from_assignment_evidence=lambda **kwargs: _student_memory_auto_propose_from_assignment_evidence_api(
             deps=student_memory_deps,
             teacher_id=kwargs.get("teacher_id"),
@@ -104,12 +104,16 @@ def survey_list_reports(
     teacher_id: str,
     status: Optional[str] = None,
     *,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
     core: Any | None = None,
 ) -> Dict[str, Any]:
     return _list_survey_reports_impl(
         teacher_id=teacher_id,
         status=status,
         deps=build_survey_report_deps(_app_core(core)),
+        limit=limit,
+        cursor=cursor,
     )
 
 
@@ -88,6 +88,7 @@ def upload_worker_deps(core: Any | None = None) -> UploadWorkerDeps:
     return UploadWorkerDeps(
         job_queue=_ac.UPLOAD_JOB_QUEUE,
         job_lock=_ac.UPLOAD_JOB_LOCK,
+        active_jobs=_ac.UPLOAD_JOB_ACTIVE,
         job_event=_ac.UPLOAD_JOB_EVENT,
         job_dir=_ac.UPLOAD_JOB_DIR,
         stop_event=_ac.UPLOAD_JOB_STOP_EVENT,
@@ -127,6 +128,7 @@ def exam_worker_deps(core: Any | None = None) -> ExamWorkerDeps:
     return ExamWorkerDeps(
         job_queue=_ac.EXAM_JOB_QUEUE,
         job_lock=_ac.EXAM_JOB_LOCK,
+        active_jobs=_ac.EXAM_JOB_ACTIVE,
         job_event=_ac.EXAM_JOB_EVENT,
         job_dir=_ac.EXAM_UPLOAD_JOB_DIR,
         stop_event=_ac.EXAM_JOB_STOP_EVENT,
@@ -167,6 +169,7 @@ def survey_worker_deps(core: Any | None = None) -> SurveyWorkerDeps:
     return SurveyWorkerDeps(
         job_queue=_ac.SURVEY_JOB_QUEUE,
         job_lock=_ac.SURVEY_JOB_LOCK,
+        active_jobs=_ac.SURVEY_JOB_ACTIVE,
         job_event=_ac.SURVEY_JOB_EVENT,
         job_dir=_ac.SURVEY_JOB_DIR,
         stop_event=_ac.SURVEY_JOB_STOP_EVENT,
@@ -3,9 +3,9 @@ from __future__ import annotations
 import json
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Deque, Dict
+from typing import Any, Callable, Deque, Dict, Set
 
 from .lifecycle_state import compute_stop_result
 
@@ -29,6 +29,8 @@ class ExamWorkerDeps:
     sleep: Callable[[float], None]
     thread_factory: Callable[..., Any]
     rq_enabled: Callable[[], bool]
+    # Job ids popped from ``job_queue`` and still being processed (guarded by ``job_lock``).
+    active_jobs: Set[str] = field(default_factory=set)
 
 
 def _thread_is_alive(thread: Any) -> bool:
@@ -69,6 +71,21 @@ def scan_pending_exam_jobs_inline(*, deps: ExamWorkerDeps) -> int:
     return count
 
 
+def _process_one(job_id: str, *, deps: ExamWorkerDeps) -> None:
+    try:
+        deps.process_job(job_id)
+    except Exception as exc:
+        _log.debug("operation failed", exc_info=True)
+        deps.diag_log("exam_upload.job.failed", {"job_id": job_id, "error": str(exc)[:200]})
+        deps.write_job(
+            job_id,
+            {
+                "status": "failed",
+                "error": str(exc)[:200],
+            },
+        )
+
+
 def exam_job_worker_loop(*, deps: ExamWorkerDeps) -> None:
     while not deps.stop_event.is_set():
         deps.job_event.wait(timeout=0.1)
@@ -78,23 +95,17 @@ def exam_job_worker_loop(*, deps: ExamWorkerDeps) -> None:
         with deps.job_lock:
             if deps.job_queue:
                 job_id = deps.job_queue.popleft()
+                deps.active_jobs.add(job_id)
             if not deps.job_queue:
                 deps.job_event.clear()
         if not job_id:
             deps.sleep(0.1)
             continue
         try:
-            deps.process_job(job_id)
-        except Exception as exc:
-            _log.debug("operation failed", exc_info=True)
-            deps.diag_log("exam_upload.job.failed", {"job_id": job_id, "error": str(exc)[:200]})
-            deps.write_job(
-                job_id,
-                {
-                    "status": "failed",
-                    "error": str(exc)[:200],
-                },
-            )
+            _process_one(job_id, deps=deps)
+        finally:
+            with deps.job_lock:
+                deps.active_jobs.discard(job_id)
 
 
 def start_exam_upload_worker(*, deps: ExamWorkerDeps) -> None:
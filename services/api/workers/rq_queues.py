@@ -0,0 +1,94 @@
+"""Queue routing for RQ jobs.
+
+Each job class gets its own queue (``<RQ_QUEUE_NAME>.<class>``) so that a long
+exam parse cannot sit in front of interactive chat jobs.  Workers listen on
+all class queues; after every job the queue order is re-drawn by weighted
+random sampling (``RQ_QUEUE_WEIGHTS``), so high-weight classes are checked
+first most of the time without starving the others.  The legacy base queue is
+always listened on last to drain jobs enqueued before the split.
+"""
+from __future__ import annotations
+
+import logging
+import random
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from services.api import settings as _settings
+
+_log = logging.getLogger(__name__)
+
+JOB_CLASSES = ("chat", "profile", "survey", "upload", "exam")
+DEFAULT_QUEUE_WEIGHTS: Dict[str, float] = {
+    "chat": 10.0,
+    "profile": 4.0,
+    "survey": 2.0,
+    "upload": 1.0,
+    "exam": 1.0,
+}
+
+
+def parse_queue_weights(raw: str) -> Dict[str, float]:
+    weights = dict(DEFAULT_QUEUE_WEIGHTS)
+    for part in str(raw or "").split(","):
+        name, sep, value = part.partition("=")
+        name = name.strip()
+        if not sep or name not in weights:
+            continue
+        try:
+            weights[name] = max(0.01, float(value))
+        except ValueError:
+            _log.debug("invalid rq queue weight: %s", part)
+    return weights
+
+
+def queue_name_for(job_class: Optional[str]) -> str:
+    base = _settings.rq_queue_name() or "default"
+    if not job_class or not _settings.rq_priority_queues_enabled():
+        return base
+    return f"{base}.{job_class}"
+
+
+def worker_job_classes() -> List[str]:
+    raw = _settings.rq_worker_job_classes_raw()
+    if not raw:
+        return list(JOB_CLASSES)
+    selected = [name.strip() for name in raw.split(",") if name.strip() in JOB_CLASSES]
+    return selected or list(JOB_CLASSES)
+
+
+def worker_queue_names() -> List[str]:
+    """Queue names a worker should listen on, highest weight first, base queue last."""
+    base = queue_name_for(None)
+    if not _settings.rq_priority_queues_enabled():
+        return [base]
+    weights = parse_queue_weights(_settings.rq_queue_weights_raw())
+    classes = sorted(worker_job_classes(), key=lambda name: -weights[name])
+    return [queue_name_for(name) for name in classes] + [base]
+
+
+def weighted_order(queues: Sequence[Any], weights: Dict[str, float], *, rng: Any = random) -> List[Any]:
+    """Order ``queues`` by weighted random sampling without replacement.
+
+    Unweighted queues (e.g. the legacy base queue) keep their place at the end.
+    """
+    weighted = [queue for queue in queues if getattr(queue, "name", "") in weights]
+    rest = [queue for queue in queues if getattr(queue, "name", "") not in weights]
+    # Efraimidis-Spirakis: sorting by u**(1/w) samples proportionally to w.
+    keyed = [(rng.random() ** (1.0 / weights[queue.name]), queue) for queue in weighted]
+    keyed.sort(key=lambda item: item[0], reverse=True)
+    return [queue for _, queue in keyed] + rest
+
+
+def queue_weights_by_name() -> Dict[str, float]:
+    weights = parse_queue_weights(_settings.rq_queue_weights_raw())
+    return {queue_name_for(name): weight for name, weight in weights.items()}
+
+
+def queue_wait_sec(enqueued_at: Optional[datetime], *, now: Optional[datetime] = None) -> Optional[float]:
+    if enqueued_at is None:
+        return None
+    if enqueued_at.tzinfo is None:
+        enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)
+    current = now or datetime.now(timezone.utc)
+    return max(0.0, (current - enqueued_at).total_seconds())
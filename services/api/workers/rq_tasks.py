@@ -3,42 +3,147 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
+from redis.exceptions import RedisError
 from rq import Queue
 
 from services.api.chat_redis_lane_store import ChatRedisLaneStore
+from services.api.observability import OBSERVABILITY
 from services.api.redis_clients import get_redis_client
+from services.api.workers.rq_queues import queue_name_for, queue_wait_sec
 from services.api.workers.rq_tenant_runtime import load_tenant_module
 
 _log = logging.getLogger(__name__)
 
 
 
-def _queue_name() -> str:
-    return str(os.getenv("RQ_QUEUE_NAME", "default") or "default")
+def _queue_name(job_class: Optional[str] = None) -> str:
+    return queue_name_for(job_class)
 
 
-def _require_redis_client(*, decode_responses: bool) -> Any:
+class _RedisHandle:
+    """A cached client plus its Queue objects and last known liveness."""
+
+    __slots__ = ("client", "healthy", "checked_at", "checking", "queues")
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+        self.healthy = False
+        self.checked_at = 0.0
+        self.checking = False
+        self.queues: Dict[str, Queue] = {}
+
+
+_HANDLES: Dict[Tuple[str, bool], _RedisHandle] = {}
+_HANDLES_LOCK = threading.Lock()
+_HEALTH_CHECK_INTERVAL_SEC = 15.0
+
+
+def reset_redis_handles() -> None:
+    with _HANDLES_LOCK:
+        _HANDLES.clear()
+
+
+def _ping_handle(handle: _RedisHandle) -> Optional[Exception]:
+    error: Optional[Exception] = None
+    try:
+        handle.client.ping()
+    except Exception as exc:  # policy: allowed-broad-except
+        error = exc
+        _log.warning("rq redis health check failed", exc_info=True)
+    handle.healthy = error is None
+    handle.checked_at = time.monotonic()
+    handle.checking = False
+    return error
+
+
+def _redis_handle(*, decode_responses: bool) -> _RedisHandle:
+    """Return the per-process handle, pinging only when it is unverified or unhealthy.
+
+    A healthy handle is re-checked in a background thread once the check
+    interval has passed, so enqueues never wait on a ping round-trip.
+    """
     redis_url = str(os.getenv("REDIS_URL", "") or "").strip()
     if not redis_url:
         raise RuntimeError("Redis required: REDIS_URL not set")
-    client = get_redis_client(redis_url, decode_responses=decode_responses)
+    key = (redis_url, bool(decode_responses))
+    with _HANDLES_LOCK:
+        handle = _HANDLES.get(key)
+        if handle is None:
+            handle = _HANDLES[key] = _RedisHandle(get_redis_client(redis_url, decode_responses=decode_responses))
+    if not handle.healthy:
+        error = _ping_handle(handle)
+        if error is not None:
+            raise RuntimeError("Redis required: unable to connect") from error
+    elif not handle.checking and time.monotonic() - handle.checked_at >= _HEALTH_CHECK_INTERVAL_SEC:
+        handle.checking = True
+        threading.Thread(target=_ping_handle, args=(handle,), daemon=True, name="rq-redis-health").start()
+    return handle
+
+
+@contextmanager
+def _redis_call(*, decode_responses: bool) -> Iterator[None]:
+    """Drop the cached handle when a Redis command fails, so the next call pings again."""
     try:
-        client.ping()
-    except Exception as exc:
+        yield
+    except RedisError as exc:
+        key = (str(os.getenv("REDIS_URL", "") or "").strip(), bool(decode_responses))
+        with _HANDLES_LOCK:
+            handle = _HANDLES.pop(key, None)
+        if handle is not None:
+            handle.healthy = False
         raise RuntimeError("Redis required: unable to connect") from exc
-    return client
+
+
+def _require_redis_client(*, decode_responses: bool) -> Any:
+    return _redis_handle(decode_responses=decode_responses).client
 
 
 def require_redis() -> None:
     _require_redis_client(decode_responses=False)
 
 
-def _get_queue() -> Queue:
-    redis = _require_redis_client(decode_responses=False)
-    return Queue(_queue_name(), connection=redis)
+def _get_queue(job_class: Optional[str] = None) -> Queue:
+    handle = _redis_handle(decode_responses=False)
+    name = _queue_name(job_class)
+    queue = handle.queues.get(name)
+    if queue is None:
+        queue = handle.queues[name] = Queue(name, connection=handle.client)
+    return queue
+
+
+def _enqueue(job_class: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    start = time.perf_counter()
+    with _redis_call(decode_responses=False):
+        _get_queue(job_class).enqueue(func, *args, **kwargs)
+    OBSERVABILITY.record_timing("rq_enqueue", job_class, time.perf_counter() - start)
+
+
+_RUN_HANDLER_CLASSES = {
+    "run_upload_job": "upload",
+    "run_exam_job": "exam",
+    "run_survey_job": "survey",
+    "run_profile_update": "profile",
+    "run_chat_job": "chat",
+}
+
+
+def observe_queue_wait(job: Any) -> None:
+    """Record how long ``job`` sat in its queue, under its job class.
+
+    Called by the worker before it hands the job over: a forked work-horse
+    leaves through ``os._exit``, so timings it recorded would be lost.
+    """
+    func_name = str(getattr(job, "func_name", "") or "")
+    job_class = _RUN_HANDLER_CLASSES.get(func_name.rpartition(".")[2])
+    wait = queue_wait_sec(getattr(job, "enqueued_at", None))
+    if job_class is not None and wait is not None:
+        OBSERVABILITY.record_timing("rq_queue_wait", job_class, wait)
 
 
 def _lane_store(mod: Any, tenant_id: Optional[str]) -> ChatRedisLaneStore:
@@ -52,23 +157,19 @@ def _lane_store(mod: Any, tenant_id: Optional[str]) -> ChatRedisLaneStore:
 
 
 def enqueue_upload_job(job_id: str, *, tenant_id: Optional[str] = None) -> None:
-    queue = _get_queue()
-    queue.enqueue(run_upload_job, job_id, tenant_id=tenant_id)
+    _enqueue("upload", run_upload_job, job_id, tenant_id=tenant_id)
 
 
 def enqueue_exam_job(job_id: str, *, tenant_id: Optional[str] = None) -> None:
-    queue = _get_queue()
-    queue.enqueue(run_exam_job, job_id, tenant_id=tenant_id)
+    _enqueue("exam", run_exam_job, job_id, tenant_id=tenant_id)
 
 
 def enqueue_survey_job(job_id: str, *, tenant_id: Optional[str] = None) -> None:
-    queue = _get_queue()
-    queue.enqueue(run_survey_job, job_id, tenant_id=tenant_id)
+    _enqueue("survey", run_survey_job, job_id, tenant_id=tenant_id)
 
 
 def enqueue_profile_update(payload: Dict[str, Any], *, tenant_id: Optional[str] = None) -> None:
-    queue = _get_queue()
-    queue.enqueue(run_profile_update, payload=payload, tenant_id=tenant_id)
+    _enqueue("profile", run_profile_update, payload=payload, tenant_id=tenant_id)
 
 
 def enqueue_chat_job(job_id: str, lane_id: Optional[str] = None, *, tenant_id: Optional[str] = None) -> Dict[str, Any]:
@@ -83,10 +184,10 @@ def enqueue_chat_job(job_id: str, lane_id: Optional[str] = None, *, tenant_id: O
             lane_final = "unknown:session_main:req_unknown"
 
     store = _lane_store(mod, tenant_id)
-    info, dispatch = store.enqueue(job_id, lane_final)
+    with _redis_call(decode_responses=True):
+        info, dispatch = store.enqueue(job_id, lane_final)
     if dispatch:
-        queue = _get_queue()
-        queue.enqueue(run_chat_job, job_id, lane_final, tenant_id=tenant_id)
+        _enqueue("chat", run_chat_job, job_id, lane_final, tenant_id=tenant_id)
     return {"lane_id": lane_final, **info}
 
 
@@ -215,5 +316,4 @@ def run_chat_job(job_id: str, lane_id: str, *, tenant_id: Optional[str] = None)
     finally:
         next_job_id = store.finish(job_id, lane_id)
         if next_job_id:
-            queue = _get_queue()
-            queue.enqueue(run_chat_job, next_job_id, lane_id, tenant_id=tenant_id)
+            _enqueue("chat", run_chat_job, next_job_id, lane_id, tenant_id=tenant_id)
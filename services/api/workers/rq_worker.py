@@ -1,24 +1,79 @@
 from __future__ import annotations
 
+import logging
 import os
+from typing import Any, Dict, Optional
 
-from rq import Worker
+from rq import SimpleWorker, Worker
 
+from services.api import settings as _settings
+from services.api.observability import OBSERVABILITY
 from services.api.redis_clients import get_redis_client
+from services.api.workers.rq_queues import queue_weights_by_name, weighted_order, worker_queue_names
 from services.api.workers.rq_tasks import (
+    observe_queue_wait,
     scan_pending_chat_jobs,
     scan_pending_exam_jobs,
     scan_pending_upload_jobs,
 )
+from services.api.workers.rq_tenant_runtime import load_tenant_module
+from services.api.workers.work_horse import mark_work_horse, run_job_end_hooks
+
+_log = logging.getLogger(__name__)
 
 
 def _truthy(value: str) -> bool:
     return str(value or "").strip().lower() in {"1", "true", "yes", "on"}
 
 
+class _WeightedQueueOrder:
+    queue_weights: Dict[str, float] = {}
+    _ordered_queues: list[Any]
+
+    def reorder_queues(self, reference_queue: Any) -> None:
+        del reference_queue
+        self._ordered_queues = weighted_order(self._ordered_queues, self.queue_weights)
+
+
+class _QueueWaitTiming:
+    def execute_job(self, job: Any, queue: Any) -> None:
+        # Runs in the worker process itself, before any work-horse is forked.
+        observe_queue_wait(job)
+        super().execute_job(job, queue)  # type: ignore[misc]
+
+
+class WeightedWorker(_QueueWaitTiming, _WeightedQueueOrder, Worker):
+    """Forking worker (one child process per job) with weighted queue order."""
+
+    def main_work_horse(self, job: Any, queue: Any) -> None:
+        mark_work_horse()
+        OBSERVABILITY.detach_shared()
+        super().main_work_horse(job, queue)
+
+    def perform_job(self, job: Any, queue: Any) -> bool:
+        # Runs in the work-horse, which leaves through os._exit: atexit hooks never run.
+        try:
+            return super().perform_job(job, queue)
+        finally:
+            run_job_end_hooks()
+
+
+class WarmWorker(_QueueWaitTiming, _WeightedQueueOrder, SimpleWorker):
+    """Non-forking worker: tenant cores and imported services stay resident between jobs."""
+
+
+def _warm_tenant_modules(tenant_id: Optional[str]) -> None:
+    tenants = [tenant_id or ""]
+    tenants += [t.strip() for t in _settings.rq_worker_warm_tenants_raw().split(",") if t.strip()]
+    for tid in dict.fromkeys(tenants):
+        try:
+            load_tenant_module(tid or None)
+        except Exception:  # policy: allowed-broad-except
+            _log.warning("rq worker warmup failed for tenant %s", tid or "default", exc_info=True)
+
+
 def main() -> None:
     os.environ.setdefault("JOB_QUEUE_BACKEND", "rq")
-    queue_name = str(os.getenv("RQ_QUEUE_NAME", "default") or "default")
     tenant_id = str(os.getenv("TENANT_ID", "") or "").strip() or None
 
     if _truthy(os.getenv("RQ_SCAN_PENDING_ON_START", "")):
@@ -26,8 +81,13 @@ def main() -> None:
         scan_pending_exam_jobs(tenant_id=tenant_id)
         scan_pending_chat_jobs(tenant_id=tenant_id)
 
+    warm = _settings.rq_worker_mode() == "warm"
+    if warm:
+        _warm_tenant_modules(tenant_id)
     redis = get_redis_client(os.getenv("REDIS_URL", ""), decode_responses=False)
-    worker = Worker([queue_name], connection=redis)
+    worker_cls = WarmWorker if warm else WeightedWorker
+    worker = worker_cls(worker_queue_names(), connection=redis)
+    worker.queue_weights = queue_weights_by_name()
     worker.work()
 
 
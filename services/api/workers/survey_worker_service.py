@@ -3,9 +3,9 @@ from __future__ import annotations
 import json
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Deque, Dict
+from typing import Any, Callable, Deque, Dict, Set
 
 from .lifecycle_state import compute_stop_result
 
@@ -29,6 +29,8 @@ class SurveyWorkerDeps:
     sleep: Callable[[float], None]
     thread_factory: Callable[..., Any]
     rq_enabled: Callable[[], bool]
+    # Job ids popped from ``job_queue`` and still being processed (guarded by ``job_lock``).
+    active_jobs: Set[str] = field(default_factory=set)
 
 
 
@@ -73,6 +75,21 @@ def scan_pending_survey_jobs_inline(*, deps: SurveyWorkerDeps) -> int:
 
 
 
+def _process_one(job_id: str, *, deps: SurveyWorkerDeps) -> None:
+    try:
+        deps.process_job(job_id)
+    except Exception as exc:
+        _log.debug("operation failed", exc_info=True)
+        deps.diag_log("survey.job.failed", {"job_id": job_id, "error": str(exc)[:200]})
+        deps.write_job(
+            job_id,
+            {
+                "status": "failed",
+                "error": str(exc)[:200],
+            },
+        )
+
+
 def survey_job_worker_loop(*, deps: SurveyWorkerDeps) -> None:
     while not deps.stop_event.is_set():
         deps.job_event.wait(timeout=0.1)
@@ -82,23 +99,17 @@ def survey_job_worker_loop(*, deps: SurveyWorkerDeps) -> None:
         with deps.job_lock:
             if deps.job_queue:
                 job_id = deps.job_queue.popleft()
+                deps.active_jobs.add(job_id)
             if not deps.job_queue:
                 deps.job_event.clear()
         if not job_id:
             deps.sleep(0.1)
             continue
         try:
-            deps.process_job(job_id)
-        except Exception as exc:
-            _log.debug("operation failed", exc_info=True)
-            deps.diag_log("survey.job.failed", {"job_id": job_id, "error": str(exc)[:200]})
-            deps.write_job(
-                job_id,
-                {
-                    "status": "failed",
-                    "error": str(exc)[:200],
-                },
-            )
+            _process_one(job_id, deps=deps)
+        finally:
+            with deps.job_lock:
+                deps.active_jobs.discard(job_id)
 
 
 
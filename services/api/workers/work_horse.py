@@ -0,0 +1,42 @@
+"""Role of the current process when it is an RQ forking work-horse.
+
+In the default ``RQ_WORKER_MODE=fork`` every job runs in a child forked from the
+worker, and that child leaves through ``os._exit`` once the job is done. So
+nothing long-lived started there survives, and ``atexit`` hooks never run. Code
+that keeps process-wide resources checks :func:`in_work_horse` and falls back to
+per-call behaviour there. Code that buffers data in the background registers a
+:func:`register_job_end_hook`; the worker runs the hooks in the work-horse once
+the job has finished, before the process exits.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Callable, List
+
+_log = logging.getLogger(__name__)
+
+_IN_WORK_HORSE = False
+_JOB_END_HOOKS: List[Callable[[], None]] = []
+
+
+def mark_work_horse() -> None:
+    """Called by the worker in a freshly forked work-horse, before the job runs."""
+    global _IN_WORK_HORSE
+    _IN_WORK_HORSE = True
+
+
+def in_work_horse() -> bool:
+    return _IN_WORK_HORSE
+
+
+def register_job_end_hook(hook: Callable[[], None]) -> None:
+    if hook not in _JOB_END_HOOKS:
+        _JOB_END_HOOKS.append(hook)
+
+
+def run_job_end_hooks() -> None:
+    for hook in list(_JOB_END_HOOKS):
+        try:
+            hook()
+        except Exception:  # policy: allowed-broad-except
+            _log.warning("work-horse job end hook failed", exc_info=True)
@@ -552,7 +552,7 @@ def build_default_registry() -> ToolRegistry:
                 "packages": {"type": "array", "items": {"type": "string"}, "description": "optional pip package hints"},
                 "opencode_enabled": {"type": "boolean"},
                 "opencode_bin": {"type": "string"},
-                "opencode_mode": {"type": "string", "description": "run|attach"},
+                "opencode_mode": {"type": "string", "description": "run|attach|serve"},
                 "opencode_attach_url": {"type": "string"},
                 "opencode_agent": {"type": "string"},
                 "opencode_model": {"type": "string"},
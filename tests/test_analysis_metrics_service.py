@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 from services.api.analysis_metrics_service import AnalysisMetricsService
+from services.api.analysis_metrics_store import AnalysisMetricsStore
 from services.api.specialist_agents.events import SpecialistRuntimeEvent
 
 
@@ -223,3 +226,30 @@ def test_metrics_service_filters_runtime_snapshot_by_window_and_groups_by_strate
     assert windowed['by_domain']['video_homework']['failed'] == 1
     assert grouped['video_homework.teacher.report']['counters']['timeout_count'] == 1
     assert 'survey.teacher.report' not in grouped
+
+
+def test_metrics_service_windowed_snapshot_restores_from_legacy_record_log(tmp_path: Path) -> None:
+    current_ts = [10_000.0]
+    writer = AnalysisMetricsService(now_ts=lambda: current_ts[0])
+    for handoff_id in ('handoff_1', 'handoff_2'):
+        writer.record(
+            SpecialistRuntimeEvent(
+                phase='started',
+                handoff_id=handoff_id,
+                agent_id='survey_analyst',
+                task_kind='survey.analysis',
+                domain='survey',
+                strategy_id='survey.teacher.report',
+            )
+        )
+    legacy = writer.snapshot(include_event_log=True)
+
+    store = AnalysisMetricsStore(tmp_path / 'metrics_snapshot.json')
+    store.save_snapshot(legacy)
+
+    current_ts[0] = 10_030.0
+    reloaded = AnalysisMetricsService(store=store, now_ts=lambda: current_ts[0])
+    grouped = reloaded.grouped_runtime_snapshot(group_by='agent', window_sec=600)
+
+    assert reloaded.snapshot(window_sec=600)['counters']['run_count'] == 2
+    assert grouped['survey_analyst']['by_phase']['started'] == 2
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -72,3 +73,85 @@ def test_analysis_report_routes_metrics_endpoint_reads_persisted_snapshot(tmp_pa
     payload = metrics_res.json()
     assert payload['metrics']['counters']['review_downgrade_count'] == 1
     assert payload['metrics']['by_domain']['survey']['review_downgraded'] == 1
+
+
+def _started(handoff_id: str) -> SpecialistRuntimeEvent:
+    return SpecialistRuntimeEvent(
+        phase='started',
+        handoff_id=handoff_id,
+        agent_id='survey_analyst',
+        task_kind='survey.analysis',
+        domain='survey',
+        strategy_id='survey.teacher.report',
+    )
+
+
+def test_analysis_metrics_store_appends_journal_and_compacts_periodically(tmp_path: Path) -> None:
+    store = AnalysisMetricsStore(tmp_path / 'metrics_snapshot.json')
+    service = AnalysisMetricsService(store=store, compact_every_events=3)
+
+    service.record(_started('h_1'))
+    service.record(_started('h_2'))
+
+    assert not store.path.exists()
+    assert [event['seq'] for event in store.load_events()] == [1, 2]
+
+    service.record(_started('h_3'))
+
+    snapshot = store.load_snapshot()
+    assert snapshot['journal_seq'] == 3
+    assert snapshot['counters']['run_count'] == 3
+    assert len(snapshot['recent_runtime_records']) == 3
+    assert store.load_events() == []
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_analysis_metrics_store_recovery_skips_events_already_in_snapshot(tmp_path: Path) -> None:
+    store = AnalysisMetricsStore(tmp_path / 'metrics_snapshot.json')
+    service = AnalysisMetricsService(store=store, compact_every_events=2)
+    service.record(_started('h_1'))
+    service.record(_started('h_2'))
+    service.record(_started('h_3'))
+    # Simulate a crash after the snapshot was written but before the journal
+    # was truncated: already-compacted events reappear in the journal.
+    for seq in (1, 2):
+        store.append_event({'seq': seq, 'kind': 'runtime', 'phase': 'started', 'timestamp_sec': 1.0})
+    with store.journal_path.open('a', encoding='utf-8') as handle:
+        handle.write('{"seq": 4, "kind": "run')
+
+    reloaded = AnalysisMetricsService(store=store)
+
+    assert reloaded.snapshot()['counters']['run_count'] == 3
+    assert reloaded.snapshot(window_sec=3600)['counters']['run_count'] == 3
+    reloaded.record(_started('h_4'))
+    assert store.load_events()[-1]['seq'] == 4
+
+
+def test_analysis_metrics_store_shared_by_processes_keeps_every_event(tmp_path: Path) -> None:
+    path = tmp_path / 'metrics_snapshot.json'
+    first = AnalysisMetricsService(store=AnalysisMetricsStore(path), compact_every_events=2)
+    second = AnalysisMetricsService(store=AnalysisMetricsStore(path), compact_every_events=3)
+
+    first.record(_started('a_1'))
+    second.record(_started('b_1'))
+    first.record(_started('a_2'))  # compacts: must fold in b_1 before truncating
+    second.record(_started('b_2'))
+    assert second.snapshot()['counters']['run_count'] == 4
+    assert [event['seq'] for event in AnalysisMetricsStore(path).load_events()] == [4]
+
+    pids = []
+    for prefix in ('x', 'y'):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                worker = AnalysisMetricsService(store=AnalysisMetricsStore(path), compact_every_events=7)
+                for idx in range(40):
+                    worker.record(_started(f'{prefix}_{idx}'))
+            finally:
+                os._exit(0)
+        pids.append(pid)
+    for pid in pids:
+        assert os.waitpid(pid, 0)[1] == 0
+
+    assert first.snapshot()['counters']['run_count'] == 84
+    assert AnalysisMetricsService(store=AnalysisMetricsStore(path)).snapshot()['counters']['run_count'] == 84
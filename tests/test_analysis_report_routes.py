@@ -65,6 +65,7 @@ def test_analysis_report_routes_expose_unified_list_detail_rerun_and_review_queu
 
     with TestClient(app) as client:
         list_res = client.get('/teacher/analysis/reports', params={'teacher_id': 'teacher_1', 'domain': 'survey'})
+        page_res = client.get('/teacher/analysis/reports', params={'teacher_id': 'teacher_1', 'limit': 1})
         detail_res = client.get('/teacher/analysis/reports/report_1', params={'teacher_id': 'teacher_1', 'domain': 'survey'})
         rerun_res = client.post('/teacher/analysis/reports/report_1/rerun', json={'teacher_id': 'teacher_1', 'domain': 'survey', 'reason': 'refresh'})
         review_res = client.get('/teacher/analysis/review-queue', params={'teacher_id': 'teacher_1', 'domain': 'survey'})
@@ -72,6 +73,8 @@ def test_analysis_report_routes_expose_unified_list_detail_rerun_and_review_queu
     assert list_res.status_code == 200
     assert list_res.json()['items'][0]['report_id'] == 'report_1'
     assert list_res.json()['items'][0]['analysis_type'] == 'survey'
+    assert [item['report_id'] for item in page_res.json()['items']] == ['report_1']
+    assert page_res.json()['next_cursor'] is None
     assert detail_res.status_code == 200
     assert detail_res.json()['report']['strategy_id'] == 'survey.teacher.report'
     assert rerun_res.status_code == 200
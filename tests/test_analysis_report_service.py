@@ -468,3 +468,63 @@ def test_list_analysis_reports_returns_ops_summary(tmp_path: Path) -> None:
     assert result['summary']['domains'][0]['total_reports'] == 1
     assert result['summary']['domains'][0]['review_required_reports'] == 1
     assert result['summary']['domains'][0]['queued_review_items'] == 1
+
+
+def test_list_analysis_reports_pages_across_domains_in_listing_order(tmp_path: Path) -> None:
+    from services.api.class_report_service import build_class_report_deps, write_class_report
+    from services.api.multimodal_report_service import (
+        build_multimodal_report_deps,
+        write_multimodal_report,
+    )
+
+    core = _Core(tmp_path)
+    _seed_survey_report(core)
+    class_deps = build_class_report_deps(core)
+    multimodal_deps = build_multimodal_report_deps(core)
+    for idx in range(3):
+        write_class_report(
+            f'class_{idx}',
+            {
+                'report_id': f'class_{idx}',
+                'teacher_id': 'teacher_1',
+                'status': 'analysis_ready',
+                'created_at': f'2026-03-0{idx + 1}T08:00:00',
+                'updated_at': f'2026-03-0{idx + 1}T08:30:00',
+            },
+            deps=class_deps,
+        )
+        write_multimodal_report(
+            f'video_{idx}',
+            {
+                'report_id': f'video_{idx}',
+                'teacher_id': 'teacher_1' if idx != 1 else 'teacher_2',
+                'target_type': 'submission',
+                'status': 'analysis_ready',
+                'created_at': f'2026-03-0{idx + 4}T08:00:00',
+                'updated_at': f'2026-03-0{idx + 4}T08:30:00',
+            },
+            deps=multimodal_deps,
+        )
+
+    deps = build_analysis_report_deps(core)
+    kwargs = dict(teacher_id='teacher_1', domain=None, status=None, strategy_id=None, target_type=None, deps=deps)
+    full = [item['report_id'] for item in list_analysis_reports(**kwargs)['items']]
+    assert full == ['job_pending_1', 'report_1', 'video_2', 'video_0', 'class_2', 'class_1', 'class_0']
+
+    paged: list[str] = []
+    cursor = None
+    while True:
+        page = list_analysis_reports(**kwargs, limit=2, cursor=cursor)
+        assert len(page['items']) <= 2
+        paged.extend(item['report_id'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert paged == full
+
+    # Filters applied after the merge still fill a page from later provider pages.
+    filtered = list_analysis_reports(**{**kwargs, 'target_type': 'submission'}, limit=1)
+    assert [item['report_id'] for item in filtered['items']] == ['video_2']
+    rest = list_analysis_reports(**{**kwargs, 'target_type': 'submission'}, limit=5, cursor=filtered['next_cursor'])
+    assert [item['report_id'] for item in rest['items']] == ['video_0']
+    assert rest['next_cursor'] is None
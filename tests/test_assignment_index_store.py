@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List
+
+from services.api.assignment_index_store import AssignmentIndexStore, assignment_index_path
+
+
+def _age(path: Path, age_sec: float = 60) -> None:
+    stamp = time.time() - age_sec
+    os.utime(path, (stamp, stamp))
+
+
+def _write_assignment(assignments_dir: Path, assignment_id: str, meta: Dict[str, Any]) -> Path:
+    folder = assignments_dir / assignment_id
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    _age(folder / "meta.json")
+    return folder
+
+
+class AssignmentIndexStoreTest(unittest.TestCase):
+    def _setup(self, root: Path):
+        assignments_dir = root / "assignments"
+        assignments_dir.mkdir(parents=True)
+        store = AssignmentIndexStore(assignment_index_path(assignments_dir), assignments_dir=assignments_dir)
+        described: List[str] = []
+
+        def describe(folder: Path) -> Dict[str, Any]:
+            described.append(folder.name)
+            meta = json.loads((folder / "meta.json").read_text(encoding="utf-8"))
+            return {**meta, "question_count": len(meta.get("questions") or [])}
+
+        return assignments_dir, store, describe, described
+
+    def test_date_lookup_and_paging_describe_each_folder_once(self):
+        with TemporaryDirectory() as td:
+            assignments_dir, store, describe, described = self._setup(Path(td))
+            _write_assignment(assignments_dir, "A1", {"date": "2026-02-08", "source": "Auto", "updated_at": "2026-02-08T08:00:00"})
+            _write_assignment(assignments_dir, "A2", {"date": "2026-02-08", "student_ids": ["S1"], "updated_at": "2026-02-08T09:00:00"})
+            _write_assignment(assignments_dir, "A3", {"date": "2026-02-09", "questions": [1, 2], "updated_at": "2026-02-09T09:00:00"})
+            _age(assignments_dir)
+
+            rows = store.rows_for_date("2026-02-08", describe=describe)
+            self.assertEqual([row["assignment_id"] for row in rows], ["A1", "A2"])
+            self.assertEqual(rows[0]["source"], "auto")
+            self.assertEqual(rows[1]["student_ids"], ["S1"])
+
+            page, total = store.page(limit=2, offset=0, describe=describe)
+            self.assertEqual(total, 3)
+            self.assertEqual([row["assignment_id"] for row in page], ["A3", "A2"])
+            self.assertEqual(page[0]["question_count"], 2)
+            self.assertEqual(sorted(described), ["A1", "A2", "A3"])
+            self.assertEqual(assignment_index_path(assignments_dir).name, "assignments.index.sqlite3")
+
+    def test_mark_dirty_picks_up_in_place_meta_rewrites(self):
+        with TemporaryDirectory() as td:
+            assignments_dir, store, describe, described = self._setup(Path(td))
+            _write_assignment(assignments_dir, "A1", {"date": "2026-02-08"})
+            _age(assignments_dir)
+            self.assertEqual(len(store.rows_for_date("2026-02-08", describe=describe)), 1)
+
+            # An in-place rewrite does not touch the directory stamp.
+            _write_assignment(assignments_dir, "A1", {"date": "2026-02-10"})
+            self.assertEqual(len(store.rows_for_date("2026-02-08", describe=describe)), 1)
+            store.mark_dirty("A1")
+            self.assertEqual(store.rows_for_date("2026-02-08", describe=describe), [])
+            self.assertEqual(len(store.rows_for_date("2026-02-10", describe=describe)), 1)
+            self.assertEqual(described, ["A1", "A1"])
+
+    def test_reconciles_added_and_removed_folders(self):
+        with TemporaryDirectory() as td:
+            assignments_dir, store, describe, _described = self._setup(Path(td))
+            _write_assignment(assignments_dir, "A1", {"date": "2026-02-08"})
+            _age(assignments_dir)
+            self.assertEqual(store.page(limit=10, offset=0, describe=describe)[1], 1)
+
+            shutil.rmtree(assignments_dir / "A1")
+            _write_assignment(assignments_dir, "A2", {"date": "2026-02-08"})
+            rows = store.rows_for_date("2026-02-08", describe=describe)
+            self.assertEqual([row["assignment_id"] for row in rows], ["A2"])
+
+    def test_describes_outside_the_write_lock_and_keeps_rows_written_meanwhile_dirty(self):
+        with TemporaryDirectory() as td:
+            assignments_dir, store, describe, described = self._setup(Path(td))
+            _write_assignment(assignments_dir, "A1", {"date": "2026-02-08"})
+            _age(assignments_dir)
+            store.rows_for_date("2026-02-08", describe=describe)
+            store.mark_dirty("A1")
+
+            def racing_describe(folder: Path) -> Dict[str, Any]:
+                info = describe(folder)
+                # Another process writes meta and marks the folder dirty while
+                # this one is describing: it must not wait on BEGIN IMMEDIATE.
+                other = sqlite3.connect(str(store.db_path), timeout=0.1)
+                other.execute("BEGIN IMMEDIATE")
+                other.execute("ROLLBACK")
+                other.close()
+                (folder / "meta.json").write_text(json.dumps({"date": "2026-02-10"}), encoding="utf-8")
+                store.mark_dirty(folder.name)
+                return info
+
+            self.assertEqual(len(store.rows_for_date("2026-02-08", describe=racing_describe)), 1)
+            _age(assignments_dir / "A1" / "meta.json")
+            self.assertEqual(store.rows_for_date("2026-02-08", describe=describe), [])
+            self.assertEqual(len(store.rows_for_date("2026-02-10", describe=describe)), 1)
+            self.assertEqual(described, ["A1", "A1", "A1"])
+
+    def test_falls_back_to_a_directory_scan_while_the_index_is_locked(self):
+        with TemporaryDirectory() as td:
+            assignments_dir, store, describe, _described = self._setup(Path(td))
+            _write_assignment(assignments_dir, "A1", {"date": "2026-02-08", "updated_at": "2026-02-08T08:00:00"})
+            _write_assignment(assignments_dir, "A2", {"date": "2026-02-09", "updated_at": "2026-02-09T08:00:00"})
+            _age(assignments_dir)
+            store.rows_for_date("2026-02-08", describe=describe)
+            _write_assignment(assignments_dir, "A3", {"date": "2026-02-08", "updated_at": "2026-02-10T08:00:00"})
+
+            def locked(*_args: Any, **_kwargs: Any) -> None:
+                raise sqlite3.OperationalError("database is locked")
+
+            store.ensure_fresh = locked  # type: ignore[method-assign]
+            rows = store.rows_for_date("2026-02-08", describe=describe)
+            page, total = store.page(limit=2, offset=0, describe=describe)
+
+            self.assertEqual([row["assignment_id"] for row in rows], ["A1", "A3"])
+            self.assertEqual(([row["assignment_id"] for row in page], total), (["A3", "A2"], 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
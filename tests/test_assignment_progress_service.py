@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from pathlib import Path
 from typing import Any, Dict, List
@@ -10,6 +11,8 @@ from services.api.assignment_progress_service import (
     AssignmentProgressDeps,
     _resolve_assignment_dir,
     compute_assignment_progress,
+    read_assignment_progress,
+    refresh_assignment_progress_student,
 )
 
 # ---------------------------------------------------------------------------
@@ -130,3 +133,107 @@ class TestComputeAssignmentProgress:
             result = compute_assignment_progress("hw1", deps=deps)
         assert result["ok"] is True
         assert "failed to write progress.json" in caplog.text
+
+
+# ---------------------------------------------------------------------------
+# materialized progress
+# ---------------------------------------------------------------------------
+
+class TestMaterializedProgress:
+    def _deps(self, tmp_path: Path, state: Dict[str, Any], **overrides: Any) -> AssignmentProgressDeps:
+        folder = tmp_path / "assignments" / "hw1"
+        folder.mkdir(parents=True, exist_ok=True)
+        (folder / "meta.json").write_text(json.dumps(state["meta"]), encoding="utf-8")
+
+        def _list_attempts(_aid: str, sid: str) -> List[Dict[str, Any]]:
+            state["attempt_calls"].append(sid)
+            return list(state["attempts"].get(sid) or [])
+
+        def _write(path: Path, data: Dict[str, Any]) -> None:
+            Path(path).write_text(json.dumps(data), encoding="utf-8")
+
+        options: Dict[str, Any] = dict(
+            load_assignment_meta=lambda f: json.loads((Path(f) / "meta.json").read_text(encoding="utf-8")),
+            list_all_student_profiles=lambda: [{"student_id": "s1"}, {"student_id": "s2"}],
+            session_discussion_pass=lambda s, _a: {"pass": s in state["passed"]},
+            list_submission_attempts=_list_attempts,
+            atomic_write_json=_write,
+            time_time=lambda: state["now"],
+            progress_max_age_sec=60.0,
+        )
+        options.update(overrides)
+        return _make_deps(tmp_path, **options)
+
+    def _state(self, due_at: str = "") -> Dict[str, Any]:
+        return {
+            "meta": {"assignment_id": "hw1", "expected_students": ["s1", "s2"], "due_at": due_at},
+            "attempts": {},
+            "passed": set(),
+            "attempt_calls": [],
+            "now": 1_700_000_000.0,
+        }
+
+    def test_read_serves_materialized_rows_until_max_age(self, tmp_path: Path):
+        state = self._state()
+        deps = self._deps(tmp_path, state)
+        first = read_assignment_progress("hw1", deps=deps)
+        assert "materialized" not in first
+        assert state["attempt_calls"] == ["s1", "s2"]
+
+        state["now"] += 30
+        assert read_assignment_progress("hw1", deps=deps) == first
+        assert read_assignment_progress("hw1", deps=deps, include_students=False)["students"] == []
+        assert state["attempt_calls"] == ["s1", "s2"]
+
+        state["now"] += 60
+        read_assignment_progress("hw1", deps=deps)
+        assert state["attempt_calls"] == ["s1", "s2", "s1", "s2"]
+
+    def test_meta_change_invalidates_materialized_rows(self, tmp_path: Path):
+        state = self._state()
+        deps = self._deps(tmp_path, state)
+        read_assignment_progress("hw1", deps=deps)
+
+        meta_path = tmp_path / "assignments" / "hw1" / "meta.json"
+        meta_path.write_text(json.dumps({**state["meta"], "expected_students": ["s1"]}), encoding="utf-8")
+        result = read_assignment_progress("hw1", deps=deps)
+        assert result["expected_count"] == 1
+        assert [row["student_id"] for row in result["students"]] == ["s1"]
+
+    def test_refresh_recomputes_only_the_changed_student(self, tmp_path: Path):
+        state = self._state()
+        deps = self._deps(tmp_path, state)
+        read_assignment_progress("hw1", deps=deps)
+        state["attempt_calls"].clear()
+
+        state["passed"].add("s2")
+        state["attempts"]["s2"] = [{"score": 90}]
+        refreshed = refresh_assignment_progress_student("hw1", "s2", deps=deps)
+        assert state["attempt_calls"] == ["s2"]
+        assert refreshed["counts"]["completed"] == 1
+        assert read_assignment_progress("hw1", deps=deps) == refreshed
+        assert state["attempt_calls"] == ["s2"]
+
+    def test_overdue_follows_the_clock_without_rewrite(self, tmp_path: Path):
+        state = self._state(due_at="2023-11-14T22:13:40+00:00")
+        writes: List[Path] = []
+
+        def _write(path: Path, data: Dict[str, Any]) -> None:
+            writes.append(Path(path))
+            Path(path).write_text(json.dumps(data), encoding="utf-8")
+
+        deps = self._deps(tmp_path, state, atomic_write_json=_write)
+        assert read_assignment_progress("hw1", deps=deps)["counts"]["overdue"] == 0
+
+        state["now"] += 30
+        later = read_assignment_progress("hw1", deps=deps)
+        assert later["counts"]["overdue"] == 2
+        assert all(row["overdue"] for row in later["students"])
+        assert len(writes) == 1
+
+    def test_zero_max_age_always_recomputes(self, tmp_path: Path):
+        state = self._state()
+        deps = self._deps(tmp_path, state, progress_max_age_sec=0.0)
+        read_assignment_progress("hw1", deps=deps)
+        refresh_assignment_progress_student("hw1", "s1", deps=deps)
+        assert state["attempt_calls"] == ["s1", "s2", "s1", "s2"]
@@ -2,16 +2,20 @@ from __future__ import annotations
 
 import asyncio
 import json
+from dataclasses import replace
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
 import pytest
 
+from services.api.chat_attachment_context_cache import AttachmentContextCache, estimate_tokens
 from services.api.chat_attachment_service import (
     MAX_FILE_SIZE_BYTES,
     ChatAttachmentDeps,
     ChatAttachmentError,
+    delete_chat_attachment,
+    resolve_chat_attachment_context,
     upload_chat_attachments,
 )
 
@@ -102,3 +106,62 @@ def test_upload_chat_attachments_uses_atomic_meta_write() -> None:
         assert result["ok"] is True
         assert written_meta_paths
         assert written_meta_paths[0].name == "meta.json"
+
+
+def _upload_texts(deps: ChatAttachmentDeps, texts: dict[str, str]) -> list[str]:
+    deps = replace(deps, extract_text_from_file=lambda path, _lang, _mode: texts[path.name])
+    result = asyncio.run(
+        upload_chat_attachments(
+            role="teacher",
+            teacher_id="t1",
+            student_id="",
+            session_id="main",
+            request_id="r1",
+            files=[_Upload(name, b"x") for name in texts],
+            deps=deps,
+        )
+    )
+    return [item["attachment_id"] for item in result["attachments"]]
+
+
+def _resolve(deps: ChatAttachmentDeps, ids: list[str], max_chars: int) -> dict:
+    return resolve_chat_attachment_context(
+        role="teacher",
+        teacher_id="t1",
+        student_id="",
+        session_id="main",
+        attachment_ids=ids,
+        deps=deps,
+        max_chars=max_chars,
+    )
+
+
+def test_resolve_context_serves_cached_text_until_attachment_deleted() -> None:
+    with TemporaryDirectory() as td:
+        cache = AttachmentContextCache(clip_chars=50)
+        deps = replace(_make_deps(Path(td) / "uploads"), context_cache=cache)
+        texts = {"a.md": "  第一章 函数\n" + "x" * 200 + "  ", "b.md": "第二章"}
+        ids = _upload_texts(deps, texts)
+        metas = [
+            json.loads((Path(td) / "uploads" / "chat_attachments" / aid / "meta.json").read_text(encoding="utf-8"))
+            for aid in ids
+        ]
+        meta = metas[0]
+        assert meta["extracted_chars"] == len(texts["a.md"].strip())
+        assert meta["extracted_tokens"] == estimate_tokens(texts["a.md"].strip())
+
+        full = "\n\n".join(f"[附件 #{n}: {name}]\n{text.strip()}" for n, (name, text) in enumerate(texts.items(), start=1))
+        for max_chars in (30, 60, 400):
+            result = _resolve(deps, ids, max_chars)
+            expected = full if len(full) <= max_chars else full[:max_chars].rstrip() + "…"
+            assert result["attachment_context"] == expected
+            assert result["ready_attachment_ids"] == ids
+        assert result["attachment_context_tokens"] == estimate_tokens(full)
+
+        # Served from the cache: extracted.txt is no longer read.
+        (Path(td) / "uploads" / "chat_attachments" / ids[1] / "extracted.txt").unlink()
+        assert _resolve(deps, ids, 400)["attachment_context"] == full
+        delete_chat_attachment(role="teacher", teacher_id="t1", student_id="", session_id="main", attachment_id=ids[1], deps=deps)
+        assert cache.get(meta["extracted_sha256"]) is not None
+        assert _resolve(deps, ids, 400)["warnings"] == [f"{ids[1]}:not_found"]
+        assert cache.get(metas[1]["extracted_sha256"]) is None
@@ -103,3 +103,22 @@ def test_update_teacher_session_index_updates_existing_item(tmp_path):
     assert items[0]["session_id"] == "main"
     assert items[0]["message_count"] == 5
     assert items[0]["preview"] == "new-preview"
+
+
+def test_only_teacher_session_appends_take_the_compaction_lock(tmp_path):
+    deps = _deps(tmp_path)
+
+    chs.append_teacher_session_message("t1", "main", "user", "hi", {"request_id": "r1"}, deps)
+    chs.append_student_session_message("s1", "main", "user", "hi", None, deps)
+
+    teacher_path = chs.teacher_session_file("t1", "main", deps)
+    student_path = chs.student_session_file("s1", "main", deps)
+    assert json.loads(teacher_path.read_text(encoding="utf-8")) == {
+        "ts": "2026-02-12T12:00:00",
+        "role": "user",
+        "content": "hi",
+        "request_id": "r1",
+    }
+    assert teacher_path.with_name(teacher_path.name + ".lock").exists()
+    assert student_path.read_text(encoding="utf-8").count("\n") == 1
+    assert not student_path.with_name(student_path.name + ".lock").exists()
@@ -562,6 +562,9 @@ class ChatJobStateMachineTest(unittest.TestCase):
                 self.assertIn('score_mode: "total"', reply_text)
                 self.assertEqual(calls["run_agent"], 0)
 
+            from services.api.diag_log_service import flush_all
+
+            flush_all()
             log_path = tmp / "tmp" / "diagnostics.log"
             self.assertTrue(log_path.exists())
             log_text = log_path.read_text(encoding="utf-8")
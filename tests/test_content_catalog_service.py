@@ -4,10 +4,13 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import time
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, Dict
 
+from services.api.content_catalog_cache import ContentCatalogCache, catalog_sidecar_path
 from services.api.content_catalog_service import (
     ContentCatalogDeps,
     list_lessons,
@@ -128,3 +131,68 @@ def test_list_skills_delegates(tmp_path: Path):
     result = list_skills(deps=deps)
     assert result == {"skills": [{"id": "sk1", "name": "Skill 1"}]}
     assert called_with[0] == tmp_path / "skills"
+
+
+# -- catalog cache -------------------------------------------------------------
+
+def _age(*paths: Path) -> None:
+    stamp = time.time() - 60
+    for path in paths:
+        os.utime(path, (stamp, stamp))
+
+
+def test_kp_tables_parse_once_and_persist_a_sidecar(tmp_path: Path):
+    path = tmp_path / "knowledge" / "knowledge_point_map.csv"
+    _write_csv(path, "question_id,kp_id\nQ1,KP001\n")
+    _age(path)
+    calls: list = []
+
+    def parse(p: Path):
+        calls.append(p)
+        return {"Q1": "KP001"}
+
+    cache = ContentCatalogCache()
+    assert cache.table(path, parse) == {"Q1": "KP001"}
+    assert cache.table(path, parse) == {"Q1": "KP001"}
+    assert len(calls) == 1
+    assert catalog_sidecar_path(path) == tmp_path / "knowledge.catalog.json"
+
+    # A new process starts from the sidecar instead of the CSV.
+    assert ContentCatalogCache().table(path, parse) == {"Q1": "KP001"}
+    assert len(calls) == 1
+
+    _write_csv(path, "question_id,kp_id\nQ1,KP001\nQ2,KP002\n")
+    _age(path)
+    assert load_question_kp_map(tmp_path, cache=cache) == {"Q1": "KP001", "Q2": "KP002"}
+    assert ContentCatalogCache().table(path, parse) == {"Q1": "KP001", "Q2": "KP002"}
+    assert len(calls) == 1
+
+
+def test_list_lessons_reuses_entries_until_invalidated(tmp_path: Path):
+    lessons = tmp_path / "lessons"
+    for lid in ("L1", "L2"):
+        (lessons / lid).mkdir(parents=True)
+        (lessons / lid / "lesson.json").write_text(json.dumps({"lesson_id": lid, "summary": lid}))
+        _age(lessons / lid / "lesson.json")
+    _age(lessons)
+    loads: list = []
+
+    def load(p: Path):
+        loads.append(p.parent.name)
+        return json.loads(p.read_text())
+
+    deps = _make_deps(tmp_path, load_profile_file=load, catalog_cache=ContentCatalogCache(revalidate_sec=3600))
+    assert [x["lesson_id"] for x in list_lessons(deps=deps)["lessons"]] == ["L1", "L2"]
+    assert [x["lesson_id"] for x in list_lessons(deps=deps)["lessons"]] == ["L1", "L2"]
+    assert sorted(loads) == ["L1", "L2"]
+
+    # In-place rewrite: the directory stamp does not move until the cache is told.
+    (lessons / "L2" / "lesson.json").write_text(json.dumps({"lesson_id": "L2", "summary": "new"}))
+    _age(lessons / "L2" / "lesson.json")
+    assert list_lessons(deps=deps)["lessons"][1]["summary"] == "L2"
+    deps.catalog_cache.invalidate(lessons)
+    assert list_lessons(deps=deps)["lessons"][1]["summary"] == "new"
+    assert sorted(loads) == ["L1", "L2", "L2"]
+
+    (lessons / "L3").mkdir()
+    assert [x["lesson_id"] for x in list_lessons(deps=deps)["lessons"]] == ["L1", "L2", "L3"]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import warnings
+from pathlib import Path
+
+from services.api.diag_log_service import AsyncDiagLogger, parse_sample_rates
+
+
+def _read_events(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def test_records_are_written_in_batches_off_the_calling_thread(tmp_path: Path) -> None:
+    logger = AsyncDiagLogger(tmp_path / "diag.log", batch_size=4, flush_interval_sec=5.0)
+    for i in range(10):
+        assert logger.log("chat.job.step", {"i": i}) is True
+
+    assert logger.flush(timeout=2.0) is True
+    events = _read_events(tmp_path / "diag.log")
+    assert [e["i"] for e in events] == list(range(10))
+    assert all(e["event"] == "chat.job.step" and e["ts"] for e in events)
+    stats = logger.stats()
+    assert stats["written_total"] == 10
+    assert stats["queued"] == 0
+    assert stats["batches_total"] >= 3
+    logger.close()
+
+
+def test_full_queue_drops_and_counts_instead_of_blocking(tmp_path: Path) -> None:
+    logger = AsyncDiagLogger(tmp_path / "diag.log", max_queue=3, flush_interval_sec=5.0, batch_size=100)
+    gate = threading.Event()
+    logger._start_writer = lambda: gate.wait(0)  # type: ignore[method-assign]
+
+    results = [logger.log("upload.parse", {"n": n}) for n in range(5)]
+
+    assert results == [True, True, True, False, False]
+    stats = logger.stats()
+    assert stats["dropped_total"] == 2
+    assert stats["queued"] == 3
+
+
+def test_sampling_policy_per_event_name(tmp_path: Path) -> None:
+    rates = parse_sample_rates("noisy.event=0, pdf.*=0 ,bad=abc, keep.event=1")
+    assert rates == {"noisy.event": 0.0, "pdf.*": 0.0, "keep.event": 1.0}
+    logger = AsyncDiagLogger(tmp_path / "diag.log", sample_rates=rates)
+
+    assert logger.log("noisy.event") is False
+    assert logger.log("pdf.extract.done", {"file": "a.pdf"}) is False
+    assert logger.log("keep.event") is True
+    assert logger.log("other.event") is True
+    logger.flush(timeout=2.0)
+
+    assert [e["event"] for e in _read_events(tmp_path / "diag.log")] == ["keep.event", "other.event"]
+    assert logger.stats()["sampled_out_total"] == 2
+    logger.close()
+
+
+def test_unserializable_payload_is_logged_with_marker(tmp_path: Path) -> None:
+    logger = AsyncDiagLogger(tmp_path / "diag.log")
+    circular: dict = {}
+    circular["self"] = circular
+    logger.log("weird", {"payload": circular})
+    logger.flush(timeout=2.0)
+
+    events = _read_events(tmp_path / "diag.log")
+    assert events[0]["event"] == "weird"
+    assert events[0]["serialize_error"] is True
+    logger.close()
+
+
+def test_forked_work_horse_writes_its_records_before_exiting(tmp_path: Path) -> None:
+    from services.api.diag_log_service import get_diag_logger
+    from services.api.workers.work_horse import run_job_end_hooks
+
+    logger = get_diag_logger(tmp_path / "diag.log")
+    logger.log("parent.event")
+    assert logger.flush(timeout=2.0) is True
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        pid = os.fork()
+    if pid == 0:  # pragma: no cover - child process
+        code = 1
+        try:
+            logger.log("child.event")
+            run_job_end_hooks()
+            code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert [e["event"] for e in _read_events(tmp_path / "diag.log")] == ["parent.event", "child.event"]
+    logger.close()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from services.api.dir_index_support import (
+    RACY_WINDOW_NS,
+    InstanceRegistry,
+    SqliteIndex,
+    dir_fingerprint,
+    dir_fingerprint_text,
+    fingerprint_text_settled,
+    settled,
+)
+
+
+class _ItemsIndex(SqliteIndex):
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute("CREATE TABLE IF NOT EXISTS items (name TEXT PRIMARY KEY)")
+
+
+def test_fresh_stamps_are_not_settled(tmp_path: Path) -> None:
+    assert not settled(time.time_ns())
+    assert settled(time.time_ns() - RACY_WINDOW_NS - 1)
+
+    folder = tmp_path / "items"
+    assert dir_fingerprint(folder) is None
+    assert dir_fingerprint_text(folder) == ""
+    folder.mkdir()
+    old_ns = time.time_ns() - 2 * RACY_WINDOW_NS
+    os.utime(folder, ns=(old_ns, old_ns))
+    text = dir_fingerprint_text(folder)
+    assert text == f"{old_ns}:{folder.stat().st_ino}"
+    assert fingerprint_text_settled(text)
+
+
+def test_sqlite_index_creates_schema_on_first_open(tmp_path: Path) -> None:
+    index = _ItemsIndex(tmp_path / "items.sqlite3")
+    assert not index.exists()
+    with index._open() as conn:
+        conn.execute("INSERT INTO items (name) VALUES ('a')")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert index.exists()
+    with index._open() as conn:
+        assert [row["name"] for row in conn.execute("SELECT name FROM items")] == ["a"]
+
+
+def test_instance_registry_shares_one_instance_per_resolved_path(tmp_path: Path) -> None:
+    registry: InstanceRegistry[_ItemsIndex] = InstanceRegistry()
+    first = registry.get(tmp_path / "items.sqlite3", lambda: _ItemsIndex(tmp_path / "items.sqlite3"))
+    again = registry.get(tmp_path / "sub" / ".." / "items.sqlite3", lambda: _ItemsIndex(tmp_path / "other.sqlite3"))
+    assert again is first
+    registry.clear()
+    assert registry.get(tmp_path / "items.sqlite3", lambda: _ItemsIndex(tmp_path / "items.sqlite3")) is not first
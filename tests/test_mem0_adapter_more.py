@@ -289,3 +289,161 @@ def test_teacher_mem0_index_entry_indexes_all_chunks(monkeypatch):
     assert adds[0][3]["file"] == "f.md"
     assert adds[2][3]["chunk_index"] == 2
     assert adds[2][3]["chunk_total"] == 3
+
+
+class _FakeBatchEmbedder:
+    def __init__(self):
+        self.config = types.SimpleNamespace(model="embed-x", embedding_dims=2)
+        self.batches = []
+        self.single = []
+
+    def embed_batch(self, texts, memory_action=None):
+        self.batches.append((list(texts), memory_action))
+        return [[float(len(text)), 1.0 if memory_action == "add" else 2.0] for text in texts]
+
+    def embed(self, text, memory_action=None):
+        self.single.append((text, memory_action))
+        return [float(len(text)), 0.0]
+
+
+def test_caching_embedder_batches_misses_and_reuses_cache(tmp_path):
+    from services.api.mem0_embedding_cache import CachingEmbedder, EmbeddingCache
+
+    inner = _FakeBatchEmbedder()
+    embedder = CachingEmbedder(inner, EmbeddingCache(tmp_path / "cache.sqlite3"), batch_size=2)
+
+    vectors = embedder.embed_many(["a", "bb", "ccc", "a"])
+    assert vectors["ccc"] == [3.0, 1.0]
+    assert inner.batches == [(["a", "bb"], "add"), (["ccc"], "add")]
+
+    # A fresh process re-importing identical content never calls the endpoint.
+    again = CachingEmbedder(inner, EmbeddingCache(tmp_path / "cache.sqlite3"))
+    assert again.embed("bb", "add") == [2.0, 1.0]
+    assert len(inner.batches) == 2
+    assert again.stats == {"hits": 1, "misses": 0, "requests": 0}
+
+    # The action is part of the key: an update embedding is not served from an add entry.
+    assert again.embed("bb", "update") == [2.0, 2.0]
+    assert inner.batches[-1] == (["bb"], "update")
+
+
+def test_caching_embedder_passes_search_through_and_bounds_table(tmp_path):
+    from services.api.mem0_embedding_cache import CachingEmbedder, EmbeddingCache
+
+    inner = _FakeBatchEmbedder()
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=2)
+    embedder = CachingEmbedder(inner, cache)
+
+    assert embedder.embed("query", "search") == [5.0, 0.0]
+    assert embedder.embed("query", "search") == [5.0, 0.0]
+    assert inner.single == [("query", "search"), ("query", "search")]
+    assert cache.count() == 0
+
+    for text in ["a", "bb", "ccc"]:
+        embedder.embed(text, "add")
+    assert cache.count() == 2
+    assert set(cache.get_many(embedder.model_key, "add", ["a", "bb", "ccc"])) == {"bb", "ccc"}
+
+
+def test_caching_embedder_embeds_one_by_one_without_embed_batch(tmp_path):
+    from services.api.mem0_embedding_cache import CachingEmbedder, EmbeddingCache
+
+    class _SingleEmbedder:
+        def __init__(self):
+            self.calls = []
+
+        def embed(self, text, memory_action=None):
+            self.calls.append((text, memory_action))
+            return [float(len(text))]
+
+    inner = _SingleEmbedder()
+    embedder = CachingEmbedder(inner, EmbeddingCache(tmp_path / "cache.sqlite3"))
+
+    assert embedder.embed_many(["a", "bb"]) == {"a": [1.0], "bb": [2.0]}
+    assert inner.calls == [("a", "add"), ("bb", "add")]
+    assert embedder.stats["requests"] == 2
+
+
+def test_teacher_mem0_index_entries_prefetches_embeddings_in_one_batch(monkeypatch, tmp_path):
+    from services.api.mem0_embedding_cache import CachingEmbedder, EmbeddingCache
+
+    monkeypatch.setattr(ma, "teacher_mem0_write_enabled", lambda: True)
+    monkeypatch.setattr(ma, "teacher_mem0_chunk_chars", lambda: 200)
+    inner = _FakeBatchEmbedder()
+
+    class _Memory:
+        def __init__(self):
+            self.embedding_model = CachingEmbedder(inner, EmbeddingCache(tmp_path / "cache.sqlite3"))
+            self.added = []
+
+        def add(self, chunk, *, user_id, infer, metadata):
+            self.embedding_model.embed(chunk, "add")
+            self.added.append((chunk, metadata))
+            return {"id": chunk}
+
+    memory = _Memory()
+    monkeypatch.setattr(ma, "get_mem0", lambda: memory)
+
+    result = ma.teacher_mem0_index_entries(
+        "teacher-1",
+        [{"text": "first entry", "metadata": {"file": "MEMORY.md"}}, {"text": "second entry"}],
+    )
+
+    assert result == {"ok": True, "chunks": 2, "results_count": 2}
+    assert inner.batches == [(["first entry", "second entry"], "add")]
+    assert inner.single == []
+    assert memory.added[0][1] == {"file": "MEMORY.md", "chunk_index": 0, "chunk_total": 1}
+
+
+def test_caching_embedder_batches_through_the_openai_list_endpoint(tmp_path):
+    from services.api.mem0_embedding_cache import CachingEmbedder, EmbeddingCache
+
+    calls = []
+
+    class _Embeddings:
+        def create(self, *, input, model, dimensions):
+            calls.append((list(input), model, dimensions))
+            data = [types.SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(input)]
+            return types.SimpleNamespace(data=list(reversed(data)))
+
+    class OpenAIEmbedding:
+        def __init__(self):
+            self.config = types.SimpleNamespace(model="text-embedding-3-small", embedding_dims=1536)
+            self.client = types.SimpleNamespace(embeddings=_Embeddings())
+
+        def embed(self, text, memory_action=None):
+            raise AssertionError("batched texts must not be embedded one by one")
+
+    embedder = CachingEmbedder(OpenAIEmbedding(), EmbeddingCache(tmp_path / "cache.sqlite3"))
+
+    assert embedder.embed_many(["a\nb", "ccc"]) == {"a\nb": [3.0], "ccc": [3.0]}
+    assert calls == [(["a b", "ccc"], "text-embedding-3-small", 1536)]
+    assert embedder.stats["requests"] == 1
+
+
+def test_teacher_mem0_import_memory_file_indexes_all_entries_together(monkeypatch, tmp_path):
+    memory_md = tmp_path / "MEMORY.md"
+    memory_md.write_text(
+        "# Long-term memory\n\n"
+        "## Grading style\n- ts: 2026-01-02\n- entry_id: p-1\n- source: manual\n\nPrefer short feedback.\n\n"
+        "## Empty\n- ts: 2026-01-03\n\n"
+        "## Units\n\nAlways use SI units.\n",
+        encoding="utf-8",
+    )
+    calls = []
+    monkeypatch.setattr(
+        ma,
+        "teacher_mem0_index_entries",
+        lambda teacher_id, entries: calls.append((teacher_id, entries)) or {"ok": True, "chunks": len(entries)},
+    )
+
+    result = ma.teacher_mem0_import_memory_file("teacher-1", memory_md)
+
+    assert result == {"ok": True, "chunks": 2, "entries": 2}
+    [(teacher_id, entries)] = calls
+    assert teacher_id == "teacher-1"
+    assert [entry["text"] for entry in entries] == ["Grading style\nPrefer short feedback.", "Units\nAlways use SI units."]
+    assert entries[0]["metadata"]["proposal_id"] == "p-1"
+    assert entries[0]["metadata"]["source"] == "manual"
+    assert entries[1]["metadata"]["source"] == "import"
+    assert ma.teacher_mem0_import_memory_file("teacher-1", tmp_path / "missing.md")["error"] == "file_not_found"
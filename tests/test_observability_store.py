@@ -1,4 +1,9 @@
-from services.api.observability import ObservabilityStore
+import json
+import time
+from pathlib import Path
+
+from services.api.latency_sketch import LatencySketch
+from services.api.observability import ObservabilityStore, render_prometheus
 
 
 def test_observability_store_snapshot_fields() -> None:
@@ -17,3 +22,139 @@ def test_observability_store_snapshot_fields() -> None:
     assert "POST /chat/start" in snap["errors_by_route"]
     assert "latency_p95_ok" in snap["slo"]
     assert "error_rate_ok" in snap["slo"]
+
+
+def test_observability_store_reports_per_route_quantiles() -> None:
+    store = ObservabilityStore()
+    for i in range(1, 1001):
+        store.record(method="GET", route="/slow", status_code=200, latency_sec=i / 1000.0)
+    store.record(method="GET", route="/fast", status_code=200, latency_sec=0.002)
+
+    snap = store.snapshot()
+    slow = snap["latency_by_route"]["GET /slow"]["2xx"]
+    assert slow["count"] == 1000
+    assert abs(slow["p50"] - 0.5) <= 0.5 * 0.02
+    assert abs(slow["p99"] - 0.99) <= 0.99 * 0.02
+    assert snap["latency_by_route"]["GET /fast"]["2xx"]["p99"] == 0.002
+
+
+def test_latency_sketch_merge_matches_single_sketch() -> None:
+    merged = LatencySketch()
+    single = LatencySketch()
+    for worker in range(4):
+        part = LatencySketch()
+        for i in range(250):
+            value = (worker * 250 + i + 1) / 100.0
+            part.add(value)
+            single.add(value)
+        merged.merge(LatencySketch.from_dict(part.to_dict()) or LatencySketch())
+
+    assert merged.count == single.count == 1000
+    for q in (0.5, 0.95, 0.99):
+        assert merged.quantile(q) == single.quantile(q)
+
+
+def test_observability_store_aggregates_shared_worker_state(tmp_path: Path) -> None:
+    worker_a = ObservabilityStore(shared_dir=tmp_path)
+    worker_b = ObservabilityStore(shared_dir=tmp_path)
+    worker_b.worker_id = "other-worker"
+    worker_a.record(method="GET", route="/health", status_code=200, latency_sec=0.01)
+    worker_b.record(method="GET", route="/health", status_code=200, latency_sec=0.03)
+    worker_b.record(method="POST", route="/chat/start", status_code=500, latency_sec=0.2)
+    worker_b.publish()
+
+    snap = worker_a.aggregated().snapshot()
+
+    assert snap["http_requests_total"] == 3
+    assert snap["http_5xx_total"] == 1
+    assert snap["requests_by_route"]["GET /health"] == 2
+    assert snap["latency_by_route"]["GET /health"]["2xx"]["count"] == 2
+
+
+def test_aggregated_prunes_state_files_of_exited_workers(tmp_path: Path) -> None:
+    live = ObservabilityStore(shared_dir=tmp_path, shared_max_age_sec=60.0)
+    exited = ObservabilityStore(shared_dir=tmp_path)
+    exited.worker_id = "host-exited"
+    exited.record_timing("rq_queue_wait", "exam", 1.0)
+    exited.publish()
+    stale = tmp_path / "host-exited.json"
+    state = json.loads(stale.read_text(encoding="utf-8"))
+    state["ts"] = time.time() - 600
+    stale.write_text(json.dumps(state), encoding="utf-8")
+
+    snap = live.aggregated().snapshot()
+
+    assert "rq_queue_wait" not in snap["timings"]
+    assert not stale.exists()
+    assert (tmp_path / f"{live.worker_id}.json").exists()
+
+    horse = ObservabilityStore(shared_dir=tmp_path)
+    horse.worker_id = "host-horse"
+    horse.detach_shared()
+    horse.record_timing("rq_enqueue", "chat", 0.1)
+    horse.publish()
+    assert not (tmp_path / "host-horse.json").exists()
+
+
+def test_render_prometheus_emits_counters_and_summaries() -> None:
+    store = ObservabilityStore()
+    store.record(method="GET", route='/a"b', status_code=200, latency_sec=0.1)
+    store.record(method="GET", route='/a"b', status_code=404, latency_sec=0.2)
+
+    text = render_prometheus(store)
+
+    assert "# TYPE http_requests_total counter" in text
+    assert 'http_requests_total{method="GET",route="/a\\"b",status_class="2xx"} 1' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/a\\"b",status_class="4xx"} 1' in text
+    assert 'quantile="0.99"' in text
+    assert text.endswith("\n")
+
+
+def test_observability_store_exports_named_timings() -> None:
+    store = ObservabilityStore()
+    store.record_timing("rq_queue_wait", "chat", 0.2)
+    store.record_timing("rq_queue_wait", "exam", 4.0)
+
+    snap = store.snapshot()
+    text = render_prometheus(store)
+
+    assert snap["timings"]["rq_queue_wait"]["exam"]["count"] == 1
+    assert snap["timings"]["rq_queue_wait"]["chat"]["p99"] == 0.2
+    assert "# TYPE rq_queue_wait_seconds summary" in text
+    assert 'rq_queue_wait_seconds_count{class="exam"} 1' in text
+
+
+def test_observability_store_counters_and_gauges_merge_across_workers() -> None:
+    first = ObservabilityStore()
+    second = ObservabilityStore()
+    first.inc_counter("tenant_evictions_total", "lru")
+    second.inc_counter("tenant_evictions_total", "lru", 2)
+    first.set_gauge("tenant_resident", 3)
+    second.set_gauge("tenant_resident", 4)
+
+    merged = ObservabilityStore()
+    merged.merge_state(first.export_state())
+    merged.merge_state(second.export_state())
+    text = render_prometheus(merged)
+
+    assert merged.snapshot()["counters"]["tenant_evictions_total"] == {"lru": 3.0}
+    assert 'tenant_evictions_total{kind="lru"} 3' in text
+    assert "# TYPE tenant_resident gauge" in text
+    assert "tenant_resident 7" in text
+
+
+def test_recording_leaves_publishing_to_a_background_thread(tmp_path: Path) -> None:
+    store = ObservabilityStore(shared_dir=tmp_path, publish_interval_sec=0.05)
+    state_file = tmp_path / f"{store.worker_id}.json"
+
+    store.record(method="GET", route="/health", status_code=200, latency_sec=0.01)
+    assert not state_file.exists()
+
+    for _ in range(100):
+        if state_file.exists():
+            break
+        time.sleep(0.02)
+    assert json.loads(state_file.read_text(encoding="utf-8"))["requests_total"] == 1
+
+    store.detach_shared()
+    assert store._publisher_stop is not None and store._publisher_stop.is_set()
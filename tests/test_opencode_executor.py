@@ -113,6 +113,99 @@ class OpencodeExecutorTest(unittest.TestCase):
             self.assertIn("save_chart", str(result.get("python_code") or ""))
             self.assertIn("yfinance", result.get("packages") or [])
 
+    def test_flag_probe_and_config_are_cached_until_files_change(self):
+        import os
+
+        import services.api.opencode_executor as mod
+
+        with TemporaryDirectory() as td:
+            mod._HELP_CACHE.clear()  # type: ignore[attr-defined]
+            binary = Path(td) / "opencode"
+            binary.write_text("#!/bin/sh\n", encoding="utf-8")
+            config_file = Path(td) / "config" / "opencode_bridge.yaml"
+            config_file.parent.mkdir()
+            config_file.write_text("enabled: true\nmode: serve\n", encoding="utf-8")
+
+            class _Proc:
+                returncode = 0
+                stdout = "--format\n--attach\n"
+                stderr = ""
+
+            with patch("services.api.opencode_executor.subprocess.run", return_value=_Proc()) as mock_run:
+                self.assertTrue(mod._detect_run_flags(str(binary))["attach"])
+                self.assertTrue(mod._detect_run_flags(str(binary))["attach"])
+                self.assertEqual(mock_run.call_count, 1)
+                os.utime(binary, ns=(1_000_000_000, 1_000_000_000))
+                mod._detect_run_flags(str(binary))
+                self.assertEqual(mock_run.call_count, 2)
+
+            with patch("services.api.opencode_executor.yaml.safe_load", wraps=mod.yaml.safe_load) as mock_load:
+                self.assertEqual(mod.load_opencode_bridge_config(Path(td))["mode"], "serve")
+                self.assertEqual(mod.load_opencode_bridge_config(Path(td))["pool_size"], 2)
+                self.assertEqual(mock_load.call_count, 1)
+                config_file.write_text("enabled: true\nmode: serve\npool_size: 3\n", encoding="utf-8")
+                self.assertEqual(mod.load_opencode_bridge_config(Path(td))["pool_size"], 3)
+                self.assertEqual(mock_load.call_count, 2)
+
+    def test_serve_mode_attaches_runs_to_a_pooled_server(self):
+        import services.api.opencode_executor as mod
+        from services.api.opencode_session_pool import OpencodeServerPool
+
+        class _Server:
+            def __init__(self, *args, **kwargs):
+                self.args = args
+
+            def poll(self):
+                return None
+
+            def terminate(self):
+                pass
+
+            def wait(self, timeout=None):
+                return 0
+
+        class _Proc:
+            def __init__(self, stdout):
+                self.returncode = 0
+                self.stdout = stdout
+                self.stderr = ""
+
+        servers = []
+
+        def popen(*args, **kwargs):
+            servers.append(_Server(*args))
+            return servers[-1]
+
+        pool = OpencodeServerPool(popen=popen, port_open=lambda port: True)
+        line = json.dumps({"python_code": "save_chart()", "packages": [], "summary": "ok"})
+        with TemporaryDirectory() as td:
+            mod._HELP_CACHE.clear()  # type: ignore[attr-defined]
+            with patch.object(mod, "OPENCODE_SERVER_POOL", pool), patch(
+                "services.api.opencode_executor.subprocess.run"
+            ) as mock_run:
+                mock_run.side_effect = [_Proc("--format\n--attach\n"), _Proc(line), _Proc(line)]
+                results = [
+                    mod.run_opencode_codegen(
+                        app_root=Path(td),
+                        task="画图",
+                        input_data={},
+                        last_error="",
+                        previous_code="",
+                        attempt=attempt,
+                        max_retries=3,
+                        overrides={"enabled": True, "bin": "/bin/echo", "mode": "serve"},
+                    )
+                    for attempt in (1, 2)
+                ]
+
+        self.assertEqual(len(servers), 1)
+        self.assertEqual(servers[0].args[0][:2], ["/bin/echo", "serve"])
+        for result in results:
+            self.assertTrue(result.get("ok"))
+            command = result.get("command") or []
+            self.assertEqual(command[command.index("--attach") + 1], result.get("session_url"))
+        self.assertTrue(str(results[0].get("session_url")).startswith("http://127.0.0.1:"))
+
 
 if __name__ == "__main__":
     unittest.main()
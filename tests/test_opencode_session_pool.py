@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from services.api.opencode_session_pool import OpencodeServerPool
+
+
+class _Proc:
+    def __init__(self, cmd):
+        self.cmd = cmd
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = -15
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+    def kill(self):
+        self.returncode = -9
+
+
+class OpencodeServerPoolTest(unittest.TestCase):
+    def _pool(self, **kwargs):
+        started = []
+
+        def popen(cmd, **_kwargs):
+            started.append(_Proc(cmd))
+            return started[-1]
+
+        return OpencodeServerPool(popen=popen, port_open=lambda port: True, **kwargs), started
+
+    def _acquire(self, pool, key="k1", wait_sec=0.0):
+        return pool.acquire(key, binary="opencode", cwd=Path("."), env={}, wait_sec=wait_sec)
+
+    def test_reuses_servers_and_bounds_the_pool(self):
+        pool, started = self._pool(max_size=1)
+        first = self._acquire(pool)
+        self.assertIsNotNone(first)
+        self.assertIsNone(self._acquire(pool))
+        pool.release(first)
+        self.assertIs(self._acquire(pool), first)
+        pool.release(first)
+
+        # A different key takes over the only slot once it is idle.
+        other = self._acquire(pool, key="k2")
+        self.assertIsNot(other, first)
+        self.assertEqual(first.proc.returncode, -15)
+        self.assertEqual(len(started), 2)
+
+    def test_unhealthy_exited_and_idle_servers_are_replaced(self):
+        pool, started = self._pool(max_size=2, idle_sec=60)
+        with pool.lease("k1", binary="opencode", cwd=Path("."), env={}, wait_sec=0) as server:
+            server.healthy = False
+        self.assertEqual(started[0].returncode, -15)
+
+        server = self._acquire(pool)
+        pool.release(server)
+        server.proc.returncode = 1
+        replacement = self._acquire(pool)
+        self.assertIsNot(replacement, server)
+        pool.release(replacement)
+
+        replacement.last_used -= 120
+        self.assertIsNot(self._acquire(pool), replacement)
+        self.assertEqual(len(started), 4)
+        pool.shutdown()
+        self.assertTrue(all(proc.returncode is not None for proc in started))
+
+    def test_reaper_stops_idle_servers_without_a_new_acquire(self):
+        pool, started = self._pool(max_size=2, idle_sec=60)
+        server = self._acquire(pool)
+        self.assertIsNotNone(pool._reaper)
+        pool.release(server)
+        self.assertEqual(pool.reap(), 0)
+        server.last_used -= 120
+        self.assertEqual(pool.reap(), 1)
+        self.assertEqual(started[0].returncode, -15)
+
+        # A forked child neither reuses nor stops the parent's servers.
+        parent_server = self._acquire(pool)
+        pool.release(parent_server)
+        parent_cond, parent_reaper = pool._cond, pool._reaper
+        pool.reset_after_fork()
+        # The parent's reaper notices the swapped state and exits instead of crashing.
+        with parent_cond:
+            parent_cond.notify_all()
+        parent_reaper.join(timeout=5)
+        self.assertFalse(parent_reaper.is_alive())
+        self.assertIsNot(self._acquire(pool), parent_server)
+        self.assertEqual(len(started), 3)
+        pool.shutdown()
+        self.assertIsNone(parent_server.proc.returncode)
+
+    def test_work_horses_run_one_shot(self):
+        from services.api import opencode_executor as executor
+        from services.api.workers import work_horse
+
+        pool, started = self._pool()
+        config = {"mode": "serve"}
+        with patch.object(executor, "OPENCODE_SERVER_POOL", pool), patch.object(work_horse, "_IN_WORK_HORSE", True):
+            with executor._codegen_session(
+                binary="opencode", flags={"attach": True}, config=config, app_root=Path("."), env={}
+            ) as server:
+                self.assertIsNone(server)
+        self.assertEqual(started, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
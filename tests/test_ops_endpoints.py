@@ -76,12 +76,27 @@ def test_ops_metrics_exposes_observability_snapshot() -> None:
                 assert "http_latency_sec" in metrics
                 assert "slo" in metrics
                 assert "analysis_runtime" in metrics
+                assert isinstance(metrics["diag_log"], list)
                 assert metrics["analysis_runtime"]["schema_version"] == "v1"
                 assert metrics["analysis_runtime"]["counters"]["run_count"] == 0
                 assert "GET /health" in metrics["requests_by_route"]
                 assert response.headers.get("x-request-id")
 
 
+def test_health_metrics_exports_prometheus_text() -> None:
+    with _env_guard():
+        with TemporaryDirectory() as td:
+            app_mod = _load_app(Path(td), auth_required="0")
+            with TestClient(app_mod.app) as client:
+                assert client.get("/health").status_code == 200
+
+                response = client.get("/health/metrics")
+                assert response.status_code == 200
+                assert response.headers["content-type"].startswith("text/plain")
+                assert 'http_requests_total{method="GET",route="/health",status_class="2xx"}' in response.text
+                assert "# TYPE http_request_duration_seconds summary" in response.text
+
+
 def test_ops_slo_includes_core_projection_fields() -> None:
     with _env_guard():
         with TemporaryDirectory() as td:
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from services.api.proposal_index_store import ProposalIndexStore, proposal_index_path
+
+
+def _write(path: Path, rec: dict, *, age_sec: float) -> None:
+    path.write_text(json.dumps(rec, ensure_ascii=False), encoding="utf-8")
+    stamp = time.time() - age_sec
+    os.utime(path, (stamp, stamp))
+
+
+def _settle(proposals_dir: Path) -> None:
+    stamp = time.time() - 60
+    os.utime(proposals_dir, (stamp, stamp))
+
+
+class ProposalIndexStoreTest(unittest.TestCase):
+    def _store(self, root: Path) -> ProposalIndexStore:
+        proposals_dir = root / "proposals"
+        proposals_dir.mkdir(parents=True)
+        return ProposalIndexStore(proposal_index_path(proposals_dir), proposals_dir=proposals_dir)
+
+    def test_lists_by_recency_with_status_and_student_filters(self):
+        with TemporaryDirectory() as td:
+            store = self._store(Path(td))
+            base = store.proposals_dir
+            _write(base / "p1.json", {"student_id": "S1", "status": "proposed"}, age_sec=300)
+            _write(base / "p2.json", {"proposal_id": "p2", "student_id": "S2", "status": "applied"}, age_sec=200)
+            _write(base / "p3.json", {"proposal_id": "p3", "student_id": "S1", "status": "deleted"}, age_sec=100)
+            (base / "broken.json").write_text("{", encoding="utf-8")
+            _settle(base)
+
+            self.assertEqual([r["proposal_id"] for r in store.list_records(limit=10)], ["p2", "p1"])
+            self.assertEqual([r["proposal_id"] for r in store.list_records(status="deleted", limit=10)], ["p3"])
+            self.assertEqual([r["proposal_id"] for r in store.list_records(student_id="S1", limit=10)], ["p1"])
+            self.assertEqual(len(store.list_records(limit=1)), 1)
+            self.assertEqual(proposal_index_path(base).name, "proposals.index.sqlite3")
+
+    def test_reconciles_files_changed_outside_the_writers(self):
+        with TemporaryDirectory() as td:
+            store = self._store(Path(td))
+            base = store.proposals_dir
+            _write(base / "p1.json", {"status": "proposed"}, age_sec=300)
+            _settle(base)
+            self.assertEqual([r["proposal_id"] for r in store.list_records(limit=10)], ["p1"])
+
+            _write(base / "p2.json", {"status": "proposed"}, age_sec=100)
+            (base / "p1.json").unlink()
+            self.assertEqual([r["proposal_id"] for r in store.list_records(limit=10)], ["p2"])
+
+    def test_record_write_indexes_in_place_rewrites(self):
+        with TemporaryDirectory() as td:
+            store = self._store(Path(td))
+            base = store.proposals_dir
+            _write(base / "p1.json", {"status": "proposed"}, age_sec=300)
+            _settle(base)
+            self.assertEqual(len(store.list_records(status="proposed", limit=10)), 1)
+
+            # An in-place rewrite does not touch the directory stamp.
+            _write(base / "p1.json", {"status": "applied"}, age_sec=250)
+            self.assertEqual(len(store.list_records(status="proposed", limit=10)), 1)
+            store.record_write(base / "p1.json", {"status": "applied"})
+            self.assertEqual(store.list_records(status="proposed", limit=10), [])
+            self.assertEqual(len(store.list_records(status="applied", limit=10)), 1)
+
+    def test_quota_count_dedupe_and_facets(self):
+        with TemporaryDirectory() as td:
+            store = self._store(Path(td))
+            base = store.proposals_dir
+            common = {"student_id": "S1", "memory_type": "learning_preference"}
+            _write(base / "a1.json", {**common, "status": "proposed", "source": "auto_student_infer", "created_at": "2026-03-01T10:00:00", "content": "先 给 结论"}, age_sec=300)
+            _write(base / "a2.json", {**common, "status": "rejected", "source": "auto_student_infer", "created_at": "2026-03-01T11:00:00", "content": "other"}, age_sec=200)
+            _write(base / "m1.json", {**common, "status": "applied", "source": "manual", "created_at": "2026-03-01T12:00:00", "content": "x"}, age_sec=100)
+
+            self.assertEqual(
+                store.count_created(
+                    student_id="S1",
+                    statuses=("proposed", "applied"),
+                    created_prefix="2026-03-01",
+                    source_prefix="auto_",
+                ),
+                1,
+            )
+            dup = store.find_duplicate(
+                student_id="S1",
+                memory_type="LEARNING_PREFERENCE",
+                content="先给结论 ",
+                statuses=("proposed", "applied"),
+            )
+            self.assertEqual((dup or {}).get("proposal_id"), "a1")
+            self.assertIsNone(
+                store.find_duplicate(student_id="S1", memory_type="learning_preference", content="other", statuses=("proposed",))
+            )
+            self.assertEqual(sorted(f[0] for f in store.facets(student_id="S1")), ["applied", "proposed", "rejected"])
+
+
+if __name__ == "__main__":
+    unittest.main()
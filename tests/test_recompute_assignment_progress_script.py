@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+
+def _load_script_module():
+    module_path = Path(__file__).resolve().parents[1] / "scripts" / "recompute_assignment_progress.py"
+    spec = importlib.util.spec_from_file_location("recompute_assignment_progress", module_path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_recomputes_every_assignment_folder_and_reports_failures(tmp_path, monkeypatch, capsys) -> None:
+    module = _load_script_module()
+    for name in ["hw1", "hw2"]:
+        (tmp_path / "assignments" / name).mkdir(parents=True)
+    calls = []
+
+    def _recompute(assignment_id, include_students=True):
+        calls.append((assignment_id, include_students))
+        return {"ok": True} if assignment_id == "hw1" else {"ok": False, "error": "assignment_not_found"}
+
+    monkeypatch.setattr(module, "app_core", SimpleNamespace(DATA_DIR=tmp_path, recompute_assignment_progress=_recompute))
+
+    assert module.main([]) == 1
+    assert calls == [("hw1", False), ("hw2", False)]
+    out = json.loads(capsys.readouterr().out)
+    assert out == {
+        "ok": False,
+        "recomputed": 1,
+        "failed": [{"assignment_id": "hw2", "error": "assignment_not_found"}],
+    }
+
+    calls.clear()
+    assert module.main(["--assignment-id", "hw1"]) == 0
+    assert calls == [("hw1", False)]
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from services.api import review_queue_service
 from services.api.analysis_metadata_repository import FileBackedAnalysisMetadataRepository
 from services.api.review_feedback_store import read_review_feedback_rows
 from services.api.review_queue_service import (
     ReviewQueueDeps,
     claim_review_item,
+    compact_review_queue,
     enqueue_review_item,
     list_review_items,
     reject_review_item,
@@ -110,3 +112,74 @@ def test_claim_review_item_does_not_append_feedback_row(tmp_path: Path) -> None:
 
     rows = read_review_feedback_rows(tmp_path / 'analysis' / 'review_feedback.jsonl')
     assert rows == []
+
+
+
+def _enqueue(deps: ReviewQueueDeps, report_id: str) -> dict:
+    return enqueue_review_item(
+        domain='survey',
+        report_id=report_id,
+        teacher_id='teacher_1',
+        reason='low_confidence',
+        confidence=0.4,
+        target_type='report',
+        target_id=report_id,
+        deps=deps,
+    )
+
+
+
+def test_review_queue_reads_replay_only_the_log_tail(tmp_path: Path, monkeypatch) -> None:
+    deps = _deps(tmp_path)
+    first = _enqueue(deps, 'report_1')
+    list_review_items(teacher_id='teacher_1', domain=None, status=None, deps=deps)
+    log_size = (tmp_path / 'review' / 'events.jsonl').stat().st_size
+    offsets: list[int] = []
+    original = FileBackedAnalysisMetadataRepository.read_jsonl_from
+
+    def _spy(self, relative_path, offset):
+        offsets.append(offset)
+        return original(self, relative_path, offset)
+
+    monkeypatch.setattr(FileBackedAnalysisMetadataRepository, 'read_jsonl_from', _spy)
+    claim_review_item(item_id=first['item_id'], reviewer_id='reviewer_1', deps=deps)
+    listed = list_review_items(teacher_id='teacher_1', domain=None, status='claimed', deps=deps)
+
+    assert offsets and all(offset == log_size for offset in offsets)
+    assert [item['item_id'] for item in listed['items']] == [first['item_id']]
+
+
+
+def test_review_queue_compaction_snapshot_survives_restart(tmp_path: Path) -> None:
+    deps = _deps(tmp_path)
+    first = _enqueue(deps, 'report_1')
+    _enqueue(deps, 'report_2')
+    claim_review_item(item_id=first['item_id'], reviewer_id='reviewer_1', deps=deps)
+
+    result = compact_review_queue(deps=deps)
+    assert result['ok'] is True
+    assert result['rows'] == 3
+    assert result['items'] == 2
+
+    review_queue_service._STATES.clear()
+    snapshot_path = tmp_path / 'review' / 'events.jsonl.snapshot.json'
+    assert snapshot_path.exists()
+    _enqueue(deps, 'report_3')
+    items = list_review_items(teacher_id='teacher_1', domain=None, status=None, deps=deps)['items']
+
+    assert [item['report_id'] for item in items] == ['report_1', 'report_2', 'report_3']
+    assert items[0]['status'] == 'claimed'
+
+
+
+def test_review_queue_replays_from_start_when_log_is_truncated(tmp_path: Path) -> None:
+    deps = _deps(tmp_path)
+    _enqueue(deps, 'report_1')
+    _enqueue(deps, 'report_2')
+    compact_review_queue(deps=deps)
+
+    (tmp_path / 'review' / 'events.jsonl').write_text('', encoding='utf-8')
+    _enqueue(deps, 'report_9')
+    items = list_review_items(teacher_id='teacher_1', domain=None, status=None, deps=deps)['items']
+
+    assert [item['report_id'] for item in items] == ['report_9']
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from services.api.workers import rq_queues
+
+
+def test_parse_queue_weights_overrides_known_classes_only() -> None:
+    weights = rq_queues.parse_queue_weights("chat=20, exam=0.5,bogus=3,upload=x")
+
+    assert weights["chat"] == 20.0
+    assert weights["exam"] == 0.5
+    assert weights["upload"] == rq_queues.DEFAULT_QUEUE_WEIGHTS["upload"]
+    assert "bogus" not in weights
+
+
+def test_worker_queue_names_order_by_weight_with_base_last(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RQ_QUEUE_NAME", "jobs")
+    monkeypatch.setenv("RQ_QUEUE_WEIGHTS", "exam=50")
+    monkeypatch.delenv("RQ_PRIORITY_QUEUES", raising=False)
+    monkeypatch.setenv("RQ_WORKER_JOB_CLASSES", "chat,exam")
+
+    assert rq_queues.worker_queue_names() == ["jobs.exam", "jobs.chat", "jobs"]
+
+    monkeypatch.setenv("RQ_PRIORITY_QUEUES", "0")
+    assert rq_queues.worker_queue_names() == ["jobs"]
+
+
+def test_weighted_order_prefers_heavier_queues_without_starving() -> None:
+    queues = [SimpleNamespace(name=name) for name in ("q.chat", "q.exam", "q")]
+    weights = {"q.chat": 9.0, "q.exam": 1.0}
+    rng = random.Random(7)
+
+    firsts = Counter(rq_queues.weighted_order(queues, weights, rng=rng)[0].name for _ in range(2000))
+
+    assert 0.85 < firsts["q.chat"] / 2000 < 0.95
+    assert firsts["q.exam"] > 0
+    assert firsts["q"] == 0
+
+
+def test_queue_wait_sec_treats_naive_timestamps_as_utc() -> None:
+    now = datetime(2026, 1, 1, 12, 0, 5, tzinfo=timezone.utc)
+
+    assert rq_queues.queue_wait_sec(datetime(2026, 1, 1, 12, 0, 0), now=now) == 5.0
+    assert rq_queues.queue_wait_sec(now + timedelta(seconds=3), now=now) == 0.0
+    assert rq_queues.queue_wait_sec(None, now=now) is None
+
+
+def test_weighted_workers_reorder_queues_by_weight() -> None:
+    from services.api.workers.rq_worker import WarmWorker, WeightedWorker
+
+    for worker_cls in (WarmWorker, WeightedWorker):
+        worker = object.__new__(worker_cls)
+        worker.queue_weights = {"q.chat": 1.0}
+        worker._ordered_queues = [SimpleNamespace(name="q"), SimpleNamespace(name="q.chat")]
+
+        worker.reorder_queues(reference_queue=worker._ordered_queues[0])
+
+        assert [queue.name for queue in worker._ordered_queues] == ["q.chat", "q"]
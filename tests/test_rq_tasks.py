@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, Dict, List
@@ -9,19 +10,34 @@ import pytest
 from services.api.workers import rq_tasks
 
 
+@pytest.fixture(autouse=True)
+def _reset_redis_handles() -> Any:
+    rq_tasks.reset_redis_handles()
+    yield
+    rq_tasks.reset_redis_handles()
+
+
 class _FakeQueue:
     def __init__(self) -> None:
         self.calls: List[Dict[str, Any]] = []
 
+        self.job_class: Any = None
+
+    def bind(self, job_class: Any) -> "_FakeQueue":
+        self.job_class = job_class
+        return self
+
     def enqueue(self, func: Any, *args: Any, **kwargs: Any) -> None:
-        self.calls.append({"func": func, "args": args, "kwargs": kwargs})
+        self.calls.append({"func": func, "args": args, "kwargs": kwargs, "job_class": self.job_class})
 
 
 class _FakeRedis:
     def __init__(self, *, fail_ping: bool = False) -> None:
         self.fail_ping = fail_ping
+        self.pings = 0
 
     def ping(self) -> None:
+        self.pings += 1
         if self.fail_ping:
             raise RuntimeError("ping failed")
 
@@ -32,6 +48,10 @@ def test_queue_name_defaults_and_overrides(monkeypatch: pytest.MonkeyPatch) -> N
 
     monkeypatch.setenv("RQ_QUEUE_NAME", "critical")
     assert rq_tasks._queue_name() == "critical"
+    assert rq_tasks._queue_name("chat") == "critical.chat"
+
+    monkeypatch.setenv("RQ_PRIORITY_QUEUES", "0")
+    assert rq_tasks._queue_name("chat") == "critical"
 
 
 def test_require_redis_client_requires_env(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -125,7 +145,7 @@ def test_lane_store_uses_tenant_fallback_and_mod_defaults(monkeypatch: pytest.Mo
 
 def test_enqueue_basic_jobs_use_queue(monkeypatch: pytest.MonkeyPatch) -> None:
     queue = _FakeQueue()
-    monkeypatch.setattr(rq_tasks, "_get_queue", lambda: queue)
+    monkeypatch.setattr(rq_tasks, "_get_queue", lambda job_class=None: queue.bind(job_class))
 
     rq_tasks.enqueue_upload_job("up-1", tenant_id="t1")
     rq_tasks.enqueue_exam_job("exam-1", tenant_id="t2")
@@ -134,6 +154,7 @@ def test_enqueue_basic_jobs_use_queue(monkeypatch: pytest.MonkeyPatch) -> None:
     assert queue.calls[0]["func"] is rq_tasks.run_upload_job
     assert queue.calls[0]["args"] == ("up-1",)
     assert queue.calls[0]["kwargs"] == {"tenant_id": "t1"}
+    assert [call["job_class"] for call in queue.calls] == ["upload", "exam", "profile"]
 
     assert queue.calls[1]["func"] is rq_tasks.run_exam_job
     assert queue.calls[1]["args"] == ("exam-1",)
@@ -154,7 +175,7 @@ def test_enqueue_chat_job_resolves_lane_and_dispatches(monkeypatch: pytest.Monke
 
     monkeypatch.setattr(rq_tasks, "load_tenant_module", lambda tenant_id: mod)
     monkeypatch.setattr(rq_tasks, "_lane_store", lambda _mod, tenant_id: store)
-    monkeypatch.setattr(rq_tasks, "_get_queue", lambda: queue)
+    monkeypatch.setattr(rq_tasks, "_get_queue", lambda job_class=None: queue.bind(job_class))
 
     result = rq_tasks.enqueue_chat_job("chat-1", lane_id=None, tenant_id="tenant-a")
 
@@ -163,6 +184,7 @@ def test_enqueue_chat_job_resolves_lane_and_dispatches(monkeypatch: pytest.Monke
     assert queue.calls[0]["func"] is rq_tasks.run_chat_job
     assert queue.calls[0]["args"] == ("chat-1", "L-1")
     assert queue.calls[0]["kwargs"] == {"tenant_id": "tenant-a"}
+    assert queue.calls[0]["job_class"] == "chat"
 
 
 def test_enqueue_chat_job_fallback_lane_and_no_dispatch(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -177,7 +199,7 @@ def test_enqueue_chat_job_fallback_lane_and_no_dispatch(monkeypatch: pytest.Monk
 
     get_queue_called = {"called": False}
 
-    def _queue_unexpected() -> _FakeQueue:
+    def _queue_unexpected(job_class: Any = None) -> _FakeQueue:
         get_queue_called["called"] = True
         return _FakeQueue()
 
@@ -290,7 +312,7 @@ def test_run_chat_job_requeues_next_job(monkeypatch: pytest.MonkeyPatch) -> None
 
     monkeypatch.setattr(rq_tasks, "load_tenant_module", lambda tenant_id: mod)
     monkeypatch.setattr(rq_tasks, "_lane_store", lambda _mod, tenant_id: _Store())
-    monkeypatch.setattr(rq_tasks, "_get_queue", lambda: queue)
+    monkeypatch.setattr(rq_tasks, "_get_queue", lambda job_class=None: queue.bind(job_class))
 
     rq_tasks.run_chat_job("chat-1", "lane-1", tenant_id="t")
 
@@ -335,7 +357,7 @@ def test_run_chat_job_finally_runs_even_on_error(monkeypatch: pytest.MonkeyPatch
 
     monkeypatch.setattr(rq_tasks, "load_tenant_module", lambda tenant_id: mod)
     monkeypatch.setattr(rq_tasks, "_lane_store", lambda _mod, tenant_id: _Store())
-    monkeypatch.setattr(rq_tasks, "_get_queue", lambda: queue)
+    monkeypatch.setattr(rq_tasks, "_get_queue", lambda job_class=None: queue.bind(job_class))
 
     with pytest.raises(RuntimeError, match="process failed"):
         rq_tasks.run_chat_job("chat-2", "lane-2", tenant_id="t")
@@ -359,3 +381,124 @@ def test_run_chat_job_finally_runs_even_on_error(monkeypatch: pytest.MonkeyPatch
     ]
     assert finish_calls == ["chat-2:lane-2"]
     assert queue.calls == []
+
+
+def test_worker_records_queue_wait_per_class_before_forking(monkeypatch: pytest.MonkeyPatch) -> None:
+    from services.api.workers import rq_worker
+
+    recorded: List[Any] = []
+    executed: List[str] = []
+    enqueued_at = datetime.now(timezone.utc) - timedelta(seconds=2)
+    monkeypatch.setattr(
+        rq_tasks.OBSERVABILITY,
+        "record_timing",
+        lambda metric, label, seconds: recorded.append((metric, label, seconds)),
+    )
+    monkeypatch.setattr(rq_worker.Worker, "execute_job", lambda self, job, queue: executed.append(job.func_name))
+    worker = object.__new__(rq_worker.WeightedWorker)
+
+    worker.execute_job(
+        SimpleNamespace(func_name="services.api.workers.rq_tasks.run_exam_job", enqueued_at=enqueued_at),
+        None,
+    )
+    worker.execute_job(SimpleNamespace(func_name="other.module.task", enqueued_at=enqueued_at), None)
+
+    assert executed == ["services.api.workers.rq_tasks.run_exam_job", "other.module.task"]
+    assert [(metric, label) for metric, label, _ in recorded] == [("rq_queue_wait", "exam")]
+    assert recorded[0][2] >= 2.0
+
+
+def test_redis_handle_and_queues_are_reused_without_pinging(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:6379/0")
+    monkeypatch.setenv("RQ_QUEUE_NAME", "jobs")
+    client = _FakeRedis()
+    clients: List[_FakeRedis] = []
+
+    def _fake_get(_url: str, *, decode_responses: bool) -> _FakeRedis:
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(rq_tasks, "get_redis_client", _fake_get)
+    monkeypatch.setattr(rq_tasks, "Queue", lambda name, connection: SimpleNamespace(name=name))
+
+    first = rq_tasks._get_queue("chat")
+    second = rq_tasks._get_queue("chat")
+    other = rq_tasks._get_queue("exam")
+
+    assert first is second
+    assert other.name == "jobs.exam"
+    assert len(clients) == 1
+    assert client.pings == 1
+
+
+def test_redis_handle_rechecks_in_background_and_reconnects_after_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:6379/0")
+    client = _FakeRedis()
+    monkeypatch.setattr(rq_tasks, "get_redis_client", lambda _url, *, decode_responses: client)
+    started: List[Any] = []
+
+    class _InlineThread:
+        def __init__(self, *, target: Any, args: Any, daemon: bool, name: str) -> None:
+            self.target, self.args = target, args
+
+        def start(self) -> None:
+            started.append(self.target)
+            self.target(*self.args)
+
+    monkeypatch.setattr(rq_tasks.threading, "Thread", _InlineThread)
+    handle = rq_tasks._redis_handle(decode_responses=False)
+    handle.checked_at -= rq_tasks._HEALTH_CHECK_INTERVAL_SEC + 1
+    client.fail_ping = True
+
+    rq_tasks._redis_handle(decode_responses=False)
+
+    assert len(started) == 1
+    assert handle.healthy is False
+    with pytest.raises(RuntimeError, match="unable to connect"):
+        rq_tasks._redis_handle(decode_responses=False)
+
+    client.fail_ping = False
+    assert rq_tasks._redis_handle(decode_responses=False) is handle
+    assert handle.healthy is True
+
+
+def test_enqueue_records_latency_per_job_class(monkeypatch: pytest.MonkeyPatch) -> None:
+    queue = _FakeQueue()
+    recorded: List[Any] = []
+    monkeypatch.setattr(rq_tasks, "_get_queue", lambda job_class=None: queue.bind(job_class))
+    monkeypatch.setattr(
+        rq_tasks.OBSERVABILITY,
+        "record_timing",
+        lambda metric, label, seconds: recorded.append((metric, label)),
+    )
+
+    rq_tasks.enqueue_survey_job("s-1", tenant_id="t")
+
+    assert queue.calls[0]["func"] is rq_tasks.run_survey_job
+    assert recorded == [("rq_enqueue", "survey")]
+
+
+def test_enqueue_failure_drops_the_redis_handle(monkeypatch: pytest.MonkeyPatch) -> None:
+    from redis.exceptions import ConnectionError as RedisConnectionError
+
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:6379/0")
+    client = _FakeRedis()
+    monkeypatch.setattr(rq_tasks, "get_redis_client", lambda _url, *, decode_responses: client)
+
+    class _BrokenQueue:
+        def __init__(self, name: str, connection: Any) -> None:
+            self.name = name
+
+        def enqueue(self, func: Any, *args: Any, **kwargs: Any) -> None:
+            raise RedisConnectionError("connection reset")
+
+    monkeypatch.setattr(rq_tasks, "Queue", _BrokenQueue)
+    handle = rq_tasks._redis_handle(decode_responses=False)
+
+    with pytest.raises(RuntimeError, match="Redis required: unable to connect"):
+        rq_tasks.enqueue_exam_job("job-1")
+
+    assert handle.healthy is False
+    fresh = rq_tasks._redis_handle(decode_responses=False)
+    assert fresh is not handle
+    assert client.pings == 2
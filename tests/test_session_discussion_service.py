@@ -6,7 +6,11 @@ import json
 from pathlib import Path
 
 from services.api.session_discussion_service import (
+    DISCUSSION_STATE_FILENAME,
     SessionDiscussionDeps,
+    load_discussion_state,
+    rebuild_discussion_state,
+    record_discussion_append,
     session_discussion_pass,
 )
 
@@ -147,3 +151,97 @@ def test_empty_marker_never_passes(tmp_path):
     res = session_discussion_pass("s1", "a1", deps=deps)
     assert res["status"] == "in_progress"
     assert res["pass"] is False
+
+
+# ── 10. Persistent discussion state ──────────────────────────────────
+
+def _state_deps(tmp_path: Path, index: list | None = None) -> SessionDiscussionDeps:
+    return SessionDiscussionDeps(
+        marker=MARKER,
+        load_student_sessions_index=lambda _sid: index or [],
+        student_session_file=lambda _sid, sess_id: tmp_path / f"{sess_id}.jsonl",
+        use_discussion_state=True,
+        student_sessions_dir=lambda _sid: tmp_path,
+    )
+
+
+def _append(path: Path, obj: dict) -> None:
+    with path.open("a") as f:
+        f.write(json.dumps(obj) + "\n")
+
+
+def test_state_catches_up_on_appended_lines_only(tmp_path):
+    session = tmp_path / "a1.jsonl"
+    _write_jsonl(session, [{"role": "user", "content": "q", "ts": "t1"}])
+    deps = _state_deps(tmp_path)
+    assert session_discussion_pass("s1", "a1", deps=deps)["message_count"] == 1
+
+    state = load_discussion_state(tmp_path / DISCUSSION_STATE_FILENAME, MARKER)
+    assert state["a1.jsonl"]["offset"] == session.stat().st_size
+
+    _append(session, {"role": "assistant", "content": f"ok {MARKER}", "ts": "t2"})
+    with session.open("a") as f:
+        f.write('{"role": "user"')  # partial line still being written
+    res = session_discussion_pass("s1", "a1", deps=deps)
+    assert res == {"status": "pass", "pass": True, "session_id": "a1", "message_count": 2, "last_ts": "t2"}
+
+
+def test_state_rescans_replaced_session_file(tmp_path):
+    session = tmp_path / "a1.jsonl"
+    _write_jsonl(session, [{"role": "assistant", "content": MARKER}, {"role": "user", "content": "x"}])
+    deps = _state_deps(tmp_path)
+    assert session_discussion_pass("s1", "a1", deps=deps)["pass"] is True
+
+    replacement = tmp_path / "a1.jsonl.tmp"
+    _write_jsonl(replacement, [{"role": "user", "content": "fresh"}])
+    replacement.replace(session)
+    res = session_discussion_pass("s1", "a1", deps=deps)
+    assert res["pass"] is False
+    assert res["message_count"] == 1
+
+
+def test_record_append_only_writes_state_for_passing_records(tmp_path):
+    session = tmp_path / "a1.jsonl"
+    state_path = tmp_path / DISCUSSION_STATE_FILENAME
+    for content in ["q1", "q2"]:
+        record = {"role": "user", "content": content, "ts": content}
+        _append(session, record)
+        record_discussion_append(session, record, marker=MARKER)
+    assert not state_path.exists()
+
+    # A passing record folds in everything appended since the last write at once.
+    record = {"role": "assistant", "content": f"done {MARKER}", "ts": "t3"}
+    _append(session, record)
+    record_discussion_append(session, record, marker=MARKER)
+    entry = load_discussion_state(state_path, MARKER)["a1.jsonl"]
+    assert entry["pass"] is True
+    assert entry["message_count"] == 3
+    assert entry["offset"] == session.stat().st_size
+
+    _append(session, {"role": "user", "content": "after"})
+    assert session_discussion_pass("s1", "a1", deps=_state_deps(tmp_path))["message_count"] == 4
+    assert load_discussion_state(state_path, "other-marker") == {}
+
+
+def test_state_file_lives_in_sessions_dir_not_next_to_assignment_session(tmp_path):
+    sessions_dir = tmp_path / "s1"
+    sessions_dir.mkdir()
+    _write_jsonl(sessions_dir / "sess-9.jsonl", [{"role": "assistant", "content": MARKER}])
+    deps = SessionDiscussionDeps(
+        marker=MARKER,
+        load_student_sessions_index=lambda _sid: [{"assignment_id": "a1", "session_id": "sess-9"}],
+        student_session_file=lambda _sid, sess_id: sessions_dir / f"{sess_id}.jsonl",
+        use_discussion_state=True,
+        student_sessions_dir=lambda sid: tmp_path / sid,
+    )
+    assert session_discussion_pass("s1", "a1", deps=deps)["pass"] is True
+    assert set(load_discussion_state(sessions_dir / DISCUSSION_STATE_FILENAME, MARKER)) == {"sess-9.jsonl"}
+
+
+def test_rebuild_discussion_state(tmp_path):
+    _write_jsonl(tmp_path / "a1.jsonl", [{"role": "user", "content": "hi"}])
+    _write_jsonl(tmp_path / "sess2.jsonl", [{"role": "assistant", "content": MARKER}])
+    assert rebuild_discussion_state(tmp_path, MARKER) == 2
+    state = load_discussion_state(tmp_path / DISCUSSION_STATE_FILENAME, MARKER)
+    assert state["sess2.jsonl"]["pass"] is True
+    assert state["a1.jsonl"]["message_count"] == 1
@@ -75,6 +75,26 @@ def test_append_student_meta_does_not_overwrite_core_fields(tmp_path, monkeypatc
     assert rec["extra"] == "ok"
 
 
+def test_append_student_message_updates_discussion_state(tmp_path, monkeypatch):
+    from services.api.session_discussion_service import (
+        DISCUSSION_STATE_FILENAME,
+        load_discussion_state,
+    )
+    from services.api.session_store import append_student_session_message
+
+    monkeypatch.setattr("services.api.session_store.student_sessions_base_dir", lambda sid: tmp_path)
+    out = tmp_path / "sess1.jsonl"
+    monkeypatch.setattr("services.api.session_store.student_session_file", lambda sid, ssid: out)
+    monkeypatch.setattr("services.api.session_store.DISCUSSION_COMPLETE_MARKER", "[[DONE]]")
+    append_student_session_message("s1", "sess1", "user", "hello")
+    append_student_session_message("s1", "sess1", "assistant", "good [[DONE]]")
+
+    entry = load_discussion_state(tmp_path / DISCUSSION_STATE_FILENAME, "[[DONE]]")["sess1.jsonl"]
+    assert entry["message_count"] == 2
+    assert entry["pass"] is True
+    assert entry["offset"] == out.stat().st_size
+
+
 def test_append_teacher_meta_does_not_overwrite_core_fields(tmp_path, monkeypatch):
     from services.api.session_store import append_teacher_session_message
 
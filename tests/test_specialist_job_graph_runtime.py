@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import contextvars
+import threading
+import time
+
 import pytest
 
 from services.api.specialist_agents.contracts import HandoffContract, SpecialistAgentResult
 from services.api.specialist_agents.governor import SpecialistAgentRuntimeError
+from services.api.specialist_agents.job_graph_artifacts import (
+    JOB_GRAPH_ARTIFACTS,
+    job_graph_inputs,
+    job_graph_previous_result,
+)
 from services.api.specialist_agents.job_graph_models import JobGraphNode, SpecialistJobGraph
 from services.api.specialist_agents.job_graph_runtime import SpecialistJobGraphRuntime
 
@@ -178,3 +187,174 @@ def test_job_graph_runtime_preserves_primary_result_when_verify_node_is_reviewer
     assert result.final_result.output['executive_summary'] == 'primary analysis'
     assert result.review_metadata['approved'] is False
     assert result.review_metadata['reason_codes'] == ['missing_evidence_clips']
+
+
+
+def _completed(handoff: HandoffContract) -> SpecialistAgentResult:
+    return SpecialistAgentResult(
+        handoff_id=handoff.handoff_id,
+        agent_id=handoff.to_agent,
+        status='completed',
+        output={'executive_summary': handoff.handoff_id},
+    )
+
+
+
+def test_job_graph_runtime_runs_independent_nodes_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    captured: dict[str, HandoffContract] = {}
+
+    def _executor(handoff: HandoffContract) -> SpecialistAgentResult:
+        captured[handoff.handoff_id] = handoff
+        if handoff.handoff_id in {'signals', 'evidence'}:
+            barrier.wait()  # both analysts must be in flight at once
+        return _completed(handoff)
+
+    graph = SpecialistJobGraph(
+        nodes=[
+            JobGraphNode(node_id='signals', handoff=_handoff('signals'), depends_on=[]),
+            JobGraphNode(node_id='evidence', handoff=_handoff('evidence'), depends_on=[]),
+            JobGraphNode(node_id='verify', node_type='verify', handoff=_handoff('verify'), depends_on=['signals', 'evidence']),
+        ]
+    )
+
+    result = SpecialistJobGraphRuntime(executor=_executor).run(graph)
+
+    assert result.trace == ['signals', 'evidence', 'verify']
+    assert [item.handoff_id for item in result.results] == ['signals', 'evidence', 'verify']
+    verify_constraints = captured['verify'].constraints
+    assert set(verify_constraints['job_graph_results']) == {'signals', 'evidence'}
+    assert verify_constraints['job_graph_previous_result']['handoff_id'] == 'evidence'
+    assert 'job_graph_results' not in captured['evidence'].constraints
+
+
+
+def test_job_graph_runtime_bounds_parallelism_and_propagates_context() -> None:
+    marker: contextvars.ContextVar[str] = contextvars.ContextVar('marker', default='unset')
+    lock = threading.Lock()
+    state = {'running': 0, 'peak': 0}
+    seen_markers: list[str] = []
+
+    def _executor(handoff: HandoffContract) -> SpecialistAgentResult:
+        with lock:
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+            seen_markers.append(marker.get())
+        time.sleep(0.02)
+        with lock:
+            state['running'] -= 1
+        return _completed(handoff)
+
+    graph = SpecialistJobGraph(
+        nodes=[JobGraphNode(node_id=f'n{i}', handoff=_handoff(f'n{i}'), depends_on=[]) for i in range(5)]
+    )
+    marker.set('request-1')
+    SpecialistJobGraphRuntime(executor=_executor, max_parallel=2).run(graph)
+
+    assert state['peak'] == 2
+    assert seen_markers == ['request-1'] * 5
+
+
+
+def test_job_graph_runtime_failure_cancels_queued_nodes_and_waits_for_running_ones() -> None:
+    started: list[str] = []
+    finished: list[str] = []
+
+    def _executor(handoff: HandoffContract) -> SpecialistAgentResult:
+        started.append(handoff.handoff_id)
+        if handoff.handoff_id == 'bad':
+            raise RuntimeError('boom')
+        time.sleep(0.2)
+        finished.append(handoff.handoff_id)
+        return _completed(handoff)
+
+    graph = SpecialistJobGraph(
+        nodes=[
+            JobGraphNode(node_id='bad', handoff=_handoff('bad'), depends_on=[]),
+            JobGraphNode(node_id='slow', handoff=_handoff('slow'), depends_on=[]),
+            JobGraphNode(node_id='queued', handoff=_handoff('queued'), depends_on=[]),
+        ]
+    )
+
+    with pytest.raises(RuntimeError, match='boom'):
+        SpecialistJobGraphRuntime(executor=_executor, max_parallel=2).run(graph)
+
+    assert sorted(started) == ['bad', 'slow']
+    assert finished == ['slow']
+
+
+
+def test_job_graph_runtime_validates_dependencies_and_budgets_before_running() -> None:
+    calls: list[str] = []
+
+    def _executor(handoff: HandoffContract) -> SpecialistAgentResult:
+        calls.append(handoff.handoff_id)
+        return _completed(handoff)
+
+    runtime = SpecialistJobGraphRuntime(executor=_executor)
+    with pytest.raises(ValueError, match='unknown or later'):
+        runtime.run(
+            SpecialistJobGraph(
+                nodes=[
+                    JobGraphNode(node_id='analyze', handoff=_handoff('analyze'), depends_on=['verify']),
+                    JobGraphNode(node_id='verify', handoff=_handoff('verify')),
+                ]
+            )
+        )
+    with pytest.raises(SpecialistAgentRuntimeError):
+        runtime.run(
+            SpecialistJobGraph(
+                nodes=[
+                    JobGraphNode(node_id='analyze', handoff=_handoff('analyze')),
+                    JobGraphNode(node_id='verify', handoff=_handoff('verify'), max_budget={'max_tokens': 10}),
+                ]
+            )
+        )
+    assert calls == []
+
+
+
+def test_job_graph_runtime_reference_mode_passes_only_declared_inputs() -> None:
+    big_output = {'executive_summary': 'x' * 5000}
+    seen: dict[str, dict] = {}
+
+    def _executor(handoff: HandoffContract) -> SpecialistAgentResult:
+        seen[handoff.handoff_id] = {
+            'constraints': dict(handoff.constraints),
+            'refs': [ref.artifact_id.rsplit('/', 1)[-1] for ref in handoff.artifact_refs],
+            'ref_ids': [ref.artifact_id for ref in handoff.artifact_refs],
+            'inputs': job_graph_inputs(handoff),
+            'previous': job_graph_previous_result(handoff),
+        }
+        return SpecialistAgentResult(
+            handoff_id=handoff.handoff_id,
+            agent_id=handoff.to_agent,
+            status='completed',
+            output=big_output,
+        )
+
+    def _graph(mode: str) -> SpecialistJobGraph:
+        return SpecialistJobGraph(
+            handoff_mode=mode,
+            nodes=[
+                JobGraphNode(node_id='extract', handoff=_handoff('extract')),
+                JobGraphNode(node_id='analyze', handoff=_handoff('analyze')),
+                JobGraphNode(node_id='verify', node_type='verify', handoff=_handoff('verify'), depends_on=['analyze']),
+            ],
+        )
+
+    runtime = SpecialistJobGraphRuntime(executor=_executor)
+    inline = runtime.run(_graph('inline'))
+    reference = runtime.run(_graph('reference'))
+
+    verify = seen['verify']
+    assert 'job_graph_results' not in verify['constraints']
+    assert verify['constraints']['job_graph_inputs'] == ['analyze']
+    assert verify['refs'] == ['analyze']
+    assert list(verify['inputs']) == ['analyze']
+    assert verify['previous']['handoff_id'] == 'analyze'
+    assert reference.trace == ['extract', 'analyze', 'verify']
+    assert reference.stats['handoff_mode'] == 'reference'
+    assert reference.stats['handoff_payload_bytes'] < inline.stats['handoff_payload_bytes'] / 10
+    assert reference.stats['materialized_bytes'] > 0
+    assert JOB_GRAPH_ARTIFACTS.materialize(verify['ref_ids'][0]) is None  # released after the run
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+import unittest
+from difflib import SequenceMatcher
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from services.api.student_directory_index import StudentDirectoryIndex
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", "", text or "").lower()
+
+
+def _load(path: Path):
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write(profiles_dir: Path, student_id: str, name: str, class_name: str, aliases=None, *, age_sec: float = 60) -> None:
+    path = profiles_dir / f"{student_id}.json"
+    payload = {"student_id": student_id, "student_name": name, "class_name": class_name, "aliases": aliases or []}
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    stamp = time.time() - age_sec
+    os.utime(path, (stamp, stamp))
+
+
+def _settle(profiles_dir: Path) -> None:
+    stamp = time.time() - 60
+    os.utime(profiles_dir, (stamp, stamp))
+
+
+def _brute_force(profiles_dir: Path, query: str):
+    scores = {}
+    for path in profiles_dir.glob("*.json"):
+        profile = _load(path)
+        keys = [profile["student_id"], profile["student_name"], profile["class_name"], *profile["aliases"]]
+        scores[profile["student_id"]] = max(
+            1.0 if query in _normalize(key) else SequenceMatcher(None, query, _normalize(key)).ratio() for key in keys
+        )
+    return sorted((round(score, 3) for score in scores.values() if score > 0.1), reverse=True)
+
+
+class StudentDirectoryIndexTest(unittest.TestCase):
+    def test_search_matches_scoring_every_profile(self):
+        with TemporaryDirectory() as td:
+            profiles_dir = Path(td)
+            names = ["张三", "张三丰", "李四", "王五", "张小明", "赵明", "李明华", "陈丽"]
+            for n, name in enumerate(names):
+                _write(profiles_dir, f"S{n}", name, f"高二240{n % 3}班", aliases=[name[-1] + "哥"])
+            _settle(profiles_dir)
+            index = StudentDirectoryIndex()
+
+            for query in ["张三", "明", "李明", "高二2401班", "王哥", "s3"]:
+                limit = 3
+                got = index.search(profiles_dir, _normalize(query), limit, load=_load, normalize=_normalize)
+                self.assertEqual([round(score, 3) for _entry, score in got], _brute_force(profiles_dir, _normalize(query))[:limit])
+
+    def test_exact_and_class_maps_follow_changes(self):
+        with TemporaryDirectory() as td:
+            profiles_dir = Path(td)
+            _write(profiles_dir, "S1", "张三", "高二2403班", aliases=["阿三"])
+            _write(profiles_dir, "S2", "李四", "高二2403班")
+            _settle(profiles_dir)
+            index = StudentDirectoryIndex(revalidate_sec=3600)
+            kwargs = {"load": _load, "normalize": _normalize}
+
+            self.assertEqual([e.student_id for e in index.exact_matches(profiles_dir, "阿三", **kwargs)], ["S1"])
+            self.assertEqual([e.student_id for e in index.exact_matches(profiles_dir, "高二2403班张三", **kwargs)], ["S1"])
+            self.assertEqual([e.student_id for e in index.class_members(profiles_dir, "高二2403班", **kwargs)], ["S1", "S2"])
+
+            # In-place rewrite: the directory stamp does not move, so it needs a revalidation.
+            _write(profiles_dir, "S2", "李四", "高二2404班", age_sec=30)
+            self.assertEqual(len(index.class_members(profiles_dir, "高二2403班", **kwargs)), 2)
+            index.invalidate(profiles_dir)
+            self.assertEqual([e.student_id for e in index.class_members(profiles_dir, "高二2403班", **kwargs)], ["S1"])
+
+            (profiles_dir / "S1.json").unlink()
+            self.assertEqual(index.exact_matches(profiles_dir, "阿三", **kwargs), [])
+            self.assertEqual([p["student_id"] for p in index.profiles(profiles_dir, **kwargs)], ["S2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -32,11 +32,11 @@ def _issues(path: str) -> list[dict]:
 def test_student_memory_hotspots_removed() -> None:
     target = "services/api/student_memory_service.py"
     source = Path(target).read_text(encoding="utf-8")
-    assert "def _load_existing_proposals(" in source
+    assert "def _proposal_index(" in source
     assert "def _resolve_auto_proposal_conflict(" in source
     assert "def _create_auto_proposal(" in source
-    assert "def _list_proposal_files(" in source
-    assert "def _proposal_matches_filters(" in source
+    assert "def _auto_daily_quota_reached(" in source
+    assert "def _auto_find_duplicate(" in source
     assert "def _normalize_listed_proposal(" in source
     assert "def student_memory_auto_propose_from_turn_api(" in source
     assert "def student_memory_auto_propose_from_assignment_evidence_api(" in source
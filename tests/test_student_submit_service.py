@@ -193,6 +193,38 @@ class StudentSubmitServiceTest(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(auto_kwargs.get("assignment_id"), "HW_1")
             self.assertIsInstance(auto_kwargs.get("evidence"), dict)
 
+    async def test_submit_streams_uploads_through_save_upload_file(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            saved = []
+
+            async def _save_upload_file(upload, dest):
+                saved.append((upload.filename, dest))
+                return len(upload.content)
+
+            deps = StudentSubmitDeps(
+                uploads_dir=root / "uploads",
+                app_root=root / "repo",
+                student_submissions_dir=root / "submissions",
+                run_script=lambda _args: "ok",
+                compute_assignment_progress=lambda _assignment_id, _include_students: {"ok": False},
+                student_memory_auto_propose_from_assignment_evidence=lambda **_kwargs: {"ok": False, "created": False},
+                resolve_teacher_id=lambda teacher_id=None: str(teacher_id or "teacher"),
+                diag_log=lambda _event, _payload: None,
+                save_upload_file=_save_upload_file,
+            )
+
+            await submit(
+                student_id="S1",
+                files=[_Upload(filename="a1.pdf", content=b"1")],
+                assignment_id=None,
+                auto_assignment=False,
+                deps=deps,
+            )
+
+            self.assertEqual(saved, [("a1.pdf", root / "uploads" / "a1.pdf")])
+            self.assertFalse((root / "uploads" / "a1.pdf").exists())
+
 
 if __name__ == "__main__":
     unittest.main()
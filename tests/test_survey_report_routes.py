@@ -110,12 +110,13 @@ def test_teacher_survey_report_routes_delegate_to_analysis_report_plane(monkeypa
     app.include_router(build_router(core))
 
     with TestClient(app) as client:
-        client.get('/teacher/surveys/reports', params={'teacher_id': 'teacher_1'})
+        client.get('/teacher/surveys/reports', params={'teacher_id': 'teacher_1', 'limit': 20, 'cursor': 'c1'})
         client.get('/teacher/surveys/reports/report_1', params={'teacher_id': 'teacher_1'})
         client.post('/teacher/surveys/reports/report_1/rerun', json={'teacher_id': 'teacher_1', 'reason': 'refresh'})
         client.get('/teacher/surveys/review-queue', params={'teacher_id': 'teacher_1'})
 
     assert called['list']['domain'] == 'survey'
+    assert (called['list']['limit'], called['list']['cursor']) == (20, 'c1')
     assert called['get']['domain'] == 'survey'
     assert called['rerun']['domain'] == 'survey'
     assert called['review']['domain'] == 'survey'
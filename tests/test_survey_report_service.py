@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 from services.api.job_repository import write_survey_job
@@ -190,3 +191,70 @@ def test_list_survey_review_queue_filters_by_teacher(tmp_path: Path) -> None:
             "created_at": None,
         }
     ]
+
+
+
+def test_list_survey_reports_paginates_with_cursor(tmp_path: Path) -> None:
+    core = _Core(tmp_path)
+    for idx in range(5):
+        write_survey_report(
+            f"report_{idx}",
+            {
+                "report_id": f"report_{idx}",
+                "teacher_id": "teacher_1",
+                "status": "analysis_ready",
+                "updated_at": f"2026-03-06T10:0{idx}:00",
+            },
+            core=core,
+        )
+    write_survey_report("other", {"report_id": "other", "teacher_id": "teacher_2", "status": "analysis_ready"}, core=core)
+
+    deps = build_survey_report_deps(core)
+    first = list_survey_reports(teacher_id="teacher_1", status=None, deps=deps, limit=2)
+    second = list_survey_reports(teacher_id="teacher_1", status=None, deps=deps, limit=2, cursor=first["next_cursor"])
+    third = list_survey_reports(teacher_id="teacher_1", status=None, deps=deps, limit=2, cursor=second["next_cursor"])
+
+    ids = [item["report_id"] for page in (first, second, third) for item in page["items"]]
+    assert ids == ["report_4", "report_3", "report_2", "report_1", "report_0"]
+    assert third["next_cursor"] is None
+    assert "next_cursor" not in list_survey_reports(teacher_id="teacher_1", status=None, deps=deps)
+
+
+
+def test_list_survey_reports_index_tracks_writes_without_rescanning(tmp_path: Path, monkeypatch) -> None:
+    core = _Core(tmp_path)
+    write_survey_job("job_1", {"job_id": "job_1", "teacher_id": "teacher_1", "status": "queued"}, core=core)
+    deps = build_survey_report_deps(core)
+    assert [item["status"] for item in list_survey_reports(teacher_id="teacher_1", status=None, deps=deps)["items"]] == ["queued"]
+
+    def _no_rebuild() -> int:
+        raise AssertionError("index should be maintained incrementally")
+
+    monkeypatch.setattr(deps.report_index, "rebuild", _no_rebuild)
+    write_survey_job("job_1", {"status": "bundle_ready"}, core=core)
+    assert list_survey_reports(teacher_id="teacher_1", status="bundle_ready", deps=deps)["items"][0]["report_id"] == "job_1"
+
+    write_survey_report(
+        "report_1",
+        {"report_id": "report_1", "job_id": "job_1", "teacher_id": "teacher_1", "status": "analysis_ready"},
+        core=core,
+    )
+    result = list_survey_reports(teacher_id="teacher_1", status=None, deps=deps)
+    assert [(item["report_id"], item["status"]) for item in result["items"]] == [("report_1", "analysis_ready")]
+
+
+
+def test_list_survey_reports_rebuilds_index_after_external_changes(tmp_path: Path) -> None:
+    core = _Core(tmp_path)
+    write_survey_report("report_1", {"report_id": "report_1", "teacher_id": "teacher_1", "status": "analysis_ready"}, core=core)
+    deps = build_survey_report_deps(core)
+    assert len(list_survey_reports(teacher_id="teacher_1", status=None, deps=deps)["items"]) == 1
+
+    (core.DATA_DIR / "survey_reports" / "report_1.json").unlink()
+    assert list_survey_reports(teacher_id="teacher_1", status=None, deps=deps)["items"] == []
+
+    (core.DATA_DIR / "survey_reports" / "report_2.json").write_text(
+        json.dumps({"report_id": "report_2", "teacher_id": "teacher_1", "status": "review"}),
+        encoding="utf-8",
+    )
+    assert [item["report_id"] for item in list_survey_reports(teacher_id="teacher_1", status=None, deps=deps)["items"]] == ["report_2"]
@@ -44,7 +44,9 @@ def test_survey_report_list_route_calls_unified_analysis_plane(monkeypatch) -> N
 
     called = {}
 
-    def _fake_list(*, teacher_id, domain, status, strategy_id, target_type, deps):
+    def _fake_list(*, teacher_id, domain, status, strategy_id, target_type, deps, limit=None, cursor=None):
+        called["limit"] = limit
+        called["cursor"] = cursor
         called["teacher_id"] = teacher_id
         called["domain"] = domain
         called["status"] = status
@@ -66,3 +68,5 @@ def test_survey_report_list_route_calls_unified_analysis_plane(monkeypatch) -> N
     assert called["status"] == "analysis_ready"
     assert called["strategy_id"] is None
     assert called["target_type"] is None
+    assert called["limit"] is None
+    assert called["cursor"] is None
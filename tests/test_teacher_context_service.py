@@ -7,9 +7,11 @@ from tempfile import TemporaryDirectory
 from services.api.teacher_context_service import (
     TeacherContextDeps,
     build_teacher_context,
+    build_teacher_memory_context_reader,
     teacher_memory_context_text,
     teacher_session_summary_text,
 )
+from services.api.teacher_memory_context_cache import TeacherMemoryContextCache
 
 
 class TeacherContextServiceTest(unittest.TestCase):
@@ -80,6 +82,68 @@ class TeacherContextServiceTest(unittest.TestCase):
             self.assertIn("[auto_intent|2] 第二重要", text)
             self.assertNotIn("fallback-memory", text)
 
+    def test_memory_context_reader_serves_materialized_block_until_invalidated(self):
+        now = [1000.0]
+        cache = TeacherMemoryContextCache(ttl_sec=300, clock=lambda: now[0])
+        fingerprint = ["v1"]
+        records = [{"content": "记住A", "source": "manual", "score": 5, "expires_at": "2999-01-01T00:00:00"}]
+        calls = []
+
+        def active(teacher_id, target="MEMORY", limit=20):
+            calls.append(teacher_id)
+            return list(records)
+
+        reader = build_teacher_memory_context_reader(
+            teacher_memory_active_applied_records=active,
+            teacher_read_text=lambda path, max_chars=4000: "",
+            teacher_workspace_file=lambda teacher_id, name: Path("/nonexistent") / name,
+            teacher_memory_rank_score=lambda rec: rec.get("score", 0),
+            teacher_memory_context_max_entries=10,
+            context_cache=cache,
+            context_fingerprint=lambda teacher_id: fingerprint[0],
+        )
+
+        self.assertIn("记住A", reader("t1", 4000))
+        self.assertIn("记住A", reader("t1", 4000))
+        self.assertEqual(len(calls), 1)
+
+        records.append({"content": "记住B", "source": "manual", "score": 9})
+        cache.invalidate("t1")
+        self.assertIn("记住B", reader("t1", 4000))
+        self.assertEqual(len(calls), 2)
+
+        fingerprint[0] = None  # too fresh to trust: rendered every time
+        reader("t1", 4000)
+        reader("t1", 4000)
+        self.assertEqual(len(calls), 4)
+
+        fingerprint[0] = "v2"
+        reader("t1", 4000)
+        now[0] += 301  # ttl bounds drift of age-decayed scores
+        reader("t1", 4000)
+        self.assertEqual(len(calls), 6)
+
+    def test_memory_context_block_expires_with_its_first_record(self):
+        now = [1000.0]
+        cache = TeacherMemoryContextCache(ttl_sec=10_000, clock=lambda: now[0])
+        calls = []
+        reader = build_teacher_memory_context_reader(
+            teacher_memory_active_applied_records=lambda teacher_id, target="MEMORY", limit=20: calls.append(1)
+            or [{"content": "临时", "source": "manual", "expires_at": "1970-01-01T00:30:00+00:00"}],
+            teacher_read_text=lambda path, max_chars=4000: "",
+            teacher_workspace_file=lambda teacher_id, name: Path("/nonexistent") / name,
+            teacher_memory_rank_score=lambda rec: 1,
+            teacher_memory_context_max_entries=10,
+            context_cache=cache,
+            context_fingerprint=lambda teacher_id: "same",
+        )
+        reader("t1", 4000)
+        reader("t1", 4000)
+        self.assertEqual(len(calls), 1)
+        now[0] = 1800.0
+        reader("t1", 4000)
+        self.assertEqual(len(calls), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -58,6 +58,38 @@ class TeacherMemoryInsightsServiceTest(unittest.TestCase):
         self.assertEqual(retrieval.get("search_calls"), 1)
         self.assertEqual(retrieval.get("context_injected"), 1)
 
+    def test_teacher_memory_insights_reads_daily_counters_instead_of_events(self):
+        since_days = []
+
+        def load_event_stats(teacher_id, since_day):
+            since_days.append(since_day)
+            return {
+                "search_calls": 4,
+                "search_hit_calls": 3,
+                "context_injected": 7,
+                "search_mode_breakdown": {"mem0": 4},
+                "top_queries": [{"query": "q1", "calls": 3, "hit_calls": 3}, {"query": "q2", "calls": 1, "hit_calls": 0}],
+            }
+
+        deps = TeacherMemoryInsightsDeps(
+            ensure_teacher_workspace=lambda teacher_id: None,
+            recent_proposals=lambda teacher_id, limit: [],
+            is_expired_record=lambda rec, now: False,
+            priority_score=lambda **kwargs: 60,
+            rank_score=lambda rec: 60.0,
+            age_days=lambda rec, now: 1,
+            load_events=lambda teacher_id, limit: self.fail("event log should not be read"),
+            parse_dt=lambda value: datetime.fromisoformat(str(value)),
+            load_event_stats=load_event_stats,
+        )
+
+        result = teacher_memory_insights("teacher_1", deps=deps, days=7)
+        retrieval = result.get("retrieval") or {}
+        self.assertEqual(since_days, [(datetime.now() - timedelta(days=7)).date().isoformat()])
+        self.assertEqual(retrieval.get("search_hit_rate"), 0.75)
+        self.assertEqual(retrieval.get("context_injected"), 7)
+        self.assertEqual([item["hit_rate"] for item in result.get("top_queries") or []], [1.0, 0.0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -60,6 +60,32 @@ class TeacherMemorySearchServiceTest(unittest.TestCase):
         self.assertEqual(result.get("mode"), "keyword")
         self.assertEqual(result.get("matches"), [])
 
+    def test_mem0_hits_resolve_records_in_one_batch(self):
+        batches = []
+
+        def load_records(teacher_id, proposal_ids):
+            batches.append(list(proposal_ids))
+            return {"p1": {"proposal_id": "p1", "status": "applied"}, "p2": {"proposal_id": "p2", "status": "deleted"}}
+
+        deps = TeacherMemorySearchDeps(
+            ensure_teacher_workspace=lambda teacher_id: None,
+            mem0_search=lambda teacher_id, query, limit: {
+                "ok": True,
+                "matches": [{"proposal_id": pid, "content": pid} for pid in ("p1", "p2", "p3")],
+            },
+            search_filter_expired=True,
+            load_record=lambda teacher_id, proposal_id: self.fail("per-hit load_record must not be used"),
+            is_expired_record=lambda rec: False,
+            diag_log=lambda *_args, **_kwargs: None,
+            log_event=lambda *_args, **_kwargs: None,
+            teacher_workspace_file=lambda teacher_id, name: Path("/tmp") / name,
+            teacher_daily_memory_dir=lambda teacher_id: Path("/tmp"),
+            load_records=load_records,
+        )
+        result = teacher_memory_search("teacher_1", "查找", deps=deps, limit=3)
+        self.assertEqual(batches, [["p1", "p2", "p3"]])
+        self.assertEqual([m["proposal_id"] for m in result.get("matches") or []], ["p1"])
+
     def test_keyword_fallback_searches_workspace_files(self):
         with TemporaryDirectory() as td:
             root = Path(td)
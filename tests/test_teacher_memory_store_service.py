@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import json
+import os
 import unittest
+from dataclasses import replace
+from datetime import date, timedelta
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
+from services.api.teacher_memory_record_index import TeacherMemoryRecordIndex
 from services.api.teacher_memory_store_service import (
     TeacherMemoryStoreDeps,
     teacher_memory_active_applied_records,
+    teacher_memory_event_stats,
     teacher_memory_load_events,
+    teacher_memory_load_records,
     teacher_memory_log_event,
 )
 
@@ -32,6 +39,54 @@ class TeacherMemoryStoreServiceTest(unittest.TestCase):
             self.assertEqual(len(events), 1)
             self.assertEqual(events[0].get("event"), "search")
 
+    def test_log_rotates_by_size_and_keeps_daily_counters(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            today = date.today().isoformat()
+            deps = replace(self._deps(root), now_iso=lambda: f"{today}T09:00:00", event_log_max_bytes=400)
+            for n in range(30):
+                payload = {"mode": "mem0" if n % 3 else "local", "query": f"q{n % 4}", "hits": n % 2}
+                teacher_memory_log_event("teacher_1", "search", payload, deps=deps)
+            teacher_memory_log_event("teacher_1", "context_injected", {}, deps=deps)
+
+            telemetry = root / "teacher_1" / "telemetry"
+            self.assertTrue((telemetry / "memory_events.1.jsonl").exists())
+            self.assertLessEqual((telemetry / "memory_events.jsonl").stat().st_size, 400)
+            events = teacher_memory_load_events("teacher_1", deps=deps, limit=100)
+            self.assertLess(len(events), 31)
+            self.assertEqual(events[-1]["event"], "context_injected")
+            self.assertEqual([e["query"] for e in events[-3:-1]], ["q0", "q1"])
+
+            # Counters survive rotation and cover every event ever logged.
+            stats = teacher_memory_event_stats("teacher_1", deps=deps, since_day=today)
+            self.assertEqual(stats["search_calls"], 30)
+            self.assertEqual(stats["search_hit_calls"], 15)
+            self.assertEqual(stats["context_injected"], 1)
+            self.assertEqual(stats["search_mode_breakdown"], {"local": 10, "mem0": 20})
+            self.assertEqual(stats["top_queries"][0], {"query": "q1", "calls": 8, "hit_calls": 8})
+            tomorrow = (date.today() + timedelta(days=1)).isoformat()
+            self.assertEqual(teacher_memory_event_stats("teacher_1", deps=deps, since_day=tomorrow)["search_calls"], 0)
+
+    def test_counters_are_seeded_once_from_an_existing_log(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            deps = self._deps(root)
+            telemetry = root / "teacher_1" / "telemetry"
+            telemetry.mkdir(parents=True)
+            lines = [
+                json.dumps({"ts": "2026-02-05T10:00:00", "event": "search", "mode": "mem0", "query": "a", "hits": 1}),
+                "{not json",
+                json.dumps({"ts": "2026-02-06T10:00:00", "event": "context_injected"}),
+            ]
+            (telemetry / "memory_events.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+            teacher_memory_log_event("teacher_1", "search", {"mode": "mem0", "query": "a", "hits": 0}, deps=deps)
+            stats = teacher_memory_event_stats("teacher_1", deps=deps, since_day="2026-02-01")
+            self.assertEqual((stats["search_calls"], stats["search_hit_calls"], stats["context_injected"]), (2, 1, 1))
+            self.assertEqual(stats["top_queries"], [{"query": "a", "calls": 2, "hit_calls": 1}])
+            self.assertEqual(teacher_memory_event_stats("teacher_1", deps=deps, since_day="2026-02-06")["search_calls"], 1)
+            self.assertEqual(len(teacher_memory_load_events("teacher_1", deps=deps, limit=10)), 3)
+
     def test_active_applied_records_filters_status(self):
         with TemporaryDirectory() as td:
             root = Path(td)
@@ -50,6 +105,33 @@ class TeacherMemoryStoreServiceTest(unittest.TestCase):
             self.assertEqual(len(items), 1)
             self.assertEqual(items[0].get("proposal_id"), "p1")
 
+    def test_load_records_batches_and_tracks_file_changes(self):
+        with TemporaryDirectory() as td:
+            root = Path(td)
+            deps = self._deps(root)
+            index = TeacherMemoryRecordIndex()
+            proposals = root / "teacher_1" / "proposals"
+            proposals.mkdir(parents=True)
+
+            def write(pid, status, stamp_ns):
+                path = proposals / f"{pid}.json"
+                tmp = proposals / f"{pid}.json.tmp"
+                tmp.write_text(json.dumps({"proposal_id": pid, "status": status}), encoding="utf-8")
+                tmp.replace(path)
+                os.utime(path, ns=(stamp_ns, stamp_ns))
+                os.utime(proposals, ns=(stamp_ns, stamp_ns))
+
+            write("p1", "applied", 1_000_000_000)
+            write("p2", "applied", 1_000_000_000)
+            found = teacher_memory_load_records("teacher_1", ["p1", "p2", "missing", ""], deps=deps, index=index)
+            self.assertEqual(sorted(found), ["p1", "p2"])
+            self.assertEqual(found["p1"]["status"], "applied")
+
+            write("p1", "deleted", 2_000_000_000)
+            (proposals / "p2.json").unlink()
+            found = teacher_memory_load_records("teacher_1", ["p1", "p2"], deps=deps, index=index)
+            self.assertEqual(found, {"p1": {"proposal_id": "p1", "status": "deleted"}})
+
 
 if __name__ == "__main__":
     unittest.main()
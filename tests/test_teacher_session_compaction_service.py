@@ -1,10 +1,19 @@
 from __future__ import annotations
 
 import json
+import threading
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
+from services.api.chat_session_history_service import load_session_messages
+from services.api.session_checkpoint_store import (
+    append_session_line,
+    checkpoint_pointer_path,
+    reclaim_session_prefix,
+    session_append_lock,
+    session_view_lines,
+)
 from services.api.teacher_session_compaction_service import (
     TeacherSessionCompactionDeps,
     maybe_compact_teacher_session,
@@ -67,6 +76,103 @@ class TeacherSessionCompactionServiceTest(unittest.TestCase):
         result = maybe_compact_teacher_session("teacher_1", "main", deps=deps)
         self.assertEqual(result.get("reason"), "disabled")
 
+    def _checkpoint_deps(self, session_path, summaries, reclaims):
+        def summarize(head, old_summary):
+            summaries.append(([r["content"] for r in head], old_summary))
+            return f"summary-{len(summaries)}"
+
+        return TeacherSessionCompactionDeps(
+            compact_enabled=True,
+            compact_main_only=False,
+            compact_max_messages=4,
+            compact_keep_tail=2,
+            chat_max_messages_teacher=20,
+            teacher_compact_allowed=lambda teacher_id, session_id: True,
+            teacher_session_file=lambda teacher_id, session_id: session_path,
+            teacher_compact_summary=summarize,
+            write_teacher_session_records=lambda path, records: self.fail("checkpoint mode must not rewrite"),
+            mark_teacher_session_compacted=lambda *_args: None,
+            diag_log=lambda *_args, **_kwargs: None,
+            compact_mode="checkpoint",
+            reclaim_min_bytes=1,
+            schedule_session_reclaim=reclaims.append,
+        )
+
+    @staticmethod
+    def _append(path, *contents):
+        with path.open("a", encoding="utf-8") as handle:
+            for n, content in enumerate(contents):
+                role = "user" if n % 2 == 0 else "assistant"
+                handle.write(json.dumps({"role": role, "content": content}, ensure_ascii=False) + "\n")
+
+    def test_checkpoint_mode_appends_summary_and_moves_read_pointer(self):
+        with TemporaryDirectory() as td:
+            session_path = Path(td) / "main.jsonl"
+            self._append(session_path, "m1", "m2", "m3", "m4", "m5", "m6")
+            summaries, reclaims = [], []
+            deps = self._checkpoint_deps(session_path, summaries, reclaims)
+
+            result = maybe_compact_teacher_session("teacher_1", "main", deps=deps)
+            self.assertTrue(result.get("ok"))
+            self.assertEqual(result.get("mode"), "checkpoint")
+            raw = [json.loads(line) for line in session_path.read_text(encoding="utf-8").splitlines()]
+            self.assertEqual([r["content"] for r in raw[:6]], ["m1", "m2", "m3", "m4", "m5", "m6"])
+            self.assertEqual(raw[-1]["kind"], "session_summary")
+            self.assertEqual(reclaims, [session_path])
+
+            self._append(session_path, "m7", "m8", "m9")
+            view = [json.loads(line) for line in session_view_lines(session_path)]
+            self.assertIn("summary-1", view[0]["content"])
+            self.assertEqual([r["content"] for r in view[1:]], ["m5", "m6", "m7", "m8", "m9"])
+            page = load_session_messages(session_path, cursor=-1, limit=50, direction="backward")
+            self.assertEqual(page["messages"], view)
+
+            # The next compaction only reads the live segment and chains the previous summary.
+            maybe_compact_teacher_session("teacher_1", "main", deps=deps)
+            self.assertEqual(summaries[1], (["m5", "m6", "m7"], view[0]["content"]))
+            view = [json.loads(line) for line in session_view_lines(session_path)]
+            self.assertIn("summary-2", view[0]["content"])
+            self.assertEqual([r["content"] for r in view[1:]], ["m8", "m9"])
+
+    def test_reclaim_rewrites_file_to_live_view(self):
+        with TemporaryDirectory() as td:
+            session_path = Path(td) / "main.jsonl"
+            self._append(session_path, "m1", "m2", "m3", "m4", "m5", "m6")
+            deps = self._checkpoint_deps(session_path, [], [])
+            maybe_compact_teacher_session("teacher_1", "main", deps=deps)
+            self._append(session_path, "m7")
+            view = session_view_lines(session_path)
+
+            self.assertTrue(reclaim_session_prefix(session_path))
+            self.assertFalse(checkpoint_pointer_path(session_path).exists())
+            self.assertEqual(session_path.read_text(encoding="utf-8").splitlines(), view)
+            self.assertEqual(session_view_lines(session_path), view)
+            self.assertFalse(reclaim_session_prefix(session_path))
+
+
+    def test_reclaim_does_not_lose_appends_racing_the_rewrite(self):
+        with TemporaryDirectory() as td:
+            session_path = Path(td) / "main.jsonl"
+            self._append(session_path, "m1", "m2", "m3", "m4", "m5", "m6")
+            deps = self._checkpoint_deps(session_path, [], [])
+            maybe_compact_teacher_session("teacher_1", "main", deps=deps)
+            view = session_view_lines(session_path)
+            line = (json.dumps({"role": "user", "content": "m7"}) + "\n").encode("utf-8")
+
+            with session_append_lock(session_path):
+                appender = threading.Thread(target=append_session_line, args=(session_path, line))
+                reclaim = threading.Thread(target=reclaim_session_prefix, args=(session_path,))
+                appender.start()
+                reclaim.start()
+                appender.join(0.2)
+                self.assertTrue(appender.is_alive())
+            appender.join(5)
+            reclaim.join(5)
+
+            self.assertFalse(checkpoint_pointer_path(session_path).exists())
+            raw_lines = session_path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(raw_lines[: len(view)], view)
+            self.assertEqual([json.loads(raw)["content"] for raw in raw_lines[len(view):]], ["m7"])
 
 if __name__ == "__main__":
     unittest.main()
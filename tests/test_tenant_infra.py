@@ -79,6 +79,109 @@ def test_validate_tenant_id_rejects_bad_input():
             validate_tenant_id(bad)
 
 
+def _fake_tenant_app(settings):
+    inst = MagicMock()
+    inst.app = MagicMock()
+    inst.has_active_jobs.return_value = False
+    return inst
+
+
+def _bounded_registry(tids, **kwargs):
+    from services.api.observability import ObservabilityStore
+    from services.api.tenant_registry import TenantRegistry
+    store = _FakeStore({tid: _FakeConfig(tid) for tid in tids})
+    metrics = ObservabilityStore()
+    return TenantRegistry(store, metrics=metrics, **kwargs), metrics
+
+
+def test_registry_evicts_least_recently_used_beyond_capacity():
+    registry, metrics = _bounded_registry(["t1", "t2", "t3"], max_resident=2, idle_ttl_sec=0)
+    with patch("services.api.tenant_registry.create_tenant_app", side_effect=_fake_tenant_app):
+        first = registry.get_or_create("t1")
+        registry.get_or_create("t2")
+        registry.get_or_create("t1")
+        registry.get_or_create("t3")
+
+    assert registry.get_loaded("t2") is None
+    assert registry.get_loaded("t1") is first
+    first.instance.shutdown.assert_not_called()
+    snap = metrics.snapshot()
+    assert snap["gauges"]["tenant_resident"] == 2
+    assert snap["counters"]["tenant_evictions_total"] == {"lru": 1.0}
+    assert snap["timings"]["tenant_build"]["request"]["count"] == 3
+
+
+def test_registry_evicts_idle_tenants_but_not_leased_ones():
+    now = [0.0]
+    registry, metrics = _bounded_registry(["t1", "t2"], max_resident=8, idle_ttl_sec=60, clock=lambda: now[0])
+    with patch("services.api.tenant_registry.create_tenant_app", side_effect=_fake_tenant_app):
+        idle = registry.get_or_create("t1")
+        busy = registry.get_or_create("t2")
+        with registry.lease(busy):
+            now[0] = 120.0
+            assert registry.evict_idle() == 1
+
+    assert registry.get_loaded("t1") is None
+    assert registry.get_loaded("t2") is busy
+    idle.instance.shutdown.assert_called_once()
+    assert metrics.snapshot()["counters"]["tenant_evictions_total"] == {"idle": 1.0}
+
+
+def test_registry_keeps_tenants_with_active_jobs_and_leases_atomically():
+    now = [0.0]
+    registry, _ = _bounded_registry(["t1", "t2", "t3"], max_resident=1, idle_ttl_sec=60, clock=lambda: now[0])
+    with patch("services.api.tenant_registry.create_tenant_app", side_effect=_fake_tenant_app):
+        working = registry.get_or_create("t1")
+        working.instance.has_active_jobs.return_value = True
+        leased = registry.get_or_create("t2", lease=True)
+        assert registry.get_loaded("t1") is working
+        registry.get_or_create("t3")
+        now[0] = 120.0
+        assert registry.evict_idle() == 1
+
+        assert registry.get_loaded("t3") is None
+        assert registry.get_loaded("t2") is leased
+        working.instance.shutdown.assert_not_called()
+        registry.release(leased)
+        working.instance.has_active_jobs.return_value = False
+        assert registry.evict_idle() == 1
+    working.instance.shutdown.assert_called_once()
+    assert registry.get_loaded("t2") is leased
+
+
+def test_registry_cold_build_does_not_block_other_tenants():
+    registry, _ = _bounded_registry(["slow", "fast"])
+    release = threading.Event()
+
+    def _create(settings):
+        if settings.tenant_id == "slow":
+            release.wait(timeout=5)
+        return _fake_tenant_app(settings)
+
+    with patch("services.api.tenant_registry.create_tenant_app", side_effect=_create):
+        slow = threading.Thread(target=registry.get_or_create, args=("slow",))
+        slow.start()
+        try:
+            assert registry.get_or_create("fast").tenant_id == "fast"
+            assert registry.get_loaded("slow") is None
+        finally:
+            release.set()
+            slow.join(timeout=5)
+    assert registry.get_loaded("slow") is not None
+
+
+def test_registry_warmup_builds_in_background():
+    registry, metrics = _bounded_registry(["t1", "t2"])
+    with patch("services.api.tenant_registry.create_tenant_app", side_effect=_fake_tenant_app):
+        thread = registry.start_warmup(["t1", "missing", "t2", "t1", ""])
+        assert thread is not None
+        thread.join(timeout=5)
+
+    assert registry.resident_count() == 2
+    assert metrics.snapshot()["timings"]["tenant_build"]["warmup"]["count"] == 2
+    assert registry.start_warmup([]) is None
+
+
 # ---------------------------------------------------------------------------
 # 2. tenant_dispatcher: tightened regex
 # ---------------------------------------------------------------------------
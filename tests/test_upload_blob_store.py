@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import errno
+import io
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from services.api import upload_blob_store
+from services.api.upload_blob_store import UploadBlobStore, get_upload_blob_store, known_digest
+from services.api.upload_text_service import file_content_sha256, save_upload_file
+
+
+class _Upload:
+    def __init__(self, content: bytes):
+        self.file = io.BytesIO(content)
+
+
+async def _inline(fn):  # type: ignore[no-untyped-def]
+    return fn()
+
+
+def _save(upload: _Upload, dest: Path, store: UploadBlobStore) -> int:
+    return asyncio.run(
+        save_upload_file(upload, dest, run_in_threadpool=_inline, chunk_size=3, blob_store=store)  # type: ignore[arg-type]
+    )
+
+
+def test_identical_uploads_are_stored_once_and_linked(tmp_path: Path) -> None:
+    store = UploadBlobStore(tmp_path / "uploads" / "blobs")
+    first = tmp_path / "uploads" / "job_a" / "paper.pdf"
+    second = tmp_path / "uploads" / "job_b" / "scan.pdf"
+
+    assert _save(_Upload(b"same worksheet"), first, store) == 14
+    assert _save(_Upload(b"same worksheet"), second, store) == 14
+
+    blobs = list((store.objects_dir).glob("*/*"))
+    assert len(blobs) == 1
+    digest = blobs[0].name
+    assert first.read_bytes() == second.read_bytes() == b"same worksheet"
+    assert os.stat(first).st_ino == os.stat(blobs[0]).st_ino
+    assert os.stat(first).st_nlink == 3
+    assert store.ref_count(digest) == 2
+    assert known_digest(first) == digest
+    assert file_content_sha256(second) == digest
+    assert not list(store.tmp_dir.iterdir())
+
+
+def test_replacing_a_linked_file_does_not_touch_the_shared_blob(tmp_path: Path) -> None:
+    store = UploadBlobStore(tmp_path / "uploads" / "blobs")
+    dest_a = tmp_path / "uploads" / "job_a" / "a.png"
+    dest_b = tmp_path / "uploads" / "job_b" / "a.png"
+    _save(_Upload(b"original"), dest_a, store)
+    _save(_Upload(b"original"), dest_b, store)
+
+    _save(_Upload(b"replacement"), dest_a, store)
+
+    assert dest_a.read_bytes() == b"replacement"
+    assert dest_b.read_bytes() == b"original"
+
+
+def test_collect_garbage_removes_unreferenced_blobs_only(tmp_path: Path) -> None:
+    store = UploadBlobStore(tmp_path / "uploads" / "blobs")
+    keep = tmp_path / "uploads" / "job_a" / "keep.pdf"
+    drop = tmp_path / "uploads" / "job_b" / "drop.pdf"
+    _save(_Upload(b"keep me"), keep, store)
+    ref = store.ingest_stream(io.BytesIO(b"drop me"))
+    store.link(ref.digest, drop)
+
+    drop.unlink()
+    assert store.ref_count(ref.digest) == 0
+
+    # Fresh blobs are protected by the age guard.
+    assert store.collect_garbage()["removed"] == 0
+    result = store.collect_garbage(min_age_sec=0)
+    assert result["removed"] == 1
+    assert result["freed_bytes"] == len(b"drop me")
+    assert not store.blob_path(ref.digest).exists()
+    assert keep.read_bytes() == b"keep me"
+
+
+def test_deleting_a_job_file_drops_its_reference(tmp_path: Path) -> None:
+    store = get_upload_blob_store(tmp_path / "blobs")
+    assert get_upload_blob_store(tmp_path / "blobs") is store
+    dest = tmp_path / "job" / "x.txt"
+    ref = store.save_stream(io.BytesIO(b"x"), dest)
+    assert store.ref_count(ref.digest) == 1
+    dest.unlink()
+    assert store.ref_count(ref.digest) == 0
+
+
+def test_hardlink_unavailable_falls_back_to_a_private_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = UploadBlobStore(tmp_path / "uploads" / "blobs")
+
+    def _no_link(src: object, dst: object) -> None:
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(upload_blob_store.os, "link", _no_link)
+    dest = tmp_path / "uploads" / "job" / "a.txt"
+    ref = store.save_stream(io.BytesIO(b"body"), dest)
+
+    assert dest.read_bytes() == b"body"
+    assert os.stat(dest).st_ino != os.stat(ref.path).st_ino
+    assert store.ref_count(ref.digest) == 1
+
+
+def test_blob_collected_before_link_is_ingested_again(tmp_path: Path) -> None:
+    store = UploadBlobStore(tmp_path / "uploads" / "blobs")
+    ref = store.ingest_stream(io.BytesIO(b"racy"))
+    real_link = store.link
+    calls = []
+
+    def _link_after_gc(digest: str, dest: Path) -> str:
+        calls.append(digest)
+        if len(calls) == 1:
+            store.blob_path(digest).unlink()
+        return real_link(digest, dest)
+
+    store.link = _link_after_gc  # type: ignore[method-assign]
+    dest = tmp_path / "uploads" / "job" / "racy.txt"
+    assert store.save_stream(io.BytesIO(b"racy"), dest).digest == ref.digest
+
+    assert len(calls) == 2
+    assert dest.read_bytes() == b"racy"
+    assert store.blob_path(ref.digest).exists()
+    assert not list(store.tmp_dir.iterdir())
+
+
+def test_collection_runs_in_the_background_once_per_interval(tmp_path: Path) -> None:
+    store = UploadBlobStore(tmp_path / "blobs", gc_interval_sec=3600, gc_min_age_sec=0)
+    orphan = store.ingest_stream(io.BytesIO(b"orphan"))
+    assert store.maybe_collect_garbage() is False
+
+    store._last_gc -= 3600
+    assert store.maybe_collect_garbage() is True
+    assert store.maybe_collect_garbage() is False
+    for _ in range(100):
+        if not store.blob_path(orphan.digest).exists():
+            break
+        time.sleep(0.02)
+    assert not store.blob_path(orphan.digest).exists()
@@ -46,6 +46,47 @@ def _deps(logs):
 @pytest.fixture(autouse=True)
 def _reset_ocr_utils(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(mod, "_OCR_UTILS", None)
+    mod.reset_pdf_extract_cache()
+
+
+def _fake_pdf_module(page_texts):
+    class _Image:
+        def __init__(self, index: int):
+            self.index = index
+
+        def save(self, path: str) -> None:
+            Path(path).write_text(f"page-{self.index}", encoding="utf-8")
+
+    class _Page:
+        def __init__(self, index: int, text: str):
+            self.index = index
+            self.text = text
+
+        def extract_text(self) -> str:
+            return self.text
+
+        def to_image(self, resolution: int = 72):
+            return _Image(self.index)
+
+    class _Pdf:
+        def __init__(self):
+            self.pages = [_Page(i, text) for i, text in enumerate(page_texts)]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb) -> None:
+            return None
+
+    opened = {"count": 0}
+
+    def _open(_path):
+        opened["count"] += 1
+        return _Pdf()
+
+    fake = types.ModuleType("pdfplumber")
+    fake.open = _open  # type: ignore[attr-defined]
+    return fake, opened
 
 
 def test_parse_timeout_env_branches(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -250,6 +291,90 @@ def test_extract_text_from_pdf_extract_exception_and_empty_fallback(
     assert any(event == "pdf.extract.error" for event, _ in logs)
 
 
+def test_extract_text_from_pdf_ocrs_only_low_text_pages_in_order(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    logs = []
+    deps = _deps(logs)
+    body = "第一页正文内容，包含足够多的文字用于直接抽取。"
+    fake, _opened = _fake_pdf_module([body, "", body + "三", " "])
+    monkeypatch.setitem(sys.modules, "pdfplumber", fake)
+    ocr_calls = []
+
+    def _ocr(image_path, **kwargs):  # type: ignore[no-untyped-def]
+        ocr_calls.append(Path(image_path).name)
+        return f"OCR {Path(image_path).read_text(encoding='utf-8')}"
+
+    monkeypatch.setattr(mod, "load_ocr_utils", lambda: (None, _ocr))
+
+    text = extract_text_from_pdf(tmp_path / "a.pdf", deps=deps)
+
+    assert text.splitlines() == [body, "OCR page-1", body + "三", "OCR page-3"]
+    assert sorted(ocr_calls) == ["page_0002.png", "page_0004.png"]
+    assert any(event == "pdf.page_ocr.done" for event, _ in logs)
+    assert not any(event == "pdf.ocr.done" for event, _ in logs)
+
+
+def test_extract_text_from_pdf_parallel_pages_keep_order(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    page_texts = [f"page {i} " + "x" * 30 for i in range(20)]
+    fake, opened = _fake_pdf_module(page_texts)
+    monkeypatch.setitem(sys.modules, "pdfplumber", fake)
+    monkeypatch.setattr(mod, "load_ocr_utils", lambda: (None, None))
+    monkeypatch.setenv("PDF_EXTRACT_WORKERS", "3")
+
+    text = extract_text_from_pdf(tmp_path / "a.pdf", deps=_deps([]))
+
+    assert text.splitlines() == [t.strip() for t in page_texts]
+    assert opened["count"] == 4
+
+
+def test_extract_text_from_pdf_caches_by_content_hash(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    logs = []
+    cache_dir = tmp_path / "cache"
+    deps = UploadTextDeps(
+        diag_log=lambda event, payload=None: logs.append((event, payload or {})),
+        limit=_deps([]).limit,
+        ocr_semaphore=object(),
+        extract_cache_dir=cache_dir,
+    )
+    fake, opened = _fake_pdf_module(["cached page body " * 4])
+    monkeypatch.setitem(sys.modules, "pdfplumber", fake)
+    monkeypatch.setattr(mod, "load_ocr_utils", lambda: (None, None))
+    first = tmp_path / "first.pdf"
+    second = tmp_path / "second.pdf"
+    first.write_bytes(b"%PDF-same-bytes")
+    second.write_bytes(b"%PDF-same-bytes")
+
+    out1 = extract_text_from_pdf(first, deps=deps)
+    out2 = extract_text_from_pdf(second, deps=deps)
+    assert out1 == out2
+    assert opened["count"] == 1
+    assert len(list(cache_dir.glob("*.txt"))) == 1
+
+    # The on-disk cache survives a cold in-process cache (e.g. a worker retry).
+    mod.reset_pdf_extract_cache()
+    assert extract_text_from_pdf(first, deps=deps) == out1
+    assert opened["count"] == 1
+    assert sum(1 for event, _ in logs if event == "pdf.extract.cache_hit") == 2
+
+
+def test_extract_text_from_pdf_does_not_cache_partial_ocr(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    fake, opened = _fake_pdf_module([""])
+    monkeypatch.setitem(sys.modules, "pdfplumber", fake)
+    monkeypatch.setattr(
+        mod,
+        "load_ocr_utils",
+        lambda: (None, lambda *args, **kwargs: (_ for _ in ()).throw(RuntimeError("network error"))),
+    )
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-scan")
+
+    assert extract_text_from_pdf(pdf, deps=_deps([])) == ""
+    monkeypatch.setattr(mod, "load_ocr_utils", lambda: (None, lambda *args, **kwargs: "recovered"))
+    assert extract_text_from_pdf(pdf, deps=_deps([])) == "recovered"
+    assert opened["count"] == 4
+
+
 def test_extract_text_from_image_success_and_failure(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     logs = []
     deps = _deps(logs)
@@ -304,3 +429,50 @@ def test_extract_text_from_file_unsupported_suffix(tmp_path: Path) -> None:
     deps = _deps([])
     with pytest.raises(RuntimeError, match="不支持的文件类型"):
         extract_text_from_file(tmp_path / "x.doc", deps=deps)
+
+
+def test_sweep_pdf_extract_cache_drops_stale_then_least_recently_used(tmp_path: Path) -> None:
+    import os
+    import time
+
+    cache_dir = tmp_path / "extract_cache"
+    cache_dir.mkdir()
+    now = time.time()
+    for name, age_sec in [("stale", 40 * 86400), ("old", 300), ("mid", 200), ("new", 100)]:
+        path = cache_dir / f"{name}.txt"
+        path.write_text("x" * 10, encoding="utf-8")
+        os.utime(path, (now - age_sec, now - age_sec))
+
+    result = mod.sweep_pdf_extract_cache(cache_dir, max_bytes=20, max_age_sec=30 * 86400)
+
+    assert result == {"removed": 2, "freed_bytes": 20, "kept": 2}
+    assert sorted(path.stem for path in cache_dir.glob("*.txt")) == ["mid", "new"]
+
+
+def test_pdf_extract_cache_sweeps_at_most_once_per_interval(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    swept = []
+
+    class _InlineThread:
+        def __init__(self, *, target, args, kwargs, name, daemon):
+            self.target, self.args, self.kwargs = target, args, kwargs
+
+        def start(self):
+            swept.append(self.kwargs)
+            self.target(*self.args, **self.kwargs)
+
+    monkeypatch.setattr(mod.threading, "Thread", _InlineThread)
+    deps = UploadTextDeps(
+        diag_log=lambda *_args, **_kwargs: None,
+        limit=_deps([]).limit,
+        ocr_semaphore=object(),
+        extract_cache_dir=tmp_path / "extract_cache",
+        extract_cache_max_bytes=1,
+        extract_cache_max_age_sec=60.0,
+        extract_cache_sweep_interval_sec=3600.0,
+    )
+
+    mod._pdf_extract_cache_put("a", "first", deps)
+    mod._pdf_extract_cache_put("b", "second", deps)
+
+    assert swept == [{"max_bytes": 1, "max_age_sec": 60.0}]
+    assert [path.name for path in (tmp_path / "extract_cache").glob("*.txt")] == ["b.txt"]